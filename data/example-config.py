@@ -116,6 +116,10 @@ config = {
         # Minimum successful image uploads required to continue
         "min_successful_image_uploads": "3",
 
+        # Upload each screenshot as soon as it has been captured and size checked,
+        # instead of waiting for every screenshot to be captured first
+        "stream_screenshot_uploads": True,
+
         # Number of cutoff screenshots
         # If there are at least this many screenshots already, perhaps pulled from existing
         # description, skip creating and uploading any further screenshots.
@@ -135,6 +139,10 @@ config = {
         # This places an additional limitation on ffmpeg to reduce CPU usage
         "ffmpeg_limit": False,
 
+        # Set false to start one ffmpeg process per screenshot instead of extracting
+        # all screenshots for a file from a single ffmpeg process (one per process_limit worker)
+        "ffmpeg_batch_screens": True,
+
         # Tonemap HDR - DV+HDR screenshots
         "tone_map": True,
 
@@ -303,6 +311,14 @@ config = {
         # Conversely, you can set a lower amount such as 1 to protect system resources (default "0" (auto))
         "mkbrr_threads": "0",
 
+        # Number of torrents that may hash at the same time from the same disk (source device).
+        # Torrents whose content is on different disks always hash in parallel (default "1")
+        "hash_device_concurrency": "1",
+
+        # Cap the combined read speed of torrent hashing in MB/s, to leave bandwidth for seeding (default "0" (no cap))
+        # Applies to the internal hasher, not to mkbrr
+        "hash_bandwidth_limit": "0",
+
         # Set true to prefer torrents with piece size <= 16 MiB when searching for existing torrents in clients
         # Does not override MTV preference for small pieces
         "prefer_max_16_torrent": False,
@@ -312,6 +328,16 @@ config = {
         # in (seconds) before rehashing begins, to allow other tasks to complete quickly, before resources are consumed by rehashing
         "rehash_cooldown": "0",
 
+        # QUEUE PIPELINE (--pipeline)
+
+        # Number of queue items allowed in each stage at the same time when running a queue with --pipeline.
+        # Item N+1 can gather metadata while item N hashes and item N-1 uploads to trackers.
+        "pipeline_metadata_workers": "2",
+        "pipeline_screenshot_workers": "1",
+        "pipeline_image_upload_workers": "2",
+        "pipeline_hash_workers": "1",
+        "pipeline_upload_workers": "1",
+
         # POST UPLOAD
 
         # Delay (in seconds) before injecting the torrent to allow the tracker to register the hash and avoid 'unregistered torrent' errors.
@@ -968,6 +994,9 @@ config = {
             "qui_proxy_url": "",
             # enable_search to True will automatically try and find a suitable hash to save having to rehash when creating torrents
             "enable_search": True,
+            # Keep a local index of the client's torrents, updated with qBittorrent's incremental sync API,
+            # so searches don't fetch the full torrent list every time. Set to False to always use the full list.
+            "torrent_index": True,
             "qbit_url": "http://127.0.0.1",
             "qbit_port": "8080",
             "qbit_user": "",
@@ -1018,6 +1047,9 @@ config = {
             "qui_proxy_url": "",
             # enable_search to True will automatically try and find a suitable hash to save having to rehash when creating torrents
             "enable_search": True,
+            # Keep a local index of the client's torrents, updated with qBittorrent's incremental sync API,
+            # so searches don't fetch the full torrent list every time. Set to False to always use the full list.
+            "torrent_index": True,
             "qbit_url": "http://127.0.0.1",
             "qbit_port": "8080",
             "qbit_user": "",
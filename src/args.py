@@ -9,6 +9,7 @@ from collections.abc import Sequence
 from typing import Any, Optional, cast
 
 from src.console import console
+from src.runcontext import run_argv
 
 
 class ShortHelpFormatter(argparse.HelpFormatter):
@@ -58,7 +59,7 @@ class CustomArgumentParser(argparse.ArgumentParser):
         """
         Show short help for `-h` and full help for `--help`
         """
-        if "--help" in sys.argv:
+        if "--help" in run_argv():
             super().print_help(file)  # Full help
         else:
             short_parser = argparse.ArgumentParser(
@@ -85,6 +86,7 @@ class Args:
         parser.add_argument('path', nargs='*', help="Path to file/directory (in single/double quotes is best)")
         parser.add_argument('--queue', nargs=1, required=False, help="(--queue queue_name) Process an entire folder (files/subfolders) in a queue")
         parser.add_argument('-lq', '--limit-queue', dest='limit_queue', nargs=1, required=False, help="Limit the amount of queue files processed", type=int, default=0)
+        parser.add_argument('-pipe', '--pipeline', dest='pipeline', action='store_true', required=False, help="Overlap queue items (metadata, screenshots, hashing and uploads run concurrently). Requires unattended mode")
         parser.add_argument('-sc', '--site-check', dest='site_check', action='store_true', required=False, help="Just search sites for suitable uploads and create log file, no uploading", default=False)
         parser.add_argument('-su', '--site-upload', dest='site_upload', nargs=1, required=False, help="Specify a single tracker, and it will process the site searches and upload.", type=str, default=None)
         parser.add_argument('--unit3d', action='store_true', required=False, help="[parse a txt output file from UNIT3D-Upload-Checker]")
@@ -126,6 +128,7 @@ class Args:
         parser.add_argument('-sfxs', '--sfx-subtitles', dest='sfx_subtitles', action='store_true', required=False, help="Manually indicate whether subtitles with visual enhancements like animations, effects, or backgrounds are included")
         parser.add_argument('-e', '--extras', dest='extras', action='store_true', required=False, help="Indicates that extras are included. Mainly used for Blu-rays discs")
         parser.add_argument('-sort', '--sorted-filelist', dest='sorted_filelist', action='store_true', required=False, help="Use the largest video file for processing instead of the first video file found")
+        parser.add_argument('-nmc', '--no-meta-cache', dest='no_meta_cache', action='store_true', required=False, help="Don't use the local cache of TMDB/IMDb/TVMaze/AniList responses for this run")
         parser.add_argument('-ptp', '--ptp', nargs=1, required=False, help="PTP torrent id/permalink", type=str)
         parser.add_argument('-blu', '--blu', nargs=1, required=False, help="BLU torrent id/link", type=str)
         parser.add_argument('-aither', '--aither', nargs=1, required=False, help="Aither torrent id/link", type=str)
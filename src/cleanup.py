@@ -1,6 +1,7 @@
 # Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
 import asyncio
 import contextlib
+import contextvars
 import multiprocessing
 import os
 import platform
@@ -8,12 +9,14 @@ import re
 import subprocess
 import sys
 import threading
+from collections.abc import Awaitable, Iterator
 from concurrent.futures import ThreadPoolExecutor
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 import psutil
 
 from src.console import console
+from src.runcontext import other_runs_active
 
 if os.name == "posix":
     import termios
@@ -27,11 +30,33 @@ running_subprocesses: set[subprocess.Popen[Any]] = set()
 thread_executor: Optional[ThreadPoolExecutor] = None
 IS_MACOS = sys.platform == 'darwin'
 erase_key: Optional[str] = None
+# Depth of cleanup_manager.deferred() blocks around the current task; a context variable, so concurrent runs keep their own
+_defer_depth: contextvars.ContextVar[int] = contextvars.ContextVar('_defer_depth', default=0)
 
 
 class CleanupManager:
+    def __init__(self) -> None:
+        self._async_closers: list[Callable[[], Awaitable[None]]] = []
+
+    def register_async_closer(self, closer: Callable[[], Awaitable[None]]) -> None:
+        """Run `closer` on every cleanup(), mid-run ones included; whole-run resources close in upload.main instead."""
+        self._async_closers.append(closer)
+
+    @contextlib.contextmanager
+    def deferred(self) -> Iterator[None]:
+        """Skip cleanup() while several queue items share the event loop, the caller cleans up afterwards."""
+        token = _defer_depth.set(_defer_depth.get() + 1)
+        try:
+            yield
+        finally:
+            _defer_depth.reset(token)
+
     async def cleanup(self) -> None:
         """Ensure all running tasks, threads, and subprocesses are properly cleaned up before exiting."""
+        # Cancelling every task would tear down the other items of a pipelined queue run
+        if _defer_depth.get():
+            return
+
         # console.print("[yellow]Cleaning up tasks before exiting...[/yellow]")
 
         # Step 1: Shutdown ThreadPoolExecutor **before checking for threads**
@@ -111,8 +136,20 @@ class CleanupManager:
             if isinstance(result, Exception) and not isinstance(result, asyncio.CancelledError):
                 console.print(f"[red]Error during cleanup: {result}[/red]")
 
-        # 🔹 Step 6: Kill all remaining threads and orphaned processes
-        self.kill_all_threads()
+        # 🔹 Step 5b: Close pooled resources (shared HTTP clients) now that nothing uses them
+        for closer in self._async_closers:
+            try:
+                await closer()
+            except RuntimeError:  # noqa: PERF203 - each closer must run even if another fails
+                # Event loop is no longer running
+                break
+            except Exception as e:
+                console.print(f"[red]Error during cleanup: {e}[/red]")
+
+        # 🔹 Step 6: Kill all remaining threads and orphaned processes, unless another
+        # in-process run (web UI) shares this process and still owns some of them
+        if not other_runs_active():
+            self.kill_all_threads()
 
         if IS_MACOS:
             # If you add shared memory or semaphore usage, append their (name, kind)
@@ -1,10 +1,11 @@
 # Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
 import asyncio
+import contextlib
 import os
 import re
 import shutil
+import tempfile
 import urllib.parse
-from pathlib import Path
 from typing import Any, Optional, Union, cast
 
 import aiohttp
@@ -13,15 +14,37 @@ import qbittorrentapi
 from torf import Torrent
 
 from src.console import console
+from src.looplocks import LoopSafeLock
 from src.torrent_clients import DelugeClientMixin, QbittorrentClientMixin, RtorrentClientMixin, TransmissionClientMixin
 
 # Secure XML-RPC client using defusedxml to prevent XML attacks
 defusedxml.xmlrpc.monkey_patch()
 
+# Upper bound on torrent clients searched at the same time by find_existing_torrent
+MAX_CONCURRENT_CLIENT_SEARCHES = 4
+
+
+def _write_export(path: str, content: bytes) -> None:
+    """Write an exported .torrent through a temporary file, so a cancelled search never leaves a truncated one behind."""
+    fd, part_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(part_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(part_path)
+        raise
+
 
 class Clients(QbittorrentClientMixin, RtorrentClientMixin, DelugeClientMixin, TransmissionClientMixin):
     def __init__(self, config: dict[str, Any]) -> None:
         self.config = config
+        # Remote path mappings by (client name, content path), shared by every tracker's injection
+        self._remote_path_maps: dict[tuple[str, str], tuple[str, str]] = {}
+        # rTorrent injections write a fast-resume file next to the tracker's .torrent, so they run one at a time
+        # (across event loops: concurrent in-process web UI runs share the module-level client)
+        self._rtorrent_lock = LoopSafeLock()
 
     @staticmethod
     def _extract_tracker_ids_from_comment(comment: str) -> dict[str, str]:
@@ -103,7 +126,7 @@ class Clients(QbittorrentClientMixin, RtorrentClientMixin, DelugeClientMixin, Tr
             console.print("[bold yellow]Add torrent manually to the client")
             return
         if os.path.exists(torrent_path):
-            torrent = Torrent.read(torrent_path)
+            torrent = await asyncio.to_thread(Torrent.read, torrent_path)
         else:
             console.print(f"[bold red]Torrent file {torrent_path} does not exist, cannot add to client")
             return
@@ -152,38 +175,48 @@ class Clients(QbittorrentClientMixin, RtorrentClientMixin, DelugeClientMixin, Tr
         if meta['debug']:
             console.print(f"[cyan]DEBUG: Clients to inject into: {inject_clients}[/cyan]")
 
-        for client_name in inject_clients:
-            if client_name == "none" or not client_name:
-                continue
-
-            if client_name not in self.config['TORRENT_CLIENTS']:
-                console.print(f"[bold red]Torrent client '{client_name}' not found in config.")
-                continue
+        # Each client waits out its own inject_delay, so injections into different clients run side by side
+        injections = [
+            self._inject_into_client(meta, tracker, client_name, torrent_path, torrent, cross)
+            for client_name in dict.fromkeys(inject_clients)
+            if client_name and client_name != "none"
+        ]
+        await asyncio.gather(*injections)
+        return
 
-            client = self.config['TORRENT_CLIENTS'][client_name]
-            torrent_client = client['torrent_client']
-            await self.inject_delay(meta, tracker, client_name)
+    async def _inject_into_client(self, meta: dict[str, Any], tracker: str, client_name: str, torrent_path: str, torrent: Torrent, cross: bool) -> None:
+        if client_name not in self.config['TORRENT_CLIENTS']:
+            console.print(f"[bold red]Torrent client '{client_name}' not found in config.")
+            return
 
-            # Must pass client_name to remote_path_map
-            local_path, remote_path = await self.remote_path_map(meta, client_name)
+        client = self.config['TORRENT_CLIENTS'][client_name]
+        torrent_client = client['torrent_client']
+        await self.inject_delay(meta, tracker, client_name)
 
-            if meta['debug']:
-                console.print(f"[bold green]Adding to {client_name} ({torrent_client})")
+        # Must pass client_name to remote_path_map
+        path_map_key = (client_name, str(meta.get('path', '')))
+        if path_map_key not in self._remote_path_maps:
+            self._remote_path_maps[path_map_key] = await self.remote_path_map(meta, client_name)
+        local_path, remote_path = self._remote_path_maps[path_map_key]
 
-            try:
-                if torrent_client.lower() == "rtorrent":
-                    self.rtorrent(meta['path'], torrent_path, torrent, meta, local_path, remote_path, client, tracker)
-                elif torrent_client == "qbit":
-                    await self.qbittorrent(meta['path'], torrent, local_path, remote_path, client, meta['is_disc'], meta['filelist'], meta, tracker, cross)
-                elif torrent_client.lower() == "deluge":
-                    self.deluge(meta['path'], torrent_path, torrent, local_path, remote_path, client, meta)
-                elif torrent_client.lower() == "transmission":
-                    self.transmission(meta['path'], torrent, local_path, remote_path, client, meta)
-                elif torrent_client.lower() == "watch":
-                    shutil.copy(torrent_path, client['watch_folder'])
-            except Exception as e:
-                console.print(f"[bold red]Failed to add torrent to {client_name}: {e}")
-        return
+        if meta['debug']:
+            console.print(f"[bold green]Adding to {client_name} ({torrent_client})")
+
+        try:
+            # The blocking client libraries run in worker threads so other clients aren't held up
+            if torrent_client.lower() == "rtorrent":
+                async with self._rtorrent_lock:
+                    await asyncio.to_thread(self.rtorrent, meta['path'], torrent_path, torrent, meta, local_path, remote_path, client, tracker)
+            elif torrent_client == "qbit":
+                await self.qbittorrent(meta['path'], torrent, local_path, remote_path, client, meta['is_disc'], meta['filelist'], meta, tracker, cross)
+            elif torrent_client.lower() == "deluge":
+                await asyncio.to_thread(self.deluge, meta['path'], torrent_path, torrent, local_path, remote_path, client, meta)
+            elif torrent_client.lower() == "transmission":
+                await asyncio.to_thread(self.transmission, meta['path'], torrent, local_path, remote_path, client, meta)
+            elif torrent_client.lower() == "watch":
+                await asyncio.to_thread(shutil.copy, torrent_path, client['watch_folder'])
+        except Exception as e:
+            console.print(f"[bold red]Failed to add torrent to {client_name}: {e}")
 
     async def inject_delay(self, meta: dict[str, Any], tracker: str, client_name: str) -> None:
         """
@@ -266,29 +299,50 @@ class Clients(QbittorrentClientMixin, RtorrentClientMixin, DelugeClientMixin, Tr
                     console.print("[yellow]No clients configured for searching...[/yellow]")
                     return None
 
-        for client_name in clients_to_search:
+        configured_clients: list[str] = []
+        for client_name in dict.fromkeys(clients_to_search):
             if client_name not in self.config['TORRENT_CLIENTS']:
                 console.print(f"[yellow]Client '{client_name}' not found in TORRENT_CLIENTS config, skipping...")
                 continue
+            configured_clients.append(client_name)
+
+        # Each client search is independent network I/O, run them side by side but decide in configured order,
+        # so an earlier client (the default one first) wins over a faster later one
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_CLIENT_SEARCHES)
+
+        async def search_client(client_name: str) -> tuple[str, Union[dict[str, Any], str, None]]:
+            async with semaphore:
+                return client_name, await self._search_single_client_for_torrent(
+                    meta, client_name, prefer_small_pieces, mtv_torrent, piece_limit, None
+                )
 
-            result = await self._search_single_client_for_torrent(
-                meta, client_name, prefer_small_pieces, mtv_torrent, piece_limit, best_match
-            )
+        tasks = [asyncio.create_task(search_client(client_name)) for client_name in configured_clients]
+        try:
+            for task in tasks:
+                client_name, result = await task
+                if not result:
+                    continue
 
-            if result:
                 if isinstance(result, dict):
                     # Got a valid torrent but not ideal piece size
-                    best_match = result
                     # If prefer_small_pieces is False, we don't care about piece size optimization
                     # so stop searching after finding the first valid torrent
                     if not prefer_small_pieces:
                         console.print(f"[green]Found valid torrent in client '{client_name}', stopping search[/green]")
-                        torrent_path = best_match.get('torrent_path')
+                        torrent_path = result.get('torrent_path')
                         return torrent_path if isinstance(torrent_path, str) else None
+                    if best_match is None or result['piece_size'] < best_match['piece_size']:
+                        best_match = result
                 else:
                     # Got a path - this means we found a torrent with ideal piece size
                     console.print(f"[green]Found valid torrent with preferred piece size in client '{client_name}', stopping search[/green]")
                     return result
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
 
         if prefer_small_pieces and best_match:
             console.print(f"[yellow]Using best match torrent with hash: [bold yellow]{best_match['torrenthash']}[/bold yellow]")
@@ -363,7 +417,7 @@ class Clients(QbittorrentClientMixin, RtorrentClientMixin, DelugeClientMixin, Tr
                         os.makedirs(extracted_torrent_dir, exist_ok=True)
                         torrent_path = os.path.join(extracted_torrent_dir, f"{hash_value_str}.torrent")
 
-                        await asyncio.to_thread(Path(torrent_path).write_bytes, torrent_file_content)
+                        await asyncio.to_thread(_write_export, torrent_path, torrent_file_content)
 
                         console.print(f"[green]Successfully saved .torrent file: {torrent_path}")
 
@@ -477,7 +531,7 @@ class Clients(QbittorrentClientMixin, RtorrentClientMixin, DelugeClientMixin, Tr
                                     found_hash = None
                                 else:
                                     os.makedirs(extracted_torrent_dir, exist_ok=True)
-                                    await asyncio.to_thread(Path(found_torrent_path).write_bytes, torrent_file_content)
+                                    await asyncio.to_thread(_write_export, found_torrent_path, torrent_file_content)
                                     console.print(f"[green]Successfully saved .torrent file: {found_torrent_path}")
                         except Exception as e:
                             console.print(f"[bold red]Unexpected error fetching .torrent from qBittorrent: {e}")
@@ -35,6 +35,7 @@ DEFAULT_KEY_TYPES: dict[str, tuple[type, ...]] = {
     "episode_overview": (bool,),
     "screens": (str, int),
     "cutoff_screens": (str, int),
+    "stream_screenshot_uploads": (bool,),
     "thumbnail_size": (str, int),
     "frame_overlay": (bool,),
     "tone_map": (bool,),
@@ -45,6 +46,7 @@ DEFAULT_KEY_TYPES: dict[str, tuple[type, ...]] = {
     "process_limit": (str, int),
     "threads": (str, int),
     "ffmpeg_limit": (bool,),
+    "ffmpeg_batch_screens": (bool,),
     "multiScreens": (str, int),
     "pack_thumb_size": (str, int),
     "charLimit": (str, int),
@@ -61,6 +63,13 @@ DEFAULT_KEY_TYPES: dict[str, tuple[type, ...]] = {
     "use_radarr": (bool,),
     "mkbrr": (bool,),
     "mkbrr_threads": (str, int),
+    "hash_device_concurrency": (str, int),
+    "hash_bandwidth_limit": (str, int),
+    "pipeline_metadata_workers": (str, int),
+    "pipeline_screenshot_workers": (str, int),
+    "pipeline_image_upload_workers": (str, int),
+    "pipeline_hash_workers": (str, int),
+    "pipeline_upload_workers": (str, int),
     "user_overrides": (bool,),
     "ping_unit3d": (bool,),
     "get_bluray_info": (bool,),
@@ -410,7 +419,8 @@ def _validate_default_section(default: dict[str, Any]) -> tuple[list[str], list[
     # Validate numeric string values can be parsed
     numeric_keys = ["screens", "cutoff_screens", "thumbnail_size", "process_limit", "threads",
                     "multiScreens", "pack_thumb_size", "charLimit", "fileLimit", "processLimit",
-                    "tracker_pass_checks", "mkbrr_threads", "ffmpeg_compression"]
+                    "tracker_pass_checks", "mkbrr_threads", "hash_device_concurrency", "hash_bandwidth_limit", "ffmpeg_compression", "pipeline_metadata_workers",
+                    "pipeline_screenshot_workers", "pipeline_image_upload_workers", "pipeline_hash_workers", "pipeline_upload_workers"]
     for key in numeric_keys:
         if key in default:
             value = default[key]
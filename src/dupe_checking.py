@@ -8,7 +8,7 @@ from typing_extensions import TypeAlias
 
 from cogs.redaction import Redaction
 from src.console import console
-from src.trackers.HUNO import HUNO
+from src.trackerregistry import tracker_class_map
 
 Meta: TypeAlias = MutableMapping[str, Any]
 
@@ -381,7 +381,7 @@ class DupeChecker:
                     return False
 
             if tracker_name == "HUNO":
-                huno = HUNO(config=self.config)
+                huno = tracker_class_map['HUNO'](config=self.config)
                 huno_name_result: Any = await huno.get_name(cast(dict[str, Any], meta))
                 huno_name_map = cast(dict[str, Any], huno_name_result)
                 huno_name = str(huno_name_map.get('name', huno_name_result)) if isinstance(huno_name_result, dict) else str(huno_name_result)
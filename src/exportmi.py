@@ -1,5 +1,6 @@
 # Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
 import asyncio
+import contextlib
 import json
 import os
 import platform
@@ -82,6 +83,102 @@ def setup_mediainfo_library(base_dir: str, debug: bool = False) -> Optional[dict
     return None
 
 
+MEDIAINFO_CACHE_VERSION = 1
+MEDIAINFO_CACHE_MAX_ENTRIES = 200
+
+
+def parse_mediainfo(video: str) -> tuple[str, str]:
+    """Text report and full JSON of `video`, rendered from a single libmediainfo parse where possible."""
+    try:
+        return _parse_mediainfo_once(video)
+    except FileNotFoundError:
+        raise
+    except Exception:
+        # Private pymediainfo API unavailable or changed, parse twice through the public one
+        return MediaInfo.parse(video, output="STRING", full=False), MediaInfo.parse(video, output="JSON")
+
+
+def _parse_mediainfo_once(video: str) -> tuple[str, str]:
+    # Relies on pymediainfo's private MediaInfo._get_library(); parse_mediainfo falls back if it fails
+    lib, handle, _, lib_version = cast(Any, MediaInfo)._get_library()
+    try:
+        # Same defaults MediaInfo.parse uses
+        if lib_version >= (18, 3):
+            lib.MediaInfo_Option(handle, "Cover_Data", "")
+        lib.MediaInfo_Option(handle, "CharSet", "UTF-8")
+        lib.MediaInfo_Option(handle, "ParseSpeed", "0.5")
+        lib.MediaInfo_Option(handle, "LegacyStreamDisplay", "")
+        if lib.MediaInfo_Open(handle, video) == 0:
+            if not os.path.exists(video):
+                raise FileNotFoundError(video)
+            raise RuntimeError(f"An error occured while opening {video} with libmediainfo")
+        lib.MediaInfo_Option(handle, "Inform", "STRING")
+        lib.MediaInfo_Option(handle, "Complete", "")
+        text = cast(str, lib.MediaInfo_Inform(handle, 0))
+        lib.MediaInfo_Option(handle, "Inform", "JSON")
+        lib.MediaInfo_Option(handle, "Complete", "1")
+        json_text = cast(str, lib.MediaInfo_Inform(handle, 0))
+    finally:
+        lib.MediaInfo_Close(handle)
+        lib.MediaInfo_Delete(handle)
+    return text, json_text
+
+
+def _mediainfo_cache_path(base_dir: str, video: str) -> Optional[Path]:
+    # Content-addressed by (device, inode, size, mtime): renames and hardlinks hit, any rewrite misses
+    try:
+        stat = os.stat(video)
+    except OSError:
+        return None
+    if not os.path.isfile(video):
+        return None
+    key = f"{stat.st_dev}-{stat.st_ino}-{stat.st_size}-{stat.st_mtime_ns}"
+    return Path(base_dir) / "data" / "mediainfo" / f"{key}.json"
+
+
+def _read_mediainfo_cache(cache_path: Path, video: str) -> Optional[tuple[str, dict[str, Any]]]:
+    try:
+        with cache_path.open("r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("version") != MEDIAINFO_CACHE_VERSION:
+        return None
+    cached_dict = cast(dict[str, Any], cached)
+    cached_path = cached_dict.get("path")
+    text = cached_dict.get("text")
+    filtered_info = cached_dict.get("json")
+    if not isinstance(cached_path, str) or not isinstance(text, str) or not isinstance(filtered_info, dict):
+        return None
+
+    if cached_path != video:
+        # Same file reached through another path, the reports embed the path they were parsed with
+        text = text.replace(cached_path, video)
+        json_text = json.dumps(filtered_info).replace(json.dumps(cached_path)[1:-1], json.dumps(video)[1:-1])
+        filtered_info = json.loads(json_text)
+    # Eviction drops the oldest mtimes first; touching the entry on a hit makes that least recently used
+    with contextlib.suppress(OSError):
+        os.utime(cache_path)
+    return text, cast(dict[str, Any], filtered_info)
+
+
+def _write_mediainfo_cache(cache_path: Path, video: str, text: str, filtered_info: dict[str, Any], debug: bool = False) -> None:
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump({"version": MEDIAINFO_CACHE_VERSION, "path": video, "text": text, "json": filtered_info}, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+
+        entries = sorted(cache_path.parent.glob("*.json"), key=lambda entry: entry.stat().st_mtime)
+        for stale in entries[:-MEDIAINFO_CACHE_MAX_ENTRIES]:
+            with contextlib.suppress(OSError):
+                stale.unlink()
+    except Exception as e:
+        if debug:
+            console.print(f"[yellow]Failed to write MediaInfo cache: {e}[/yellow]")
+
+
 async def mi_resolution(
     res: str,
     guess: dict[str, Any],
@@ -411,7 +508,14 @@ async def exportInfo(
     if not isdir:
         os.chdir(os.path.dirname(video))
 
-    if mediainfo_cmd and is_dvd:
+    cache_path = None if (mediainfo_cmd and is_dvd) else _mediainfo_cache_path(base_dir, video)
+    cached = await asyncio.to_thread(_read_mediainfo_cache, cache_path, video) if cache_path is not None else None
+
+    if cached is not None:
+        media_info, filtered_info = cached
+        if debug:
+            console.print(f"[green]Using cached MediaInfo from {cache_path}[/green]")
+    elif mediainfo_cmd and is_dvd:
         result = None
         try:
             # Validate and sanitize the video path
@@ -427,32 +531,19 @@ async def exportInfo(
 
         except subprocess.TimeoutExpired:
             console.print("[bold red]Specialized MediaInfo timed out (30s) - falling back to standard MediaInfo[/bold red]")
-            media_info = MediaInfo.parse(video, output="STRING", full=False)
+            media_info = await asyncio.to_thread(MediaInfo.parse, video, output="STRING", full=False)
         except ValueError as e:
             console.print(f"[bold red]Path validation error: {e}[/bold red]")
             console.print("[bold yellow]Falling back to standard MediaInfo for text...")
-            media_info = MediaInfo.parse(video, output="STRING", full=False)
+            media_info = await asyncio.to_thread(MediaInfo.parse, video, output="STRING", full=False)
         except (subprocess.CalledProcessError, Exception) as e:
             console.print(f"[bold red]Error getting text from specialized MediaInfo: {e}")
             if debug and result is not None:
                 console.print(f"[red]Subprocess stderr: {result.stderr}[/red]")
                 console.print(f"[red]Subprocess returncode: {result.returncode}[/red]")
             console.print("[bold yellow]Falling back to standard MediaInfo for text...")
-            media_info = MediaInfo.parse(video, output="STRING", full=False)
-    else:
-        media_info = MediaInfo.parse(video, output="STRING", full=False)
+            media_info = await asyncio.to_thread(MediaInfo.parse, video, output="STRING", full=False)
 
-    # Filter out unwanted lines from media info regardless of type
-    filtered_media_info = "\n".join(line for line in media_info.splitlines() if not line.strip().startswith("ReportBy") and not line.strip().startswith("Report created by "))
-
-    async with aiofiles.open(f"{base_dir}/tmp/{folder_id}/MEDIAINFO.txt", "w", newline="", encoding="utf-8") as export:
-        await export.write(filtered_media_info.replace(video, os.path.basename(video)))
-    async with aiofiles.open(f"{base_dir}/tmp/{folder_id}/MEDIAINFO_CLEANPATH.txt", "w", newline="", encoding="utf-8") as export_cleanpath:
-        await export_cleanpath.write(filtered_media_info.replace(video, os.path.basename(video)))
-    if debug:
-        console.print("[bold green]MediaInfo Exported.")
-
-    if mediainfo_cmd and is_dvd:
         result: Optional[subprocess.CompletedProcess[str]] = None
         try:
             # Validate and sanitize the video path
@@ -470,11 +561,11 @@ async def exportInfo(
         except ValueError as e:
             console.print(f"[bold red]Path validation error: {e}[/bold red]")
             console.print("[bold yellow]Falling back to standard MediaInfo for JSON...")
-            media_info_json = MediaInfo.parse(video, output="JSON")
+            media_info_json = await asyncio.to_thread(MediaInfo.parse, video, output="JSON")
             media_info_dict = json.loads(media_info_json)
         except subprocess.TimeoutExpired:
             console.print("[bold red]Specialized MediaInfo timed out (30s) - falling back to standard MediaInfo[/bold red]")
-            media_info_json = MediaInfo.parse(video, output="JSON")
+            media_info_json = await asyncio.to_thread(MediaInfo.parse, video, output="JSON")
             media_info_dict = json.loads(media_info_json)
         except (subprocess.CalledProcessError, json.JSONDecodeError, Exception) as e:
             console.print(f"[bold red]Error getting JSON from specialized MediaInfo: {e}")
@@ -484,14 +575,26 @@ async def exportInfo(
                 if result.stdout:
                     console.print(f"[red]Subprocess stdout preview: {result.stdout[:200]}...[/red]")
             console.print("[bold yellow]Falling back to standard MediaInfo for JSON...[/bold yellow]")
-            media_info_json = MediaInfo.parse(video, output="JSON")
+            media_info_json = await asyncio.to_thread(MediaInfo.parse, video, output="JSON")
             media_info_dict = json.loads(media_info_json)
+
+        filtered_info = filter_mediainfo(media_info_dict)
     else:
         # Use standard MediaInfo library for non-DVD or when specialized CLI not available
-        media_info_json = MediaInfo.parse(video, output="JSON")
-        media_info_dict = json.loads(media_info_json)
+        media_info, media_info_json = await asyncio.to_thread(parse_mediainfo, video)
+        filtered_info = filter_mediainfo(json.loads(media_info_json))
+        if cache_path is not None:
+            await asyncio.to_thread(_write_mediainfo_cache, cache_path, video, media_info, filtered_info, debug)
 
-    filtered_info = filter_mediainfo(media_info_dict)
+    # Filter out unwanted lines from media info regardless of type
+    filtered_media_info = "\n".join(line for line in media_info.splitlines() if not line.strip().startswith("ReportBy") and not line.strip().startswith("Report created by "))
+
+    async with aiofiles.open(f"{base_dir}/tmp/{folder_id}/MEDIAINFO.txt", "w", newline="", encoding="utf-8") as export:
+        await export.write(filtered_media_info.replace(video, os.path.basename(video)))
+    async with aiofiles.open(f"{base_dir}/tmp/{folder_id}/MEDIAINFO_CLEANPATH.txt", "w", newline="", encoding="utf-8") as export_cleanpath:
+        await export_cleanpath.write(filtered_media_info.replace(video, os.path.basename(video)))
+    if debug:
+        console.print("[bold green]MediaInfo Exported.")
 
     async with aiofiles.open(f"{base_dir}/tmp/{folder_id}/MediaInfo.json", "w", encoding="utf-8") as export:
         await export.write(json.dumps(filtered_info, indent=4))
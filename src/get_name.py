@@ -3,24 +3,17 @@ import os
 import re
 import sys
 from collections.abc import MutableMapping, Sequence
-from typing import Any, Callable, Optional, cast
+from typing import Any, Optional, cast
 
 import anitopy
 import cli_ui
-import guessit
 from typing_extensions import TypeAlias
 
 from src.cleanup import cleanup_manager
 from src.console import console
+from src.guessitcache import guessit_fn
 from src.trackers.COMMON import COMMON
 
-guessit_module: Any = cast(Any, guessit)
-GuessitFn = Callable[[str, Optional[dict[str, Any]]], dict[str, Any]]
-
-
-def guessit_fn(value: str, options: Optional[dict[str, Any]] = None) -> dict[str, Any]:
-    return cast(dict[str, Any], guessit_module.guessit(value, options))
-
 TRACKER_DISC_REQUIREMENTS = {
     'ULCX': {'region': 'mandatory', 'distributor': 'mandatory'},
     'SHRI': {'region': 'mandatory', 'distributor': 'optional'},
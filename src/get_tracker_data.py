@@ -18,7 +18,7 @@ from src.btnid import BtnIdManager
 from src.cleanup import cleanup_manager
 from src.console import console
 from src.trackermeta import TrackerMetaManager
-from src.trackersetup import tracker_class_map
+from src.trackerregistry import tracker_class_map
 
 
 class TrackerDataManager:
@@ -6,24 +6,17 @@ import sys
 from collections.abc import Mapping
 from difflib import SequenceMatcher
 from pathlib import Path
-from typing import Any, Callable, Optional, cast
+from typing import Any, Optional, cast
 
 import anitopy
-import guessit
 import httpx
 
 from src.console import console
 from src.exceptions import *  # noqa: F403
+from src.guessitcache import guessit_fn
 from src.tags import get_tag
 from src.tmdb import TmdbManager
 
-guessit_module: Any = cast(Any, guessit)
-GuessitFn = Callable[[str, Optional[dict[str, Any]]], dict[str, Any]]
-
-
-def guessit_fn(value: str, options: Optional[dict[str, Any]] = None) -> dict[str, Any]:
-    return cast(dict[str, Any], guessit_module.guessit(value, options))
-
 Meta = dict[str, Any]
 
 
@@ -0,0 +1,62 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+import copy
+import functools
+from collections.abc import Mapping
+from typing import Any, NamedTuple, Optional, cast
+
+import guessit
+
+guessit_module: Any = cast(Any, guessit)
+
+# Distinct (string, options) pairs kept; a run parses a handful of names, a queue a few per item
+GUESSIT_CACHE_SIZE = 1024
+
+
+class GuessitCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        mapping = cast(Mapping[Any, Any], value)
+        return tuple(sorted((key, _freeze(item)) for key, item in mapping.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_freeze(item) for item in cast(Any, value)]
+        return ('__set__', tuple(sorted(items, key=repr))) if isinstance(value, (set, frozenset)) else ('__list__', tuple(items))
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, tuple) and len(cast(tuple[Any, ...], value)) == 2 and value[0] in ('__list__', '__set__'):
+        return [_thaw(item) for item in value[1]]
+    return value
+
+
+@functools.lru_cache(maxsize=GUESSIT_CACHE_SIZE)
+def _cached_guess(value: str, frozen_options: Optional[tuple[tuple[str, Any], ...]]) -> dict[str, Any]:
+    options = {key: _thaw(item) for key, item in frozen_options} if frozen_options is not None else None
+    # Plain dict snapshot, the MatchesDict guessit returns drags the whole rule-engine match set along
+    return dict(guessit_module.guessit(value, options))
+
+
+def guessit_fn(value: str, options: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+    """
+    guessit with a bounded LRU cache keyed by the string and its options.
+
+    The same release names are parsed by prep, naming, tags, edition, region and the metadata
+    lookups; a guessit parse rebuilds the rule engine every call. Callers get their own copy
+    of the cached result, so mutating it never leaks into later lookups.
+    """
+    return copy.deepcopy(_cached_guess(value, _freeze(options) if options is not None else None))
+
+
+def guessit_cache_info() -> GuessitCacheInfo:
+    info = _cached_guess.cache_info()
+    return GuessitCacheInfo(hits=info.hits, misses=info.misses, size=info.currsize)
@@ -0,0 +1,128 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+import asyncio
+from collections.abc import Mapping
+from typing import Any, Callable, Optional
+
+import httpx
+from httpx._utils import get_environment_proxies  # pyright: ignore[reportPrivateImportUsage]
+
+from src.console import console
+
+try:
+    import h2  # noqa: F401  # pyright: ignore[reportMissingImports, reportUnusedImport]
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class _BorrowedTransport(httpx.AsyncBaseTransport):
+    """Hands requests to a registry-owned transport; closing the client doesn't close the pool."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pass
+
+
+# Client options that configure the connection pool itself; a client asking for these gets its own pool
+TRANSPORT_OPTIONS = frozenset({"verify", "cert", "http1", "http2", "limits", "proxy", "proxies", "mounts", "transport", "app"})
+
+_registries: list["HTTPPoolRegistry"] = []
+
+
+def environment_proxy_mounts(make_transport: Callable[[str], httpx.AsyncBaseTransport]) -> dict[str, Optional[httpx.AsyncBaseTransport]]:
+    """
+    The `mounts=` httpx would derive from HTTP(S)_PROXY, ALL_PROXY and NO_PROXY, for a client given its own
+    transport (httpx ignores the environment's proxies then). `make_transport(proxy_url)` supplies the
+    transport for each proxy; NO_PROXY patterns map to None, i.e. the client's own transport.
+    """
+    return {
+        pattern: None if proxy is None else make_transport(proxy)
+        for pattern, proxy in get_environment_proxies().items()
+    }
+
+
+class HTTPPoolRegistry:
+    """
+    One pooled keep-alive connection transport per name (a tracker, an image host), shared by
+    short-lived `httpx.AsyncClient`s.
+
+    Call sites keep their own headers, cookies, timeouts and redirect handling on the client, as with
+    `httpx.AsyncClient(...)`, while the TCP+TLS connections underneath are reused by every request to
+    that name in a run. HTTP/2 is negotiated when the optional `h2` package is installed. Pools are
+    per event loop, so concurrent in-process runs never share one, and live until close_pools() at
+    the end of the run.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        connection_limits: Optional[Mapping[str, int]] = None,
+        http2: bool = True,
+        **client_kwargs: Any,
+    ) -> None:
+        self.name = name
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.connection_limits = dict(connection_limits or {})
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.client_kwargs = client_kwargs
+        self._transports: dict[tuple[asyncio.AbstractEventLoop, str, Optional[str]], httpx.AsyncHTTPTransport] = {}
+        _registries.append(self)
+
+    def transport(self, key: str, proxy: Optional[str] = None) -> httpx.AsyncHTTPTransport:
+        """The pool for `key` on this event loop, connecting through `proxy` when given."""
+        loop = asyncio.get_running_loop()
+        transport = self._transports.get((loop, key, proxy))
+        if transport is not None:
+            return transport
+
+        # Pools of a loop that ended without close_pools() can't be closed any more, drop them
+        for stale in [entry for entry in self._transports if entry[0].is_closed()]:
+            del self._transports[stale]
+        max_connections = self.connection_limits.get(key, self.max_connections)
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=min(self.max_keepalive_connections, max_connections),
+            keepalive_expiry=self.keepalive_expiry,
+        )
+        transport = httpx.AsyncHTTPTransport(limits=limits, http2=self.http2, proxy=proxy)
+        self._transports[(loop, key, proxy)] = transport
+        return transport
+
+    def client(self, key: str, **client_kwargs: Any) -> httpx.AsyncClient:
+        """Drop-in for `httpx.AsyncClient(**client_kwargs)` that sends through the pool for `key`."""
+        kwargs = {**self.client_kwargs, **client_kwargs}
+        if TRANSPORT_OPTIONS.intersection(kwargs):
+            return httpx.AsyncClient(**kwargs)
+        mounts: dict[str, Optional[httpx.AsyncBaseTransport]] = {}
+        if kwargs.get("trust_env", True):
+            mounts = environment_proxy_mounts(lambda proxy: _BorrowedTransport(self.transport(key, proxy)))
+        return httpx.AsyncClient(transport=_BorrowedTransport(self.transport(key)), mounts=mounts, **kwargs)
+
+    async def aclose(self) -> None:
+        """Close this event loop's pools; other loops' pools belong to concurrent runs and stay open."""
+        loop = asyncio.get_running_loop()
+        for entry in [entry for entry in self._transports if entry[0] is loop]:
+            transport = self._transports.pop(entry)
+            try:
+                await transport.aclose()
+            except Exception as e:
+                console.print(f"[yellow]Error closing {self.name} HTTP pool for {entry[1]}: {e}[/yellow]")
+
+
+async def close_pools() -> None:
+    """Close every registry's pools for the running event loop; called once a run is over."""
+    for registry in _registries:
+        await registry.aclose()
+
+
+tracker_sessions = HTTPPoolRegistry("tracker")
@@ -0,0 +1,121 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+import contextlib
+import os
+import threading
+import time
+from collections.abc import AsyncIterator
+from typing import Any, Optional, Union
+
+from src.console import console
+from src.looplocks import LoopSafeSemaphore
+
+
+class BandwidthLimiter:
+    """Thread-safe pacing of reads to a byte rate, shared by every hashing thread."""
+
+    # Seconds of unused allowance that may be spent in a burst
+    BURST_SECONDS = 1.0
+
+    def __init__(self, bytes_per_second: float) -> None:
+        self.bytes_per_second = bytes_per_second
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def consume(self, nbytes: int) -> None:
+        """Account for `nbytes` just read, sleeping the calling thread if that exceeds the rate."""
+        with self._lock:
+            now = time.monotonic()
+            self._next = max(self._next, now - self.BURST_SECONDS) + nbytes / self.bytes_per_second
+            delay = self._next - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class DeviceQueue:
+    """Admission to one device, shared by every event loop (concurrent in-process runs each have their own)."""
+
+    def __init__(self, device: int, concurrency: int) -> None:
+        self.device = device
+        self.semaphore = LoopSafeSemaphore(concurrency)
+
+    @property
+    def concurrency(self) -> int:
+        return self.semaphore.limit
+
+    @property
+    def running(self) -> int:
+        return self.semaphore.running
+
+    @property
+    def queued(self) -> int:
+        return self.semaphore.queued
+
+
+class IOScheduler:
+    """
+    Admits hashing jobs per source device (`st_dev`) instead of one at a time process-wide.
+
+    Jobs reading from different disks or pools run in parallel, jobs on the same device
+    queue behind its concurrency limit. An optional global bandwidth cap paces the reads
+    done by the internal piece hasher.
+    """
+
+    def __init__(self) -> None:
+        self._devices: dict[int, DeviceQueue] = {}
+        self._devices_lock = threading.Lock()
+        self.limiter: Optional[BandwidthLimiter] = None
+
+    @staticmethod
+    def device_of(path: Union[str, os.PathLike[str]]) -> int:
+        try:
+            return os.stat(path).st_dev
+        except OSError:
+            # Unknown device, share a single queue
+            return -1
+
+    def set_bandwidth_limit(self, limit_mb: Any) -> None:
+        """Set the global read cap in MB/s; 0 or an invalid value removes it."""
+        try:
+            bytes_per_second = float(limit_mb or 0) * 1024 * 1024
+        except (TypeError, ValueError):
+            bytes_per_second = 0
+        if bytes_per_second <= 0:
+            self.limiter = None
+        elif self.limiter is None or self.limiter.bytes_per_second != bytes_per_second:
+            self.limiter = BandwidthLimiter(bytes_per_second)
+
+    def throttle(self, nbytes: int) -> None:
+        limiter = self.limiter
+        if limiter is not None:
+            limiter.consume(nbytes)
+
+    @contextlib.asynccontextmanager
+    async def reserve(self, path: Union[str, os.PathLike[str]], concurrency: int = 1, debug: bool = False, label: str = "") -> AsyncIterator[None]:
+        device = self.device_of(path)
+        with self._devices_lock:
+            queue = self._devices.get(device)
+            if queue is None:
+                queue = DeviceQueue(device, max(1, concurrency))
+                self._devices[device] = queue
+        # The caller's limit (from config, re-read every run) applies from now on, not just the first one seen
+        queue.semaphore.set_limit(max(1, concurrency))
+
+        wait_started: Optional[float] = None
+        if queue.semaphore.locked():
+            wait_started = time.time()
+        if debug:
+            console.print(f"[cyan]I/O device {device}: {label} queued | running={queue.running}/{queue.concurrency}, queued={queue.queued}[/cyan]")
+        await queue.semaphore.acquire()
+
+        if debug:
+            wait_msg = f" (waited {time.time() - wait_started:.2f}s)" if wait_started is not None else ""
+            console.print(f"[cyan]I/O device {device}: {label} start{wait_msg} | running={queue.running}/{queue.concurrency}, queued={queue.queued}[/cyan]")
+        try:
+            yield
+        finally:
+            queue.semaphore.release()
+            if debug:
+                console.print(f"[cyan]I/O device {device}: {label} done | running={queue.running}/{queue.concurrency}, queued={queue.queued}[/cyan]")
+
+
+io_scheduler = IOScheduler()
@@ -0,0 +1,101 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+import asyncio
+import threading
+from collections import deque
+from types import TracebackType
+from typing import Optional
+
+
+class LoopSafeSemaphore:
+    """
+    asyncio-style semaphore that may be shared by several event loops.
+
+    asyncio.Semaphore/Lock bind to the first loop that waits on them, so a process-wide one breaks
+    once concurrent in-process runs (each with its own thread and loop) use it. Here waiters park
+    on a future of their own loop and are woken thread-safely, in arrival order. The limit may be
+    changed at any time; raising it admits waiters straight away.
+    """
+
+    def __init__(self, value: int = 1) -> None:
+        self._limit = max(1, value)
+        self._running = 0
+        self._lock = threading.Lock()
+        self._waiters: deque[tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]] = deque()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def locked(self) -> bool:
+        return self._running >= self._limit
+
+    def set_limit(self, value: int) -> None:
+        with self._lock:
+            self._limit = max(1, value)
+            self._wake()
+
+    async def acquire(self) -> bool:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._running < self._limit and not self._waiters:
+                self._running += 1
+                return True
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            # The slot was granted while the cancellation landed; hand it on
+            self.release()
+            raise
+        return True
+
+    def release(self) -> None:
+        with self._lock:
+            self._running -= 1
+            self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self._running < self._limit:
+            loop, future = self._waiters.popleft()
+            try:
+                loop.call_soon_threadsafe(_grant, future)
+            except RuntimeError:
+                # The waiter's loop is closed, nobody is left to take the slot
+                continue
+            self._running += 1
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.release()
+
+
+class LoopSafeLock(LoopSafeSemaphore):
+    """Mutual exclusion across event loops; see LoopSafeSemaphore."""
+
+    def __init__(self) -> None:
+        super().__init__(1)
+
+
+def _grant(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
@@ -0,0 +1,257 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+import asyncio
+import contextlib
+import contextvars
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import urllib.parse
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, cast
+
+import httpx
+
+from src.console import console
+from src.httpclients import environment_proxy_mounts
+
+# Whole-cache size bound; least recently used responses are evicted past it
+METADATA_CACHE_MAX_BYTES = 128 * 1024 * 1024
+DAY = 24 * 60 * 60
+
+
+class CacheRule(NamedTuple):
+    host: str
+    path: re.Pattern[str]
+    ttl: int
+    stale: int
+
+
+# First matching rule wins. `ttl` is how long a response is served as fresh, `stale` how much longer it may
+# still be served while a background request refreshes it. Hosts without a rule are never cached.
+CACHE_RULES: tuple[CacheRule, ...] = (
+    CacheRule("api.themoviedb.org", re.compile(r"/search/"), DAY, 7 * DAY),
+    CacheRule("api.themoviedb.org", re.compile(r"/tv/\d+/season/"), DAY, 7 * DAY),
+    CacheRule("api.themoviedb.org", re.compile(r"/find/|/external_ids$"), 30 * DAY, 30 * DAY),
+    CacheRule("api.themoviedb.org", re.compile(r""), 7 * DAY, 30 * DAY),
+    CacheRule("api.graphql.imdb.com", re.compile(r""), 3 * DAY, 14 * DAY),
+    CacheRule("graphql.anilist.co", re.compile(r""), 7 * DAY, 30 * DAY),
+    CacheRule("api.tvmaze.com", re.compile(r""), DAY, 7 * DAY),
+)
+
+# Query parameters that don't change the response, and ones whose value is a comma separated set
+IGNORED_PARAMS = frozenset({"api_key"})
+LIST_PARAMS = frozenset({"append_to_response", "include_image_language"})
+# Headers that describe the wire encoding, the cache stores decoded bodies
+DROPPED_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"})
+
+
+def _rule_for(request: httpx.Request) -> Optional[CacheRule]:
+    if request.method not in ("GET", "POST"):
+        return None
+    for rule in CACHE_RULES:
+        if request.url.host == rule.host and rule.path.search(request.url.path):
+            return rule
+    return None
+
+
+def cache_key(request: httpx.Request) -> str:
+    """Normalised key: method, host, path and sorted query without credentials, plus a digest of any body."""
+    params: list[tuple[str, str]] = []
+    for name, value in request.url.params.multi_items():
+        if name in IGNORED_PARAMS:
+            continue
+        if name in LIST_PARAMS:
+            value = ",".join(sorted(part.strip() for part in value.split(",") if part.strip()))
+        elif name == "language":
+            value = value.lower()
+        params.append((name, value))
+    key = f"{request.method} {request.url.host}{request.url.path}?{urllib.parse.urlencode(sorted(params))}"
+
+    body = request.content
+    if body:
+        with contextlib.suppress(ValueError):
+            body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode("utf-8")
+        key += f" {hashlib.sha256(body).hexdigest()}"
+    return key
+
+
+class CachedResponse(NamedTuple):
+    status_code: int
+    headers: list[tuple[str, str]]
+    content: bytes
+    stored_at: float
+    expires_at: float
+    stale_until: float
+
+
+class MetadataCache:
+    """
+    SQLite store of metadata API responses (TMDB, IMDb, AniList, TVMaze), shared by every module
+    through `metadata_client()`. Releases of the same show make identical lookups, so they are answered
+    from disk, with per-endpoint TTLs from CACHE_RULES and stale-while-revalidate past them.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_bytes: int = METADATA_CACHE_MAX_BYTES) -> None:
+        self.path = path or Path(__file__).resolve().parent.parent / "data" / "metadata_cache.sqlite3"
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._refreshing: set[str] = set()
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    status INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    stale_until REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT status, headers, body, stored_at, expires_at, stale_until FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[5] < now:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        headers = [(str(name), str(value)) for name, value in json.loads(row[1])]
+        return CachedResponse(row[0], headers, row[2], row[3], row[4], row[5])
+
+    def put(self, key: str, rule: CacheRule, status_code: int, headers: list[tuple[str, str]], content: bytes) -> None:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, status, headers, body, size, stored_at, expires_at, stale_until, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, status_code, json.dumps(headers), content, len(content), now, now + rule.ttl, now + rule.ttl + rule.stale, now),
+            )
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                # Evict least recently used responses until the cache is back to 90% of its bound
+                excess = total - int(self.max_bytes * 0.9)
+                for row_key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+                    if excess <= 0:
+                        break
+                    conn.execute("DELETE FROM responses WHERE key = ?", (row_key,))
+                    excess -= size
+
+    def clear(self) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+    def schedule_refresh(self, key: str, rule: CacheRule, request: httpx.Request) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        task = asyncio.create_task(self._refresh(key, rule, request))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, key: str, rule: CacheRule, request: httpx.Request) -> None:
+        try:
+            # The client that served the stale response may already be closed, refresh on a fresh one
+            async with httpx.AsyncClient(timeout=10.0) as client:
+                response = await client.send(httpx.Request(request.method, request.url, headers=request.headers, content=request.content))
+            if _cacheable(response):
+                await asyncio.to_thread(self.put, key, rule, response.status_code, _stored_headers(response), response.content)
+        except Exception as e:
+            console.print(f"[yellow]Metadata cache refresh failed for {request.url.host}{request.url.path}: {e}[/yellow]")
+        finally:
+            self._refreshing.discard(key)
+
+
+def _stored_headers(response: httpx.Response) -> list[tuple[str, str]]:
+    return [(name, value) for name, value in response.headers.multi_items() if name.lower() not in DROPPED_HEADERS]
+
+
+def _cacheable(response: httpx.Response) -> bool:
+    if response.status_code != 200:
+        return False
+    # GraphQL reports failures inside a 200 response
+    if "json" in response.headers.get("content-type", ""):
+        try:
+            data = response.json()
+        except ValueError:
+            return False
+        if isinstance(data, dict) and cast(dict[str, Any], data).get("errors"):
+            return False
+        # A search that found nothing may find the title once it is added upstream, so ask again next time
+        if "/search/" in response.request.url.path and (data == [] or (isinstance(data, dict) and cast(dict[str, Any], data).get("results") == [])):
+            return False
+    return True
+
+
+metadata_cache = MetadataCache()
+# Set for a run (or queue item) started with --no-meta-cache; a context variable, so concurrent runs keep their own
+cache_bypassed: contextvars.ContextVar[bool] = contextvars.ContextVar('cache_bypassed', default=False)
+
+
+class MetadataCacheTransport(httpx.AsyncBaseTransport):
+    """httpx transport answering cacheable metadata requests from `metadata_cache` before the network."""
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None, cache: Optional[MetadataCache] = None) -> None:
+        self._transport = transport or httpx.AsyncHTTPTransport()
+        self._cache = cache or metadata_cache
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        rule = None if cache_bypassed.get() else _rule_for(request)
+        if rule is None:
+            return await self._transport.handle_async_request(request)
+
+        await request.aread()
+        key = cache_key(request)
+        try:
+            cached = await asyncio.to_thread(self._cache.get, key)
+        except sqlite3.Error as e:
+            console.print(f"[yellow]Metadata cache unavailable: {e}[/yellow]")
+            return await self._transport.handle_async_request(request)
+
+        if cached is not None:
+            if cached.expires_at < time.time():
+                self._cache.schedule_refresh(key, rule, request)
+            return httpx.Response(cached.status_code, headers=cached.headers, content=cached.content, request=request)
+
+        response = await self._transport.handle_async_request(request)
+        content = await response.aread()
+        stored = httpx.Response(response.status_code, headers=_stored_headers(response), content=content, request=request, extensions=response.extensions)
+        if _cacheable(stored):
+            try:
+                await asyncio.to_thread(self._cache.put, key, rule, stored.status_code, _stored_headers(stored), content)
+            except sqlite3.Error as e:
+                console.print(f"[yellow]Could not store metadata response: {e}[/yellow]")
+        return stored
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def metadata_client(**kwargs: Any) -> httpx.AsyncClient:
+    """`httpx.AsyncClient` whose metadata API requests go through the shared response cache."""
+    mounts: dict[str, Optional[httpx.AsyncBaseTransport]] = {}
+    if kwargs.get("trust_env", True):
+        mounts = environment_proxy_mounts(lambda proxy: MetadataCacheTransport(httpx.AsyncHTTPTransport(proxy=proxy)))
+    return httpx.AsyncClient(transport=MetadataCacheTransport(), mounts=mounts, **kwargs)
@@ -0,0 +1,66 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+import copy
+from collections.abc import Iterator, Mapping, MutableMapping
+from typing import Any
+
+# Large payloads that tracker checks only ever read; these are shared with the base instead of copied
+SHARED_READ_ONLY_KEYS = frozenset({'mediainfo', 'bdinfo', 'discs', 'image_list', 'imdb_info'})
+
+_MISSING = object()
+
+
+class MetaOverlay(MutableMapping[str, Any]):
+    """
+    Copy-on-write view over a meta dict, used in place of a full `copy.deepcopy(meta)`.
+
+    The top level of `base` is snapshotted when the overlay is created. Writes and deletes
+    land in the overlay's own layer; reads fall through to the snapshot. Mutable containers
+    are deep-copied into the layer the first time they are read, so in-place edits stay
+    local, except for SHARED_READ_ONLY_KEYS which are handed out shared and must not be
+    modified through the overlay.
+    """
+
+    def __init__(self, base: Mapping[str, Any], shared_keys: frozenset[str] = SHARED_READ_ONLY_KEYS) -> None:
+        self._base = dict(base)
+        self._layer: dict[str, Any] = {}
+        self._deleted: set[str] = set()
+        self._shared_keys = shared_keys
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._layer.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if key in self._deleted:
+            raise KeyError(key)
+        value = self._base[key]
+        if key not in self._shared_keys and isinstance(value, (dict, list, set)):
+            value = copy.deepcopy(value)
+            self._layer[key] = value
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._layer[key] = value
+        self._deleted.discard(key)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._layer.pop(key, None)
+        if key in self._base:
+            self._deleted.add(key)
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._layer:
+            return True
+        return key in self._base and key not in self._deleted
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self._base:
+            if key not in self._deleted:
+                yield key
+        for key in self._layer:
+            if key not in self._base:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
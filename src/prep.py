@@ -1,10 +1,11 @@
 # Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
-from typing import Any, Callable, Optional, cast
+from typing import Any, Optional, cast
 
 console: Any = None
 
 try:
     import asyncio
+    import functools
     import ntpath
     import os
     import re
@@ -14,7 +15,6 @@ try:
 
     import aiofiles
     import cli_ui
-    import guessit
 
     from src.apply_overrides import ApplyOverrides
     from src.audio import AudioManager
@@ -30,10 +30,13 @@ try:
     from src.get_source import get_source
     from src.get_tracker_data import TrackerDataManager
     from src.getseasonep import SeasonEpisodeManager
+    from src.guessitcache import guessit_cache_info, guessit_fn
     from src.imdb import imdb_manager
     from src.is_scene import SceneManager
     from src.languages import languages_manager
+    from src.metacache import cache_bypassed
     from src.metadata_searching import MetadataSearchingManager
+    from src.prepgraph import PrepGraph
     from src.radarr import RadarrManager
     from src.region import get_distributor, get_region, get_service
     from src.rehostimages import RehostImagesManager
@@ -44,12 +47,6 @@ try:
     from src.tvmaze import tvmaze_manager
     from src.video import video_manager
 
-    guessit_module: Any = cast(Any, guessit)
-    GuessitFn = Callable[[str, Optional[dict[str, Any]]], dict[str, Any]]
-
-    def guessit_fn(value: str, options: Optional[dict[str, Any]] = None) -> dict[str, Any]:
-        return cast(dict[str, Any], guessit_module.guessit(value, options))
-
 except ModuleNotFoundError:
     if console is not None:
         console.print('Missing Module Found. Please reinstall required dependencies from requirements.txt.', markup=False)
@@ -134,6 +131,7 @@ class Prep:
         meta['isdir'] = os.path.isdir(meta['path'])
         base_dir = meta['base_dir']
         meta['saved_description'] = False
+        cache_bypassed.set(bool(meta.get('no_meta_cache', False)))
         client = Clients(config=self.config)
         meta['skip_auto_torrent'] = meta.get('skip_auto_torrent', False) or self.config['DEFAULT'].get('skip_auto_torrent', False)
         hash_ids = ['infohash', 'torrent_hash', 'skip_auto_torrent']
@@ -148,6 +146,8 @@ class Prep:
         meta['keep_images'] = bool(self.config['DEFAULT'].get('keep_images', True) if not meta.get('keep_images') else True)
         mkbrr_threads = self.config['DEFAULT'].get('mkbrr_threads', "0")
         meta['mkbrr_threads'] = mkbrr_threads
+        meta['hash_device_concurrency'] = self.config['DEFAULT'].get('hash_device_concurrency', "1")
+        meta['hash_bandwidth_limit'] = self.config['DEFAULT'].get('hash_bandwidth_limit', "0")
 
         # make sure these are set in meta
         meta['we_checked_tvdb'] = False
@@ -718,11 +718,6 @@ class Prep:
                 else:
                     ids = None
 
-        # if there's no region/distributor info, lets ping some unit3d trackers and see if we get it
-        ping_unit3d_config = self.config['DEFAULT'].get('ping_unit3d', False)
-        if (not meta.get('region') or not meta.get('distributor')) and meta['is_disc'] == "BDMV" and ping_unit3d_config and not meta.get('edit', False) and not meta.get('emby', False) and not meta.get('site_check', False):
-            await self.tracker_data_manager.ping_unit3d(meta)
-
         # the first user override check that allows to set metadata ids.
         # it relies on imdb or tvdb already being set.
         user_overrides = self.config['DEFAULT'].get('user_overrides', False)
@@ -737,400 +732,455 @@ class Prep:
         if emby_cat is not None and str(emby_cat).upper() != str(meta.get('category') or '').upper():
             return meta
 
-        if meta['debug']:
-            console.print("ID inputs into prep")
-            console.print("category:", meta.get("category"))
-            console.print(f"Raw TVDB ID: {meta['tvdb_id']} (type: {type(meta['tvdb_id']).__name__})")
-            console.print(f"Raw IMDb ID: {meta['imdb_id']} (type: {type(meta['imdb_id']).__name__})")
-            console.print(f"Raw TMDb ID: {meta['tmdb_id']} (type: {type(meta['tmdb_id']).__name__})")
-            console.print(f"Raw TVMAZE ID: {meta['tvmaze_id']} (type: {type(meta['tvmaze_id']).__name__})")
-            console.print(f"Raw MAL ID: {meta['mal_id']} (type: {type(meta['mal_id']).__name__})")
+        # lookups that don't depend on each other run as graph nodes and overlap the id resolution below
+        prep_graph = PrepGraph(str(meta.get('uuid') or 'prep'))
+        try:
+            # if there's no region/distributor info, lets ping some unit3d trackers and see if we get it
+            # it only fills missing fields, so it can run alongside everything up to the bluray.com lookup
+            ping_unit3d_config = self.config['DEFAULT'].get('ping_unit3d', False)
+            prep_graph.add(
+                'ping_unit3d',
+                functools.partial(self.tracker_data_manager.ping_unit3d, meta),
+                provides=('region', 'distributor'),
+                when=bool((not meta.get('region') or not meta.get('distributor')) and meta['is_disc'] == "BDMV" and ping_unit3d_config and not meta.get('edit', False) and not meta.get('emby', False) and not meta.get('site_check', False)),
+            )
 
-        if meta.get('mal_id', 0) != 0:
-            meta['anime'] = True
-            meta['not_anime'] = True
+            if meta['debug']:
+                console.print("ID inputs into prep")
+                console.print("category:", meta.get("category"))
+                console.print(f"Raw TVDB ID: {meta['tvdb_id']} (type: {type(meta['tvdb_id']).__name__})")
+                console.print(f"Raw IMDb ID: {meta['imdb_id']} (type: {type(meta['imdb_id']).__name__})")
+                console.print(f"Raw TMDb ID: {meta['tmdb_id']} (type: {type(meta['tmdb_id']).__name__})")
+                console.print(f"Raw TVMAZE ID: {meta['tvmaze_id']} (type: {type(meta['tvmaze_id']).__name__})")
+                console.print(f"Raw MAL ID: {meta['mal_id']} (type: {type(meta['mal_id']).__name__})")
 
-        console.print("[yellow]Building meta data.....")
+            if meta.get('mal_id', 0) != 0:
+                meta['anime'] = True
+                meta['not_anime'] = True
 
-        # set a timer to check speed
-        if meta['debug']:
-            meta_middle_time = time.time()
-            console.print(f"Source/tracker data processed in {meta_middle_time - meta_start_time:.2f} seconds")
+            console.print("[yellow]Building meta data.....")
 
-        manual_language = meta.get('manual_language')
-        if isinstance(manual_language, str) and manual_language:
-            meta['original_language'] = manual_language.lower()
+            # set a timer to check speed
+            if meta['debug']:
+                meta_middle_time = time.time()
+                console.print(f"Source/tracker data processed in {meta_middle_time - meta_start_time:.2f} seconds")
 
-        meta['type'] = await video_manager.get_type(video, meta['scene'], meta['is_disc'], meta)
+            manual_language = meta.get('manual_language')
+            if isinstance(manual_language, str) and manual_language:
+                meta['original_language'] = manual_language.lower()
 
-        # if it's not an anime, we can run season/episode checks now to speed the process
-        if meta.get("not_anime", False) and meta.get("category") == "TV":
-            meta = await self.season_episode_manager.get_season_episode(video, meta)
+            meta['type'] = await video_manager.get_type(video, meta['scene'], meta['is_disc'], meta)
 
-        mi_data: dict[str, Any] = mi or {}
+            # if it's not an anime, we can run season/episode checks now to speed the process
+            if meta.get("not_anime", False) and meta.get("category") == "TV":
+                meta = await self.season_episode_manager.get_season_episode(video, meta)
 
-        # Run a check against mediainfo to see if it has tmdb/imdb
-        if (meta.get('tmdb_id') == 0 or meta.get('imdb_id') == 0) and not meta.get('emby', False):
-            meta['category'], meta['tmdb_id'], meta['imdb_id'], meta['tvdb_id'] = await self.tmdb_manager.get_tmdb_imdb_from_mediainfo(
-                mi_data, meta
-            )
+            mi_data: dict[str, Any] = mi or {}
 
-        # Flag for emby if no IDs were found
-        if meta.get('imdb_id', 0) == 0 and meta.get('tvdb_id', 0) == 0 and meta.get('tmdb_id', 0) == 0 and meta.get('tvmaze_id', 0) == 0 and meta.get('mal_id', 0) == 0 and meta.get('emby', False):
-            meta['no_ids'] = True
+            # Run a check against mediainfo to see if it has tmdb/imdb
+            if (meta.get('tmdb_id') == 0 or meta.get('imdb_id') == 0) and not meta.get('emby', False):
+                meta['category'], meta['tmdb_id'], meta['imdb_id'], meta['tvdb_id'] = await self.tmdb_manager.get_tmdb_imdb_from_mediainfo(
+                    mi_data, meta
+                )
 
-        meta['video_duration'] = await video_manager.get_video_duration(meta)
-        duration = meta.get('video_duration', None)
+            # Flag for emby if no IDs were found
+            if meta.get('imdb_id', 0) == 0 and meta.get('tvdb_id', 0) == 0 and meta.get('tmdb_id', 0) == 0 and meta.get('tvmaze_id', 0) == 0 and meta.get('mal_id', 0) == 0 and meta.get('emby', False):
+                meta['no_ids'] = True
 
-        unattended = not (not meta['unattended'] or meta['unattended'] and meta.get('unattended_confirm', False))
-        debug = bool(meta.get('emby_debug', False) or meta['debug'])
+            meta['video_duration'] = await video_manager.get_video_duration(meta)
+            duration = meta.get('video_duration', None)
 
-        # run a search to find tmdb and imdb ids if we don't have them
-        if int(meta.get('tmdb_id') or 0) == 0 and int(meta.get('imdb_id') or 0) == 0:
-            if meta.get('category') == "TV":
-                year = meta.get('manual_year', '') or meta.get('search_year', '') or meta.get('year', '')
-            elif meta.get('emby_debug', False):
-                year = ""
-            else:
-                year = meta.get('manual_year', '') or meta.get('year', '') or meta.get('search_year', '')
-            year_value = _normalize_search_year(year)
-            category_pref = meta.get('category') or ''
-            tmdb_task: asyncio.Task[tuple[int, str]] = asyncio.create_task(
-                self.tmdb_manager.get_tmdb_id(
-                    filename,
-                    year_value,
-                    category_pref,
-                    untouched_filename,
-                    attempted=0,
-                    debug=debug,
-                    secondary_title=meta.get('secondary_title', None),
-                    unattended=unattended,
+            unattended = not (not meta['unattended'] or meta['unattended'] and meta.get('unattended_confirm', False))
+            debug = bool(meta.get('emby_debug', False) or meta['debug'])
+
+            # run a search to find tmdb and imdb ids if we don't have them
+            if int(meta.get('tmdb_id') or 0) == 0 and int(meta.get('imdb_id') or 0) == 0:
+                if meta.get('category') == "TV":
+                    year = meta.get('manual_year', '') or meta.get('search_year', '') or meta.get('year', '')
+                elif meta.get('emby_debug', False):
+                    year = ""
+                else:
+                    year = meta.get('manual_year', '') or meta.get('year', '') or meta.get('search_year', '')
+                year_value = _normalize_search_year(year)
+                category_pref = meta.get('category') or ''
+                tmdb_task: asyncio.Task[tuple[int, str]] = asyncio.create_task(
+                    self.tmdb_manager.get_tmdb_id(
+                        filename,
+                        year_value,
+                        category_pref,
+                        untouched_filename,
+                        attempted=0,
+                        debug=debug,
+                        secondary_title=meta.get('secondary_title', None),
+                        unattended=unattended,
+                    )
                 )
-            )
-            imdb_task: asyncio.Task[int] = asyncio.create_task(
-                imdb_manager.search_imdb(
+                imdb_task: asyncio.Task[int] = asyncio.create_task(
+                    imdb_manager.search_imdb(
+                        filename,
+                        year_value,
+                        quickie=True,
+                        category=category_pref,
+                        debug=debug,
+                        secondary_title=meta.get('secondary_title', None),
+                        untouched_filename=untouched_filename,
+                        duration=duration,
+                        unattended=unattended,
+                    )
+                )
+                tmdb_result, imdb_result = await asyncio.gather(tmdb_task, imdb_task)
+                tmdb_id, category = tmdb_result
+                meta['category'] = category
+                meta['tmdb_id'] = _to_int(tmdb_id)
+                meta['imdb_id'] = _to_int(imdb_result)
+                meta['quickie_search'] = True
+                meta['no_ids'] = True
+
+            # If we have an IMDb ID but no TMDb ID, fetch TMDb ID from IMDb
+            if int(meta.get('imdb_id') or 0) != 0 and int(meta.get('tmdb_id') or 0) == 0:
+                imdb_id_value = _to_int(meta.get('imdb_id'))
+                tvdb_id_value = _to_int(meta.get('tvdb_id'))
+                search_year_value = _normalize_search_year(meta.get('search_year'))
+                category, tmdb_id, original_language, filename_search = await self.tmdb_manager.get_tmdb_from_imdb(
+                    imdb_id_value,
+                    tvdb_id_value if tvdb_id_value else None,
+                    search_year_value,
                     filename,
-                    year_value,
-                    quickie=True,
-                    category=category_pref,
-                    debug=debug,
-                    secondary_title=meta.get('secondary_title', None),
-                    untouched_filename=untouched_filename,
-                    duration=duration,
-                    unattended=unattended,
+                    debug=meta.get('debug', False),
+                    mode=meta.get('mode', 'discord'),
+                    category_preference=meta.get('category'),
+                    imdb_info=meta.get('imdb_info', None)
                 )
-            )
-            tmdb_result, imdb_result = await asyncio.gather(tmdb_task, imdb_task)
-            tmdb_id, category = tmdb_result
-            meta['category'] = category
-            meta['tmdb_id'] = _to_int(tmdb_id)
-            meta['imdb_id'] = _to_int(imdb_result)
-            meta['quickie_search'] = True
-            meta['no_ids'] = True
-
-        # If we have an IMDb ID but no TMDb ID, fetch TMDb ID from IMDb
-        if int(meta.get('imdb_id') or 0) != 0 and int(meta.get('tmdb_id') or 0) == 0:
-            imdb_id_value = _to_int(meta.get('imdb_id'))
-            tvdb_id_value = _to_int(meta.get('tvdb_id'))
-            search_year_value = _normalize_search_year(meta.get('search_year'))
-            category, tmdb_id, original_language, filename_search = await self.tmdb_manager.get_tmdb_from_imdb(
-                imdb_id_value,
-                tvdb_id_value if tvdb_id_value else None,
-                search_year_value,
-                filename,
-                debug=meta.get('debug', False),
-                mode=meta.get('mode', 'discord'),
-                category_preference=meta.get('category'),
-                imdb_info=meta.get('imdb_info', None)
-            )
 
-            meta['category'] = category
-            meta['tmdb_id'] = _to_int(tmdb_id)
-            meta['original_language'] = original_language
-            meta['no_ids'] = filename_search
+                meta['category'] = category
+                meta['tmdb_id'] = _to_int(tmdb_id)
+                meta['original_language'] = original_language
+                meta['no_ids'] = filename_search
 
-        no_original_language = False
-        if meta.get('original_language', None) is None:
-            no_original_language = True
+            no_original_language = False
+            if meta.get('original_language', None) is None:
+                no_original_language = True
 
-        # if we have all of the ids, search everything all at once
-        if int(meta.get('imdb_id') or 0) != 0 and int(meta.get('tvdb_id') or 0) != 0 and int(meta.get('tmdb_id') or 0) != 0 and int(meta.get('tvmaze_id') or 0) != 0:
-            meta = await self.metadata_searching_manager.all_ids(meta)
+            # if we have all of the ids, search everything all at once
+            if int(meta.get('imdb_id') or 0) != 0 and int(meta.get('tvdb_id') or 0) != 0 and int(meta.get('tmdb_id') or 0) != 0 and int(meta.get('tvmaze_id') or 0) != 0:
+                meta = await self.metadata_searching_manager.all_ids(meta)
 
-        # Check if IMDb, TMDb, and TVDb IDs are all present
-        elif int(meta.get('imdb_id') or 0) != 0 and int(meta.get('tvdb_id') or 0) != 0 and int(meta.get('tmdb_id') or 0) != 0 and not meta.get('quickie_search', False):
-            meta = await self.metadata_searching_manager.imdb_tmdb_tvdb(meta, filename)
+            # Check if IMDb, TMDb, and TVDb IDs are all present
+            elif int(meta.get('imdb_id') or 0) != 0 and int(meta.get('tvdb_id') or 0) != 0 and int(meta.get('tmdb_id') or 0) != 0 and not meta.get('quickie_search', False):
+                meta = await self.metadata_searching_manager.imdb_tmdb_tvdb(meta, filename)
 
-        # Check if both IMDb and TVDB IDs are present
-        elif int(meta.get('imdb_id') or 0) != 0 and int(meta.get('tvdb_id') or 0) != 0 and not meta.get('quickie_search', False):
-            meta = await self.metadata_searching_manager.imdb_tvdb(meta, filename)
+            # Check if both IMDb and TVDB IDs are present
+            elif int(meta.get('imdb_id') or 0) != 0 and int(meta.get('tvdb_id') or 0) != 0 and not meta.get('quickie_search', False):
+                meta = await self.metadata_searching_manager.imdb_tvdb(meta, filename)
 
-        # Check if both IMDb and TMDb IDs are present
-        elif int(meta.get('imdb_id') or 0) != 0 and int(meta.get('tmdb_id') or 0) != 0 and not meta.get('quickie_search', False):
-            meta = await self.metadata_searching_manager.imdb_tmdb(meta, filename)
+            # Check if both IMDb and TMDb IDs are present
+            elif int(meta.get('imdb_id') or 0) != 0 and int(meta.get('tmdb_id') or 0) != 0 and not meta.get('quickie_search', False):
+                meta = await self.metadata_searching_manager.imdb_tmdb(meta, filename)
 
-        # we should have tmdb id one way or another, so lets get data if needed
-        if int(meta.get('tmdb_id') or 0) != 0:
-            await self.tmdb_manager.set_tmdb_metadata(meta, filename)
+            # we should have tmdb id one way or another, so lets get data if needed
+            if int(meta.get('tmdb_id') or 0) != 0:
+                await self.tmdb_manager.set_tmdb_metadata(meta, filename)
 
-        # If there was no original language set before the combined metadata searching, tvdb changes mean we might have set a bad tvdb series name
-        # Now that we have original language, we can safely kill the tvdb series name if it was en original to account for the change
-        if meta.get('tvdb_series_name', None) and meta.get('original_language', 'en') == 'en' and meta.get('tmdb_id', 0) != 0 and no_original_language:
-            meta['tvdb_series_name'] = None
+            # If there was no original language set before the combined metadata searching, tvdb changes mean we might have set a bad tvdb series name
+            # Now that we have original language, we can safely kill the tvdb series name if it was en original to account for the change
+            if meta.get('tvdb_series_name', None) and meta.get('original_language', 'en') == 'en' and meta.get('tmdb_id', 0) != 0 and no_original_language:
+                meta['tvdb_series_name'] = None
 
-        # If there's a mismatch between IMDb and TMDb IDs, try to resolve it
-        if meta.get('imdb_mismatch', False) and "subsplease" not in meta.get('uuid', '').lower():
-            if meta['debug']:
-                console.print("[yellow]IMDb ID mismatch detected, attempting to resolve...[/yellow]")
-            # with refactored tmdb, it quite likely to be correct
-            meta['imdb_id'] = meta.get('mismatched_imdb_id', 0)
-            meta['imdb_info'] = None
+            # If there's a mismatch between IMDb and TMDb IDs, try to resolve it
+            if meta.get('imdb_mismatch', False) and "subsplease" not in meta.get('uuid', '').lower():
+                if meta['debug']:
+                    console.print("[yellow]IMDb ID mismatch detected, attempting to resolve...[/yellow]")
+                # with refactored tmdb, it quite likely to be correct
+                meta['imdb_id'] = meta.get('mismatched_imdb_id', 0)
+                meta['imdb_info'] = None
 
-        # Get IMDb ID if not set
-        if meta.get('imdb_id') == 0:
-            try:
+            # Get IMDb ID if not set
+            if meta.get('imdb_id') == 0:
+                try:
+                    search_year_value = _normalize_search_year(meta.get('search_year'))
+                    meta['imdb_id'] = await imdb_manager.search_imdb(
+                        filename,
+                        search_year_value,
+                        quickie=False,
+                        category=meta.get('category', None),
+                        debug=debug,
+                        secondary_title=meta.get('secondary_title', None),
+                        untouched_filename=untouched_filename,
+                        attempted=0,
+                        duration=duration,
+                        unattended=unattended,
+                    )
+                except Exception as e:
+                    console.print(f"[red]Error searching IMDb: {e}[/red]")
+                    raise Exception(f"Error searching IMDb: {e}") from e
+
+            # user might have skipped tmdb earlier, lets double check
+            if meta.get('imdb_id') != 0 and meta.get('tmdb_id') == 0:
+                console.print("[yellow]No TMDB ID found, attempting to fetch from IMDb...[/yellow]")
+                imdb_id_value = _to_int(meta.get('imdb_id'))
+                tvdb_id_value = _to_int(meta.get('tvdb_id'))
                 search_year_value = _normalize_search_year(meta.get('search_year'))
-                meta['imdb_id'] = await imdb_manager.search_imdb(
-                    filename,
+                category, tmdb_id, original_language, filename_search = await self.tmdb_manager.get_tmdb_from_imdb(
+                    imdb_id_value,
+                    tvdb_id_value if tvdb_id_value else None,
                     search_year_value,
-                    quickie=False,
-                    category=meta.get('category', None),
-                    debug=debug,
-                    secondary_title=meta.get('secondary_title', None),
-                    untouched_filename=untouched_filename,
-                    attempted=0,
-                    duration=duration,
-                    unattended=unattended,
+                    filename,
+                    debug=meta.get('debug', False),
+                    mode=meta.get('mode', 'discord'),
+                    category_preference=meta.get('category'),
+                    imdb_info=meta.get('imdb_info', None)
                 )
-            except Exception as e:
-                console.print(f"[red]Error searching IMDb: {e}[/red]")
-                raise Exception(f"Error searching IMDb: {e}") from e
 
-        # user might have skipped tmdb earlier, lets double check
-        if meta.get('imdb_id') != 0 and meta.get('tmdb_id') == 0:
-            console.print("[yellow]No TMDB ID found, attempting to fetch from IMDb...[/yellow]")
+                meta['category'] = category
+                meta['tmdb_id'] = _to_int(tmdb_id)
+                meta['original_language'] = original_language
+                meta['no_ids'] = filename_search
+
+            # TMDB metadata and IMDb info only need the resolved ids, so fetch them together
+            tmdb_id_value = _to_int(meta.get('tmdb_id'))
             imdb_id_value = _to_int(meta.get('imdb_id'))
-            tvdb_id_value = _to_int(meta.get('tvdb_id'))
-            search_year_value = _normalize_search_year(meta.get('search_year'))
-            category, tmdb_id, original_language, filename_search = await self.tmdb_manager.get_tmdb_from_imdb(
-                imdb_id_value,
-                tvdb_id_value if tvdb_id_value else None,
-                search_year_value,
-                filename,
-                debug=meta.get('debug', False),
-                mode=meta.get('mode', 'discord'),
-                category_preference=meta.get('category'),
-                imdb_info=meta.get('imdb_info', None)
+            prep_graph.add(
+                'tmdb_metadata',
+                functools.partial(self.tmdb_manager.set_tmdb_metadata, meta, filename),
+                provides=('title', 'year', 'genres', 'overview'),
+                when=tmdb_id_value != 0,
             )
+            prep_graph.add(
+                'imdb_info',
+                functools.partial(imdb_manager.get_imdb_info_api, imdb_id_value, manual_language=meta.get('manual_language'), debug=meta.get('debug', False)),
+                provides=('imdb_info',),
+                when=meta.get('imdb_info', None) is None and imdb_id_value != 0,
+            )
+            await prep_graph.result('tmdb_metadata')
+            imdb_info = await prep_graph.result('imdb_info')
+            if imdb_info is not None and _to_int(meta.get('imdb_id')) == imdb_id_value:
+                meta['imdb_info'] = imdb_info
 
-            meta['category'] = category
-            meta['tmdb_id'] = _to_int(tmdb_id)
-            meta['original_language'] = original_language
-            meta['no_ids'] = filename_search
-
-        tmdb_id_value = _to_int(meta.get('tmdb_id'))
-        if tmdb_id_value != 0:
-            await self.tmdb_manager.set_tmdb_metadata(meta, filename)
+            # Ensure IMDb info is retrieved if it wasn't already fetched (or TMDB changed the IMDb ID)
+            imdb_id_value = _to_int(meta.get('imdb_id'))
+            if meta.get('imdb_info', None) is None and imdb_id_value != 0:
+                imdb_info = await imdb_manager.get_imdb_info_api(imdb_id_value, manual_language=meta.get('manual_language'), debug=meta.get('debug', False))
+                meta['imdb_info'] = imdb_info
 
-        # Ensure IMDb info is retrieved if it wasn't already fetched
-        imdb_id_value = _to_int(meta.get('imdb_id'))
-        if meta.get('imdb_info', None) is None and imdb_id_value != 0:
-            imdb_info = await imdb_manager.get_imdb_info_api(imdb_id_value, manual_language=meta.get('manual_language'), debug=meta.get('debug', False))
-            meta['imdb_info'] = imdb_info
+            check_valid_data = meta.get('imdb_info', {}).get('title', "")
+            if check_valid_data:
+                try:
+                    title = meta['title'].lower().strip()
+                except KeyError:
+                    console.print("[red]Title is missing from TMDB....")
+                    sys.exit(1)
+                aka = meta.get('imdb_info', {}).get('title', "").strip().lower()
+                imdb_aka = meta.get('imdb_info', {}).get('aka', "").strip().lower()
+                year = str(meta.get('imdb_info', {}).get('year', ""))
+
+                if aka and not meta.get('aka'):
+                    aka_trimmed = aka[4:].strip().lower() if aka.lower().startswith("aka") else aka.lower()
+                    difference = SequenceMatcher(None, title, aka_trimmed).ratio()
+                    if difference >= 0.7 or not aka_trimmed or aka_trimmed in title:
+                        aka = None
+
+                    difference = SequenceMatcher(None, title, imdb_aka).ratio()
+                    if difference >= 0.7 or not imdb_aka or imdb_aka in title:
+                        imdb_aka = None
+
+                    if aka is not None:
+                        if f"({year})" in aka:
+                            aka = meta.get('imdb_info', {}).get('title', "").replace(f"({year})", "").strip()
+                        else:
+                            aka = meta.get('imdb_info', {}).get('title', "").strip()
+                        meta['aka'] = f"AKA {aka.strip()}"
+                        meta['title'] = meta['title'].strip()
+                    elif imdb_aka is not None:
+                        if f"({year})" in imdb_aka:
+                            imdb_aka = meta.get('imdb_info', {}).get('aka', "").replace(f"({year})", "").strip()
+                        else:
+                            imdb_aka = meta.get('imdb_info', {}).get('aka', "").strip()
+                        meta['aka'] = f"AKA {imdb_aka.strip()}"
+                        meta['title'] = meta['title'].strip()
+
+            if meta.get('aka', None) is None:
+                meta['aka'] = ""
+
+            # if it was skipped earlier, make sure we have the season/episode data
+            if not meta.get('not_anime', False) and meta.get('category') == "TV":
+                meta = await self.season_episode_manager.get_season_episode(video, meta)
+
+            if meta['category'] == "TV" and meta.get('tv_pack'):
+                await self.season_episode_manager.check_season_pack_completeness(meta)
+
+            # lets check for tv movies
+            meta['tv_movie'] = False
+            if meta['imdb_id'] != 0:
+                is_tv_movie = meta.get('imdb_info', {}).get('type', '')
+                if is_tv_movie:
+                    tv_movie_keywords = ['tv movie', 'tv special', 'tvmovie']
+                    if any(re.search(rf'(^|,\s*){re.escape(keyword)}(\s*,|$)', is_tv_movie, re.IGNORECASE) for keyword in tv_movie_keywords):
+                        if meta['debug']:
+                            console.print(f"[yellow]Identified as TV Movie based on IMDb type: {is_tv_movie}[/yellow]")
+                        meta['tv_movie'] = True
 
-        check_valid_data = meta.get('imdb_info', {}).get('title', "")
-        if check_valid_data:
-            try:
-                title = meta['title'].lower().strip()
-            except KeyError:
-                console.print("[red]Title is missing from TMDB....")
-                sys.exit(1)
-            aka = meta.get('imdb_info', {}).get('title', "").strip().lower()
-            imdb_aka = meta.get('imdb_info', {}).get('aka', "").strip().lower()
-            year = str(meta.get('imdb_info', {}).get('year', ""))
-
-            if aka and not meta.get('aka'):
-                aka_trimmed = aka[4:].strip().lower() if aka.lower().startswith("aka") else aka.lower()
-                difference = SequenceMatcher(None, title, aka_trimmed).ratio()
-                if difference >= 0.7 or not aka_trimmed or aka_trimmed in title:
-                    aka = None
-
-                difference = SequenceMatcher(None, title, imdb_aka).ratio()
-                if difference >= 0.7 or not imdb_aka or imdb_aka in title:
-                    imdb_aka = None
-
-                if aka is not None:
-                    if f"({year})" in aka:
-                        aka = meta.get('imdb_info', {}).get('title', "").replace(f"({year})", "").strip()
-                    else:
-                        aka = meta.get('imdb_info', {}).get('title', "").strip()
-                    meta['aka'] = f"AKA {aka.strip()}"
-                    meta['title'] = meta['title'].strip()
-                elif imdb_aka is not None:
-                    if f"({year})" in imdb_aka:
-                        imdb_aka = meta.get('imdb_info', {}).get('aka', "").replace(f"({year})", "").strip()
-                    else:
-                        imdb_aka = meta.get('imdb_info', {}).get('aka', "").strip()
-                    meta['aka'] = f"AKA {imdb_aka.strip()}"
-                    meta['title'] = meta['title'].strip()
-
-        if meta.get('aka', None) is None:
-            meta['aka'] = ""
-
-        # if it was skipped earlier, make sure we have the season/episode data
-        if not meta.get('not_anime', False) and meta.get('category') == "TV":
-            meta = await self.season_episode_manager.get_season_episode(video, meta)
-
-        if meta['category'] == "TV" and meta.get('tv_pack'):
-            await self.season_episode_manager.check_season_pack_completeness(meta)
-
-        # lets check for tv movies
-        meta['tv_movie'] = False
-        if meta['imdb_id'] != 0:
-            is_tv_movie = meta.get('imdb_info', {}).get('type', '')
-            if is_tv_movie:
-                tv_movie_keywords = ['tv movie', 'tv special', 'tvmovie']
-                if any(re.search(rf'(^|,\s*){re.escape(keyword)}(\s*,|$)', is_tv_movie, re.IGNORECASE) for keyword in tv_movie_keywords):
-                    if meta['debug']:
-                        console.print(f"[yellow]Identified as TV Movie based on IMDb type: {is_tv_movie}[/yellow]")
-                    meta['tv_movie'] = True
-
-        if meta['category'] == "TV" or meta.get('tv_movie', False):
-            both_ids_searched = False
-            search_year_value = _normalize_search_year(meta.get('search_year'))
-            if meta.get('tvmaze_id', 0) == 0 and meta.get('tvdb_id', 0) == 0:
-                tvmaze, tvdb, tvdb_data, tvdb_name = await self.metadata_searching_manager.get_tvmaze_tvdb(
-                    filename,
-                    search_year_value or "",
-                    meta.get('imdb_id', 0),
-                    meta.get('tmdb_id', 0),
-                    meta.get('manual_data'),
-                    meta.get('tvmaze_manual', 0),
-                    year=meta.get('year', ''),
-                    debug=meta.get('debug', False),
-                    tv_movie=meta.get('tv_movie', False)
-                )
-                both_ids_searched = True
-                if tvmaze:
-                    meta['tvmaze_id'] = tvmaze
-                    if meta['debug']:
-                        console.print(f"[blue]Found TVMAZE ID from search: {tvmaze}[/blue]")
-                if tvdb:
-                    meta['tvdb_id'] = tvdb
-                    if meta['debug']:
-                        console.print(f"[blue]Found TVDB ID from search: {tvdb}[/blue]")
-                if tvdb_data:
-                    meta['tvdb_search_results'] = tvdb_data
-                    if meta['debug']:
-                        console.print("[blue]Found TVDB search results from search.[/blue]")
-                if tvdb_name:
-                    meta['tvdb_series_name'] = tvdb_name
-                    if meta['debug']:
-                        console.print(f"[blue]Found TVDB series name from search: {tvdb_name}[/blue]")
-            if meta.get('tvmaze_id', 0) == 0 and not both_ids_searched:
-                if meta['debug']:
+            if meta['category'] == "TV" or meta.get('tv_movie', False):
+                both_ids_searched = False
+                search_year_value = _normalize_search_year(meta.get('search_year'))
+                if meta.get('tvmaze_id', 0) == 0 and meta.get('tvdb_id', 0) == 0:
+                    tvmaze, tvdb, tvdb_data, tvdb_name = await self.metadata_searching_manager.get_tvmaze_tvdb(
+                        filename,
+                        search_year_value or "",
+                        meta.get('imdb_id', 0),
+                        meta.get('tmdb_id', 0),
+                        meta.get('manual_data'),
+                        meta.get('tvmaze_manual', 0),
+                        year=meta.get('year', ''),
+                        debug=meta.get('debug', False),
+                        tv_movie=meta.get('tv_movie', False)
+                    )
+                    both_ids_searched = True
+                    if tvmaze:
+                        meta['tvmaze_id'] = tvmaze
+                        if meta['debug']:
+                            console.print(f"[blue]Found TVMAZE ID from search: {tvmaze}[/blue]")
+                    if tvdb:
+                        meta['tvdb_id'] = tvdb
+                        if meta['debug']:
+                            console.print(f"[blue]Found TVDB ID from search: {tvdb}[/blue]")
+                    if tvdb_data:
+                        meta['tvdb_search_results'] = tvdb_data
+                        if meta['debug']:
+                            console.print("[blue]Found TVDB search results from search.[/blue]")
+                    if tvdb_name:
+                        meta['tvdb_series_name'] = tvdb_name
+                        if meta['debug']:
+                            console.print(f"[blue]Found TVDB series name from search: {tvdb_name}[/blue]")
+                # the TVMAZE and TVDB searches don't feed each other, so run them side by side
+                search_tvmaze = meta.get('tvmaze_id', 0) == 0 and not both_ids_searched
+                search_tvdb = meta.get('tvdb_id', 0) == 0
+                if search_tvmaze and meta['debug']:
                     console.print("[yellow]No TVMAZE ID found, attempting to fetch...[/yellow]")
-                meta['tvmaze_id'] = await tvmaze_manager.search_tvmaze(
-                    filename, search_year_value or "", meta.get('imdb_id', 0), meta.get('tvdb_id', 0),
-                    manual_date=meta.get('manual_date'),
-                    tvmaze_manual=meta.get('tvmaze_manual'),
-                    debug=meta.get('debug', False),
-                    return_full_tuple=False
-                )
-            if meta.get('tvdb_id', 0) == 0:
-                if meta['debug']:
+                if search_tvdb and meta['debug']:
                     console.print("[yellow]No TVDB ID found, attempting to fetch...[/yellow]")
-                try:
-                    series_results, series_id = await self.tvdb_handler.search_tvdb_series(filename=filename, year=meta.get('year', ''), debug=meta.get('debug', False))
-                    if series_id:
-                        meta['tvdb_id'] = series_id
-                        console.print(f"[blue]Found TVDB series ID from search: {series_id}[/blue]")
-                    if series_results:
-                        meta['tvdb_search_results'] = series_results
-                except Exception as e:
-                    console.print(f"[red]Error searching TVDB: {e}[/red]")
-
-            # all your episode data belongs to us
-            meta = await self.metadata_searching_manager.get_tv_data(meta)
-
-            if meta.get('tvdb_imdb_id', None):
-                imdb = meta['tvdb_imdb_id'].replace('tt', '')
-                if imdb.isdigit() and imdb != meta.get('imdb_id', 0):
-                    episode_info = await imdb_manager.get_imdb_from_episode(imdb, debug=True)
-                    if episode_info:
-                        series_id = episode_info.get('series', {}).get('series_id', None)
+                prep_graph.add(
+                    'tvmaze_search',
+                    functools.partial(
+                        tvmaze_manager.search_tvmaze,
+                        filename, search_year_value or "", meta.get('imdb_id', 0), meta.get('tvdb_id', 0),
+                        manual_date=meta.get('manual_date'),
+                        tvmaze_manual=meta.get('tvmaze_manual'),
+                        debug=meta.get('debug', False),
+                        return_full_tuple=False
+                    ),
+                    provides=('tvmaze_id',),
+                    when=search_tvmaze,
+                )
+                prep_graph.add(
+                    'tvdb_search',
+                    functools.partial(self.tvdb_handler.search_tvdb_series, filename=filename, year=meta.get('year', ''), debug=meta.get('debug', False)),
+                    provides=('tvdb_id', 'tvdb_search_results'),
+                    when=search_tvdb,
+                )
+                if search_tvmaze:
+                    meta['tvmaze_id'] = await prep_graph.result('tvmaze_search')
+                if search_tvdb:
+                    try:
+                        series_results, series_id = await prep_graph.result('tvdb_search')
                         if series_id:
-                            series_imdb = series_id.replace('tt', '')
-                            if series_imdb.isdigit() and int(series_imdb) != meta.get('imdb_id', 0):
-                                if meta['debug']:
-                                    console.print(f"[yellow]Updating IMDb ID from episode data: {series_imdb}")
-                                meta['imdb_id'] = int(series_imdb)
-                                imdb_info = await imdb_manager.get_imdb_info_api(meta['imdb_id'], manual_language=meta.get('manual_language'), debug=meta.get('debug', False))
-                                meta['imdb_info'] = imdb_info
-                                check_valid_data = meta.get('imdb_info', {}).get('title', "")
-                                if check_valid_data:
-                                    title = meta.get('title', "").strip()
-                                    aka = meta.get('imdb_info', {}).get('aka', "").strip()
-                                    year = str(meta.get('imdb_info', {}).get('year', ""))
-
-                                    if aka:
-                                        aka_trimmed = aka[4:].strip().lower() if aka.lower().startswith("aka") else aka.lower()
-                                        difference = SequenceMatcher(None, title.lower(), aka_trimmed).ratio()
-                                        if difference >= 0.7 or not aka_trimmed or aka_trimmed in title:
-                                            aka = None
-
-                                        if aka is not None:
-                                            if f"({year})" in aka:
-                                                aka = meta.get('imdb_info', {}).get('aka', "").replace(f"({year})", "").strip()
+                            meta['tvdb_id'] = series_id
+                            console.print(f"[blue]Found TVDB series ID from search: {series_id}[/blue]")
+                        if series_results:
+                            meta['tvdb_search_results'] = series_results
+                    except Exception as e:
+                        console.print(f"[red]Error searching TVDB: {e}[/red]")
+
+                # all your episode data belongs to us
+                meta = await self.metadata_searching_manager.get_tv_data(meta)
+
+                if meta.get('tvdb_imdb_id', None):
+                    imdb = meta['tvdb_imdb_id'].replace('tt', '')
+                    if imdb.isdigit() and imdb != meta.get('imdb_id', 0):
+                        episode_info = await imdb_manager.get_imdb_from_episode(imdb, debug=True)
+                        if episode_info:
+                            series_id = episode_info.get('series', {}).get('series_id', None)
+                            if series_id:
+                                series_imdb = series_id.replace('tt', '')
+                                if series_imdb.isdigit() and int(series_imdb) != meta.get('imdb_id', 0):
+                                    if meta['debug']:
+                                        console.print(f"[yellow]Updating IMDb ID from episode data: {series_imdb}")
+                                    meta['imdb_id'] = int(series_imdb)
+                                    imdb_info = await imdb_manager.get_imdb_info_api(meta['imdb_id'], manual_language=meta.get('manual_language'), debug=meta.get('debug', False))
+                                    meta['imdb_info'] = imdb_info
+                                    check_valid_data = meta.get('imdb_info', {}).get('title', "")
+                                    if check_valid_data:
+                                        title = meta.get('title', "").strip()
+                                        aka = meta.get('imdb_info', {}).get('aka', "").strip()
+                                        year = str(meta.get('imdb_info', {}).get('year', ""))
+
+                                        if aka:
+                                            aka_trimmed = aka[4:].strip().lower() if aka.lower().startswith("aka") else aka.lower()
+                                            difference = SequenceMatcher(None, title.lower(), aka_trimmed).ratio()
+                                            if difference >= 0.7 or not aka_trimmed or aka_trimmed in title:
+                                                aka = None
+
+                                            if aka is not None:
+                                                if f"({year})" in aka:
+                                                    aka = meta.get('imdb_info', {}).get('aka', "").replace(f"({year})", "").strip()
+                                                else:
+                                                    aka = meta.get('imdb_info', {}).get('aka', "").strip()
+                                                meta['aka'] = f"AKA {aka.strip()}"
                                             else:
-                                                aka = meta.get('imdb_info', {}).get('aka', "").strip()
-                                            meta['aka'] = f"AKA {aka.strip()}"
+                                                meta['aka'] = ""
                                         else:
                                             meta['aka'] = ""
-                                    else:
-                                        meta['aka'] = ""
 
-            if meta.get('tvdb_series_name') and meta['category'] == "TV":
-                series_name = meta.get('tvdb_series_name')
-                if series_name and meta.get('title') != series_name:
-                    if meta['debug']:
-                        console.print(f"[yellow]tvdb series name: {series_name}")
-                    year_match = re.search(r'\b(19|20)\d{2}\b', series_name)
-                    if year_match:
-                        extracted_year = year_match.group(0)
-                        series_name = re.sub(r'\s*\b(19|20)\d{2}\b\s*', '', series_name).strip()
-                    series_name = series_name.replace('(', '').replace(')', '').strip()
-                    should_use_tvdb_series_name = (
-                        series_name
-                        and not _tvdb_title_drops_existing_leading_article(meta.get('title'), series_name)
-                    )
-                    if should_use_tvdb_series_name:
-                        meta['title'] = series_name
-
-        # bluray.com data if config
-        get_bluray_info = self.config['DEFAULT'].get('get_bluray_info', False)
-        meta['bluray_score'] = int(float(self.config['DEFAULT'].get('bluray_score', 100)))
-        meta['bluray_single_score'] = int(float(self.config['DEFAULT'].get('bluray_single_score', 100)))
-        meta['use_bluray_images'] = self.config['DEFAULT'].get('use_bluray_images', False)
-        if meta.get('is_disc') in ("BDMV", "DVD") and get_bluray_info and (meta.get('distributor') is None or meta.get('region') is None) and meta.get('imdb_id') != 0 and not meta.get('emby', False) and not meta.get('edit', False) and not meta.get('site_check', False):
-            releases = await get_bluray_releases(meta)
-
-            if releases and meta.get('is_disc') in ("BDMV", "DVD") and meta.get('use_bluray_images', False):
-                # and if we getting bluray/dvd images, we'll rehost them
-                    url_host_mapping = {
-                        "ibb.co": "imgbb",
-                        "pixhost.to": "pixhost",
-                        "imgbox.com": "imgbox",
-                    }
-
-                    approved_image_hosts = ['imgbox', 'imgbb', 'pixhost']
-                    await self.rehost_images_manager.check_hosts(
-                        meta,
-                        "covers",
-                        url_host_mapping=url_host_mapping,
-                        img_host_index=1,
-                        approved_image_hosts=approved_image_hosts,
-                    )
+                if meta.get('tvdb_series_name') and meta['category'] == "TV":
+                    series_name = meta.get('tvdb_series_name')
+                    if series_name and meta.get('title') != series_name:
+                        if meta['debug']:
+                            console.print(f"[yellow]tvdb series name: {series_name}")
+                        year_match = re.search(r'\b(19|20)\d{2}\b', series_name)
+                        if year_match:
+                            extracted_year = year_match.group(0)
+                            series_name = re.sub(r'\s*\b(19|20)\d{2}\b\s*', '', series_name).strip()
+                        series_name = series_name.replace('(', '').replace(')', '').strip()
+                        should_use_tvdb_series_name = (
+                            series_name
+                            and not _tvdb_title_drops_existing_leading_article(meta.get('title'), series_name)
+                        )
+                        if should_use_tvdb_series_name:
+                            meta['title'] = series_name
+
+            # bluray.com data if config
+            get_bluray_info = self.config['DEFAULT'].get('get_bluray_info', False)
+            meta['bluray_score'] = int(float(self.config['DEFAULT'].get('bluray_score', 100)))
+            meta['bluray_single_score'] = int(float(self.config['DEFAULT'].get('bluray_single_score', 100)))
+            meta['use_bluray_images'] = self.config['DEFAULT'].get('use_bluray_images', False)
+            # bluray.com only fills what the unit3d ping couldn't, and later overrides must win over both
+            await prep_graph.result('ping_unit3d')
+            if meta.get('is_disc') in ("BDMV", "DVD") and get_bluray_info and (meta.get('distributor') is None or meta.get('region') is None) and meta.get('imdb_id') != 0 and not meta.get('emby', False) and not meta.get('edit', False) and not meta.get('site_check', False):
+                prep_graph.add('bluray_releases', functools.partial(get_bluray_releases, meta), requires=('ping_unit3d',), provides=('region', 'distributor'))
+                releases = await prep_graph.result('bluray_releases')
+
+                if releases and meta.get('is_disc') in ("BDMV", "DVD") and meta.get('use_bluray_images', False):
+                    # and if we getting bluray/dvd images, we'll rehost them
+                        url_host_mapping = {
+                            "ibb.co": "imgbb",
+                            "pixhost.to": "pixhost",
+                            "imgbox.com": "imgbox",
+                        }
+
+                        approved_image_hosts = ['imgbox', 'imgbb', 'pixhost']
+                        await self.rehost_images_manager.check_hosts(
+                            meta,
+                            "covers",
+                            url_host_mapping=url_host_mapping,
+                            img_host_index=1,
+                            approved_image_hosts=approved_image_hosts,
+                        )
+
+            await prep_graph.join()
+            if meta['debug']:
+                prep_graph.dump()
+        finally:
+            # A failure above must not leave lookups running, and writing to meta, after prep has given up
+            await prep_graph.aclose()
 
         # user override check that only sets data after metadata setting
         if user_overrides and not meta.get('no_override', False) and not meta.get('emby', False):
@@ -1287,6 +1337,8 @@ class Prep:
         if meta['debug']:
             meta_finish_time = time.time()
             console.print(f"Metadata processed in {meta_finish_time - meta_start_time:.2f} seconds")
+            guessit_stats = guessit_cache_info()
+            console.print(f"guessit cache: {guessit_stats.hits} hits, {guessit_stats.misses} misses ({guessit_stats.hit_rate:.0%} hit rate)")
 
         return meta
 
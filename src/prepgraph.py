@@ -0,0 +1,138 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+import asyncio
+import time
+from collections.abc import Awaitable, Iterable
+from typing import Any, Callable, Optional
+
+from src.console import console
+
+
+class PrepNode:
+    def __init__(self, name: str, requires: tuple[str, ...], provides: tuple[str, ...]) -> None:
+        self.name = name
+        self.requires = requires
+        self.provides = provides
+        self.task: Optional[asyncio.Task[Any]] = None
+        self.skipped = False
+        self.ready_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[BaseException] = None
+        # Set once a caller awaited the node through result() and so handled its failure
+        self.consumed = False
+
+
+class PrepGraph:
+    """
+    Small dependency-graph scheduler for the lookups in Prep.gather_prep.
+
+    Each node declares the nodes it requires and the meta keys it provides. A node is
+    started as soon as it is added and runs once every required node has finished, so
+    independent lookups overlap and prep time follows the critical path. Nodes must be
+    added after the nodes they require, which keeps the graph acyclic.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.created_at = time.time()
+        self.nodes: dict[str, PrepNode] = {}
+
+    def add(
+        self,
+        name: str,
+        run: Callable[[], Awaitable[Any]],
+        requires: Iterable[str] = (),
+        provides: Iterable[str] = (),
+        when: bool = True,
+    ) -> None:
+        """Schedule `run` to start once all `requires` nodes are done. With `when=False` the node is recorded as skipped."""
+        if name in self.nodes:
+            raise ValueError(f"Prep graph node '{name}' already exists")
+        requires_tuple = tuple(requires)
+        missing = [dep for dep in requires_tuple if dep not in self.nodes]
+        if missing:
+            raise ValueError(f"Prep graph node '{name}' requires unknown node(s): {', '.join(missing)}")
+
+        node = PrepNode(name, requires_tuple, tuple(provides))
+        self.nodes[name] = node
+        if not when:
+            node.skipped = True
+            return
+
+        dependencies = [self.nodes[dep].task for dep in requires_tuple]
+
+        async def runner() -> Any:
+            waiting = [task for task in dependencies if task is not None]
+            if waiting:
+                await asyncio.gather(*waiting)
+            node.ready_at = time.time()
+            try:
+                return await run()
+            except BaseException as e:
+                node.error = e
+                raise
+            finally:
+                node.finished_at = time.time()
+
+        node.task = asyncio.create_task(runner())
+        node.task.add_done_callback(self._consume_exception)
+
+    @staticmethod
+    def _consume_exception(task: asyncio.Task[Any]) -> None:
+        # Failures are re-raised to whoever awaits the node; this only keeps unawaited
+        # failures (e.g. after an early return from prep) from being reported by asyncio.
+        if not task.cancelled():
+            task.exception()
+
+    async def result(self, name: str) -> Any:
+        """Wait for a node and return its result (None for skipped nodes)."""
+        node = self.nodes[name]
+        if node.task is None:
+            return None
+        node.consumed = True
+        return await node.task
+
+    async def join(self) -> None:
+        """
+        Wait for every scheduled node, re-raising the first failure nobody handled.
+
+        Failures of nodes already awaited through result() belong to that caller, which may have
+        caught them (e.g. a transient TVDB error); neither they nor the same error propagating
+        through the nodes that depend on them abort the join.
+        """
+        nodes = [node for node in self.nodes.values() if node.task is not None]
+        if not nodes:
+            return
+        await asyncio.gather(*(node.task for node in nodes if node.task is not None), return_exceptions=True)
+        handled = {id(node.error) for node in nodes if node.consumed and node.error is not None}
+        for node in nodes:
+            if node.task is None or node.task.cancelled():
+                continue
+            error = node.task.exception()
+            if error is not None and not node.consumed and id(error) not in handled:
+                raise error
+
+    async def aclose(self) -> None:
+        """Cancel the nodes still pending or running and wait for them; a no-op once join() returned."""
+        pending = [node.task for node in self.nodes.values() if node.task is not None and not node.task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def dump(self) -> None:
+        """Print the resolved graph with per-node wait and run times."""
+        console.print(f"[cyan]Prep graph '{self.name}':[/cyan]")
+        for node in self.nodes.values():
+            requires = ', '.join(node.requires) or '-'
+            provides = ', '.join(node.provides) or '-'
+            if node.skipped:
+                timing = "skipped"
+            elif node.ready_at is None:
+                timing = "waiting"
+            elif node.finished_at is None:
+                timing = f"started +{node.ready_at - self.created_at:.2f}s, running"
+            else:
+                timing = f"started +{node.ready_at - self.created_at:.2f}s, took {node.finished_at - node.ready_at:.2f}s"
+                if node.error is not None:
+                    timing += f", failed: {node.error}"
+            console.print(f"  {node.name} (requires: {requires}) -> {provides}: {timing}", markup=False)
@@ -0,0 +1,165 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+import asyncio
+import contextlib
+import contextvars
+from collections.abc import AsyncIterator, Awaitable, Sequence
+from typing import Any, Callable, Optional
+
+from typing_extensions import TypeAlias
+
+from src.console import console
+
+# Deferred processed-files log write for a finished queue item (None = nothing to record)
+LogWriter: TypeAlias = Optional[Callable[[], Awaitable[None]]]
+ItemWorker: TypeAlias = Callable[[int, Any], Awaitable[LogWriter]]
+
+# stage name -> (config key in DEFAULT, default worker count)
+PIPELINE_STAGES: dict[str, tuple[str, int]] = {
+    'metadata': ('pipeline_metadata_workers', 2),
+    'screenshots': ('pipeline_screenshot_workers', 1),
+    'image_upload': ('pipeline_image_upload_workers', 2),
+    'hashing': ('pipeline_hash_workers', 1),
+    'tracker_upload': ('pipeline_upload_workers', 1),
+}
+
+_active_pipeline: contextvars.ContextVar[Optional['QueuePipeline']] = contextvars.ContextVar('_active_pipeline', default=None)
+
+
+@contextlib.asynccontextmanager
+async def pipeline_stage(name: str) -> AsyncIterator[None]:
+    """Hold a worker slot for `name` while running inside a queue pipeline, otherwise do nothing."""
+    pipeline = _active_pipeline.get()
+    if pipeline is None:
+        yield
+        return
+    async with pipeline.stage(name):
+        yield
+
+
+def reserve_queue_upload(meta: dict[str, Any]) -> bool:
+    """
+    Claim a `limit_queue` upload slot for this item when running inside a queue pipeline.
+    Returns False once the limit is used up; the caller releases the slot with finish_upload().
+    """
+    pipeline = _active_pipeline.get()
+    if pipeline is None or meta.get('queue_upload_reserved'):
+        return True
+    if not pipeline.reserve_upload():
+        return False
+    meta['queue_upload_reserved'] = True
+    return True
+
+
+class QueuePipeline:
+    """
+    Runs queue items concurrently, with a bounded worker pool per processing stage.
+
+    Each item still walks the stages in order; the pools only decide how many items may
+    be inside a given stage at once, so item N+1 can gather metadata while item N hashes
+    and item N-1 uploads. Processed-file log entries are written in queue order.
+    """
+
+    def __init__(self, config: dict[str, Any], limit: int = 0, debug: bool = False) -> None:
+        default_cfg = config.get('DEFAULT', {})
+        self.debug = debug
+        self.limit = max(0, limit)
+        self.workers: dict[str, int] = {}
+        for stage_name, (key, fallback) in PIPELINE_STAGES.items():
+            try:
+                workers = int(default_cfg.get(key, fallback))
+            except (TypeError, ValueError):
+                workers = fallback
+            self.workers[stage_name] = max(1, workers)
+
+        # Enough items in flight to keep every stage busy without preparing the whole queue up front
+        self.window = sum(self.workers.values())
+        self._semaphores = {stage_name: asyncio.Semaphore(count) for stage_name, count in self.workers.items()}
+        self._waiting = dict.fromkeys(self.workers, 0)
+        self._running = dict.fromkeys(self.workers, 0)
+        self._stopped = asyncio.Event()
+        self._uploads_reserved = 0
+        self._pending_logs: dict[int, LogWriter] = {}
+        self._next_log_index = 0
+        self._log_lock = asyncio.Lock()
+
+    @contextlib.asynccontextmanager
+    async def stage(self, name: str) -> AsyncIterator[None]:
+        semaphore = self._semaphores.get(name)
+        if semaphore is None:
+            yield
+            return
+
+        self._waiting[name] += 1
+        if self.debug:
+            console.print(f"[cyan]Pipeline {name}: {self._running[name]}/{self.workers[name]} running, {self._waiting[name]} waiting[/cyan]")
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting[name] -= 1
+        self._running[name] += 1
+        try:
+            yield
+        finally:
+            self._running[name] -= 1
+            semaphore.release()
+
+    def reserve_upload(self) -> bool:
+        """Claim one of the `limit_queue` upload slots. Returns False once the limit is used up."""
+        if self.limit and self._uploads_reserved >= self.limit:
+            return False
+        self._uploads_reserved += 1
+        return True
+
+    def finish_upload(self, uploaded: bool) -> None:
+        """Release a reserved upload slot if the upload did not happen, stop admitting items once the limit is met."""
+        if not uploaded:
+            self._uploads_reserved -= 1
+        elif self.limit and self._uploads_reserved >= self.limit:
+            self._stopped.set()
+
+    async def _record(self, index: int, writer: LogWriter) -> None:
+        async with self._log_lock:
+            self._pending_logs[index] = writer
+            while self._next_log_index in self._pending_logs:
+                pending = self._pending_logs.pop(self._next_log_index)
+                self._next_log_index += 1
+                if pending is None:
+                    continue
+                try:
+                    await pending()
+                except Exception as e:
+                    console.print(f"[red]Failed to record processed queue item: {e}[/red]")
+
+    async def run(self, items: Sequence[Any], worker: ItemWorker) -> None:
+        """Run `worker(index, item)` for every item, returning once all admitted items have finished."""
+        window = asyncio.Semaphore(self.window)
+        tasks: list[asyncio.Task[None]] = []
+
+        async def run_one(index: int, item: Any) -> None:
+            writer: LogWriter = None
+            try:
+                writer = await worker(index, item)
+            except SystemExit as e:
+                # process_meta still exits on some invalid input; that ends this item, not the pipeline
+                console.print(f"[red]Queue item {index + 1} exited (code {e.code}), skipping it[/red]")
+            except Exception as e:
+                console.print(f"[red]Queue item {index + 1} failed: {e}[/red]")
+            finally:
+                window.release()
+                await self._record(index, writer)
+
+        token = _active_pipeline.set(self)
+        try:
+            if self.debug:
+                workers_str = ', '.join(f"{name}={count}" for name, count in self.workers.items())
+                console.print(f"[cyan]Pipeline workers: {workers_str} (window {self.window})[/cyan]")
+            for index, item in enumerate(items):
+                await window.acquire()
+                if self._stopped.is_set():
+                    window.release()
+                    console.print(f"[yellow]Queue limit reached, not starting the remaining {len(items) - index} item(s).[/yellow]")
+                    break
+                tasks.append(asyncio.create_task(run_one(index, item)))
+            await asyncio.gather(*tasks)
+        finally:
+            _active_pipeline.reset(token)
@@ -0,0 +1,158 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+import contextlib
+import contextvars
+import queue
+import sys
+import threading
+from collections.abc import Iterator
+from typing import Any, Callable, Optional, cast
+
+import cli_ui
+
+from src.console import console
+
+# Receives the (args, kwargs) of every console.print made by a run
+OutputSink = Callable[[tuple[Any, ...], dict[str, Any]], None]
+
+
+class RunContext:
+    """
+    One upload run driven in-process, e.g. from the web UI.
+
+    Holds what a CLI run takes from the process itself: its command line, where its console
+    output goes, where answers to its prompts come from and the token that cancels it. The
+    active run lives in a context variable, so several runs can share the process, each on
+    its own thread and event loop, and everything they call still finds its own run.
+    """
+
+    def __init__(self, run_id: str, argv: list[str], output: OutputSink) -> None:
+        self.run_id = run_id
+        self.argv = argv
+        self.output = output
+        self.input_queue: queue.Queue[str] = queue.Queue()
+        self.cancel_event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def cancel(self) -> None:
+        self.cancel_event.set()
+
+    def read_input(self) -> str:
+        """Next answer sent to this run; raises EOFError once the run is cancelled."""
+        while True:
+            if self.cancel_event.is_set():
+                raise EOFError()
+            try:
+                return self.input_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+
+_current_run: contextvars.ContextVar[Optional[RunContext]] = contextvars.ContextVar('_current_run', default=None)
+_active_runs: set[RunContext] = set()
+_active_runs_lock = threading.Lock()
+
+
+def current_run() -> Optional[RunContext]:
+    return _current_run.get()
+
+
+@contextlib.contextmanager
+def activate_run(run: RunContext) -> Iterator[RunContext]:
+    """Make `run` the active run of this thread, and of the tasks and threads it starts via asyncio."""
+    token = _current_run.set(run)
+    with _active_runs_lock:
+        _active_runs.add(run)
+    try:
+        yield run
+    finally:
+        with _active_runs_lock:
+            _active_runs.discard(run)
+        _current_run.reset(token)
+
+
+def other_runs_active() -> bool:
+    """Whether a run other than the active one is executing in this process."""
+    run = _current_run.get()
+    with _active_runs_lock:
+        return any(other is not run for other in _active_runs)
+
+
+def run_argv() -> list[str]:
+    """Command line of the active run, or of the process outside one."""
+    run = _current_run.get()
+    return run.argv if run is not None else sys.argv
+
+
+_hooks_installed = False
+_hooks_lock = threading.Lock()
+
+
+def install_run_hooks() -> None:
+    """
+    Route the shared console and cli_ui prompts to the active run. Installed once per process;
+    outside a run they behave as before.
+    """
+    global _hooks_installed
+    with _hooks_lock:
+        if _hooks_installed:
+            return
+        _hooks_installed = True
+
+    orig_print = console.print
+    orig_input = console.input
+    orig_ask_yes_no = cli_ui.ask_yes_no
+    orig_ask_string = cli_ui.ask_string
+
+    def run_print(*args: Any, **kwargs: Any) -> None:
+        run = _current_run.get()
+        if run is not None:
+            with contextlib.suppress(Exception):
+                run.output(args, kwargs)
+        orig_print(*args, **kwargs)
+
+    def run_input(prompt: Any = "", **kwargs: Any) -> str:
+        run = _current_run.get()
+        if run is None:
+            return orig_input(prompt, **kwargs)
+        # Print the prompt so it appears in the run's output
+        with contextlib.suppress(Exception):
+            run_print(prompt)
+        return run.read_input()
+
+    def run_ask_yes_no(*args: Any, default: bool = False, **kwargs: Any) -> bool:
+        run = _current_run.get()
+        if run is None:
+            return orig_ask_yes_no(*args, default=default, **kwargs)
+        # Both ask_yes_no(question, default=...) and ask_yes_no(color, question, default=...) are used
+        if len(args) >= 2:
+            question = args[1]
+        elif len(args) == 1:
+            question = args[0]
+        else:
+            question = kwargs.get('question', '')
+        default_val = args[2] if len(args) >= 3 else default
+
+        with contextlib.suppress(Exception):
+            run_print(str(question))
+        answer = (run.read_input() or "").strip().lower()
+        if answer in ("y", "yes"):
+            return True
+        if answer in ("n", "no"):
+            return False
+        return default_val
+
+    def run_ask_string(*args: Any, **kwargs: Any) -> Optional[str]:
+        run = _current_run.get()
+        if run is None:
+            return orig_ask_string(*args, **kwargs)
+        with contextlib.suppress(Exception):
+            run_print(" ".join(str(arg) for arg in args))
+        return run.read_input()
+
+    console.print = cast(Any, run_print)
+    console.input = cast(Any, run_input)
+    cli_ui.ask_yes_no = cast(Any, run_ask_yes_no)
+    cli_ui.ask_string = cast(Any, run_ask_string)
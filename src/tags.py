@@ -4,18 +4,10 @@ import json
 import os
 import re
 from pathlib import Path
-from typing import Any, Callable, Optional, cast
-
-import guessit
+from typing import Any, Optional, cast
 
 from src.console import console
-
-guessit_module: Any = cast(Any, guessit)
-GuessitFn = Callable[[str, Optional[dict[str, Any]]], dict[str, Any]]
-
-
-def guessit_fn(value: str, options: Optional[dict[str, Any]] = None) -> dict[str, Any]:
-    return cast(dict[str, Any], guessit_module.guessit(value, options))
+from src.guessitcache import guessit_fn
 
 
 async def get_tag(video: str, meta: dict[str, Any], season_pack_check: bool = False) -> str:
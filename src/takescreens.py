@@ -20,11 +20,15 @@ from pymediainfo import MediaInfo
 
 from src.cleanup import cleanup_manager
 from src.console import console
+from src.uploadscreens import ScreenshotUploadStream
 
 default_config: dict[str, Any] = {}
+# Frames per ffmpeg process in batch capture while uploads are streamed
+STREAM_BATCH_FRAMES = 2
 task_limit = 1
 cutoff = 1
 ffmpeg_limit = False
+batch_screens = True
 ffmpeg_is_good = False
 use_libplacebo = True
 tone_map = False
@@ -35,7 +39,7 @@ desat = 10.0
 
 def _apply_config(config: Mapping[str, Any]) -> None:
     global default_config, task_limit, cutoff
-    global ffmpeg_limit, ffmpeg_is_good, use_libplacebo
+    global ffmpeg_limit, batch_screens, ffmpeg_is_good, use_libplacebo
     global tone_map, ffmpeg_compression, algorithm, desat
 
     default_section = config.get('DEFAULT', {})
@@ -52,6 +56,7 @@ def _apply_config(config: Mapping[str, Any]) -> None:
         cutoff = 1
 
     ffmpeg_limit = default_config.get('ffmpeg_limit', False)
+    batch_screens = default_config.get('ffmpeg_batch_screens', True)
     ffmpeg_is_good = default_config.get('ffmpeg_is_good', False)
     use_libplacebo = default_config.get('use_libplacebo', True)
     tone_map = default_config.get('tone_map', False)
@@ -865,6 +870,7 @@ async def screenshots(
         num_screens: int = 0,
         force_screenshots: bool = False,
         manual_frames: Union[str, list[str]] = "",
+        upload_stream: Optional[ScreenshotUploadStream] = None,
 ) -> Union[list[str], None]:
     img_host = await get_image_host(meta)
     screens = meta['screens']
@@ -1052,68 +1058,35 @@ async def screenshots(
         async with semaphore:
             return await capture_screenshot(args)
 
-    capture_tasks: list[Awaitable[Optional[tuple[int, Optional[str]]]]] = []
+    pending_frames: list[tuple[int, float, str]] = []
     for i in range(num_capture):
         image_index = existing_images_count + i
         image_path = os.path.abspath(f"{base_dir}/tmp/{folder_id}/{sanitized_filename}-{image_index}.png")
         if not os.path.exists(image_path) or meta.get('retake', False):
-            capture_tasks.append(
-                capture_with_semaphore(
-                    (i, path, float(ss_times[i]), image_path, width, height, w_sar, h_sar, loglevel, hdr_tonemap, meta)
-                )
-            )
+            pending_frames.append((i, float(ss_times[i]), image_path))
 
-    try:
-        results = cast(list[object], await asyncio.gather(*capture_tasks, return_exceptions=True))
-        # Log any error strings that were returned (these indicate exceptions in capture_screenshot)
-        for r in results:
-            if isinstance(r, Exception):
-                console.print(f"[red]Screenshot capture exception: {r}[/red]")
-        capture_result_tuples: list[tuple[int, Optional[str]]] = [
-            cast(tuple[int, Optional[str]], r)
-            for r in results
-            if isinstance(r, tuple)
-        ]
-        capture_result_tuples.sort(key=lambda x: x[0])
-        capture_results: list[str] = [r[1] for r in capture_result_tuples if r[1] is not None]
+    valid_results: list[str] = []
+    remaining_retakes: list[str] = []
 
-    except KeyboardInterrupt:
-        console.print("\n[red]CTRL+C detected. Cancelling capture tasks...[/red]")
-        await asyncio.sleep(0.1)
-        await kill_all_child_processes()
-        console.print("[red]All tasks cancelled. Exiting.[/red]")
-        gc.collect()
-        cleanup_manager.reset_terminal()
-        sys.exit(1)
-    except asyncio.CancelledError:
-        await asyncio.sleep(0.1)
-        await kill_all_child_processes()
-        gc.collect()
-        cleanup_manager.reset_terminal()
-        sys.exit(1)
-    except Exception:
-        await asyncio.sleep(0.1)
-        await kill_all_child_processes()
-        gc.collect()
-        cleanup_manager.reset_terminal()
-        sys.exit(1)
-    finally:
-        await asyncio.sleep(0.1)
-        await kill_all_child_processes()
-        if meta['debug']:
-            console.print("[yellow]All capture tasks finished. Cleaning up...[/yellow]")
+    def frame_index_of(image_path: str) -> int:
+        return int(image_path.rsplit('-', 1)[-1].split('.')[0])
 
-    if not force_screenshots and meta['debug']:
-        console.print(f"[green]Successfully captured {len(capture_results)} screenshots.")
+    def accept_image(image_path: str) -> None:
+        valid_results.append(image_path)
+        if upload_stream is not None:
+            upload_stream.put(frame_index_of(image_path), image_path)
 
-    valid_results: list[str] = []
-    remaining_retakes: list[str] = []
-    for image_path in capture_results:
+    async def validate_capture(image_path: str) -> None:
         retake = False
-        image_size = os.path.getsize(image_path)
+        try:
+            image_size = os.path.getsize(image_path)
+        except OSError as e:
+            console.print(f"[yellow]Could not read {image_path} ({e}), retaking.")
+            image_size = 0
+            retake = True
         if meta['debug']:
             console.print(f"[yellow]Checking image {image_path} (size: {image_size} bytes) for image host: {img_host}[/yellow]")
-        if not manual_frames:
+        if not manual_frames and not retake:
             if image_size <= 75000:
                 console.print(f"[yellow]Image {image_path} is incredibly small, retaking.")
                 retake = True
@@ -1142,8 +1115,7 @@ async def screenshots(
         if retake:
             retry_attempts = 5
             retry_offsets = [5.0, 10.0, -10.0, 100.0, -100.0]
-            frame_rate = meta.get('frame_rate', 24.0)
-            original_index = int(image_path.rsplit('-', 1)[-1].split('.')[0])
+            original_index = frame_index_of(image_path)
             original_time = ss_times[original_index] if original_index < len(ss_times) else None
 
             for attempt in range(1, retry_attempts + 1):
@@ -1183,7 +1155,7 @@ async def screenshots(
                                 valid_image = True
 
                             if valid_image:
-                                valid_results.append(screenshot_path)
+                                accept_image(screenshot_path)
                                 break
                         except Exception as e:
                             console.print(f"[red]Error retaking screenshot for {image_path} at {adjusted_time:.2f}s: {e}[/red]")
@@ -1223,7 +1195,7 @@ async def screenshots(
                             valid_image = True
 
                         if valid_image:
-                            valid_results.append(screenshot_path)
+                            accept_image(screenshot_path)
                             break
                     except Exception as e:
                         console.print(f"[red]Error retaking screenshot for {image_path} at random time {random_time:.2f}s: {e}[/red]")
@@ -1233,7 +1205,90 @@ async def screenshots(
                 gc.collect()
 
         else:
-            valid_results.append(image_path)
+            accept_image(image_path)
+
+    async def check_capture(image_path: str) -> None:
+        # Checked inside the capture loop, whose error handler ends the run; one bad frame must not
+        try:
+            await validate_capture(image_path)
+        except Exception as e:
+            console.print(f"[red]Error checking screenshot {image_path}: {e}[/red]")
+            remaining_retakes.append(image_path)
+
+    capture_results: list[str] = []
+    try:
+        if batch_screens and not meta.get('frame_overlay', False) and len(pending_frames) > 1:
+            # One ffmpeg process per worker, each extracting its share of the frames. When uploads
+            # are streamed, the shares are split further so the first frames reach the uploader early.
+            batch_size = -(-len(pending_frames) // num_workers)
+            if upload_stream is not None:
+                batch_size = min(batch_size, STREAM_BATCH_FRAMES)
+            batches = [pending_frames[k:k + batch_size] for k in range(0, len(pending_frames), batch_size)]
+
+            async def batch_with_semaphore(batch: list[tuple[int, float, str]]) -> list[tuple[int, Optional[str]]]:
+                async with semaphore:
+                    return await capture_screenshots_batch(path, batch, width, height, w_sar, h_sar, loglevel, hdr_tonemap, meta)
+
+            captured: set[int] = set()
+            for next_batch in asyncio.as_completed([batch_with_semaphore(batch) for batch in batches]):
+                for index, image_path in sorted(await next_batch):
+                    if image_path is not None:
+                        captured.add(index)
+                        capture_results.append(image_path)
+                        await check_capture(image_path)
+            if meta['debug']:
+                console.print(f"[cyan]Batch capture took {len(captured)}/{len(pending_frames)} screenshot(s) in {len(batches)} ffmpeg process(es)[/cyan]")
+            pending_frames = [frame for frame in pending_frames if frame[0] not in captured]
+
+        capture_tasks: list[Awaitable[Optional[tuple[int, Optional[str]]]]] = [
+            capture_with_semaphore(
+                (i, path, ss_time, image_path, width, height, w_sar, h_sar, loglevel, hdr_tonemap, meta)
+            )
+            for i, ss_time, image_path in pending_frames
+        ]
+
+        # Each screenshot is size-checked (and retaken if needed) as soon as it is captured,
+        # so a streamed upload can start while the remaining frames are still decoding
+        for next_capture in asyncio.as_completed(capture_tasks):
+            try:
+                result = await next_capture
+            except Exception as e:
+                console.print(f"[red]Screenshot capture exception: {e}[/red]")
+                continue
+            if isinstance(result, tuple) and result[1] is not None:
+                capture_results.append(result[1])
+                await check_capture(result[1])
+
+    except KeyboardInterrupt:
+        console.print("\n[red]CTRL+C detected. Cancelling capture tasks...[/red]")
+        await asyncio.sleep(0.1)
+        await kill_all_child_processes()
+        console.print("[red]All tasks cancelled. Exiting.[/red]")
+        gc.collect()
+        cleanup_manager.reset_terminal()
+        sys.exit(1)
+    except asyncio.CancelledError:
+        await asyncio.sleep(0.1)
+        await kill_all_child_processes()
+        gc.collect()
+        cleanup_manager.reset_terminal()
+        sys.exit(1)
+    except Exception:
+        await asyncio.sleep(0.1)
+        await kill_all_child_processes()
+        gc.collect()
+        cleanup_manager.reset_terminal()
+        sys.exit(1)
+    finally:
+        await asyncio.sleep(0.1)
+        await kill_all_child_processes()
+        if meta['debug']:
+            console.print("[yellow]All capture tasks finished. Cleaning up...[/yellow]")
+
+    if not force_screenshots and meta['debug']:
+        console.print(f"[green]Successfully captured {len(capture_results)} screenshots.")
+
+    valid_results.sort(key=frame_index_of)
 
     if remaining_retakes:
         console.print(f"[red]The following images could not be retaken successfully: {remaining_retakes}[/red]")
@@ -1259,6 +1314,150 @@ async def screenshots(
     return valid_results if valid_results else None
 
 
+async def warmup_libplacebo_if_needed(path: str, meta: dict[str, Any], loglevel: str, hdr_tonemap: bool) -> None:
+    # Warm-up (only for first screenshot index or if not warmed)
+    if use_libplacebo:
+        warm_up = default_config.get('ffmpeg_warmup', False)
+        if warm_up:
+            meta['_libplacebo_warmed'] = False
+        else:
+            meta['_libplacebo_warmed'] = True
+        if "_libplacebo_warmed" not in meta:
+            meta['_libplacebo_warmed'] = False
+        if hdr_tonemap and meta.get('libplacebo') and not meta.get('_libplacebo_warmed'):
+            await libplacebo_warmup(path, meta, loglevel)
+
+
+def build_screenshot_vf_chain(width: float, height: float, w_sar: float, h_sar: float, hdr_tonemap: bool, meta: dict[str, Any], loglevel: str) -> str:
+    """PAR scale and tonemap -vf chain for a single (non-overlay) screenshot."""
+    vf_filters: list[str] = []
+
+    if w_sar != 1 or h_sar != 1:
+        scaled_w = round_to_even(width * w_sar)
+        scaled_h = round_to_even(height * h_sar)
+        vf_filters.append(f"scale={scaled_w}:{scaled_h}")
+        if loglevel == 'verbose' or (meta and meta.get('debug', False)):
+            console.print(f"[cyan]Applied PAR scale -> {scaled_w}x{scaled_h}[/cyan]")
+
+    if hdr_tonemap:
+        if meta.get('libplacebo', False):
+            vf_filters.append(
+                "libplacebo=tonemapping=hable:colorspace=bt709:"
+                "color_primaries=bt709:color_trc=bt709:range=tv"
+            )
+            if loglevel == 'verbose' or (meta and meta.get('debug', False)):
+                console.print("[cyan]Using libplacebo tonemapping[/cyan]")
+        else:
+            vf_filters.extend([
+                "zscale=transfer=linear",
+                f"tonemap=tonemap={algorithm}:desat={desat}",
+                "zscale=transfer=bt709",
+                "format=rgb24",
+            ])
+            if loglevel == 'verbose' or (meta and meta.get('debug', False)):
+                console.print(f"[cyan]Using zscale tonemap chain (algo={algorithm}, desat={desat})[/cyan]")
+
+    vf_filters.append("format=rgb24")
+    vf_chain = ",".join(vf_filters) if vf_filters else "format=rgb24"
+
+    if loglevel == 'verbose' or (meta and meta.get('debug', False)):
+        console.print(f"[cyan]Final -vf chain: {vf_chain}[/cyan]")
+    return vf_chain
+
+
+async def capture_screenshots_batch(
+        path: str,
+        frames: list[tuple[int, float, str]],
+        width: float,
+        height: float,
+        w_sar: float,
+        h_sar: float,
+        loglevel: str,
+        hdr_tonemap: bool,
+        meta: dict[str, Any],
+) -> list[tuple[int, Optional[str]]]:
+    """
+    Capture several frames of one file with a single ffmpeg process.
+
+    `frames` holds (index, ss_time, image_path). Every frame gets its own fast-seeked input and
+    output with the same -vf chain as capture_screenshot, so the container is probed and
+    libplacebo/Vulkan is initialised once per batch instead of once per screenshot.
+    Returns (index, image_path) for frames that were written and (index, None) for the rest,
+    which the caller retakes through the per-frame path.
+    """
+    failed: list[tuple[int, Optional[str]]] = [(index, None) for index, _, _ in frames]
+    if not frames or width <= 0 or height <= 0 or any(ss_time < 0 for _, ss_time, _ in frames):
+        return failed
+
+    # Directory inputs and missing files are reported by the per-frame path
+    input_path = await asyncio.to_thread(_batch_input_path, path)
+    if input_path is None:
+        return failed
+    path = input_path
+
+    try:
+        await warmup_libplacebo_if_needed(path, meta, loglevel, hdr_tonemap)
+        vf_chain = build_screenshot_vf_chain(width, height, w_sar, h_sar, hdr_tonemap, meta, loglevel)
+
+        outputs: list[Any] = []
+        for _, ss_time, image_path in frames:
+            inp = cast(Any, ffmpeg).input(path, ss=str(ss_time))
+            outputs.append(inp['v:0'].output(
+                image_path,
+                vframes=1,
+                vf=vf_chain,
+                compression_level=ffmpeg_compression,
+                pred='mixed'
+            ))
+
+        global_args = ['-y', '-loglevel', loglevel, '-hide_banner', '-an', '-sn']
+        if meta.get('libplacebo', False):
+            global_args += ['-init_hw_device', 'vulkan']
+        if ffmpeg_limit:
+            global_args += ['-threads', '1']
+        batch_cmd: Any = cast(Any, ffmpeg).merge_outputs(*outputs).global_args(*global_args)
+
+        if loglevel == 'verbose' or meta.get('debug', False):
+            console.print(f"[cyan]Batch FFmpeg command ({len(frames)} frames): {' '.join(batch_cmd.compile())}[/cyan]", emoji=False)
+
+        await asyncio.to_thread(_remove_files, [image_path for _, _, image_path in frames])
+
+        try:
+            returncode, _, stderr = await asyncio.wait_for(run_ffmpeg(batch_cmd), timeout=max(140, 40 * len(frames)))
+        except asyncio.TimeoutError:
+            returncode, stderr = -1, b"Timeout"
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        if meta.get('debug', False):
+            console.print(traceback.format_exc())
+        return failed
+
+    if returncode != 0:
+        if loglevel == 'verbose' or meta.get('debug', False):
+            err_txt = (stderr or b"").decode(errors='replace').strip()
+            console.print(f"[yellow]Batch screenshot capture failed, falling back to per-frame capture: {err_txt}[/yellow]")
+        return failed
+
+    written = await asyncio.to_thread(_existing_files, [image_path for _, _, image_path in frames])
+    return [(index, image_path if image_path in written else None) for index, _, image_path in frames]
+
+
+def _batch_input_path(path: str) -> Optional[str]:
+    path = os.path.normpath(path)
+    return path if os.path.isfile(path) else None
+
+
+def _remove_files(paths: list[str]) -> None:
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _existing_files(paths: list[str]) -> set[str]:
+    return {path for path in paths if os.path.exists(path)}
+
+
 async def capture_screenshot(args: tuple[int, str, float, str, float, float, float, float, str, bool, dict[str, Any]]) -> Optional[tuple[int, Optional[str]]]:
     index, path, ss_time, image_path, width, height, w_sar, h_sar, loglevel, hdr_tonemap, meta = args
 
@@ -1303,52 +1502,11 @@ async def capture_screenshot(args: tuple[int, str, float, str, float, float, flo
             console.print(f"[cyan]Processing file: {path}[/cyan]")
 
         if not meta.get('frame_overlay', False):
-            # Warm-up (only for first screenshot index or if not warmed)
-            if use_libplacebo:
-                warm_up = default_config.get('ffmpeg_warmup', False)
-                if warm_up:
-                    meta['_libplacebo_warmed'] = False
-                else:
-                    meta['_libplacebo_warmed'] = True
-                if "_libplacebo_warmed" not in meta:
-                    meta['_libplacebo_warmed'] = False
-                if hdr_tonemap and meta.get('libplacebo') and not meta.get('_libplacebo_warmed'):
-                    await libplacebo_warmup(path, meta, loglevel)
+            await warmup_libplacebo_if_needed(path, meta, loglevel, hdr_tonemap)
 
             threads_value = set_ffmpeg_threads()
             threads_val = threads_value[1]
-            vf_filters: list[str] = []
-
-            if w_sar != 1 or h_sar != 1:
-                scaled_w = round_to_even(width * w_sar)
-                scaled_h = round_to_even(height * h_sar)
-                vf_filters.append(f"scale={scaled_w}:{scaled_h}")
-                if loglevel == 'verbose' or (meta and meta.get('debug', False)):
-                    console.print(f"[cyan]Applied PAR scale -> {scaled_w}x{scaled_h}[/cyan]")
-
-            if hdr_tonemap:
-                if meta.get('libplacebo', False):
-                    vf_filters.append(
-                        "libplacebo=tonemapping=hable:colorspace=bt709:"
-                        "color_primaries=bt709:color_trc=bt709:range=tv"
-                    )
-                    if loglevel == 'verbose' or (meta and meta.get('debug', False)):
-                        console.print("[cyan]Using libplacebo tonemapping[/cyan]")
-                else:
-                    vf_filters.extend([
-                        "zscale=transfer=linear",
-                        f"tonemap=tonemap={algorithm}:desat={desat}",
-                        "zscale=transfer=bt709",
-                        "format=rgb24",
-                    ])
-                    if loglevel == 'verbose' or (meta and meta.get('debug', False)):
-                        console.print(f"[cyan]Using zscale tonemap chain (algo={algorithm}, desat={desat})[/cyan]")
-
-            vf_filters.append("format=rgb24")
-            vf_chain = ",".join(vf_filters) if vf_filters else "format=rgb24"
-
-            if loglevel == 'verbose' or (meta and meta.get('debug', False)):
-                console.print(f"[cyan]Final -vf chain: {vf_chain}[/cyan]")
+            vf_chain = build_screenshot_vf_chain(width, height, w_sar, h_sar, hdr_tonemap, meta, loglevel)
 
             threads_value = ['-threads', '1']
             threads_val = threads_value[1]
@@ -1883,8 +2041,9 @@ class TakeScreensManager:
             num_screens: int = 0,
             force_screenshots: bool = False,
             manual_frames: Union[str, list[str]] = "",
+            upload_stream: Optional[ScreenshotUploadStream] = None,
     ) -> Optional[list[str]]:
-        return await screenshots(path, filename, folder_id, base_dir, meta, num_screens, force_screenshots, manual_frames)
+        return await screenshots(path, filename, folder_id, base_dir, meta, num_screens, force_screenshots, manual_frames, upload_stream)
 
     async def capture_screenshot(
             self,
@@ -1,5 +1,6 @@
 # Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
 import asyncio
+import collections
 import contextlib
 import json
 import os
@@ -7,19 +8,21 @@ import re
 import sys
 from datetime import datetime, timezone
 from difflib import SequenceMatcher
-from typing import Any, Callable, Optional, Union
+from typing import Any, Optional, Union
 from typing import cast as typing_cast
 
 import aiofiles
 import anitopy
 import cli_ui
-import guessit
 import httpx
 
 from src.args import Args
 from src.cleanup import cleanup_manager
 from src.console import console
+from src.guessitcache import guessit_fn
 from src.imdb import imdb_manager
+from src.looplocks import LoopSafeLock
+from src.metacache import metadata_client
 
 default_config: dict[str, Any] = {}
 tmdb_api_key: Optional[str] = None
@@ -44,15 +47,10 @@ def _get_parser() -> Args:
     return parser
 
 anitopy_parse_fn: Any = typing_cast(Any, anitopy).parse
-guessit_module: Any = typing_cast(Any, guessit)
-GuessitFn = Callable[[str, Optional[dict[str, Any]]], dict[str, Any]]
 
-
-def guessit_fn(value: str, options: Optional[dict[str, Any]] = None) -> dict[str, Any]:
-    return typing_cast(dict[str, Any], guessit_module.guessit(value, options))
-
-# Module-level dict to store async locks for cache keys to prevent race conditions
-_cache_locks: dict[str, asyncio.Lock] = {}
+# Module-level dict to store async locks for cache keys to prevent race conditions; the locks
+# work across event loops, concurrent in-process web UI runs share them
+_cache_locks: dict[str, LoopSafeLock] = {}
 
 
 class TmdbManager:
@@ -312,7 +310,7 @@ async def get_tmdb_from_imdb(
         url = f"{TMDB_BASE_URL}/find/{external_id}"
         params = {"api_key": tmdb_api_key, "external_source": source}
 
-        async with httpx.AsyncClient() as client:
+        async with metadata_client() as client:
             response: Optional[httpx.Response] = None
             try:
                 response = await client.get(url, params=params, timeout=10)
@@ -454,7 +452,7 @@ async def get_tmdb_id(
             final_attempt = False
         if attempted:
             await asyncio.sleep(1)  # Whoa baby, slow down
-        async with httpx.AsyncClient() as client:
+        async with metadata_client() as client:
             try:
                 # Primary search attempt with year
                 if category == "MOVIE":
@@ -971,6 +969,78 @@ async def get_tmdb_id(
     return tmdb_id, category
 
 
+# Sub-resources fetched together with a title's details, the helpers below read them from that one payload
+TMDB_APPENDED_DETAILS = ("external_ids", "videos", "keywords", "credits", "images", "translations")
+TMDB_DETAILS_MEMO_SIZE = 32
+_tmdb_details: collections.OrderedDict[str, dict[str, Any]] = collections.OrderedDict()
+
+
+def tmdb_image_languages() -> list[str]:
+    """
+    Languages the appended `images` are fetched in: the configured logo languages, English and images
+    without a language. An appended request is otherwise filtered to its request language alone.
+    """
+    configured = str(default_config.get('logo_language') or '')
+    languages = [lang.strip() for lang in configured.split(',') if lang.strip()]
+    return list(dict.fromkeys([*languages, 'en', 'null']))
+
+
+async def get_tmdb_details(tmdb_id: int, category: Optional[str], client: Optional[httpx.AsyncClient] = None) -> dict[str, Any]:
+    """
+    Details of a movie or show with TMDB_APPENDED_DETAILS included through `append_to_response`,
+    one request per title per run instead of one per sub-resource. Returns {} when the request fails.
+    The payload is shared between callers and must not be modified.
+    """
+    endpoint = "movie" if category == "MOVIE" else "tv"
+    cache_key = f"details:{endpoint}:{tmdb_id}"
+    cache_lock = _cache_locks.setdefault(cache_key, LoopSafeLock())
+
+    async with cache_lock:
+        cached = _tmdb_details.get(cache_key)
+        if cached is not None:
+            _tmdb_details.move_to_end(cache_key)
+            return cached
+
+        params = {
+            "api_key": tmdb_api_key,
+            "append_to_response": ",".join(TMDB_APPENDED_DETAILS),
+            "include_image_language": ",".join(tmdb_image_languages()),
+        }
+        try:
+            if client is not None:
+                response = await client.get(f"{TMDB_BASE_URL}/{endpoint}/{tmdb_id}", params=params)
+            else:
+                async with metadata_client() as details_client:
+                    response = await details_client.get(f"{TMDB_BASE_URL}/{endpoint}/{tmdb_id}", params=params)
+        except httpx.RequestError as e:
+            console.print(f"[bold red]Failed to fetch media data: {e}[/bold red]")
+            return {}
+        try:
+            response.raise_for_status()
+            details = typing_cast(dict[str, Any], response.json())
+        except Exception:
+            console.print(f"[bold red]Failed to fetch media data: {response.status_code}[/bold red]")
+            return {}
+
+        _tmdb_details[cache_key] = details
+        if len(_tmdb_details) > TMDB_DETAILS_MEMO_SIZE:
+            _tmdb_details.popitem(last=False)
+        return details
+
+
+async def get_tmdb_images(tmdb_id: int, category: str) -> Optional[dict[str, Any]]:
+    """Images of a movie or show in every language, for lookups outside tmdb_image_languages()."""
+    endpoint = "tv" if category == "TV" else "movie"
+    async with metadata_client() as client:
+        response = await client.get(f"{TMDB_BASE_URL}/{endpoint}/{tmdb_id}/images", params={"api_key": tmdb_api_key})
+    try:
+        response.raise_for_status()
+        return typing_cast(dict[str, Any], response.json())
+    except Exception:
+        console.print(f"[bold red]Failed to fetch image data: {response.status_code}[/bold red]")
+        return None
+
+
 async def tmdb_other_meta(
     tmdb_id: int,
     path: Optional[str] = None,
@@ -1066,17 +1136,10 @@ async def tmdb_other_meta(
     year = None
     original_imdb_id = imdb_id
 
-    async with httpx.AsyncClient() as client:
-        # Get main media details first (movie or TV show)
-        main_url = f"{TMDB_BASE_URL}/{('movie' if category == 'MOVIE' else 'tv')}/{tmdb_id}"
-
-        # Make the main API call to get basic data
-        response = await client.get(main_url, params={"api_key": tmdb_api_key})
-        try:
-            response.raise_for_status()
-            media_data = typing_cast(dict[str, Any], response.json())
-        except Exception:
-            console.print(f"[bold red]Failed to fetch media data: {response.status_code}[/bold red]")
+    async with metadata_client() as client:
+        # One request returns the details together with external ids, videos, keywords, credits and images
+        media_data = await get_tmdb_details(tmdb_id, category, client)
+        if not media_data:
             return {}
 
         if debug:
@@ -1145,44 +1208,18 @@ async def tmdb_other_meta(
         if backdrop:
             backdrop = f"https://image.tmdb.org/t/p/original{backdrop}"
 
-        # Prepare all API endpoints for concurrent requests
-        endpoints = [
-            # External IDs
-            client.get(f"{main_url}/external_ids", params={"api_key": tmdb_api_key}),
-            # Videos
-            client.get(f"{main_url}/videos", params={"api_key": tmdb_api_key}),
-            # Keywords
-            client.get(f"{main_url}/keywords", params={"api_key": tmdb_api_key}),
-            # Credits
-            client.get(f"{main_url}/credits", params={"api_key": tmdb_api_key})
-        ]
-
-        # Add logo request if needed
-        if default_config.get('add_logo', False):
-            endpoints.append(
-                client.get(f"{TMDB_BASE_URL}/{('movie' if category == 'MOVIE' else 'tv')}/{tmdb_id}/images",
-                           params={"api_key": tmdb_api_key})
-            )
-
-        # Make all requests concurrently
-        results = await asyncio.gather(*endpoints, return_exceptions=True)
-
-        # Process results with the correct indexing
-        external_data, videos_data, keywords_data, credits_data, *rest = results
-        idx = 0
-        logo_data = None
-
-        # Get logo data if it was requested
-        if default_config.get('add_logo', False):
-            logo_data = rest[idx]
-            idx += 1
+        external_data = media_data.get('external_ids')
+        videos_data = media_data.get('videos')
+        keywords_data = media_data.get('keywords')
+        credits_data = media_data.get('credits')
+        logo_data = media_data.get('images') if default_config.get('add_logo', False) else None
 
         # Process external IDs
-        if isinstance(external_data, Exception):
+        if not isinstance(external_data, dict):
             console.print("[bold red]Failed to fetch external IDs[/bold red]")
         else:
             try:
-                external = typing_cast(dict[str, Any], external_data.json())  # type: ignore
+                external = typing_cast(dict[str, Any], external_data)
                 # Process IMDB ID
                 if quickie_search or imdb_id == 0:
                     external_imdb_id = external.get('imdb_id', None)
@@ -1218,11 +1255,11 @@ async def tmdb_other_meta(
                 console.print("[bold red]Failed to process external IDs[/bold red]")
 
         # Process videos
-        if isinstance(videos_data, Exception):
+        if not isinstance(videos_data, dict):
             console.print("[yellow]Unable to grab videos from TMDb.[/yellow]")
         else:
             try:
-                videos = typing_cast(dict[str, Any], videos_data.json())  # type: ignore
+                videos = typing_cast(dict[str, Any], videos_data)
                 for each in videos.get('results', []):
                     if each.get('site', "") == 'YouTube' and each.get('type', "") == "Trailer":
                         youtube = f"https://www.youtube.com/watch?v={each.get('key')}"
@@ -1231,12 +1268,12 @@ async def tmdb_other_meta(
                 console.print("[yellow]Unable to process videos from TMDb.[/yellow]")
 
         # Process keywords
-        if isinstance(keywords_data, Exception):
+        if not isinstance(keywords_data, dict):
             console.print("[bold red]Failed to fetch keywords[/bold red]")
             keywords = ""
         else:
             try:
-                kw_json = typing_cast(dict[str, Any], keywords_data.json())  # type: ignore
+                kw_json = typing_cast(dict[str, Any], keywords_data)
                 if category == "MOVIE":
                     keywords = ', '.join([keyword['name'].replace(',', ' ') for keyword in kw_json.get('keywords', [])])
                 else:  # TV
@@ -1256,13 +1293,13 @@ async def tmdb_other_meta(
         # Limit to the first 5 unique names
         creators = list(dict.fromkeys(creators))[:5]
 
-        if isinstance(credits_data, Exception):
+        if not isinstance(credits_data, dict):
             console.print("[bold red]Failed to fetch credits[/bold red]")
             directors = []
             cast = []
         else:
             try:
-                credits = typing_cast(dict[str, Any], credits_data.json())  # type: ignore
+                credits = typing_cast(dict[str, Any], credits_data)
                 directors = []
                 cast = []
                 for each in credits.get('cast', []) + credits.get('crew', []):
@@ -1284,9 +1321,9 @@ async def tmdb_other_meta(
         genre_ids = genres_data['genre_ids']
 
         # Process logo if needed
-        if default_config.get('add_logo', False) and logo_data and not isinstance(logo_data, Exception):
+        if default_config.get('add_logo', False) and isinstance(logo_data, dict):
             try:
-                logo_json = typing_cast(dict[str, Any], logo_data.json())  # type: ignore
+                logo_json = typing_cast(dict[str, Any], logo_data)
                 logo_path = await get_logo(tmdb_id, category or "MOVIE", debug, TMDB_API_KEY=tmdb_api_key, TMDB_BASE_URL=TMDB_BASE_URL, logo_json=logo_json)
                 tmdb_logo = logo_path.split('/')[-1]
             except Exception:
@@ -1358,29 +1395,23 @@ async def tmdb_other_meta(
 
 
 async def get_keywords(tmdb_id: int, category: str) -> str:
-    """Get keywords for a movie or TV show using httpx"""
-    endpoint = "movie" if category == "MOVIE" else "tv"
-    url = f"{TMDB_BASE_URL}/{endpoint}/{tmdb_id}/keywords"
-
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, params={"api_key": tmdb_api_key})
-            try:
-                response.raise_for_status()
-                data = response.json()
-            except Exception:
-                console.print(f"[bold red]Failed to fetch keywords: {response.status_code}[/bold red]")
-                return ""
+    """Get keywords for a movie or TV show from the consolidated details request"""
+    try:
+        data = (await get_tmdb_details(tmdb_id, category)).get('keywords')
+        if not isinstance(data, dict):
+            console.print("[bold red]Failed to fetch keywords[/bold red]")
+            return ""
 
-            if category == "MOVIE":
-                keywords = [keyword['name'].replace(',', ' ') for keyword in data.get('keywords', [])]
-            else:  # TV
-                keywords = [keyword['name'].replace(',', ' ') for keyword in data.get('results', [])]
+        data = typing_cast(dict[str, Any], data)
+        if category == "MOVIE":
+            keywords = [keyword['name'].replace(',', ' ') for keyword in data.get('keywords', [])]
+        else:  # TV
+            keywords = [keyword['name'].replace(',', ' ') for keyword in data.get('results', [])]
 
-            return ', '.join(keywords)
-        except Exception as e:
-            console.print(f'[yellow]Failed to get keywords: {str(e)}')
-            return ''
+        return ', '.join(keywords)
+    except Exception as e:
+        console.print(f'[yellow]Failed to get keywords: {str(e)}')
+        return ''
 
 
 async def get_genres(response_data: Optional[dict[str, Any]]) -> dict[str, str]:
@@ -1407,29 +1438,23 @@ async def get_genres(response_data: Optional[dict[str, Any]]) -> dict[str, str]:
 
 
 async def get_directors(tmdb_id: int, category: str) -> list[str]:
-    """Get directors for a movie or TV show using httpx"""
-    endpoint = "movie" if category == "MOVIE" else "tv"
-    url = f"{TMDB_BASE_URL}/{endpoint}/{tmdb_id}/credits"
-
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, params={"api_key": tmdb_api_key})
-            try:
-                response.raise_for_status()
-                data = response.json()
-            except Exception:
-                console.print(f"[bold red]Failed to fetch credits: {response.status_code}[/bold red]")
-                return []
-
-            return [
-                each.get('original_name', each.get('name'))
-                for each in data.get('cast', []) + data.get('crew', [])
-                if each.get('known_for_department', '') == "Directing" or each.get('job', '') == "Director"
-            ]
-        except Exception as e:
-            console.print(f'[yellow]Failed to get directors: {str(e)}')
+    """Get directors for a movie or TV show from the consolidated details request"""
+    try:
+        data = (await get_tmdb_details(tmdb_id, category)).get('credits')
+        if not isinstance(data, dict):
+            console.print("[bold red]Failed to fetch credits[/bold red]")
             return []
 
+        data = typing_cast(dict[str, Any], data)
+        return [
+            each.get('original_name', each.get('name'))
+            for each in data.get('cast', []) + data.get('crew', [])
+            if each.get('known_for_department', '') == "Directing" or each.get('job', '') == "Director"
+        ]
+    except Exception as e:
+        console.print(f'[yellow]Failed to get directors: {str(e)}')
+        return []
+
 
 async def get_anime(response: dict[str, Any], meta: dict[str, Any]) -> tuple[int, str, bool, str]:
     tmdb_name = meta['title']
@@ -1528,7 +1553,7 @@ async def get_romaji(tmdb_name: str, mal: Optional[int], meta: dict[str, Any]) -
         url = 'https://graphql.anilist.co'
         for attempt in range(3):
             try:
-                async with httpx.AsyncClient(timeout=30.0) as client:
+                async with metadata_client(timeout=30.0) as client:
                     response = await client.post(url, json={'query': query, 'variables': variables})
                 json_data = typing_cast(dict[str, Any], response.json())
 
@@ -1696,7 +1721,7 @@ def extract_imdb_id(value: str) -> Optional[int]:
 async def daily_to_tmdb_season_episode(tmdbid: int, date: Union[str, datetime]) -> tuple[int, int]:
     date = datetime.fromisoformat(str(date))
 
-    async with httpx.AsyncClient() as client:
+    async with metadata_client() as client:
         # Get TV show information to get seasons
         response = await client.get(
             f"{TMDB_BASE_URL}/tv/{tmdbid}",
@@ -1753,7 +1778,7 @@ async def get_episode_details(
 ) -> dict[str, Any]:
     if debug:
         console.print(f"[cyan]Fetching episode details for TMDb ID: {tmdb_id}, Season: {season_number}, Episode: {episode_number}[/cyan]")
-    async with httpx.AsyncClient() as client:
+    async with metadata_client() as client:
         try:
             # Get episode details
             response = await client.get(
@@ -1832,7 +1857,7 @@ async def get_season_details(
 ) -> dict[str, Any]:
     if debug:
         console.print(f"[cyan]Fetching season details for TMDb ID: {tmdb_id}, Season: {season_number}[/cyan]")
-    async with httpx.AsyncClient() as client:
+    async with metadata_client() as client:
         try:
             # Get season details
             response = await client.get(
@@ -1911,6 +1936,7 @@ async def get_logo(
     TMDB_BASE_URL: Optional[str] = None,
     logo_json: Optional[dict[str, Any]] = None,
 ) -> str:
+    _ = TMDB_API_KEY, TMDB_BASE_URL  # images come from get_tmdb_details, kept for existing callers
     logo_path = ""
     if logo_languages and isinstance(logo_languages, str) and ',' in logo_languages:
         logo_languages = [lang.strip() for lang in logo_languages.split(',')]
@@ -1936,20 +1962,17 @@ async def get_logo(
             image_data = logo_json
             if debug:
                 console.print("[cyan]Using provided logo_json data instead of making an HTTP request[/cyan]")
+        elif set(logo_languages) <= {'', *tmdb_image_languages()}:
+            # Images come with the consolidated details request when logo_json is not provided
+            image_data = (await get_tmdb_details(tmdb_id, "TV" if category == "TV" else "MOVIE")).get('images')
+            if not isinstance(image_data, dict):
+                console.print("[bold red]Failed to fetch image data[/bold red]")
+                return ""
         else:
-            # Make HTTP request only if logo_json is not provided
-            async with httpx.AsyncClient() as client:
-                endpoint = "tv" if category == "TV" else "movie"
-                image_response = await client.get(
-                    f"{TMDB_BASE_URL}/{endpoint}/{tmdb_id}/images",
-                    params={"api_key": TMDB_API_KEY}
-                )
-                try:
-                    image_response.raise_for_status()
-                    image_data = image_response.json()
-                except Exception:
-                    console.print(f"[bold red]Failed to fetch image data: {image_response.status_code}[/bold red]")
-                    return ""
+            # The details request only carries images in the configured languages
+            image_data = await get_tmdb_images(tmdb_id, category)
+            if image_data is None:
+                return ""
 
         if debug and image_data:
             console.print(f"[cyan]Image Data: {json.dumps(image_data, indent=2)[:500]}...")
@@ -1990,34 +2013,31 @@ async def get_tmdb_translations(
     debug: bool = False,
 ) -> str:
     """Get translations from TMDb API"""
-    endpoint = "movie" if category == "MOVIE" else "tv"
-    url = f"{TMDB_BASE_URL}/{endpoint}/{tmdb_id}/translations"
-
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, params={"api_key": tmdb_api_key})
-            response.raise_for_status()
-            data = response.json()
+    try:
+        data = (await get_tmdb_details(tmdb_id, category)).get('translations')
+        if not isinstance(data, dict):
+            raise ValueError("no translations in TMDb details")
+        data = typing_cast(dict[str, Any], data)
 
-            # Look for target language translation
-            for translation in data.get('translations', []):
-                if translation.get('iso_639_1') == target_language:
-                    translated_data = translation.get('data', {})
-                    translated_title = translated_data.get('title') or translated_data.get('name')
+        # Look for target language translation
+        for translation in data.get('translations', []):
+            if translation.get('iso_639_1') == target_language:
+                translated_data = translation.get('data', {})
+                translated_title = translated_data.get('title') or translated_data.get('name')
 
-                    if translated_title and debug:
-                        console.print(f"[cyan]Found TMDb translation: '{translated_title}'[/cyan]")
+                if translated_title and debug:
+                    console.print(f"[cyan]Found TMDb translation: '{translated_title}'[/cyan]")
 
-                    return translated_title or ""
+                return translated_title or ""
 
-            if debug:
-                console.print(f"[yellow]No {target_language} translation found in TMDb[/yellow]")
-            return ""
+        if debug:
+            console.print(f"[yellow]No {target_language} translation found in TMDb[/yellow]")
+        return ""
 
-        except Exception as e:
-            if debug:
-                console.print(f"[yellow]TMDb translation fetch failed: {e}[/yellow]")
-            return ""
+    except Exception as e:
+        if debug:
+            console.print(f"[yellow]TMDb translation fetch failed: {e}[/yellow]")
+        return ""
 
 
 async def set_tmdb_metadata(meta: dict[str, Any], filename: Optional[str] = None) -> None:
@@ -2122,10 +2142,7 @@ async def get_tmdb_localized_data(meta: dict[str, Any], data_type: str, language
     cache_key = filename
 
     # Get or create a lock for this cache key
-    if cache_key not in _cache_locks:
-        _cache_locks[cache_key] = asyncio.Lock()
-
-    cache_lock = _cache_locks[cache_key]
+    cache_lock = _cache_locks.setdefault(cache_key, LoopSafeLock())
 
     async with cache_lock:
         # Re-read the cache file while holding the lock
@@ -2150,7 +2167,7 @@ async def get_tmdb_localized_data(meta: dict[str, Any], data_type: str, language
 
         # Fetch from API if not in cache
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with metadata_client(timeout=10.0) as client:
                 response = await client.get(url, params=params)
                 if response.status_code == 200:
                     tmdb_data = response.json()
@@ -0,0 +1,172 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+import contextlib
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import Any, cast
+
+QBIT_INDEX_SCHEMA_VERSION = 1
+
+# Torrent fields kept in the index, everything the client searches read from a torrent
+INDEXED_FIELDS = ('name', 'save_path', 'content_path', 'size', 'category', 'num_complete', 'tracker', 'comment')
+
+
+class QbitTorrentIndex:
+    """
+    On-disk SQLite index of one qBittorrent client's torrents.
+
+    It is kept current with the rid-based deltas of `/api/v2/sync/maindata`: only torrents that
+    changed since the last sync are transferred and written, and lookups by name or content
+    path go through SQLite indexes instead of a linear scan of `torrents_info()`.
+    qBittorrent keeps sync state per WebUI session, so the first sync after a new login gets a
+    `full_update` and rebuilds the index; later syncs in the same session are small deltas.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.rid = 0
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        try:
+            if conn.execute("PRAGMA user_version").fetchone()[0] != QBIT_INDEX_SCHEMA_VERSION:
+                conn.executescript("""
+                    DROP TABLE IF EXISTS torrents;
+                    DROP TABLE IF EXISTS tracker_torrents;
+                    DROP TABLE IF EXISTS state;
+                """)
+                conn.execute(f"PRAGMA user_version = {QBIT_INDEX_SCHEMA_VERSION}")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS torrents (
+                    hash TEXT PRIMARY KEY,
+                    name TEXT NOT NULL DEFAULT '',
+                    name_lower TEXT NOT NULL DEFAULT '',
+                    save_path TEXT NOT NULL DEFAULT '',
+                    content_path TEXT NOT NULL DEFAULT '',
+                    size INTEGER NOT NULL DEFAULT 0,
+                    category TEXT NOT NULL DEFAULT '',
+                    num_complete INTEGER NOT NULL DEFAULT 0,
+                    tracker TEXT NOT NULL DEFAULT '',
+                    comment TEXT NOT NULL DEFAULT ''
+                );
+                CREATE INDEX IF NOT EXISTS torrents_name_lower ON torrents (name_lower);
+                CREATE INDEX IF NOT EXISTS torrents_content_path ON torrents (content_path);
+                CREATE TABLE IF NOT EXISTS tracker_torrents (
+                    url TEXT NOT NULL,
+                    hash TEXT NOT NULL,
+                    PRIMARY KEY (url, hash)
+                );
+                CREATE INDEX IF NOT EXISTS tracker_torrents_hash ON tracker_torrents (hash);
+                CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT);
+            """)
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def load(self) -> int:
+        """Read the rid of the last applied sync from disk and return it."""
+        with self._lock:
+            if not self._loaded:
+                with self._connect() as conn:
+                    row = conn.execute("SELECT value FROM state WHERE key = 'rid'").fetchone()
+                self.rid = int(row[0]) if row else 0
+                self._loaded = True
+            return self.rid
+
+    def apply(self, maindata: Mapping[str, Any]) -> int:
+        """Apply one sync/maindata response and return the number of torrents written."""
+        with self._lock, self._connect() as conn:
+            if maindata.get('full_update'):
+                conn.execute("DELETE FROM torrents")
+                conn.execute("DELETE FROM tracker_torrents")
+
+            # Deltas only carry the fields that changed, so rows are upserted per field set
+            torrents = cast(Mapping[str, Mapping[str, Any]], maindata.get('torrents') or {})
+            grouped: dict[tuple[str, ...], list[tuple[Any, ...]]] = {}
+            for torrent_hash, changes in torrents.items():
+                values = {field: changes[field] for field in INDEXED_FIELDS if field in changes}
+                if 'name' in values:
+                    values['name_lower'] = str(values['name']).lower()
+                columns = tuple(values)
+                grouped.setdefault(columns, []).append((torrent_hash, *values.values()))
+            for columns, rows in grouped.items():
+                placeholders = ", ".join("?" for _ in range(len(columns) + 1))
+                updates = ", ".join(f"{column} = excluded.{column}" for column in columns)
+                conflict = f"DO UPDATE SET {updates}" if columns else "DO NOTHING"
+                conn.executemany(
+                    f"INSERT INTO torrents (hash{''.join(', ' + column for column in columns)}) VALUES ({placeholders}) "  # nosec B608 - column names come from INDEXED_FIELDS
+                    f"ON CONFLICT (hash) {conflict}",
+                    rows,
+                )
+
+            removed = [(torrent_hash,) for torrent_hash in maindata.get('torrents_removed') or []]
+            if removed:
+                conn.executemany("DELETE FROM torrents WHERE hash = ?", removed)
+                conn.executemany("DELETE FROM tracker_torrents WHERE hash = ?", removed)
+
+            trackers = cast(Mapping[str, Iterable[str]], maindata.get('trackers') or {})
+            for url, hashes in trackers.items():
+                conn.execute("DELETE FROM tracker_torrents WHERE url = ?", (url,))
+                conn.executemany("INSERT OR IGNORE INTO tracker_torrents (url, hash) VALUES (?, ?)", [(url, h) for h in hashes])
+            for url in maindata.get('trackers_removed') or []:
+                conn.execute("DELETE FROM tracker_torrents WHERE url = ?", (url,))
+
+            self.rid = int(maindata.get('rid') or 0)
+            self._loaded = True
+            conn.execute("INSERT OR REPLACE INTO state (key, value) VALUES ('rid', ?)", (str(self.rid),))
+            return len(torrents)
+
+    def find(self, names: Iterable[str] = (), content_paths: Iterable[str] = ()) -> list[dict[str, Any]]:
+        """Torrents whose name (case-insensitive) or content path matches, with their tracker URLs."""
+        name_keys = sorted({name.lower() for name in names if name})
+        path_keys = sorted({path for path in content_paths if path})
+        if not name_keys and not path_keys:
+            return []
+
+        clauses: list[str] = []
+        if name_keys:
+            clauses.append(f"name_lower IN ({', '.join('?' for _ in name_keys)})")
+        if path_keys:
+            clauses.append(f"content_path IN ({', '.join('?' for _ in path_keys)})")
+        columns: tuple[str, ...] = ('hash', *INDEXED_FIELDS)
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(columns)} FROM torrents WHERE {' OR '.join(clauses)}",  # nosec B608 - only placeholders are interpolated
+                (*name_keys, *path_keys),
+            ).fetchall()
+            results: list[dict[str, Any]] = [dict(zip(columns, row)) for row in rows]
+            for result in results:
+                result['tracker_list'] = [
+                    url for (url,) in conn.execute("SELECT url FROM tracker_torrents WHERE hash = ?", (result['hash'],))
+                ]
+        return results
+
+
+_indexes: dict[str, QbitTorrentIndex] = {}
+
+
+def get_qbit_index(base_dir: str, client_config: Mapping[str, Any]) -> QbitTorrentIndex:
+    """Index for the qBittorrent instance described by `client_config`, shared within the process."""
+    identity = f"{client_config.get('qbit_url', '')}:{client_config.get('qbit_port', '')}:{client_config.get('qbit_user', '')}"
+    host = re.sub(r'[^A-Za-z0-9.-]+', '_', re.sub(r'^[a-z]+://', '', str(client_config.get('qbit_url', ''))))
+    key = f"{host}-{hashlib.sha256(identity.encode('utf-8')).hexdigest()[:12]}"
+    index = _indexes.get(key)
+    if index is None:
+        index = QbitTorrentIndex(Path(base_dir) / "data" / "qbit_index" / f"{key}.sqlite3")
+        _indexes[key] = index
+    return index
+
+
+def index_path_candidates(path: str) -> list[str]:
+    """Content path forms to look up: as given and without a trailing separator."""
+    normalized = os.path.normpath(path) if path else ""
+    return [p for p in dict.fromkeys((path, normalized)) if p]
@@ -1,6 +1,5 @@
 # Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
 import asyncio
-import collections
 import os
 import platform
 import re
@@ -18,11 +17,15 @@ from torf import Torrent
 
 from cogs.redaction import Redaction
 from src.console import console
+from src.looplocks import LoopSafeLock
+from src.torrent_clients.qbitindex import get_qbit_index, index_path_candidates
 from src.torrentcreate import TorrentCreator
 
 # These have to be global variables to be shared across all instances since a new instance is made every time
 qbittorrent_cached_clients: dict[tuple[str, int, str], qbittorrentapi.Client] = {}  # Cache for qbittorrent clients that have been successfully logged into
-qbittorrent_locks: collections.defaultdict[tuple[str, int, str], asyncio.Lock] = collections.defaultdict(asyncio.Lock)  # Locks for qbittorrent clients to prevent concurrent logins
+# The locks work across event loops, concurrent in-process web UI runs share them
+qbittorrent_locks: dict[tuple[str, int, str], LoopSafeLock] = {}  # Locks for qbittorrent clients to prevent concurrent logins
+qbittorrent_index_locks: dict[Path, LoopSafeLock] = {}  # Locks so only one sync/maindata delta is applied to an index at a time
 
 
 class _CandidateEntry(TypedDict):
@@ -262,7 +265,7 @@ class QbittorrentClientMixin:
         # Creates and logs into a qbittorrent client, with caching to avoid redundant logins
         # If login fails, returns None
         client_key = (client['qbit_url'], client['qbit_port'], client['qbit_user'])
-        async with qbittorrent_locks[client_key]:
+        async with qbittorrent_locks.setdefault(client_key, LoopSafeLock()):
             # We lock to further prevent concurrent logins for the same client. If two clients try to init at the same time, if the first one succeeds, the second one can use the cached client.
             potential_cached_client = qbittorrent_cached_clients.get(client_key)
             if potential_cached_client is not None:
@@ -400,11 +403,15 @@ class QbittorrentClientMixin:
                     if qbt_client is None:
                         console.print("[bold red]qBittorrent client not initialized")
                         return None
-                    torrents = await self.retry_qbt_operation(
-                        lambda: asyncio.to_thread(qbt_client.torrents_info),
-                        "Get torrents list",
-                        initial_timeout=14.0
-                    )
+                    indexed_torrents = await self.get_indexed_qbit_torrents(qbt_client, client, meta, [meta['uuid']])
+                    if indexed_torrents is not None:
+                        torrents = indexed_torrents
+                    else:
+                        torrents = await self.retry_qbt_operation(
+                            lambda: asyncio.to_thread(qbt_client.torrents_info),
+                            "Get torrents list",
+                            initial_timeout=14.0
+                        )
             except asyncio.TimeoutError:
                 console.print("[bold red]Getting torrents list timed out after retries")
                 return None
@@ -1142,6 +1149,35 @@ class QbittorrentClientMixin:
         query_string = "&".join(query_parts)
         return f"{qbt_proxy_url}/api/v2/torrents/search?{query_string}"
 
+    async def get_indexed_qbit_torrents(self, qbt_client: qbittorrentapi.Client, client_config: dict[str, Any], meta: dict[str, Any], names: list[str], content_paths: Optional[list[str]] = None) -> Optional[list[Any]]:
+        """
+        Candidate torrents for `names`/`content_paths` from the client's persistent index,
+        brought up to date with a sync/maindata delta first.
+        Returns None when the index is disabled or unusable, callers then fall back to `torrents_info()`.
+        """
+        if not client_config.get('torrent_index', True):
+            return None
+
+        index = get_qbit_index(meta.get('base_dir', '.'), client_config)
+        try:
+            async with qbittorrent_index_locks.setdefault(index.path, LoopSafeLock()):
+                rid = await asyncio.to_thread(index.load)
+                maindata = await self.retry_qbt_operation(
+                    lambda: asyncio.to_thread(qbt_client.sync_maindata, rid=rid),
+                    "Sync torrent index",
+                    initial_timeout=14.0
+                )
+                changed = await asyncio.to_thread(index.apply, maindata)
+                if meta.get('debug'):
+                    update_type = "full update" if maindata.get('full_update') else "delta"
+                    console.print(f"[cyan]qBittorrent index synced ({update_type}, {changed} torrents changed, rid {index.rid})")
+            torrents_data = await asyncio.to_thread(index.find, names, content_paths or [])
+        except Exception as e:
+            console.print(f"[yellow]qBittorrent torrent index unavailable, falling back to full torrent list: {e}")
+            return None
+
+        return self._build_mock_torrents(torrents_data)
+
     def _build_mock_torrents(self, torrents_data: list[dict[str, Any]]) -> list[Any]:
         class MockTorrent:
             def __init__(self, data: dict[str, Any]):
@@ -1231,7 +1267,7 @@ class QbittorrentClientMixin:
 
         matching_torrents.sort(key=get_priority_score)
 
-    async def _search_single_qbit_client(self, client_config: dict[str, Any], _content_path: str, meta: dict[str, Any], client_name: str) -> list[dict[str, Any]]:
+    async def _search_single_qbit_client(self, client_config: dict[str, Any], content_path: str, meta: dict[str, Any], client_name: str) -> list[dict[str, Any]]:
         """Search a single qBittorrent client for matching torrents."""
         qbt_session: Optional[aiohttp.ClientSession] = None
         qbt_client: Optional[qbittorrentapi.Client] = None
@@ -1336,11 +1372,20 @@ class QbittorrentClientMixin:
                 else:
                     if qbt_client is None:
                         return []
-                    torrents = await self.retry_qbt_operation(
-                        lambda: asyncio.to_thread(qbt_client.torrents_info),
-                        "Get torrents list",
-                        initial_timeout=14.0
+                    index_names = [meta['uuid']]
+                    if meta.get('is_disc', "") in ("", None) and len(meta.get('filelist', [])) == 1:
+                        index_names.append(os.path.basename(meta['filelist'][0]))
+                    indexed_torrents = await self.get_indexed_qbit_torrents(
+                        qbt_client, client_config, meta, index_names, index_path_candidates(content_path)
                     )
+                    if indexed_torrents is not None:
+                        torrents = indexed_torrents
+                    else:
+                        torrents = await self.retry_qbt_operation(
+                            lambda: asyncio.to_thread(qbt_client.torrents_info),
+                            "Get torrents list",
+                            initial_timeout=14.0
+                        )
             except asyncio.TimeoutError:
                 console.print("[bold red]Getting torrents list timed out after retries")
                 if qbt_session:
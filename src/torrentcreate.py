@@ -3,6 +3,7 @@ import asyncio
 import contextlib
 import fnmatch
 import glob
+import hashlib
 import math
 import os
 import platform
@@ -11,8 +12,10 @@ import re
 import shutil
 import subprocess
 import sys
+import threading
 import time
-from collections.abc import Mapping, MutableMapping, Sequence
+from collections.abc import Callable, Mapping, MutableMapping, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
 from typing import Any, Optional, Union
 
@@ -22,6 +25,7 @@ from torf import Torrent
 from typing_extensions import TypeAlias
 
 from src.console import console
+from src.ioscheduler import io_scheduler
 
 PIECE_SIZE_MIN = 32 * 1024  # 32 KiB
 PIECE_SIZE_MAX = 134_217_728  # 128 MiB
@@ -97,11 +101,149 @@ class CustomTorrent(torf.Torrent):
             return
 
 
+class PieceHasher:
+    """
+    Multi-threaded v1 piece hasher producing the same `pieces` as torf's `Torrent.generate`.
+
+    The content is split into batches of whole pieces. Each worker reads its batch with
+    `readinto` into a reusable per-thread buffer and hashes it; both release the GIL, so
+    reading and hashing scale across cores instead of being fed by torf's single reader.
+    Extra piece sizes are hashed from the same buffers, so every variant costs one read.
+    """
+
+    # Bytes read per batch; rounded up to whole pieces of the largest size
+    BATCH_BYTES = 16 * 1024 * 1024
+
+    def __init__(
+        self,
+        torrent: Torrent,
+        threads: Optional[int] = None,
+        extra_piece_sizes: Sequence[int] = (),
+        throttle: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        self.torrent = torrent
+        self.throttle = throttle
+        self.piece_size = int(torrent.piece_size)
+        self.threads = max(1, threads or min(8, os.cpu_count() or 1))
+        # Piece sizes are powers of two, so batches aligned to the largest size are aligned to all of them
+        self.piece_sizes = sorted({self.piece_size, *(int(size) for size in extra_piece_sizes)}, reverse=True)
+
+        info = torrent.metainfo['info']
+        root = os.fspath(torrent.path or "")
+        if 'files' in info:
+            self.files = [(os.path.join(root, *entry['path']), int(entry['length'])) for entry in info['files']]
+        else:
+            self.files = [(root, int(info.get('length', 0)))]
+        self.total_size = sum(size for _, size in self.files)
+        self.piece_count = math.ceil(self.total_size / self.piece_size)
+        self.batch_size = max(1, self.BATCH_BYTES // self.piece_sizes[0]) * self.piece_sizes[0]
+        self._local = threading.local()
+
+    def _buffer(self) -> bytearray:
+        buffer: Optional[bytearray] = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            buffer = bytearray(self.batch_size)
+            self._local.buffer = buffer
+        return buffer
+
+    def _read_range(self, offset: int, length: int, view: memoryview) -> str:
+        """Fill `view` with `length` bytes of the concatenated content starting at `offset`, return the first file touched."""
+        first_path = ""
+        file_start = 0
+        filled = 0
+        for filepath, size in self.files:
+            file_end = file_start + size
+            if file_end <= offset + filled or size == 0:
+                file_start = file_end
+                continue
+            if file_start >= offset + length:
+                break
+            first_path = first_path or filepath
+            with open(filepath, 'rb', buffering=0) as f:
+                f.seek(offset + filled - file_start)
+                while filled < length and offset + filled < file_end:
+                    want = min(length - filled, file_end - offset - filled)
+                    count = f.readinto(view[filled:filled + want])
+                    if not count:
+                        raise OSError(f"Unexpected end of file: {filepath}")
+                    filled += count
+                    if self.throttle is not None:
+                        self.throttle(count)
+            file_start = file_end
+        if filled != length:
+            raise OSError(f"Read {filled} of {length} bytes while hashing pieces")
+        return first_path
+
+    def _hash_batch(self, batch: int) -> tuple[int, dict[int, list[bytes]], str]:
+        offset = batch * self.batch_size
+        length = min(self.batch_size, self.total_size - offset)
+
+        view = memoryview(self._buffer())
+        filepath = self._read_range(offset, length, view)
+        hashes = {
+            piece_size: [
+                hashlib.sha1(view[start:min(start + piece_size, length)]).digest()  # nosec B324 - BitTorrent v1 piece hash
+                for start in range(0, length, piece_size)
+            ]
+            for piece_size in self.piece_sizes
+        }
+        return offset, hashes, filepath
+
+    def hash(self, callback: Optional[Callable[[Torrent, str, int, int], Any]] = None, interval: float = 0) -> Optional[bytes]:
+        """Hash every piece, reporting through a torf-style `callback`. Returns None if the callback cancelled."""
+        pieces = self.hash_all(callback=callback, interval=interval)
+        return pieces[self.piece_size] if pieces is not None else None
+
+    def hash_all(self, callback: Optional[Callable[[Torrent, str, int, int], Any]] = None, interval: float = 0) -> Optional[dict[int, bytes]]:
+        """Like `hash`, but returns the concatenated piece hashes for every piece size."""
+        if self.total_size < 1:
+            raise ValueError("Empty or all files excluded")
+
+        piece_hashes: dict[int, list[bytes]] = {
+            piece_size: [b""] * math.ceil(self.total_size / piece_size) for piece_size in self.piece_sizes
+        }
+        batch_count = math.ceil(self.total_size / self.batch_size)
+        pieces_done = 0
+        last_report = 0.0
+        filepath = self.files[0][0]
+        if callback is not None and callback(self.torrent, filepath, 0, self.piece_count) is not None:
+            return None
+
+        with ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="piece-hasher") as executor:
+            next_batch = 0
+            pending: set[Future[tuple[int, dict[int, list[bytes]], str]]] = set()
+            try:
+                while next_batch < batch_count or pending:
+                    # Keep a bounded number of batches in flight so buffers are reused, not piled up
+                    while next_batch < batch_count and len(pending) < self.threads * 2:
+                        pending.add(executor.submit(self._hash_batch, next_batch))
+                        next_batch += 1
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        offset, hashes, filepath = future.result()
+                        for piece_size, batch_hashes in hashes.items():
+                            first_piece = offset // piece_size
+                            piece_hashes[piece_size][first_piece:first_piece + len(batch_hashes)] = batch_hashes
+                        pieces_done += len(hashes[self.piece_size])
+
+                    now = time.time()
+                    if callback is not None and (now - last_report >= interval or pieces_done == self.piece_count):
+                        last_report = now
+                        if callback(self.torrent, filepath, pieces_done, self.piece_count) is not None:
+                            return None
+            finally:
+                for future in pending:
+                    future.cancel()
+
+        return {piece_size: b"".join(hashes) for piece_size, hashes in piece_hashes.items()}
+
+
 class TorrentCreator:
-    # Limit concurrent torrent creation to avoid heavy parallel hashing
-    _create_torrent_semaphore = asyncio.Semaphore(1)
     _create_torrent_inflight = 0
     _torf_start_time = time.time()
+    # Trackers that reject torrents above a piece size (MiB); matching variants are hashed alongside BASE.
+    # HDB and PTP (16 MiB) need none, calculate_piece_size already caps BASE for them.
+    PIECE_SIZE_CAPS = {'MTV': 8}
 
     @staticmethod
     def calculate_piece_size(
@@ -193,24 +335,24 @@ class TorrentCreator:
         output_filename: str,
         tracker_url: Optional[str] = None,
         piece_size: int = 0,
+        variant_piece_sizes: Sequence[int] = (),
     ) -> Union[str, Torrent]:
-        # Ensure only one torrent creation runs at a time
-        wait_started: Optional[float] = None
-        if cls._create_torrent_semaphore.locked():
-            wait_started = time.time()
-            if meta.get('debug', False):
-                console.print("[yellow]Waiting for create_torrent slot...[/yellow]")
-
-        async with cls._create_torrent_semaphore:
+        # Limit concurrent torrent creation per source device; jobs on different disks hash in parallel
+        try:
+            device_concurrency = max(1, int(meta.get('hash_device_concurrency', 1) or 1))
+        except (TypeError, ValueError):
+            device_concurrency = 1
+        io_scheduler.set_bandwidth_limit(meta.get('hash_bandwidth_limit', 0))
+
+        async with io_scheduler.reserve(path, concurrency=device_concurrency, debug=meta.get('debug', False), label=output_filename):
             cls._create_torrent_inflight += 1
             if meta.get('debug', False):
-                wait_msg = ""
-                if wait_started is not None:
-                    waited = time.time() - wait_started
-                    wait_msg = f" (waited {waited:.2f}s)"
-                console.print(f"[cyan]create_torrent start | in-flight={cls._create_torrent_inflight}{wait_msg}[/cyan]")
+                console.print(f"[cyan]create_torrent start | in-flight={cls._create_torrent_inflight}[/cyan]")
 
             try:
+                if output_filename == "BASE":
+                    # Variants belong to the BASE they were hashed with
+                    meta['piece_size_variants'] = {}
                 if not piece_size:
                     piece_size = meta.get('max_piece_size', 0)
                 tracker_url = tracker_url or None
@@ -400,6 +542,15 @@ class TorrentCreator:
 
                 piece_size = cls.calculate_piece_size(initial_size, 32768, 134217728, meta, piece_size=piece_size)
 
+                # Smaller piece size variants (MiB cap -> bytes), hashed from the same read as this torrent.
+                # --keep-nfo changes the file selection for non-BASE torrents, so those still rehash.
+                variant_sizes: dict[int, int] = {}
+                if not meta.get('keep_nfo', False):
+                    for cap in variant_piece_sizes:
+                        variant_size = cls.calculate_piece_size(initial_size, 32768, 134217728, meta, piece_size=cap)
+                        if variant_size < piece_size:
+                            variant_sizes[cap] = variant_size
+
                 # Fallback to CustomTorrent if mkbrr is not used
                 torrent = CustomTorrent(
                     meta=meta,
@@ -417,10 +568,31 @@ class TorrentCreator:
 
                 # Run torrent generation in thread to avoid blocking the event loop
                 def generate_torrent() -> None:
-                    torrent.generate(callback=cls.torf_cb, interval=5)
+                    pieces: Optional[dict[int, bytes]] = None
+                    try:
+                        hasher = PieceHasher(torrent, extra_piece_sizes=list(variant_sizes.values()), throttle=io_scheduler.throttle)
+                        pieces = hasher.hash_all(callback=cls.torf_cb, interval=5)
+                    except Exception as e:
+                        console.print(f"[yellow]Parallel piece hashing failed ({e}), falling back to torf[/yellow]")
+                        torrent.generate(callback=cls.torf_cb, interval=5)
+                    else:
+                        if pieces is not None:
+                            torrent.metainfo['info']['pieces'] = pieces[torrent.piece_size]
                     torrent.write(f"{meta['base_dir']}/tmp/{meta['uuid']}/{output_filename}.torrent", overwrite=True)
                     torrent.verify_filesize(path)
 
+                    if pieces is None:
+                        return
+                    for cap, variant_size in variant_sizes.items():
+                        variant_name = f"{output_filename}_{cap}MiB"
+                        variant = Torrent.read_stream(torrent.dump())
+                        variant.metainfo['info']['piece length'] = variant_size
+                        variant.metainfo['info']['pieces'] = pieces[variant_size]
+                        variant.write(f"{meta['base_dir']}/tmp/{meta['uuid']}/{variant_name}.torrent", overwrite=True)
+                        meta.setdefault('piece_size_variants', {})[str(cap)] = variant_name
+                        if meta['debug']:
+                            console.print(f"[green]Wrote {variant_name}.torrent ({variant_size // 1024} KiB pieces) from the same read")
+
                 await asyncio.to_thread(generate_torrent)
 
                 total_elapsed_time = time.time() - overall_start_time
@@ -438,6 +610,30 @@ class TorrentCreator:
                 if meta.get('debug', False):
                     console.print(f"[cyan]create_torrent end | in-flight={cls._create_torrent_inflight}[/cyan]")
 
+    @classmethod
+    def piece_size_variant_caps(cls, meta: Mapping[str, Any], config: Mapping[str, Any]) -> list[int]:
+        """Piece size caps (MiB) needed by the selected trackers, so BASE creation can hash them in the same pass."""
+        raw_trackers = meta.get('trackers') or []
+        trackers = {str(t).strip().upper() for t in ([raw_trackers] if isinstance(raw_trackers, str) else raw_trackers)}
+        caps: set[int] = set()
+        for tracker, cap in cls.PIECE_SIZE_CAPS.items():
+            if tracker not in trackers:
+                continue
+            tracker_config = config.get('TRACKERS', {}).get(tracker, {})
+            # MTV with skip_if_rehash drops oversized torrents instead of rehashing them
+            if tracker == 'MTV' and str(tracker_config.get('skip_if_rehash', 'false')).lower() == 'true':
+                continue
+            caps.add(cap)
+        return sorted(caps)
+
+    @staticmethod
+    def get_piece_size_variant(meta: Mapping[str, Any], cap: int) -> Optional[str]:
+        """Name of a pre-hashed variant of BASE with pieces of at most `cap` MiB, if one was written."""
+        variant_name = (meta.get('piece_size_variants') or {}).get(str(cap))
+        if variant_name and os.path.exists(f"{meta['base_dir']}/tmp/{meta['uuid']}/{variant_name}.torrent"):
+            return str(variant_name)
+        return None
+
     @staticmethod
     def torf_cb(torrent: Torrent, _filepath: str, pieces_done: int, pieces_total: int) -> None:
         if pieces_done == 0:
@@ -555,6 +751,7 @@ async def create_torrent(
     output_filename: str,
     tracker_url: Optional[str] = None,
     piece_size: int = 0,
+    variant_piece_sizes: Sequence[int] = (),
 ) -> Union[str, Torrent]:
     return await TorrentCreator.create_torrent(
         meta=meta,
@@ -562,6 +759,7 @@ async def create_torrent(
         output_filename=output_filename,
         tracker_url=tracker_url,
         piece_size=piece_size,
+        variant_piece_sizes=variant_piece_sizes,
     )
 
 
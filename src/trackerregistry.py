@@ -0,0 +1,76 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+import importlib
+import threading
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+# Tracker name -> module defining a class of the same name. Modules are imported on first use,
+# so a run only pays for the trackers it touches.
+TRACKER_MODULES: dict[str, str] = {
+    'A4K': 'src.trackers.A4K', 'ACM': 'src.trackers.ACM', 'AITHER': 'src.trackers.AITHER', 'ANT': 'src.trackers.ANT',
+    'AR': 'src.trackers.AR', 'ASC': 'src.trackers.ASC', 'AZ': 'src.trackers.AZ', 'BHD': 'src.trackers.BHD', 'BHDTV': 'src.trackers.BHDTV',
+    'BJS': 'src.trackers.BJS', 'BLU': 'src.trackers.BLU', 'BT': 'src.trackers.BT', 'CBR': 'src.trackers.CBR', 'CZ': 'src.trackers.CZ',
+    'DC': 'src.trackers.DC', 'DP': 'src.trackers.DP', 'DT': 'src.trackers.DT', 'EMUW': 'src.trackers.EMUW', 'FNP': 'src.trackers.FNP',
+    'FF': 'src.trackers.FF', 'FL': 'src.trackers.FL', 'FRIKI': 'src.trackers.FRIKI', 'GPW': 'src.trackers.GPW', 'HDB': 'src.trackers.HDB',
+    'HDS': 'src.trackers.HDS', 'HDT': 'src.trackers.HDT', 'HHD': 'src.trackers.HHD', 'HUNO': 'src.trackers.HUNO',
+    'ITT': 'src.trackers.ITT', 'IHD': 'src.trackers.IHD', 'IS': 'src.trackers.IS', 'LCD': 'src.trackers.LCD', 'LDU': 'src.trackers.LDU',
+    'LST': 'src.trackers.LST', 'LT': 'src.trackers.LT', 'LUME': 'src.trackers.LUME', 'MTV': 'src.trackers.MTV', 'NBL': 'src.trackers.NBL',
+    'OE': 'src.trackers.OE', 'OTW': 'src.trackers.OTW', 'PHD': 'src.trackers.PHD', 'PT': 'src.trackers.PT', 'PTP': 'src.trackers.PTP',
+    'PTER': 'src.trackers.PTER', 'PTS': 'src.trackers.PTS', 'PTT': 'src.trackers.PTT', 'R4E': 'src.trackers.R4E',
+    'RAS': 'src.trackers.RAS', 'RF': 'src.trackers.RF', 'RTF': 'src.trackers.RTF', 'SAM': 'src.trackers.SAM', 'SHRI': 'src.trackers.SHRI',
+    'SN': 'src.trackers.SN', 'SP': 'src.trackers.SP', 'SPD': 'src.trackers.SPD', 'STC': 'src.trackers.STC', 'THR': 'src.trackers.THR',
+    'TIK': 'src.trackers.TIK', 'TL': 'src.trackers.TL', 'TLZ': 'src.trackers.TLZ', 'TOS': 'src.trackers.TOS', 'TVC': 'src.trackers.TVC',
+    'TTG': 'src.trackers.TTG', 'TTR': 'src.trackers.TTR', 'ULCX': 'src.trackers.ULCX', 'UTP': 'src.trackers.UTP',
+    'YOINK': 'src.trackers.YOINK', 'YUS': 'src.trackers.YUS'
+}
+
+
+class LazyTrackerMap(Mapping[str, type[Any]]):
+    """
+    Read-only mapping of tracker name to tracker class that imports each class on first access.
+
+    Membership, iteration and len() only use the static module table; indexing or `.get()`
+    imports the tracker's module once and caches the class.
+    """
+
+    def __init__(self, modules: Mapping[str, str]) -> None:
+        self._modules = dict(modules)
+        self._classes: dict[str, type[Any]] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> type[Any]:
+        tracker_class = self._classes.get(name)
+        if tracker_class is not None:
+            return tracker_class
+        module_path = self._modules[name]
+        with self._lock:
+            tracker_class = self._classes.get(name)
+            if tracker_class is None:
+                tracker_class = getattr(importlib.import_module(module_path), name)
+                self._classes[name] = tracker_class
+        return tracker_class
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._modules
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._modules)
+
+    def __len__(self) -> int:
+        return len(self._modules)
+
+
+tracker_class_map = LazyTrackerMap(TRACKER_MODULES)
+
+api_trackers = {
+    'A4K', 'ACM', 'AITHER', 'BHD', 'BLU', 'CBR', 'DP', 'DT', 'EMUW', 'FNP', 'FRIKI', 'HHD', 'HUNO', 'IHD', 'ITT', 'LCD', 'LDU', 'LST', 'LT', 'LUME',
+    'OE', 'OTW', 'PT', 'PTT', 'RAS', 'RF', 'R4E', 'SAM', 'SHRI', 'SP', 'STC', 'TIK', 'TLZ', 'TOS', 'TTR', 'ULCX', 'UTP', 'YOINK', 'YUS'
+}
+
+other_api_trackers = {
+    'ANT', 'BHDTV', 'DC', 'GPW', 'NBL', 'RTF', 'SN', 'SPD', 'TL', 'TVC'
+}
+
+http_trackers = {
+    'AR', 'ASC', 'AZ', 'BJS', 'BT', 'CZ', 'FF', 'FL', 'HDB', 'HDS', 'HDT', 'IS', 'MTV', 'PHD', 'PTER', 'PTS', 'TTG'
+}
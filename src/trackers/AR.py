@@ -8,7 +8,6 @@ import urllib.parse
 from typing import Any, Optional, cast
 
 import aiofiles
-import httpx
 from bs4 import BeautifulSoup
 from pymediainfo import MediaInfo
 from rich.prompt import Prompt
@@ -16,6 +15,7 @@ from rich.prompt import Prompt
 from src.console import console
 from src.cookie_auth import CookieAuthUploader, CookieValidator
 from src.exceptions import *  # noqa F403
+from src.httpclients import tracker_sessions
 from src.trackers.COMMON import COMMON
 
 
@@ -269,7 +269,7 @@ class AR:
         }
 
         try:
-            async with httpx.AsyncClient(headers=headers, timeout=30.0, cookies=cookie_jar) as client:
+            async with tracker_sessions.client(self.tracker, headers=headers, timeout=30.0, cookies=cookie_jar) as client:
                 response = await client.get(search_url)
 
                 if response.status_code != 200:
@@ -322,7 +322,7 @@ class AR:
         }
 
         try:
-            async with httpx.AsyncClient(headers=headers, timeout=30.0, cookies=cookie_jar) as client:
+            async with tracker_sessions.client(self.tracker, headers=headers, timeout=30.0, cookies=cookie_jar) as client:
                 response = await client.get(self.test_url)
                 soup = BeautifulSoup(response.text, 'html.parser')
                 logout_link = soup.find('a', href=True, text='Logout')
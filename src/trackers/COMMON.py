@@ -21,6 +21,7 @@ from torf import Torrent
 from src.bbcode import BBCODE
 from src.console import console
 from src.exportmi import exportInfo
+from src.httpclients import tracker_sessions
 from src.languages import languages_manager
 
 
@@ -189,7 +190,7 @@ class COMMON:
         path = f"{meta['base_dir']}/tmp/{meta['uuid']}/[{tracker}_cross].torrent" if cross else f"{meta['base_dir']}/tmp/{meta['uuid']}/[{tracker}].torrent"
         if downurl:
             try:
-                async with httpx.AsyncClient(headers=headers, params=params, timeout=30.0) as session, session.stream("GET", downurl) as r:
+                async with tracker_sessions.client(tracker, headers=headers, params=params, timeout=30.0) as session, session.stream("GET", downurl) as r:
                     r.raise_for_status()
                     async with aiofiles.open(path, "wb") as f:
                         async for chunk in r.aiter_bytes():
@@ -507,7 +508,7 @@ class COMMON:
         params: dict[str, str] = {'api_token': api_key}
         url = f"{torrent_url}{id}"
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with tracker_sessions.client(tracker, timeout=30.0) as client:
                 response = await client.get(url=url, params=params)
                 json_response = response.json()
         except (httpx.RequestError, httpx.TimeoutException) as e:
@@ -621,7 +622,7 @@ class COMMON:
 
         # Make the GET request with proper encoding handled by 'params'
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with tracker_sessions.client(tracker, timeout=30.0) as client:
                 response = await client.get(url=url, params=params)
                 json_response = response.json()
         except (httpx.RequestError, httpx.TimeoutException) as e:
@@ -775,7 +776,7 @@ class COMMON:
                 return None
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with tracker_sessions.client("ptgen") as client:
                 # get douban url
                 if int(meta.get('imdb_id', 0)) != 0:
                     data['search'] = f"tt{meta['imdb_id']}"
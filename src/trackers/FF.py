@@ -14,6 +14,7 @@ from src.bbcode import BBCODE
 from src.console import console
 from src.cookie_auth import CookieAuthUploader, CookieValidator
 from src.get_desc import DescriptionBuilder
+from src.httpclients import tracker_sessions
 from src.languages import languages_manager
 
 
@@ -563,7 +564,7 @@ class FF:
 
         poster_file = None
         if poster_url:
-            async with httpx.AsyncClient() as client:
+            async with tracker_sessions.client(self.tracker) as client:
                 response = await client.get(poster_url)
                 if response.status_code == 200:
                     poster_ext = os.path.splitext(poster_url)[1] or ".jpg"
@@ -15,6 +15,7 @@ from unidecode import unidecode
 from src.console import console
 from src.cookie_auth import CookieValidator
 from src.exceptions import *  # noqa F403
+from src.httpclients import tracker_sessions
 from src.trackers.COMMON import COMMON
 
 
@@ -221,7 +222,7 @@ class FL:
             cookiefile_json = os.path.abspath(f"{meta['base_dir']}/data/cookies/FL.json")
             cookiefile_pkl = os.path.abspath(f"{meta['base_dir']}/data/cookies/FL.pkl")
             cookies = self._load_cookie_dict(cookiefile_json, cookiefile_pkl)
-            async with httpx.AsyncClient(cookies=cookies, timeout=60.0, follow_redirects=True) as client:
+            async with tracker_sessions.client(self.tracker, cookies=cookies, timeout=60.0, follow_redirects=True) as client:
                 up = await client.post(url=url, data=data, files=files)
 
             # Match url to verify successful upload
@@ -260,7 +261,7 @@ class FL:
             }
 
         try:
-            async with httpx.AsyncClient(cookies=cookies, timeout=10.0) as client:
+            async with tracker_sessions.client(self.tracker, cookies=cookies, timeout=10.0) as client:
                 response = await client.get(search_url, params=params)
                 if response.status_code == 200:
                     soup = BeautifulSoup(response.text, 'html.parser')
@@ -322,7 +323,7 @@ class FL:
         cookiefile_pkl = os.path.abspath(f"{meta['base_dir']}/data/cookies/FL.pkl")
         cookies = self._load_cookie_dict(cookiefile_json, cookiefile_pkl)
         if cookies:
-            async with httpx.AsyncClient(cookies=cookies, timeout=30.0) as client:
+            async with tracker_sessions.client(self.tracker, cookies=cookies, timeout=30.0) as client:
                 resp = await client.get(url=url)
             if meta['debug']:
                 console.print(resp.url)
@@ -330,7 +331,7 @@ class FL:
         return False
 
     async def login(self, cookiefile: str) -> None:
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+        async with tracker_sessions.client(self.tracker, timeout=30.0, follow_redirects=True) as client:
             r = await client.get("https://filelist.io/login.php")
             await asyncio.sleep(0.5)
             soup = BeautifulSoup(r.text, 'html.parser')
@@ -362,7 +363,7 @@ class FL:
 
     async def download_new_torrent(self, cookies: dict[str, str], id: str, torrent_path: str) -> None:
         download_url = f"https://filelist.io/download.php?id={id}"
-        async with httpx.AsyncClient(cookies=cookies, timeout=30.0) as client:
+        async with tracker_sessions.client(self.tracker, cookies=cookies, timeout=30.0) as client:
             r = await client.get(url=download_url)
         if r.status_code == 200:
             async with aiofiles.open(torrent_path, "wb") as tor:
@@ -402,7 +403,7 @@ class FL:
                     async with aiofiles.open(screen_path, 'rb') as image_file:
                         image_bytes = await image_file.read()
                     files.append(('images', (os.path.basename(screen), image_bytes, 'image/png')))
-                async with httpx.AsyncClient(timeout=30.0) as client:
+                async with tracker_sessions.client(self.tracker, timeout=30.0) as client:
                     response = await client.post(url, data=data, files=files, auth=(self.fltools['user'], self.fltools['pass']))
                 final_desc = response.text.replace('\r\n', '\n')
             else:
@@ -423,7 +424,7 @@ class FL:
                         async with aiofiles.open(screen_path, 'rb') as image_file:
                             image_bytes = await image_file.read()
                         files.append(('images', (os.path.basename(screen), image_bytes, 'image/png')))
-                    async with httpx.AsyncClient(timeout=30.0) as client:
+                    async with tracker_sessions.client(self.tracker, timeout=30.0) as client:
                         response = await client.post(url, files=files, auth=(self.fltools['user'], self.fltools['pass']))
                     final_desc += response.text.replace('\r\n', '\n')
             await descfile.write(final_desc)
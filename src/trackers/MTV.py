@@ -14,6 +14,7 @@ import pyotp
 from defusedxml import ElementTree as ET
 
 from src.console import console
+from src.httpclients import tracker_sessions
 from src.rehostimages import RehostImagesManager
 from src.torrentcreate import TorrentCreator
 from src.trackers.COMMON import COMMON
@@ -87,18 +88,23 @@ class MTV:
         if base_piece_mb > 8 and not meta.get('nohash', False):
             tracker_config = self.config['TRACKERS'].get(self.tracker, {})
             if str(tracker_config.get('skip_if_rehash', 'false')).lower() == "false":
-                console.print("[red]Piece size is OVER 8M and does not work on MTV. Generating a new .torrent")
                 piece_size = 8
                 tracker_url = str(tracker_config.get('announce_url', "https://fake.tracker")).strip()
                 torrent_create = f"[{self.tracker}]"
-                try:
-                    cooldown = int(self.config.get('DEFAULT', {}).get('rehash_cooldown', 0) or 0)
-                except (ValueError, TypeError):
-                    cooldown = 0
-                if cooldown > 0:
-                    await asyncio.sleep(cooldown)  # Small cooldown before rehashing
+                variant = TorrentCreator.get_piece_size_variant(meta, piece_size)
+                if variant:
+                    console.print(f"[yellow]Piece size is OVER 8M for MTV, using {variant}.torrent hashed alongside BASE")
+                    torrent_create = variant
+                else:
+                    console.print("[red]Piece size is OVER 8M and does not work on MTV. Generating a new .torrent")
+                    try:
+                        cooldown = int(self.config.get('DEFAULT', {}).get('rehash_cooldown', 0) or 0)
+                    except (ValueError, TypeError):
+                        cooldown = 0
+                    if cooldown > 0:
+                        await asyncio.sleep(cooldown)  # Small cooldown before rehashing
 
-                await TorrentCreator.create_torrent(meta, str(meta['path']), torrent_create, tracker_url=tracker_url, piece_size=piece_size)
+                    await TorrentCreator.create_torrent(meta, str(meta['path']), torrent_create, tracker_url=tracker_url, piece_size=piece_size)
                 await common.create_torrent_for_upload(meta, self.tracker, self.source_flag, torrent_filename=torrent_create)
 
             else:
@@ -159,7 +165,8 @@ class MTV:
                     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
                 }
 
-                async with httpx.AsyncClient(
+                async with tracker_sessions.client(
+                    self.tracker,
                     cookies=cookies,
                     timeout=10.0,
                     follow_redirects=True,
@@ -529,7 +536,7 @@ class MTV:
                     data = await cf.read()
                     cookies_dict = await self.async_json_loads(data)
 
-                async with httpx.AsyncClient(cookies=cookies_dict, timeout=10) as client:
+                async with tracker_sessions.client(self.tracker, cookies=cookies_dict, timeout=10) as client:
                     try:
                         resp = await client.get(url=url)
                         if meta['debug']:
@@ -567,7 +574,7 @@ class MTV:
                     data = await cf.read()
                     cookies = await self.async_json_loads(data)
 
-                async with httpx.AsyncClient(cookies=cookies, timeout=10) as client:
+                async with tracker_sessions.client(self.tracker, cookies=cookies, timeout=10) as client:
                     try:
                         resp = await client.get(url=url)
                         if "authkey=" in resp.text:
@@ -588,7 +595,7 @@ class MTV:
 
     async def login(self, cookiefile: str) -> bool:
         try:
-            async with httpx.AsyncClient(timeout=25, follow_redirects=True) as client:
+            async with tracker_sessions.client(self.tracker, timeout=25, follow_redirects=True) as client:
                 url = 'https://www.morethantv.me/login'
                 payload = {
                     'username': self.config['TRACKERS'][self.tracker].get('username'),
@@ -746,7 +753,7 @@ class MTV:
             params['q'] = meta['title'].replace(': ', ' ').replace('’', '').replace("'", '')
 
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with tracker_sessions.client(self.tracker, timeout=5.0) as client:
                 response = await client.get(url=self.search_url, params=params)
 
                 if response.status_code == 200 and response.text:
@@ -9,6 +9,7 @@ import cli_ui
 import httpx
 
 from src.console import console
+from src.httpclients import tracker_sessions
 from src.trackers.COMMON import COMMON
 
 Meta = dict[str, Any]
@@ -76,7 +77,7 @@ class NBL:
 
         try:
             if not meta['debug']:
-                async with httpx.AsyncClient(timeout=30) as client:
+                async with tracker_sessions.client(self.tracker, timeout=30) as client:
                     response = await client.post(url=self.upload_url, files=files, data=data)
                     if response.status_code in [200, 201]:
                         try:
@@ -174,7 +175,7 @@ class NBL:
         response: Optional[httpx.Response] = None
         try:
             max_pages = int(self.config['TRACKERS'][self.tracker].get('search_max_pages', 10))
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with tracker_sessions.client(self.tracker, timeout=10.0) as client:
                 for page in range(max_pages):
                     page_params = dict(params)
                     page_params["page"] = page
@@ -15,6 +15,7 @@ from unidecode import unidecode
 from src.console import console
 from src.cookie_auth import CookieValidator
 from src.exceptions import *  # noqa E403
+from src.httpclients import tracker_sessions
 from src.trackers.COMMON import COMMON
 
 Meta = dict[str, Any]
@@ -58,7 +59,7 @@ class PTER:
         cookiefile = f"{meta['base_dir']}/data/cookies/PTER.txt"
         if os.path.exists(cookiefile):
             cookies = await common.parseCookieFile(cookiefile)
-            async with httpx.AsyncClient(cookies=cookies, timeout=30.0, follow_redirects=True) as client:
+            async with tracker_sessions.client(self.tracker, cookies=cookies, timeout=30.0, follow_redirects=True) as client:
                 resp = await client.get(url=url)
 
                 return resp.text.find('''<a href="#" data-url="logout.php" id="logout-confirm">''') != -1
@@ -80,7 +81,7 @@ class PTER:
         search_url = f"https://pterclub.com/torrents.php?search={imdb}&incldead=0&search_mode=0&source{source}=1"
 
         try:
-            async with httpx.AsyncClient(cookies=cookies, timeout=10.0, follow_redirects=True) as client:
+            async with tracker_sessions.client(self.tracker, cookies=cookies, timeout=10.0, follow_redirects=True) as client:
                 response = await client.get(search_url)
 
                 if response.status_code == 200:
@@ -247,7 +248,7 @@ class PTER:
         if os.path.exists(cookiefile):
             raw_cookies = self.cookie_validator._load_cookies_dict_secure(cookiefile)  # pyright: ignore[reportPrivateUsage]
             cookies = {name: str(data.get('value', '')) for name, data in raw_cookies.items()}
-            async with httpx.AsyncClient(cookies=cookies, timeout=30.0, follow_redirects=True) as client:
+            async with tracker_sessions.client(self.tracker, cookies=cookies, timeout=30.0, follow_redirects=True) as client:
                 response = await client.get("https://s3.pterclub.com")
                 logged_in = await self.validate_login(response)
                 if logged_in is True:
@@ -261,7 +262,7 @@ class PTER:
             'password': self.password,
             'keep-login': 1
         }
-        async with httpx.AsyncClient(cookies=cookies, timeout=30.0, follow_redirects=True) as client:
+        async with tracker_sessions.client(self.tracker, cookies=cookies, timeout=30.0, follow_redirects=True) as client:
             response = await client.get("https://s3.pterclub.com")
             data['auth_token'] = self._extract_auth_token(response.text, r'auth_token.*?"(\w+)"')
             loginresponse = await client.post(url='https://s3.pterclub.com/login', data=data)
@@ -290,7 +291,7 @@ class PTER:
         if os.path.exists(cookiefile):
             raw_cookies = self.cookie_validator._load_cookies_dict_secure(cookiefile)  # pyright: ignore[reportPrivateUsage]
             cookies = {name: str(data.get('value', '')) for name, data in raw_cookies.items()}
-            async with httpx.AsyncClient(cookies=cookies, timeout=60.0, follow_redirects=True) as client:
+            async with tracker_sessions.client(self.tracker, cookies=cookies, timeout=60.0, follow_redirects=True) as client:
                 for image_path in images:
                     async with aiofiles.open(image_path, 'rb') as f:
                         file_bytes = await f.read()
@@ -443,7 +444,7 @@ class PTER:
             cookiefile = f"{meta['base_dir']}/data/cookies/PTER.txt"
             if os.path.exists(cookiefile):
                 cookies = await common.parseCookieFile(cookiefile)
-                async with httpx.AsyncClient(cookies=cookies, timeout=30.0, follow_redirects=True) as client:
+                async with tracker_sessions.client(self.tracker, cookies=cookies, timeout=30.0, follow_redirects=True) as client:
                     up = await client.post(url=url, data=data, files=files)
 
                     if str(up.url).startswith("https://pterclub.com/details.php?id="):
@@ -464,7 +465,7 @@ class PTER:
 
     async def download_new_torrent(self, id: str, torrent_path: str) -> None:
         download_url = f"https://pterclub.com/download.php?id={id}&passkey={self.passkey}"
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+        async with tracker_sessions.client(self.tracker, timeout=30.0, follow_redirects=True) as client:
             r = await client.get(url=download_url)
         if r.status_code == 200:
             async with aiofiles.open(torrent_path, "wb") as tor:
@@ -22,6 +22,7 @@ from src.bbcode import BBCODE
 from src.console import console
 from src.cookie_auth import CookieValidator
 from src.exceptions import *  # noqa F403
+from src.httpclients import tracker_sessions
 from src.rehostimages import RehostImagesManager
 from src.takescreens import TakeScreensManager
 from src.torrentcreate import TorrentCreator
@@ -123,7 +124,7 @@ class PTP:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+            async with tracker_sessions.client(self.tracker, timeout=30.0, follow_redirects=True) as client:
                 response = await client.get(url=url, headers=headers, params=params)
             await asyncio.sleep(1)
 
@@ -178,7 +179,7 @@ class PTP:
             'User-Agent': self.user_agent
         }
         url = 'https://passthepopcorn.me/torrents.php'
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+        async with tracker_sessions.client(self.tracker, timeout=30.0, follow_redirects=True) as client:
             response = await client.get(url, params=params, headers=headers)
         await asyncio.sleep(1)
         try:
@@ -213,7 +214,7 @@ class PTP:
         }
         url = 'https://passthepopcorn.me/torrents.php'
         console.print(f"[yellow]Requesting description from {url} with ID {ptp_torrent_id}")
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+        async with tracker_sessions.client(self.tracker, timeout=30.0, follow_redirects=True) as client:
             response = await client.get(url, params=params, headers=headers)
         await asyncio.sleep(1)
 
@@ -264,7 +265,7 @@ class PTP:
             'User-Agent': self.user_agent
         }
         url = 'https://passthepopcorn.me/torrents.php'
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+        async with tracker_sessions.client(self.tracker, timeout=30.0, follow_redirects=True) as client:
             response = await client.get(url=url, headers=headers, params=params)
         await asyncio.sleep(1)
         try:
@@ -359,7 +360,7 @@ class PTP:
             'User-Agent': self.user_agent
         }
         url = "https://passthepopcorn.me/ajax.php"
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+        async with tracker_sessions.client(self.tracker, timeout=30.0, follow_redirects=True) as client:
             response = await client.get(url=url, params=params, headers=headers)
         await asyncio.sleep(1)
         tinfo = {}
@@ -427,7 +428,7 @@ class PTP:
         url = 'https://passthepopcorn.me/torrents.php'
 
         try:
-            async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
+            async with tracker_sessions.client(self.tracker, timeout=10.0, follow_redirects=True) as client:
                 response = await client.get(url, headers=headers, params=params)
                 await asyncio.sleep(1)  # Mimic server-friendly delay
                 if response.status_code == 200:
@@ -464,7 +465,7 @@ class PTP:
         headers = {'referer': 'https://ptpimg.me/index.php'}
         url = "https://ptpimg.me/upload.php"
 
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+        async with tracker_sessions.client(self.tracker, timeout=30.0, follow_redirects=True) as client:
             response = await client.post(url, headers=headers, data=payload)
         try:
             response = response.json()
@@ -523,7 +524,7 @@ class PTP:
         tmp_dir = Path(meta['base_dir']) / "tmp" / meta['uuid']
         try:
             tmp_dir.mkdir(parents=True, exist_ok=True)
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+            async with tracker_sessions.client(self.tracker, timeout=30.0, follow_redirects=True) as client:
                 response = await client.get(image_url)
                 response.raise_for_status()
             poster_path = tmp_dir / f"PTP_POSTER{self._poster_extension(image_url, response.headers.get('content-type', ''))}"
@@ -1383,7 +1384,7 @@ class PTP:
         if os.path.exists(cookiefile):
             raw_cookies = self.cookie_validator._load_cookies_dict_secure(cookiefile)  # pyright: ignore[reportPrivateUsage]
             cookies = {name: str(data.get('value', '')) for name, data in raw_cookies.items()}
-            async with httpx.AsyncClient(cookies=cookies, timeout=30.0, follow_redirects=True) as client:
+            async with tracker_sessions.client(self.tracker, cookies=cookies, timeout=30.0, follow_redirects=True) as client:
                 uploadresponse = await client.get("https://passthepopcorn.me/upload.php")
                 loggedIn = await self.validate_login(uploadresponse)
                 if loggedIn is True:
@@ -1410,7 +1411,7 @@ class PTP:
             "keeplogged": "1",
         }
         headers = {"User-Agent": self.user_agent}
-        async with httpx.AsyncClient(cookies=cookies, timeout=30.0, follow_redirects=True) as client:
+        async with tracker_sessions.client(self.tracker, cookies=cookies, timeout=30.0, follow_redirects=True) as client:
             loginresponse = await client.post("https://passthepopcorn.me/ajax.php?action=login", data=data, headers=headers)
             await asyncio.sleep(2)
             try:
@@ -1669,7 +1670,7 @@ class PTP:
             cookiefile = f"{meta['base_dir']}/data/cookies/PTP.json"
             raw_cookies = self.cookie_validator._load_cookies_dict_secure(cookiefile)  # pyright: ignore[reportPrivateUsage]
             cookies = {name: str(data.get('value', '')) for name, data in raw_cookies.items()}
-            async with httpx.AsyncClient(cookies=cookies, timeout=60.0, follow_redirects=True) as client:
+            async with tracker_sessions.client(self.tracker, cookies=cookies, timeout=60.0, follow_redirects=True) as client:
                 response = await client.post(url=url, data=data, headers=headers, files=files)
             console.print(f"[cyan]{response.url}")
             responsetext = response.text
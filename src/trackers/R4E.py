@@ -5,6 +5,7 @@ from typing import Any, Optional, cast
 import httpx
 
 from src.console import console
+from src.httpclients import tracker_sessions
 from src.trackers.COMMON import COMMON
 from src.trackers.UNIT3D import UNIT3D
 
@@ -121,7 +122,7 @@ class R4E(UNIT3D):
         if meta.get('edition', "") != "":
             params['name'] = str(params['name']) + str(meta['edition'])
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with tracker_sessions.client(self.tracker, timeout=5.0) as client:
                 response = await client.get(url=url, params=params)
                 if response.status_code == 200:
                     data = cast(dict[str, Any], response.json())
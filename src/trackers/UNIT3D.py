@@ -13,6 +13,7 @@ from typing_extensions import TypeAlias
 
 from src.console import console
 from src.get_desc import DescriptionBuilder
+from src.httpclients import tracker_sessions
 from src.trackers.COMMON import COMMON
 
 QueryValue: TypeAlias = Union[str, int, float, bool, None]
@@ -113,7 +114,7 @@ class UNIT3D:
             urls_to_check.append(self.pending_url)
 
         try:
-            async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
+            async with tracker_sessions.client(self.tracker, timeout=10.0, follow_redirects=True) as client:
                 for url in urls_to_check:
                     check_pending = False
                     if "api/torrents/pending" in url:
@@ -474,7 +475,7 @@ class UNIT3D:
 
             for attempt in range(max_retries):
                 try:  # noqa: PERF203
-                    async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
+                    async with tracker_sessions.client(self.tracker, timeout=timeout, follow_redirects=True) as client:
                         response = await client.post(
                             url=self.upload_url, files=files, data=data, headers=headers
                         )
@@ -4,9 +4,10 @@ import json
 import os
 import re
 import sys
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Optional, Union, cast
+from typing import Any, NamedTuple, Optional, Union, cast
 
 import aiofiles
 import cli_ui
@@ -14,79 +15,49 @@ import httpx
 
 from src.cleanup import cleanup_manager
 from src.console import console
-from src.trackers.A4K import A4K
-from src.trackers.ACM import ACM
-from src.trackers.AITHER import AITHER
-from src.trackers.ANT import ANT
-from src.trackers.AR import AR
-from src.trackers.ASC import ASC
-from src.trackers.AZ import AZ
-from src.trackers.BHD import BHD
-from src.trackers.BHDTV import BHDTV
-from src.trackers.BJS import BJS
-from src.trackers.BLU import BLU
-from src.trackers.BT import BT
-from src.trackers.CBR import CBR
+from src.httpclients import tracker_sessions
+from src.trackerregistry import tracker_class_map
 from src.trackers.COMMON import COMMON
-from src.trackers.CZ import CZ
-from src.trackers.DC import DC
-from src.trackers.DP import DP
-from src.trackers.DT import DT
-from src.trackers.EMUW import EMUW
-from src.trackers.FF import FF
-from src.trackers.FL import FL
-from src.trackers.FNP import FNP
-from src.trackers.FRIKI import FRIKI
-from src.trackers.GPW import GPW
-from src.trackers.HDB import HDB
-from src.trackers.HDS import HDS
-from src.trackers.HDT import HDT
-from src.trackers.HHD import HHD
-from src.trackers.HUNO import HUNO
-from src.trackers.IHD import IHD
-from src.trackers.IS import IS
-from src.trackers.ITT import ITT
-from src.trackers.LCD import LCD
-from src.trackers.LDU import LDU
-from src.trackers.LST import LST
-from src.trackers.LT import LT
-from src.trackers.LUME import LUME
-from src.trackers.MTV import MTV
-from src.trackers.NBL import NBL
-from src.trackers.OE import OE
-from src.trackers.OTW import OTW
-from src.trackers.PHD import PHD
-from src.trackers.PT import PT
-from src.trackers.PTER import PTER
-from src.trackers.PTP import PTP
-from src.trackers.PTS import PTS
-from src.trackers.PTT import PTT
-from src.trackers.R4E import R4E
-from src.trackers.RAS import RAS
-from src.trackers.RF import RF
-from src.trackers.RTF import RTF
-from src.trackers.SAM import SAM
-from src.trackers.SHRI import SHRI
-from src.trackers.SN import SN
-from src.trackers.SP import SP
-from src.trackers.SPD import SPD
-from src.trackers.STC import STC
-from src.trackers.THR import THR
-from src.trackers.TIK import TIK
-from src.trackers.TL import TL
-from src.trackers.TLZ import TLZ
-from src.trackers.TOS import TOS
-from src.trackers.TTG import TTG
-from src.trackers.TTR import TTR
-from src.trackers.TVC import TVC
-from src.trackers.ULCX import ULCX
-from src.trackers.UTP import UTP
-from src.trackers.YOINK import YOINK
-from src.trackers.YUS import YUS
 
 JsonDict = dict[str, Any]
 Meta = dict[str, Any]
 
+# Trackers whose banned groups are fetched from their API rather than the class's banned_groups list
+BANNED_GROUP_API_TRACKERS = ("AITHER", "LST", "LUME", "SPD")
+# How long a loaded banned group list is used before it is refreshed in the background
+BANNED_GROUPS_TTL = 60 * 60
+
+
+class BannedGroupIndex(NamedTuple):
+    """Lowercased banned group names of one tracker, with the notes some entries carry."""
+    names: frozenset[str]
+    notes: dict[str, str]
+    loaded_at: float
+
+    @classmethod
+    def build(cls, banned_group_list: list[Any]) -> "BannedGroupIndex":
+        names: set[str] = set()
+        notes: dict[str, str] = {}
+        for tag in banned_group_list:
+            if isinstance(tag, list):
+                tag_list = [str(item) for item in cast(list[Any], tag)]
+                if not tag_list:
+                    continue
+                name = tag_list[0].strip().lower()
+                names.add(name)
+                if len(tag_list) > 1:
+                    notes[name] = tag_list[1]
+            else:
+                names.add(str(tag).strip().lower())
+        names.discard("")
+        return cls(frozenset(names), notes, time.monotonic())
+
+
+# Process-wide, so queue items and repeated checks don't re-read and re-parse the lists
+_banned_group_indexes: dict[str, BannedGroupIndex] = {}
+_class_banned_group_indexes: dict[str, BannedGroupIndex] = {}
+_banned_group_refreshes: dict[str, "asyncio.Task[Optional[BannedGroupIndex]]"] = {}
+
 
 class TRACKER_SETUP:
     def __init__(self, config: dict[str, Any]):
@@ -149,7 +120,7 @@ class TRACKER_SETUP:
         all_data: list[JsonDict] = []
         next_cursor: Optional[str] = None
 
-        async with httpx.AsyncClient() as client:
+        async with tracker_sessions.client(tracker) as client:
             while True:
                 try:
                     # Add query parameters for pagination
@@ -241,7 +212,7 @@ class TRACKER_SETUP:
             "https://raw.githubusercontent.com/TRaSH-Guides/Guides/refs/heads/master/docs/json/radarr/cf/lq.json"
         )
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with tracker_sessions.client("trash-guides", timeout=10.0) as client:
                 response = await client.get(url)
                 if response.status_code != 200:
                     console.print(f"[red]Failed to fetch TRaSH groups: HTTP {response.status_code}[/red]")
@@ -318,8 +289,58 @@ class TRACKER_SETUP:
         with open(file_path, encoding="utf-8") as file:
             return file.read()
 
+    async def load_banned_group_index(self, meta: Meta, tracker: str, banned_group_list: list[Any], announce: bool = True) -> Optional[BannedGroupIndex]:
+        """Fetch the tracker's banned groups file if it is due and index it; None if it could not be loaded."""
+        file_path = await self.get_banned_groups(meta, tracker)
+        if file_path == "empty":
+            if announce:
+                console.print(f"[bold red]No banned groups found for '{tracker}'.")
+            index = BannedGroupIndex.build([])
+            _banned_group_indexes[tracker] = index
+            return index
+        if not file_path:
+            if announce:
+                console.print(f"[bold red]Failed to load banned groups for '{tracker}'.")
+            return None
+
+        try:
+            content = await asyncio.to_thread(self._read_file, file_path)
+            data = json.loads(content)
+        except FileNotFoundError:
+            if announce:
+                console.print(f"[bold red]Banned group file for '{tracker}' not found.")
+            return None
+        except json.JSONDecodeError:
+            if announce:
+                console.print(f"[bold red]Failed to parse banned group file for '{tracker}'.")
+            return None
+
+        banned_groups = data.get("banned_groups", "")
+        index = BannedGroupIndex.build(banned_groups.split(", ") if banned_groups else banned_group_list)
+        _banned_group_indexes[tracker] = index
+        return index
+
+    async def get_banned_group_index(self, meta: Meta, tracker: str, banned_group_list: list[Any]) -> Optional[BannedGroupIndex]:
+        if tracker.upper() not in BANNED_GROUP_API_TRACKERS:
+            index = _class_banned_group_indexes.get(tracker)
+            if index is None:
+                index = BannedGroupIndex.build(banned_group_list)
+                _class_banned_group_indexes[tracker] = index
+            return index
+
+        index = _banned_group_indexes.get(tracker)
+        if index is None:
+            return await self.load_banned_group_index(meta, tracker, banned_group_list)
+
+        if time.monotonic() - index.loaded_at > BANNED_GROUPS_TTL and tracker not in _banned_group_refreshes:
+            # Keep answering from the loaded list while it is refreshed; a failed refresh keeps it
+            refresh_meta: Meta = {'base_dir': meta['base_dir'], 'debug': meta.get('debug', False)}
+            task = asyncio.create_task(self.load_banned_group_index(refresh_meta, tracker, banned_group_list, announce=False))
+            _banned_group_refreshes[tracker] = task
+            task.add_done_callback(lambda _: _banned_group_refreshes.pop(tracker, None))
+        return index
+
     async def check_banned_group(self, tracker: str, banned_group_list: list[Any], meta: Meta) -> bool:
-        result = False
         if not meta['tag']:
             return False
 
@@ -327,62 +348,28 @@ class TRACKER_SETUP:
         if 'taoe' in group_tags:
             group_tags = 'taoe'
 
-        if tracker.upper() in ("AITHER", "LST", "LUME", "SPD"):
-            file_path = await self.get_banned_groups(meta, tracker)
-            if file_path == "empty":
-                console.print(f"[bold red]No banned groups found for '{tracker}'.")
-                return False
-            if not file_path:
-                console.print(f"[bold red]Failed to load banned groups for '{tracker}'.")
-                return False
-
-            # Load the banned groups from the file
-            try:
-                content = await asyncio.to_thread(self._read_file, file_path)
-                data = json.loads(content)
-                banned_groups = data.get("banned_groups", "")
-                if banned_groups:
-                    banned_group_list = banned_groups.split(", ")
-
-            except FileNotFoundError:
-                console.print(f"[bold red]Banned group file for '{tracker}' not found.")
-                return False
-            except json.JSONDecodeError:
-                console.print(f"[bold red]Failed to parse banned group file for '{tracker}'.")
-                return False
+        index = await self.get_banned_group_index(meta, tracker, banned_group_list)
+        if index is None:
+            return False
 
-        for tag in banned_group_list:
-            if isinstance(tag, list):
-                tag_list = [str(item) for item in cast(list[Any], tag)]
-                if not tag_list:
-                    continue
-                tag_name = tag_list[0]
-                if group_tags == tag_name.lower():
-                    console.print(f"[bold yellow]{meta['tag'][1:]}[/bold yellow][bold red] was found on [bold yellow]{tracker}'s[/bold yellow] list of banned groups.")
-                    if len(tag_list) > 1:
-                        console.print(f"[bold red]NOTE: [bold yellow]{tag_list[1]}")
-                    result = True
-            else:
-                tag_name = str(tag)
-                if group_tags == tag_name.lower():
-                    console.print(f"[bold yellow]{meta['tag'][1:]}[/bold yellow][bold red] was found on [bold yellow]{tracker}'s[/bold yellow] list of banned groups.")
-                    result = True
+        if group_tags not in index.names:
+            return False
 
-        if result:
-            if not meta['unattended'] or meta.get('unattended_confirm', False):
-                try:
-                    if cli_ui.ask_yes_no(cli_ui.red, "Do you want to continue anyway?", default=False):
-                        return False
-                except EOFError:
-                    console.print("\n[red]Exiting on user request (Ctrl+C)[/red]")
-                    await cleanup_manager.cleanup()
-                    cleanup_manager.reset_terminal()
-                    sys.exit(1)
-                return True
+        console.print(f"[bold yellow]{meta['tag'][1:]}[/bold yellow][bold red] was found on [bold yellow]{tracker}'s[/bold yellow] list of banned groups.")
+        if group_tags in index.notes:
+            console.print(f"[bold red]NOTE: [bold yellow]{index.notes[group_tags]}")
 
-            return True
+        if not meta['unattended'] or meta.get('unattended_confirm', False):
+            try:
+                if cli_ui.ask_yes_no(cli_ui.red, "Do you want to continue anyway?", default=False):
+                    return False
+            except EOFError:
+                console.print("\n[red]Exiting on user request (Ctrl+C)[/red]")
+                await cleanup_manager.cleanup()
+                cleanup_manager.reset_terminal()
+                sys.exit(1)
 
-        return False
+        return True
 
     async def write_internal_claims_to_file(self, file_path: str, data: list[JsonDict], debug: bool = False) -> None:
         try:
@@ -445,7 +432,7 @@ class TRACKER_SETUP:
         all_data: list[JsonDict] = []
         next_cursor: Optional[str] = None
 
-        async with httpx.AsyncClient() as client:
+        async with tracker_sessions.client(tracker) as client:
             while True:
                 try:
                     # Add query parameters for pagination
@@ -584,7 +571,7 @@ class TRACKER_SETUP:
             'tmdb': meta['tmdb'],
         }
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with tracker_sessions.client(tracker, timeout=10.0) as client:
                 response = await client.get(url=url, headers=headers, params=params)
                 if response.status_code == 200:
                     data = response.json()
@@ -644,7 +631,7 @@ class TRACKER_SETUP:
             'tmdb_id': f"{meta['category'].lower()}/{meta['tmdb_id']}",
         }
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with tracker_sessions.client(tracker, timeout=10.0) as client:
                 response = await client.post(url=url, params=params)
                 if response.status_code == 200:
                     data = response.json()
@@ -1128,7 +1115,7 @@ class TRACKER_SETUP:
         next_cursor: Optional[str] = None
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with tracker_sessions.client(tracker, timeout=10.0) as client:
                 while True:
                     try:
                         # Add pagination cursor to params if we have one
@@ -1311,7 +1298,7 @@ class TRACKER_SETUP:
 
         if not meta.get('debug', False):
             try:
-                async with httpx.AsyncClient(timeout=10.0) as client:
+                async with tracker_sessions.client(tracker, timeout=10.0) as client:
                     response = await client.post(url=create_url, headers=headers, json=payload)
                     if response.status_code in (200, 201):
                         console.print(f"[bold green]Successfully created trump report on {tracker}[/bold green]")
@@ -1334,25 +1321,3 @@ class TRACKER_SETUP:
             console.print(f"[cyan]POST URL: {create_url}[/cyan]")
             console.print(f"[cyan]Payload: {payload}[/cyan]")
             return True
-
-
-tracker_class_map: dict[str, type[Any]] = {
-    'A4K': A4K, 'ACM': ACM, 'AITHER': AITHER, 'ANT': ANT, 'AR': AR, 'ASC': ASC, 'AZ': AZ, 'BHD': BHD, 'BHDTV': BHDTV, 'BJS': BJS, 'BLU': BLU, 'BT': BT, 'CBR': CBR,
-    'CZ': CZ, 'DC': DC, 'DP': DP, 'DT': DT, 'EMUW': EMUW, 'FNP': FNP, 'FF': FF, 'FL': FL, 'FRIKI': FRIKI, 'GPW': GPW, 'HDB': HDB, 'HDS': HDS, 'HDT': HDT, 'HHD': HHD, 'HUNO': HUNO, 'ITT': ITT,
-    'IHD': IHD, 'IS': IS, 'LCD': LCD, 'LDU': LDU, 'LST': LST, 'LT': LT, 'LUME': LUME, 'MTV': MTV, 'NBL': NBL, 'OE': OE, 'OTW': OTW, 'PHD': PHD, 'PT': PT, 'PTP': PTP, 'PTER': PTER, 'PTS': PTS, 'PTT': PTT,
-    'R4E': R4E, 'RAS': RAS, 'RF': RF, 'RTF': RTF, 'SAM': SAM, 'SHRI': SHRI, 'SN': SN, 'SP': SP, 'SPD': SPD, 'STC': STC, 'THR': THR,
-    'TIK': TIK, 'TL': TL, 'TLZ': TLZ, 'TOS': TOS, 'TVC': TVC, 'TTG': TTG, 'TTR': TTR, 'ULCX': ULCX, 'UTP': UTP, 'YOINK': YOINK, 'YUS': YUS
-}
-
-api_trackers = {
-    'A4K', 'ACM', 'AITHER', 'BHD', 'BLU', 'CBR', 'DP', 'DT', 'EMUW', 'FNP', 'FRIKI', 'HHD', 'HUNO', 'IHD', 'ITT', 'LCD', 'LDU', 'LST', 'LT', 'LUME',
-    'OE', 'OTW', 'PT', 'PTT', 'RAS', 'RF', 'R4E', 'SAM', 'SHRI', 'SP', 'STC', 'TIK', 'TLZ', 'TOS', 'TTR', 'ULCX', 'UTP', 'YOINK', 'YUS'
-}
-
-other_api_trackers = {
-    'ANT', 'BHDTV', 'DC', 'GPW', 'NBL', 'RTF', 'SN', 'SPD', 'TL', 'TVC'
-}
-
-http_trackers = {
-    'AR', 'ASC', 'AZ', 'BJS', 'BT', 'CZ', 'FF', 'FL', 'HDB', 'HDS', 'HDT', 'IS', 'MTV', 'PHD', 'PTER', 'PTS', 'TTG'
-}
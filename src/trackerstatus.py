@@ -1,10 +1,9 @@
 # Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
 import asyncio
-import copy
 import os
 import sys
 from collections.abc import Mapping, MutableMapping
-from typing import Any, Optional, cast
+from typing import Any, NamedTuple, Optional, cast
 
 import cli_ui
 from torf import Torrent
@@ -15,14 +14,22 @@ from src.clients import Clients
 from src.console import console
 from src.dupe_checking import DupeChecker
 from src.imdb import imdb_manager
+from src.metaoverlay import MetaOverlay
 from src.torrentcreate import TorrentCreator
-from src.trackers.PTP import PTP
-from src.trackersetup import TRACKER_SETUP, tracker_class_map
+from src.trackerregistry import tracker_class_map
+from src.trackersetup import TRACKER_SETUP
 from src.uphelper import UploadHelper
 
 Meta: TypeAlias = MutableMapping[str, Any]
 
 
+class TrackerPrefetch(NamedTuple):
+    """Network results for one tracker fetched ahead of the attended prompts."""
+    meta: Meta
+    tracker_class: Any
+    claimed: Optional[bool]
+
+
 class TrackerStatusManager:
     def __init__(self, config: dict[str, Any]) -> None:
         self.config = config
@@ -42,22 +49,38 @@ class TrackerStatusManager:
             if tracker not in meta['tracker_status']:
                 meta['tracker_status'][tracker] = {}
 
-        async def process_single_tracker(tracker_name: str, shared_meta: Meta) -> tuple[str, dict[str, bool]]:
+        def tracker_meta(shared_meta: Meta) -> Meta:
+            local_meta: Meta = MetaOverlay(shared_meta)  # Ensure each task gets its own copy-on-write view of meta
+            if local_meta['name'].endswith('DUPE?'):
+                local_meta['name'] = local_meta['name'].replace(' DUPE?', '')
+            return local_meta
+
+        async def prefetch_tracker(tracker_name: str) -> TrackerPrefetch:
+            # Banned groups and claims only: a dupe search (or PTP's group lookup) may prompt, so it runs in turn
+            local_meta = tracker_meta(meta)
+            tracker_class: Any = tracker_class_map[tracker_name](config=self.config)
+            if local_meta['tag']:
+                await tracker_setup.get_banned_group_index(local_meta, tracker_class.tracker, tracker_class.banned_groups)
+            if local_meta['tracker_status'][tracker_name].get('skip_upload'):
+                return TrackerPrefetch(local_meta, tracker_class, None)
+            claimed = bool(await tracker_setup.get_torrent_claims(local_meta, tracker_name))
+            return TrackerPrefetch(local_meta, tracker_class, claimed)
+
+        async def process_single_tracker(
+            tracker_name: str, shared_meta: Meta, prefetched: Optional[TrackerPrefetch] = None
+        ) -> tuple[str, dict[str, bool]]:
             nonlocal successful_trackers
-            local_meta = copy.deepcopy(shared_meta)  # Ensure each task gets its own copy of meta
+            local_meta = prefetched.meta if prefetched is not None else tracker_meta(shared_meta)
             local_tracker_status = {'banned': False, 'skipped': False, 'dupe': False, 'upload': False, 'other': False}
             disctype = local_meta.get('disctype', None)
             we_already_asked = False
 
-            if local_meta['name'].endswith('DUPE?'):
-                local_meta['name'] = local_meta['name'].replace(' DUPE?', '')
-
             if tracker_name == "MANUAL":
                 local_tracker_status['upload'] = True
                 successful_trackers += 1
 
             if tracker_name in tracker_class_map:
-                tracker_class: Any = tracker_class_map[tracker_name](config=self.config)
+                tracker_class: Any = prefetched.tracker_class if prefetched is not None else tracker_class_map[tracker_name](config=self.config)
                 if tracker_name in {"THR", "PTP"} and local_meta.get('imdb_id', 0) == 0:
                     while True:
                         if local_meta.get('unattended', False):
@@ -100,22 +123,25 @@ class TrackerStatusManager:
                     local_tracker_status['skipped'] = False
 
                 if not local_tracker_status['banned'] and not local_tracker_status['skipped']:
-                    claimed = await tracker_setup.get_torrent_claims(local_meta, tracker_name)
+                    if prefetched is not None and prefetched.claimed is not None:
+                        claimed = prefetched.claimed
+                    else:
+                        claimed = await tracker_setup.get_torrent_claims(local_meta, tracker_name)
                     local_tracker_status['skipped'] = bool(claimed)
 
                     if tracker_name not in {"PTP"} and not local_tracker_status['skipped']:
-                        dupes: list[Any] = cast(list[Any], await tracker_class.search_existing(local_meta, disctype))
+                        dupes = cast(list[Any], await tracker_class.search_existing(local_meta, disctype))
                         # set trackers here so that they are not double checked later with cross seeding
                         async with meta_lock:
                             meta.setdefault('dupe_checked_trackers', []).append(tracker_name)
                         if local_meta['tracker_status'][tracker_name].get('other', False):
                             local_tracker_status['other'] = True
                     elif tracker_name == "PTP":
-                        ptp: Any = PTP(config=self.config)
+                        ptp = tracker_class_map['PTP'](config=self.config)
                         groupID = await ptp.get_group_by_imdb(local_meta['imdb'])
+                        dupes = cast(list[Any], await ptp.search_existing(groupID or "", cast(dict[str, Any], local_meta), disctype))
                         async with meta_lock:
                             meta['ptp_groupID'] = groupID
-                        dupes = cast(list[Any], await ptp.search_existing(groupID or "", cast(dict[str, Any], local_meta), disctype))
                     else:
                         dupes = []
 
@@ -257,14 +283,24 @@ class TrackerStatusManager:
             if passed_trackers:
                 console.print(f"[bold green]Trackers passed all checks: [bold yellow]{', '.join(passed_trackers)}")
         else:
+            # Fetch every tracker's banned groups and claims concurrently, then walk the searches and prompts in order
             passed_trackers: list[str] = []
-            for tracker_name in meta['trackers']:
-                if tracker_name in tracker_class_map:
-                    console.print(f"[yellow]Searching for existing torrents on {tracker_name}...")
-                tracker_name, status = await process_single_tracker(tracker_name, meta)
-                tracker_status[tracker_name] = status
-                if not status['banned'] and not status['skipped'] and not status['dupe']:
-                    passed_trackers.append(tracker_name)
+            searching_trackers = [name for name in meta['trackers'] if name in tracker_class_map]
+            prefetches = {name: asyncio.create_task(prefetch_tracker(name)) for name in dict.fromkeys(searching_trackers)}
+            try:
+                for tracker_name in meta['trackers']:
+                    if tracker_name in tracker_class_map:
+                        console.print(f"[yellow]Searching for existing torrents on {tracker_name}...")
+                    prefetch_task = prefetches.pop(tracker_name, None)
+                    prefetched = await prefetch_task if prefetch_task is not None else None
+                    tracker_name, status = await process_single_tracker(tracker_name, meta, prefetched)
+                    tracker_status[tracker_name] = status
+                    if not status['banned'] and not status['skipped'] and not status['dupe']:
+                        passed_trackers.append(tracker_name)
+            finally:
+                for prefetch_task in prefetches.values():
+                    prefetch_task.cancel()
+                await asyncio.gather(*prefetches.values(), return_exceptions=True)
 
         if meta['debug']:
             console.print("\n[bold]Tracker Processing Summary:[/bold]")
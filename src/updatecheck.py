@@ -0,0 +1,124 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+import asyncio
+import contextlib
+import json
+import os
+import re
+import time
+from typing import Any, Optional
+
+import httpx
+
+from src.console import console
+
+REMOTE_VERSION_URL = 'https://raw.githubusercontent.com/Audionut/Upload-Assistant/master/data/version.py'
+# How long a remote version check is reused before the next run checks again
+UPDATE_CHECK_TTL = 6 * 60 * 60
+
+_check_tasks: set[asyncio.Task[None]] = set()
+
+
+def update_check_path(base_dir: str) -> str:
+    return os.path.join(base_dir, 'data', 'update_check.json')
+
+
+def load_update_check(base_dir: str) -> dict[str, Any]:
+    """The last remote version check stored on disk, or an empty dict."""
+    try:
+        with open(update_check_path(base_dir), encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_update_check(base_dir: str, data: dict[str, Any]) -> None:
+    path = update_check_path(base_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def extract_changelog(content: str, to_version: str) -> Optional[str]:
+    """Extracts the changelog entries between the specified versions."""
+    # Try to find the to_version with 'v' prefix first (current format)
+    patterns_to_try = [
+        rf'__version__\s*=\s*"{re.escape(to_version)}"\s*\n\s*"""\s*(.*?)\s*"""',  # Try with 'v' prefix
+        rf'__version__\s*=\s*"{re.escape(to_version.lstrip("v"))}"\s*\n\s*"""\s*(.*?)\s*"""'  # Try without 'v' prefix
+    ]
+
+    for pattern in patterns_to_try:
+        match = re.search(pattern, content, re.DOTALL)
+        if match:
+            changelog = match.group(1).strip()
+            # Remove the comment markers (# ) that were added by the GitHub Action
+            changelog = re.sub(r'^# ', '', changelog, flags=re.MULTILINE)
+            return changelog
+
+    return None
+
+
+async def refresh_update_check(base_dir: str, url: str = REMOTE_VERSION_URL, debug: bool = False) -> None:
+    """
+    Fetch the remote version file and store its version and changelog.
+
+    The request is conditional on the stored ETag / Last-Modified, so an unchanged file is a
+    bodiless 304. Failures keep the stored result and are retried after the TTL.
+    """
+    cached = await asyncio.to_thread(load_update_check, base_dir)
+    headers: dict[str, str] = {}
+    if cached.get('etag'):
+        headers['If-None-Match'] = str(cached['etag'])
+    if cached.get('last_modified'):
+        headers['If-Modified-Since'] = str(cached['last_modified'])
+
+    data = dict(cached)
+    data['checked_at'] = time.time()
+    try:
+        async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
+            response = await client.get(url, headers=headers)
+        if response.status_code == 200:
+            match = re.search(r'__version__\s*=\s*"([^"]+)"', response.text)
+            if match:
+                data['remote_version'] = match.group(1)
+                data['changelog'] = extract_changelog(response.text, match.group(1))
+                data['etag'] = response.headers.get('etag')
+                data['last_modified'] = response.headers.get('last-modified')
+            elif debug:
+                console.print("[red]Version not found in remote file.")
+        elif response.status_code != 304 and debug:
+            console.print(f"[red]Failed to fetch remote version file. Status code: {response.status_code}")
+    except httpx.HTTPError as e:
+        if debug:
+            console.print(f"[red]An error occurred while fetching the remote version file: {e}")
+
+    try:
+        await asyncio.to_thread(_save_update_check, base_dir, data)
+    except OSError as e:
+        if debug:
+            console.print(f"[yellow]Could not store the update check: {e}[/yellow]")
+
+
+def schedule_update_check(base_dir: str, cached: dict[str, Any], debug: bool = False) -> None:
+    """Start a background refresh of the stored update check when it is older than UPDATE_CHECK_TTL."""
+    checked_at = cached.get('checked_at')
+    if isinstance(checked_at, (int, float)) and time.time() - checked_at < UPDATE_CHECK_TTL:
+        return
+    task = asyncio.create_task(refresh_update_check(base_dir, debug=debug))
+    _check_tasks.add(task)
+    task.add_done_callback(_check_tasks.discard)
+
+
+async def cancel_update_checks() -> None:
+    """Drop a check still in flight at exit; the next run retries it."""
+    # Only this event loop's checks, another in-process run may own the rest
+    loop = asyncio.get_running_loop()
+    tasks = [task for task in _check_tasks if task.get_loop() is loop]
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await task
+
@@ -13,7 +13,7 @@ from cogs.redaction import Redaction
 from src.bdinfo_comparator import compare_bdinfo, has_bdinfo_content
 from src.cleanup import cleanup_manager
 from src.console import console
-from src.trackersetup import tracker_class_map
+from src.trackerregistry import tracker_class_map
 
 Meta = dict[str, Any]
 DupeEntry = dict[str, Any]
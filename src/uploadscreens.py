@@ -17,10 +17,17 @@ import pyimgbox
 from typing_extensions import TypeAlias
 
 from src.console import console
+from src.httpclients import HTTPPoolRegistry
 
 Meta: TypeAlias = dict[str, Any]
 ImageDict: TypeAlias = dict[str, Any]
 
+# Concurrent uploads allowed per host, hosts not listed take every image at once
+HOST_UPLOAD_LIMITS = {"onlyimage": 6, "ptscreens": 6, "lensdump": 1, "passtheimage": 6}
+
+# Keep-alive connection pools shared by every upload to the same host during a run
+image_host_clients = HTTPPoolRegistry("image host", max_connections=12, connection_limits=HOST_UPLOAD_LIMITS, timeout=60.0)
+
 
 class UploadScreensManager:
     def __init__(self, config: dict[str, Any]) -> None:
@@ -38,6 +45,7 @@ class UploadScreensManager:
         retry_mode: bool = False,
         max_retries: int = 3,
         allowed_hosts: Union[list[str], None] = None,
+        skip_files: Sequence[str] = (),
     ) -> tuple[list[ImageDict], int]:
         return await _upload_screens(
             self.config,
@@ -51,9 +59,83 @@ class UploadScreensManager:
             retry_mode=retry_mode,
             max_retries=max_retries,
             allowed_hosts=allowed_hosts,
+            skip_files=skip_files,
         )
 
 
+class ScreenshotUploadStream:
+    """
+    Uploads screenshots while takescreens.screenshots is still capturing the rest.
+
+    The capture side calls `put()` for every image that passed its size check; each image is
+    uploaded to the current `meta['imghost']` as soon as it arrives. `finish()` closes the
+    stream, waits for the outstanding uploads and returns the images in frame order. Host
+    switching and retries across hosts stay with upload_screens, which the caller falls back
+    to when the stream did not produce enough images.
+    """
+
+    def __init__(self, config: dict[str, Any], meta: Meta) -> None:
+        self.config = config
+        self.meta = meta
+        self.img_host = str(meta.get('imghost') or config.get('DEFAULT', {}).get('img_host_1') or '')
+        self.queue: asyncio.Queue[Optional[tuple[int, str]]] = asyncio.Queue()
+        self.semaphore = asyncio.Semaphore(HOST_UPLOAD_LIMITS.get(self.img_host, max(1, int(meta.get('screens') or 1))))
+        self.running_tasks: set[asyncio.Task[dict[str, Any]]] = set()
+        self._uploads: list[asyncio.Task[Union[tuple[int, dict[str, Any]], None]]] = []
+        # Local screenshots uploaded successfully, for upload_screens to skip when topping up
+        self.uploaded_files: list[str] = []
+        self._consumer = asyncio.create_task(self._consume())
+
+    def put(self, index: int, image_path: str) -> None:
+        self.queue.put_nowait((index, image_path))
+
+    async def _consume(self) -> None:
+        while True:
+            item = await self.queue.get()
+            if item is None:
+                return
+            index, image_path = item
+            if self.meta.get('debug'):
+                console.print(f"[blue]Streaming screenshot {index} to {self.img_host}: {image_path}[/blue]")
+            task = (index, image_path, self.img_host, self.config, self.meta)
+            self._uploads.append(asyncio.create_task(upload_with_retries(task, self.semaphore, self.running_tasks)))
+
+    async def finish(self) -> list[ImageDict]:
+        self.queue.put_nowait(None)
+        try:
+            await self._consumer
+            upload_results = await asyncio.gather(*self._uploads)
+        except asyncio.CancelledError:
+            for upload in self._uploads:
+                upload.cancel()
+            for task in self.running_tasks:
+                task.cancel()
+            raise
+
+        results = sorted((res for res in upload_results if res is not None), key=lambda x: x[0])
+        image_sizes = cast(dict[str, Any], self.meta.setdefault('image_sizes', {}))
+        images: list[ImageDict] = []
+        for _index, upload in results:
+            if upload.get('status') != 'success':
+                continue
+            images.append({
+                'img_url': upload['img_url'],
+                'raw_url': upload['raw_url'],
+                'web_url': upload['web_url'],
+            })
+            local_file_path = upload.get('local_file_path')
+            if local_file_path:
+                self.uploaded_files.append(local_file_path)
+                size = await asyncio.to_thread(_file_size, local_file_path)
+                if size is not None:
+                    image_sizes[upload['raw_url']] = size
+        return images
+
+
+def _file_size(path: str) -> Optional[int]:
+    return os.path.getsize(path) if os.path.exists(path) else None
+
+
 async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
     image, img_host, config, meta = args
     try:
@@ -90,7 +172,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
                 return {'status': 'failed', 'reason': 'Missing ptpimg API key in config'}
 
             try:
-                async with httpx.AsyncClient() as client:
+                async with image_host_clients.client(img_host) as client:
                     async with aiofiles.open(image, 'rb') as file:
                         files = {'file-upload[0]': (os.path.basename(image), await file.read())}
                         headers = {'referer': 'https://ptpimg.me/index.php'}
@@ -140,7 +222,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
                     'image': encoded_image,
                 }
 
-                async with httpx.AsyncClient() as client:
+                async with image_host_clients.client(img_host) as client:
                     response = await client.post(url, data=data, timeout=timeout)
                     response_data = response.json()
                     if response.status_code != 200 or not response_data.get('success'):
@@ -178,7 +260,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
                     'key': config['DEFAULT']['dalexni_api'],
                     'image': encoded_image,
                 }
-                async with httpx.AsyncClient() as client:
+                async with image_host_clients.client(img_host) as client:
                     response = await client.post(url, data=data, timeout=timeout)
                     response_data = response.json()
                     if response.status_code != 200 or not response_data.get('success'):
@@ -213,7 +295,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
                     'X-API-Key': config['DEFAULT']['ptscreens_api']
                 }
 
-                async with httpx.AsyncClient() as client, aiofiles.open(image, 'rb') as file:
+                async with image_host_clients.client(img_host) as client, aiofiles.open(image, 'rb') as file:
                     files = {
                         'source': ('file-upload[0]', await file.read())
                     }
@@ -255,7 +337,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
                     'X-API-Key': config['DEFAULT']['utppm_api'],
                 }
 
-                async with httpx.AsyncClient() as client:
+                async with image_host_clients.client(img_host) as client:
                     response = await client.post(url, data=data, headers=headers, timeout=timeout)
                     response_data = response.json()
 
@@ -293,7 +375,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
                     'X-API-Key': config['DEFAULT']['onlyimage_api'],
                 }
 
-                async with httpx.AsyncClient() as client:
+                async with image_host_clients.client(img_host) as client:
                     response = await client.post(url, data=data, headers=headers, timeout=timeout)
                     response_data = response.json()
 
@@ -326,7 +408,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
                     'max_th_size': 350
                 }
 
-                async with httpx.AsyncClient() as client, aiofiles.open(image, 'rb') as file:
+                async with image_host_clients.client(img_host) as client, aiofiles.open(image, 'rb') as file:
                     files = {
                         'img': ('file-upload[0]', await file.read())
                     }
@@ -372,7 +454,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
                 headers = {
                     'X-API-Key': config['DEFAULT']['lensdump_api']
                 }
-                async with httpx.AsyncClient() as client:
+                async with image_host_clients.client(img_host) as client:
                     response = await client.post(url, data=data, headers=headers, timeout=timeout)
                     response_data = response.json()
                     if response_data.get('status_code') == 200:
@@ -405,7 +487,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
                     'Authorization': f'{api_key}',
                 }
 
-                async with httpx.AsyncClient() as client:
+                async with image_host_clients.client(img_host) as client:
                     response = await client.post(url, files={'file': (filename, file_bytes)}, headers=headers, timeout=timeout)
                     if response.status_code == 200:
                         response_data = response.json()
@@ -448,7 +530,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
                     'X-API-Key': pass_api_key
                 }
 
-                async with httpx.AsyncClient() as client, aiofiles.open(image, 'rb') as img_file:
+                async with image_host_clients.client(img_host) as client, aiofiles.open(image, 'rb') as img_file:
                     files = {'source': (os.path.basename(image), await img_file.read())}
                     response = await client.post(url, headers=headers, files=files, timeout=timeout)
 
@@ -499,7 +581,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
             try:
                 headers = {'Authorization': f'Bearer {api_key}'}
 
-                async with httpx.AsyncClient() as client, aiofiles.open(image, 'rb') as img_file:
+                async with image_host_clients.client(img_host) as client, aiofiles.open(image, 'rb') as img_file:
                     files = {'files[]': (os.path.basename(image), await img_file.read())}
 
                     response = await client.post(url, headers=headers, files=files, timeout=timeout)
@@ -559,7 +641,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
                 headers = {'Authorization': f'{api_key}'}
                 data = {'title': 'Upload-Assistant screenshot'}
 
-                async with httpx.AsyncClient() as client, aiofiles.open(image, 'rb') as img_file:
+                async with image_host_clients.client(img_host) as client, aiofiles.open(image, 'rb') as img_file:
                     files = {'file': (os.path.basename(image), await img_file.read())}
                     response = await client.post(url, headers=headers, data=data, files=files, timeout=timeout)
 
@@ -623,6 +705,81 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
         }
 
 
+async def upload_with_retries(
+    task: tuple[int, str, str, dict[str, Any], dict[str, Any]],
+    semaphore: asyncio.Semaphore,
+    running_tasks: set[asyncio.Task[dict[str, Any]]],
+    max_retries: int = 3,
+) -> Union[tuple[int, dict[str, Any]], None]:
+    """Upload image with concurrency control and retry logic."""
+    index, *task_args = task
+    img_host = task[2]
+    retry_count = 0
+
+    async with semaphore:
+        while retry_count <= max_retries:
+            future: Optional[asyncio.Task[dict[str, Any]]] = None
+            try:
+                future = asyncio.create_task(upload_image_task(task_args))
+                running_tasks.add(future)
+
+                try:
+                    result = await asyncio.wait_for(future, timeout=60.0)
+                    running_tasks.discard(future)
+
+                    if result.get('status') == 'success':
+                        return (index, result)
+                    else:
+                        reason = result.get('reason', 'Unknown error')
+                        if "duplicate" in reason.lower():
+                            console.print(f"[yellow]Skipping host because duplicate image {index}: {reason}[/yellow]")
+                            return None
+                        elif "api key" in reason.lower():
+                            console.print(f"[red]API key error for {img_host}. Aborting further attempts.[/red]")
+                            return None
+                        if retry_count < max_retries:
+                            retry_count += 1
+                            console.print(f"[yellow]Retry {retry_count}/{max_retries} for image {index}: {reason}[/yellow]")
+                            await asyncio.sleep(1.1 * retry_count)
+                            continue
+                        else:
+                            console.print(f"[red]Failed to upload image {index} after {max_retries} attempts: {reason}[/red]")
+                            return None
+
+                except asyncio.TimeoutError:
+                    console.print(f"[red]Upload task {index} timed out after 60 seconds[/red]")
+                    if future in running_tasks:
+                        future.cancel()
+                        running_tasks.discard(future)
+
+                    if retry_count < max_retries:
+                        retry_count += 1
+                        console.print(f"[yellow]Retry {retry_count}/{max_retries} for image {index} after timeout[/yellow]")
+                        await asyncio.sleep(1.1 * retry_count)
+                        continue
+                    return None
+
+            except asyncio.CancelledError:
+                console.print(f"[red]Upload task {index} cancelled.[/red]")
+                if future and future in running_tasks:
+                    future.cancel()
+                    running_tasks.discard(future)
+                return None
+
+            except Exception as e:
+                console.print(f"[red]Error during upload for image {index}: {str(e)}[/red]")
+                if retry_count < max_retries:
+                    retry_count += 1
+                    console.print(f"[yellow]Retry {retry_count}/{max_retries} for image {index}: {str(e)}[/yellow]")
+                    await asyncio.sleep(1.5 * retry_count)
+                    continue
+                else:
+                    console.print(f"[red]Error during upload for image {index} after {max_retries} attempts: {str(e)}[/red]")
+                    return None
+
+    return None
+
+
 async def _upload_screens(
     config: dict[str, Any],
     meta: Meta,
@@ -634,7 +791,8 @@ async def _upload_screens(
     return_dict: dict[str, Any],
     retry_mode: bool = False,
     max_retries: int = 3,
-    allowed_hosts: Union[list[str], None] = None
+    allowed_hosts: Union[list[str], None] = None,
+    skip_files: Sequence[str] = ()
 ) -> tuple[list[ImageDict], int]:
     default_config = config.get('DEFAULT', {})
     if 'image_list' not in meta:
@@ -706,6 +864,9 @@ async def _upload_screens(
                 hidden_glob_results = await asyncio.to_thread(glob.glob, hidden_pattern)
                 unwanted_files.update(hidden_glob_results)
 
+        # Screenshots already uploaded by the caller (e.g. streamed while capturing) are not uploaded again
+        unwanted_files.update(os.path.basename(file) for file in skip_files)
+
         image_glob = [file for file in image_glob if file not in unwanted_files]
         image_glob = list(set(image_glob))
 
@@ -738,90 +899,18 @@ async def _upload_screens(
 
     # Concurrency Control
     default_pool_size = len(upload_tasks)
-    host_limits = {"onlyimage": 6, "ptscreens": 6, "lensdump": 1, "passtheimage": 6}
-    pool_size = host_limits.get(img_host, default_pool_size)
+    pool_size = HOST_UPLOAD_LIMITS.get(img_host, default_pool_size)
     max_workers = min(len(upload_tasks), pool_size)
     semaphore = asyncio.Semaphore(max_workers)
 
     # Track running tasks for cancellation
     running_tasks: set[asyncio.Task[dict[str, Any]]] = set()
 
-    async def async_upload(
-        task: tuple[int, str, str, dict[str, Any], dict[str, Any]],
-        max_retries: int = 3,
-    ) -> Union[tuple[int, dict[str, Any]], None]:
-        """Upload image with concurrency control and retry logic."""
-        index, *task_args = task
-        retry_count = 0
-
-        async with semaphore:
-            while retry_count <= max_retries:
-                future: Optional[asyncio.Task[dict[str, Any]]] = None
-                try:
-                    future = asyncio.create_task(upload_image_task(task_args))
-                    running_tasks.add(future)
-
-                    try:
-                        result = await asyncio.wait_for(future, timeout=60.0)
-                        running_tasks.discard(future)
-
-                        if result.get('status') == 'success':
-                            return (index, result)
-                        else:
-                            reason = result.get('reason', 'Unknown error')
-                            if "duplicate" in reason.lower():
-                                console.print(f"[yellow]Skipping host because duplicate image {index}: {reason}[/yellow]")
-                                return None
-                            elif "api key" in reason.lower():
-                                console.print(f"[red]API key error for {img_host}. Aborting further attempts.[/red]")
-                                return None
-                            if retry_count < max_retries:
-                                retry_count += 1
-                                console.print(f"[yellow]Retry {retry_count}/{max_retries} for image {index}: {reason}[/yellow]")
-                                await asyncio.sleep(1.1 * retry_count)
-                                continue
-                            else:
-                                console.print(f"[red]Failed to upload image {index} after {max_retries} attempts: {reason}[/red]")
-                                return None
-
-                    except asyncio.TimeoutError:
-                        console.print(f"[red]Upload task {index} timed out after 60 seconds[/red]")
-                        if future in running_tasks:
-                            future.cancel()
-                            running_tasks.discard(future)
-
-                        if retry_count < max_retries:
-                            retry_count += 1
-                            console.print(f"[yellow]Retry {retry_count}/{max_retries} for image {index} after timeout[/yellow]")
-                            await asyncio.sleep(1.1 * retry_count)
-                            continue
-                        return None
-
-                except asyncio.CancelledError:
-                    console.print(f"[red]Upload task {index} cancelled.[/red]")
-                    if future and future in running_tasks:
-                        future.cancel()
-                        running_tasks.discard(future)
-                    return None
-
-                except Exception as e:
-                    console.print(f"[red]Error during upload for image {index}: {str(e)}[/red]")
-                    if retry_count < max_retries:
-                        retry_count += 1
-                        console.print(f"[yellow]Retry {retry_count}/{max_retries} for image {index}: {str(e)}[/yellow]")
-                        await asyncio.sleep(1.5 * retry_count)
-                        continue
-                    else:
-                        console.print(f"[red]Error during upload for image {index} after {max_retries} attempts: {str(e)}[/red]")
-                        return None
-
-        return None
-
     try:
         max_retries = 3
         results: list[tuple[int, dict[str, Any]]] = []
         try:
-            upload_results = await asyncio.gather(*[async_upload(task, max_retries) for task in upload_tasks])
+            upload_results = await asyncio.gather(*[upload_with_retries(task, semaphore, running_tasks, max_retries) for task in upload_tasks])
             results = [res for res in upload_results if res is not None]
             results.sort(key=lambda x: x[0])
         except Exception as e:
@@ -844,7 +933,7 @@ async def _upload_screens(
                 console.print(f"[cyan]Switching to the next image host: {meta['imghost']}[/cyan]")
 
                 gc.collect()
-                return await _upload_screens(config, meta, screens, img_host_num, i, total_screens, custom_img_list, return_dict, retry_mode=True)
+                return await _upload_screens(config, meta, screens, img_host_num, i, total_screens, custom_img_list, return_dict, retry_mode=True, skip_files=skip_files)
             else:
                 console.print("[red]No more image hosts available. Aborting upload process.")
                 return image_list, len(image_list)
@@ -0,0 +1,278 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+import argparse
+import asyncio
+import codecs
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import IO, Any, Callable, ClassVar, Optional
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_SOCKET_PATH = BASE_DIR / "data" / "worker.sock"
+
+Emit = Callable[[dict[str, Any]], None]
+
+
+def send_message(sock: socket.socket, message: dict[str, Any]) -> None:
+    sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+def read_messages(lines: Iterable[bytes]) -> Iterator[dict[str, Any]]:
+    """Decode the newline-delimited JSON messages of a worker connection, skipping malformed lines."""
+    for line in lines:
+        try:
+            message = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(message, dict):
+            yield message
+
+
+def connect_worker(socket_path: str, timeout: float = 5.0) -> socket.socket:
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("Unix sockets are not available on this platform")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        raise
+    sock.settimeout(None)
+    return sock
+
+
+class UploadWorker:
+    """
+    Runs upload.py jobs one at a time inside a long-lived process.
+
+    upload.py and everything it imports are loaded once, so a job skips interpreter start-up
+    and the import of every dependency, and in-process caches (guessit, TMDB details, banned
+    groups, tracker classes) carry over between jobs. A job's stdout/stderr, including that of
+    the tools it spawns, is captured at the file descriptor level and streamed back; its stdin
+    is fed from the client's input messages.
+    """
+
+    def __init__(self) -> None:
+        self._job_lock = threading.Lock()
+        self._upload_main: Optional[Callable[[], Any]] = None
+
+    @property
+    def busy(self) -> bool:
+        return self._job_lock.locked()
+
+    def warm_up(self) -> None:
+        if str(BASE_DIR) not in sys.path:
+            sys.path.insert(0, str(BASE_DIR))
+        import upload
+
+        self._upload_main = upload.main
+
+    def run_job(self, argv: list[str], emit: Emit, stdin: IO[str]) -> int:
+        with self._job_lock:
+            if self._upload_main is None:
+                self.warm_up()
+            upload_main = self._upload_main
+            assert upload_main is not None  # nosec B101 - set by warm_up
+
+            sys.stdout.flush()
+            sys.stderr.flush()
+            read_fd, write_fd = os.pipe()
+            saved_stdout, saved_stderr = os.dup(1), os.dup(2)
+            os.dup2(write_fd, 1)
+            os.dup2(write_fd, 2)
+            os.close(write_fd)
+            pump = threading.Thread(target=self._pump_output, args=(read_fd, emit), name="worker-output", daemon=True)
+            pump.start()
+
+            old_stdin, old_argv = sys.stdin, sys.argv
+            sys.stdin = stdin
+            sys.argv = [str(BASE_DIR / "upload.py"), *argv]
+            code = 0
+            try:
+                asyncio.run(upload_main())
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            except BaseException as e:
+                print(f"Upload worker job failed: {e}", file=sys.stderr)
+                code = 1
+            finally:
+                sys.stdin, sys.argv = old_stdin, old_argv
+                with contextlib.suppress(Exception):
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                os.dup2(saved_stdout, 1)
+                os.dup2(saved_stderr, 2)
+                os.close(saved_stdout)
+                os.close(saved_stderr)
+                # A tool the job left running may still hold the pipe; don't wait on it forever
+                pump.join(timeout=5)
+            return code
+
+    @staticmethod
+    def _pump_output(read_fd: int, emit: Emit) -> None:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        try:
+            while True:
+                chunk = os.read(read_fd, 65536)
+                if not chunk:
+                    break
+                text = decoder.decode(chunk)
+                if text:
+                    emit({"type": "output", "data": text})
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                emit({"type": "output", "data": tail})
+        finally:
+            os.close(read_fd)
+
+
+class _JobHandler(socketserver.StreamRequestHandler):
+    worker: ClassVar[Optional[UploadWorker]] = None
+
+    def handle(self) -> None:
+        worker = self.worker
+        send_lock = threading.Lock()
+
+        def emit(message: dict[str, Any]) -> None:
+            # The client may have gone away; the job still runs to completion
+            with send_lock, contextlib.suppress(OSError):
+                send_message(self.connection, message)
+
+        messages = read_messages(self.rfile)
+        request = next(messages, None)
+        argv = request.get("argv") if request and request.get("type") == "run" else None
+        if worker is None or not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+            emit({"type": "system", "data": "Invalid job request"})
+            emit({"type": "exit", "code": 2})
+            return
+
+        in_read, in_write = os.pipe()
+
+        def forward_input() -> None:
+            # Input messages become lines on the job's stdin; eof or a disconnect closes it
+            try:
+                for message in messages:
+                    if message.get("type") == "input":
+                        os.write(in_write, f"{message.get('data', '')}\n".encode())
+                    elif message.get("type") == "eof":
+                        break
+            except OSError:
+                pass
+            finally:
+                os.close(in_write)
+
+        threading.Thread(target=forward_input, name="worker-input", daemon=True).start()
+        if worker.busy:
+            emit({"type": "system", "data": "Waiting for the running upload job to finish"})
+        with open(in_read, encoding="utf-8") as job_stdin:
+            code = worker.run_job(list(argv), emit, job_stdin)
+        emit({"type": "exit", "code": code})
+        with contextlib.suppress(OSError):
+            self.connection.shutdown(socket.SHUT_RDWR)
+
+
+def serve(socket_path: str) -> int:
+    if not hasattr(socket, "AF_UNIX"):
+        print("The upload worker needs Unix socket support, which this platform lacks.", file=sys.stderr)
+        return 1
+
+    if os.path.exists(socket_path):
+        try:
+            connect_worker(socket_path, timeout=1.0).close()
+        except OSError:
+            os.unlink(socket_path)  # left behind by a worker that didn't shut down cleanly
+        else:
+            print(f"An upload worker is already listening on {socket_path}", file=sys.stderr)
+            return 1
+
+    # Job output is relayed as it is written, not when a block buffer fills
+    for stream in (sys.stdout, sys.stderr):
+        if isinstance(stream, io.TextIOWrapper):
+            stream.reconfigure(line_buffering=True)
+
+    worker = UploadWorker()
+    print("Loading Upload Assistant...", file=sys.stderr)
+    worker.warm_up()
+    _JobHandler.worker = worker
+
+    os.makedirs(os.path.dirname(socket_path) or ".", exist_ok=True)
+    # Only the owner may submit jobs; the socket is created with owner-only permissions
+    old_umask = os.umask(0o177)
+    try:
+        server = socketserver.ThreadingUnixStreamServer(socket_path, _JobHandler)
+    finally:
+        os.umask(old_umask)
+    server.daemon_threads = True
+
+    print(f"Upload worker listening on {socket_path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        with contextlib.suppress(OSError):
+            os.unlink(socket_path)
+    return 0
+
+
+def submit(argv: list[str], socket_path: str) -> int:
+    """Run one upload on the worker, relaying this terminal's output and input."""
+    try:
+        sock = connect_worker(socket_path)
+    except OSError as e:
+        print(f"Upload worker unavailable at {socket_path}: {e}", file=sys.stderr)
+        return 1
+
+    def forward_stdin() -> None:
+        with contextlib.suppress(OSError, ValueError):
+            for line in sys.stdin:
+                send_message(sock, {"type": "input", "data": line.rstrip("\n")})
+            send_message(sock, {"type": "eof"})
+
+    try:
+        send_message(sock, {"type": "run", "argv": argv})
+        threading.Thread(target=forward_stdin, name="submit-input", daemon=True).start()
+        with sock.makefile("rb") as lines:
+            for message in read_messages(lines):
+                if message.get("type") == "output":
+                    sys.stdout.write(str(message.get("data", "")))
+                    sys.stdout.flush()
+                elif message.get("type") == "system":
+                    print(message.get("data", ""), file=sys.stderr)
+                elif message.get("type") == "exit":
+                    code = message.get("code")
+                    return code if isinstance(code, int) else 1
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        sock.close()
+    print("Upload worker closed the connection before the job finished", file=sys.stderr)
+    return 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.workerdaemon", description="Long-lived Upload Assistant worker")
+    parser.add_argument("--socket", default=os.environ.get("UA_WORKER_SOCKET", str(DEFAULT_SOCKET_PATH)), help="Unix socket path")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("serve", help="Start the worker and wait for jobs")
+    submit_parser = subparsers.add_parser("submit", help="Run upload.py with the given arguments on the worker")
+    submit_parser.add_argument("upload_args", nargs=argparse.REMAINDER, help="Arguments for upload.py, after --")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        return serve(args.socket)
+    upload_args: list[str] = args.upload_args[1:] if args.upload_args[:1] == ["--"] else args.upload_args
+    return submit(upload_args, args.socket)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+"""
+Replay of the guessit calls gather_prep makes for a movie, direct guessit against the shared
+guessit_fn cache (src/guessitcache.py). Not collected by pytest; run `python tests/bench_guessit.py`.
+"""
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import guessit  # noqa: E402
+
+from src.guessitcache import guessit_cache_info, guessit_fn  # noqa: E402
+
+TITLE_OPTIONS = {"excludes": ["country", "language"]}
+VIDEO = "The.Movie.Title.2019.1080p.BluRay.DTS-HD.MA.5.1.x264-GROUP.mkv"
+FOLDER = "The.Movie.Title.2019.1080p.BluRay.DTS-HD.MA.5.1.x264-GROUP"
+SEARCH = "The Movie Title 2019 1080p BluRay DTS HD MA 5 1 x264 GROUP"
+
+# (string, options) in the order prep, source, edition, tags, region and the id lookups ask for them
+CALLS: list[tuple[str, Optional[dict[str, Any]]]] = [
+    (VIDEO, None),
+    (FOLDER, TITLE_OPTIONS),
+    (VIDEO, None),
+    (VIDEO, None),
+    (SEARCH, TITLE_OPTIONS),
+    (VIDEO, None),
+    (FOLDER, TITLE_OPTIONS),
+    (VIDEO, None),
+    (VIDEO, None),
+    (FOLDER, TITLE_OPTIONS),
+    (VIDEO, None),
+    (SEARCH, TITLE_OPTIONS),
+    (VIDEO, None),
+    (FOLDER, TITLE_OPTIONS),
+]
+
+
+def main() -> None:
+    # guessit builds its rule engine on first use; keep that out of the "before" figure
+    guessit.guessit("Warmup.2000.mkv")  # pyright: ignore[reportUnknownMemberType]
+
+    start = time.perf_counter()
+    direct = [dict(guessit.guessit(value, options)) for value, options in CALLS]  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType]
+    before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cached = [guessit_fn(value, options) for value, options in CALLS]
+    after = time.perf_counter() - start
+
+    assert cached == direct, "guessit_fn results differ from guessit"  # nosec B101 - benchmark self-check
+    info = guessit_cache_info()
+    print(f"{len(CALLS)} calls over {len({(value, repr(options)) for value, options in CALLS})} distinct inputs")
+    print(f"  before: {before * 1000:.0f} ms")
+    print(f"  after:  {after * 1000:.0f} ms ({info.hits} hits, {info.misses} misses)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+"""
+Per-tracker meta views in process_all_trackers: copy.deepcopy(meta) against MetaOverlay
+(src/metaoverlay.py), on a synthetic BDMV-sized meta. Not collected by pytest; run
+`python tests/bench_metaoverlay.py [trackers]`.
+"""
+import copy
+import sys
+import time
+import tracemalloc
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.metaoverlay import MetaOverlay  # noqa: E402
+
+DEFAULT_TRACKERS = 25
+
+
+def synthetic_meta() -> dict[str, Any]:
+    """A meta shaped like a full BDMV run: mediainfo tracks, bdinfo playlists, discs, images and lookups."""
+    tracks = [
+        {"@type": kind, "ID": str(i), "Format": "AVC", "Title": f"Track {i}", "extra": {f"field_{n}": "x" * 40 for n in range(60)}}
+        for i, kind in enumerate(["General", "Video"] + ["Audio"] * 12 + ["Text"] * 40)
+    ]
+    playlists = [
+        {"file": f"{n:05d}.MPLS", "duration": 7200 + n, "items": [{"file": f"{m:05d}.M2TS", "size": 10 ** 9} for m in range(30)]}
+        for n in range(60)
+    ]
+    return {
+        "name": "The Movie Title 2019 1080p Blu-ray AVC DTS-HD MA 5.1-GROUP",
+        "tag": "-GROUP",
+        "trackers": [f"TRK{n}" for n in range(DEFAULT_TRACKERS)],
+        "tracker_status": {f"TRK{n}": {} for n in range(DEFAULT_TRACKERS)},
+        "mediainfo": {"media": {"track": tracks}},
+        "bdinfo": {"playlists": playlists, "files": [{"file": f"{m:05d}.M2TS", "size": 10 ** 9} for m in range(400)], "summary": "x" * 200_000},
+        "discs": [{"path": f"/media/disc{d}", "summary": "y" * 150_000, "bdinfo": {"playlists": playlists}} for d in range(2)],
+        "image_list": [{"img_url": f"https://img.host/{i}.png", "raw_url": f"https://img.host/raw/{i}.png"} for i in range(12)],
+        "imdb_info": {"title": "The Movie Title", "aka": "", "cast": [{"name": f"Actor {i}", "roles": ["x"] * 5} for i in range(300)]},
+        "tmdb_details": {"credits": {"cast": [{"name": f"Actor {i}", "character": "x" * 30} for i in range(300)]}},
+        "debug": False,
+        "unattended": True,
+    }
+
+
+def tracker_reads(view: MutableMapping[str, Any]) -> None:
+    """What a tracker check does with its view: a few reads, a rename and some status writes."""
+    _ = view["tag"], view["mediainfo"], view["imdb_info"], view.get("region")
+    view["name"] = view["name"].replace(" DUPE?", "")
+    view["tracker_status"]["TRK0"]["dupe"] = False
+    view["skipping"] = None
+
+
+def measure(label: str, make_view: Callable[[dict[str, Any]], MutableMapping[str, Any]], meta: dict[str, Any], trackers: int) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    views = [make_view(meta) for _ in range(trackers)]
+    for view in views:
+        tracker_reads(view)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<10} {elapsed * 1000:8.1f} ms, peak {peak / 1e6:6.1f} MB")
+
+
+def main() -> None:
+    trackers = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TRACKERS
+    meta = synthetic_meta()
+    print(f"{trackers} per-tracker views of a synthetic BDMV meta")
+    measure("deepcopy", copy.deepcopy, meta, trackers)
+    measure("overlay", MetaOverlay, meta, trackers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+"""
+Piece hashing throughput of PieceHasher (src/torrentcreate.py) against torf's Torrent.generate,
+on a temporary file, checking both produce the same pieces. Not collected by pytest; run
+`python tests/bench_piecehasher.py [size_mib] [piece_mib]`.
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from torf import Torrent  # noqa: E402
+
+from src.torrentcreate import PieceHasher  # noqa: E402
+
+DEFAULT_SIZE_MIB = 512
+DEFAULT_PIECE_MIB = 4
+
+
+def main() -> None:
+    size_mib = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE_MIB
+    piece_mib = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_PIECE_MIB
+    with tempfile.TemporaryDirectory() as tmp:
+        content = os.path.join(tmp, "content.mkv")
+        with open(content, "wb") as f:
+            for _ in range(size_mib):
+                f.write(os.urandom(1024 * 1024))
+
+        torrent = Torrent(content, piece_size=piece_mib * 1024 * 1024, private=True)
+        start = time.perf_counter()
+        torrent.generate()
+        torf_seconds = time.perf_counter() - start
+        torf_pieces = torrent.metainfo["info"]["pieces"]
+
+        hasher = PieceHasher(torrent)
+        start = time.perf_counter()
+        pieces = hasher.hash()
+        hasher_seconds = time.perf_counter() - start
+
+    assert pieces == torf_pieces, "PieceHasher pieces differ from torf"  # nosec B101 - benchmark self-check
+    print(f"{size_mib} MiB, {piece_mib} MiB pieces, {hasher.threads} hasher thread(s), {os.cpu_count()} CPU(s)")
+    print(f"  torf:        {size_mib / torf_seconds:7.0f} MiB/s")
+    print(f"  PieceHasher: {size_mib / hasher_seconds:7.0f} MiB/s")
+
+
+if __name__ == "__main__":
+    main()
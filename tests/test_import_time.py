@@ -0,0 +1,40 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+"""Importing the tracker setup must not pull in every tracker module (see src/trackerregistry.py)."""
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+# Cumulative import budget for src.trackersetup; eager tracker imports took ~0.9 s, lazy ones ~0.35 s
+TRACKERSETUP_IMPORT_BUDGET_US = 1_500_000
+
+IMPORT_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def _import_times(module: str) -> dict[str, int]:
+    """Cumulative import time in microseconds of every module `module` loads, from -X importtime."""
+    result = subprocess.run(  # noqa: S603 - fixed interpreter and arguments
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE_RE.match(line)
+        if match:
+            times[match.group(4)] = int(match.group(2))
+    return times
+
+
+def test_trackersetup_loads_only_common_tracker() -> None:
+    times = _import_times("src.trackersetup")
+    tracker_modules = sorted(name for name in times if name.startswith("src.trackers."))
+    assert tracker_modules == ["src.trackers.COMMON"]
+
+
+def test_trackersetup_import_budget() -> None:
+    times = _import_times("src.trackersetup")
+    assert times["src.trackersetup"] < TRACKERSETUP_IMPORT_BUDGET_US
@@ -2,6 +2,7 @@
 # Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
 import asyncio
 import contextlib
+import copy
 import filecmp
 import gc
 import json
@@ -21,7 +22,6 @@ from typing import Any, Optional, cast
 import aiofiles
 import cli_ui
 import discord
-import requests
 from packaging import version
 from torf import Torrent
 from typing_extensions import TypeAlias
@@ -39,20 +39,23 @@ from src.dupe_checking import DupeChecker
 from src.get_desc import gen_desc
 from src.get_name import NameManager
 from src.get_tracker_data import TrackerDataManager
+from src.httpclients import close_pools
 from src.languages import languages_manager
 from src.nfo_link import NfoLinkManager
 from src.qbitwait import Wait
 from src.queuemanage import QueueManager
+from src.queuepipeline import LogWriter, QueuePipeline, pipeline_stage, reserve_queue_upload
+from src.runcontext import run_argv
 from src.takescreens import TakeScreensManager
 from src.torrentcreate import TorrentCreator
 from src.trackerhandle import process_trackers
-from src.trackers.AR import AR
+from src.trackerregistry import api_trackers, http_trackers, other_api_trackers, tracker_class_map
 from src.trackers.COMMON import COMMON
-from src.trackers.PTP import PTP
-from src.trackersetup import TRACKER_SETUP, api_trackers, http_trackers, other_api_trackers, tracker_class_map
+from src.trackersetup import TRACKER_SETUP
 from src.trackerstatus import TrackerStatusManager
+from src.updatecheck import cancel_update_checks, load_update_check, schedule_update_check
 from src.uphelper import UploadHelper
-from src.uploadscreens import UploadScreensManager
+from src.uploadscreens import ScreenshotUploadStream, UploadScreensManager
 
 cli_ui.setup(color='always', title="Upload Assistant")
 base_dir = os.path.abspath(os.path.dirname(__file__))
@@ -457,7 +460,8 @@ async def process_meta(meta: Meta, base_dir: str, bot: Any = None) -> None:
             console.print("[yellow]Running in Auto Mode")
     prep = Prep(screens=meta['screens'], img_host=meta['imghost'], config=config)
     try:
-        meta = await prep.gather_prep(meta=meta, mode='cli')
+        async with pipeline_stage('metadata'):
+            meta = await prep.gather_prep(meta=meta, mode='cli')
     except Exception as e:
         console.print(f"Error in gather_prep: {e}")
         console.print(traceback.format_exc())
@@ -562,7 +566,7 @@ async def process_meta(meta: Meta, base_dir: str, bot: Any = None) -> None:
         # Carry original args over, let parse handle duplicates
         meta, _help, _before_args = cast(
             tuple[Meta, Any, Any],
-            parser.parse(list(' '.join(sys.argv[1:]).split(' ')) + list(editargs_tracking), meta)
+            parser.parse(list(' '.join(run_argv()[1:]).split(' ')) + list(editargs_tracking), meta)
         )
         if not meta.get('trackers'):
             meta['trackers'] = previous_trackers
@@ -713,6 +717,12 @@ async def process_meta(meta: Meta, base_dir: str, bot: Any = None) -> None:
             meta['we_are_uploading'] = False
             return
 
+        # Claim the limit_queue slot before screenshots and image hosts, so items past the limit stop before any network work
+        if not reserve_queue_upload(meta):
+            meta['queue_limit_reached'] = True
+            meta['we_are_uploading'] = False
+            return
+
         filename: str = meta.get('title', '')
         bdmv_filename = meta.get('filename', '')
         bdinfo = meta.get('bdinfo', '')
@@ -788,99 +798,123 @@ async def process_meta(meta: Meta, base_dir: str, bot: Any = None) -> None:
                     elif meta.get('path_to_menu_screenshots', ""):
                         await process_disc_menus(meta, config)
 
-                # Take Screenshots
-                try:
-                    if meta['is_disc'] == "BDMV":
-                        use_vs = meta.get('vapoursynth', False)
-                        try:
-                            await takescreens_manager.disc_screenshots(
-                                meta, bdmv_filename, bdinfo, meta['uuid'], base_dir, use_vs,
-                                meta.get('image_list', []), meta.get('ffdebug', False), 0
-                            )
-                        except asyncio.CancelledError as e:
-                            await cleanup_screenshot_temp_files(meta)
-                            await asyncio.sleep(0.1)
-                            await cleanup_manager.cleanup()
-                            gc.collect()
-                            cleanup_manager.reset_terminal()
-                            raise Exception("Error during screenshot capture") from e
-                        except Exception as e:
-                            await cleanup_screenshot_temp_files(meta)
-                            await asyncio.sleep(0.1)
-                            await cleanup_manager.cleanup()
-                            gc.collect()
-                            cleanup_manager.reset_terminal()
-                            raise Exception(f"Error during screenshot capture: {e}") from e
+                # Pick the image host before capturing, so screenshots can be uploaded as they are taken
+                upload_images = len(meta.get('image_list', [])) < int(meta.get('cutoff') or 1) and meta.get('skip_imghost_upload', False) is False
+                relevant_trackers: list[str] = []
+                allowed_hosts: Optional[list[str]] = None
+                if upload_images:
+                    relevant_trackers, allowed_hosts = select_image_host(meta)
+                streamed_images: list[dict[str, Any]] = []
+                streamed_files: list[str] = []
 
-                    elif meta['is_disc'] == "DVD":
-                        try:
-                            await takescreens_manager.dvd_screenshots(
-                                meta,
-                                disc_num=0,
-                                num_screens=0,
-                                retry_cap=False
-                            )
-                        except asyncio.CancelledError as e:
-                            await cleanup_screenshot_temp_files(meta)
-                            await asyncio.sleep(0.1)
-                            await cleanup_manager.cleanup()
-                            gc.collect()
-                            cleanup_manager.reset_terminal()
-                            raise Exception("Error during screenshot capture") from e
-                        except Exception as e:
-                            await cleanup_screenshot_temp_files(meta)
-                            await asyncio.sleep(0.1)
-                            await cleanup_manager.cleanup()
-                            gc.collect()
-                            cleanup_manager.reset_terminal()
-                            raise Exception(f"Error during screenshot capture: {e}") from e
+                # Take Screenshots
+                async with pipeline_stage('screenshots'):
+                    try:
+                        if meta['is_disc'] == "BDMV":
+                            use_vs = meta.get('vapoursynth', False)
+                            try:
+                                await takescreens_manager.disc_screenshots(
+                                    meta, bdmv_filename, bdinfo, meta['uuid'], base_dir, use_vs,
+                                    meta.get('image_list', []), meta.get('ffdebug', False), 0
+                                )
+                            except asyncio.CancelledError as e:
+                                await cleanup_screenshot_temp_files(meta)
+                                await asyncio.sleep(0.1)
+                                await cleanup_manager.cleanup()
+                                gc.collect()
+                                cleanup_manager.reset_terminal()
+                                raise Exception("Error during screenshot capture") from e
+                            except Exception as e:
+                                await cleanup_screenshot_temp_files(meta)
+                                await asyncio.sleep(0.1)
+                                await cleanup_manager.cleanup()
+                                gc.collect()
+                                cleanup_manager.reset_terminal()
+                                raise Exception(f"Error during screenshot capture: {e}") from e
+
+                        elif meta['is_disc'] == "DVD":
+                            try:
+                                await takescreens_manager.dvd_screenshots(
+                                    meta,
+                                    disc_num=0,
+                                    num_screens=0,
+                                    retry_cap=False
+                                )
+                            except asyncio.CancelledError as e:
+                                await cleanup_screenshot_temp_files(meta)
+                                await asyncio.sleep(0.1)
+                                await cleanup_manager.cleanup()
+                                gc.collect()
+                                cleanup_manager.reset_terminal()
+                                raise Exception("Error during screenshot capture") from e
+                            except Exception as e:
+                                await cleanup_screenshot_temp_files(meta)
+                                await asyncio.sleep(0.1)
+                                await cleanup_manager.cleanup()
+                                gc.collect()
+                                cleanup_manager.reset_terminal()
+                                raise Exception(f"Error during screenshot capture: {e}") from e
 
-                    else:
-                        try:
-                            if meta['debug']:
-                                console.print(f"videopath: {videopath}, filename: {filename}, meta: {meta['uuid']}, base_dir: {base_dir}, manual_frames: {manual_frames}")
-
-                            await takescreens_manager.screenshots(
-                                videopath, filename, meta['uuid'], base_dir, meta,
-                                manual_frames=manual_frames  # Pass additional kwargs directly
-                            )
-                        except asyncio.CancelledError as e:
-                            await cleanup_screenshot_temp_files(meta)
-                            await asyncio.sleep(0.1)
-                            await cleanup_manager.cleanup()
-                            gc.collect()
-                            cleanup_manager.reset_terminal()
-                            raise Exception("Error during screenshot capture") from e
-                        except Exception as e:
-                            console.print(traceback.format_exc())
-                            await cleanup_screenshot_temp_files(meta)
-                            await asyncio.sleep(0.1)
-                            await cleanup_manager.cleanup()
-                            gc.collect()
-                            cleanup_manager.reset_terminal()
-                            if "workers" in str(e):
-                                console.print("[red]max workers issue, see https://github.com/Audionut/Upload-Assistant/wiki/ffmpeg---max-workers-issues[/red]")
-                            raise Exception(f"Error during screenshot capture: {e}") from e
-
-                except asyncio.CancelledError as e:
-                    await cleanup_screenshot_temp_files(meta)
-                    await asyncio.sleep(0.1)
-                    await cleanup_manager.cleanup()
-                    gc.collect()
-                    cleanup_manager.reset_terminal()
-                    raise Exception("Error during screenshot capture") from e
-                except Exception as e:
-                    await cleanup_screenshot_temp_files(meta)
-                    await asyncio.sleep(0.1)
-                    await cleanup_manager.cleanup()
-                    gc.collect()
-                    cleanup_manager.reset_terminal()
-                    raise Exception("Error during screenshot capture") from e
-                finally:
-                    await asyncio.sleep(0.1)
-                    await cleanup_manager.cleanup()
-                    gc.collect()
-                    cleanup_manager.reset_terminal()
+                        else:
+                            try:
+                                if meta['debug']:
+                                    console.print(f"videopath: {videopath}, filename: {filename}, meta: {meta['uuid']}, base_dir: {base_dir}, manual_frames: {manual_frames}")
+
+                                upload_stream: Optional[ScreenshotUploadStream] = None
+                                if (
+                                    upload_images
+                                    and config['DEFAULT'].get('stream_screenshot_uploads', True)
+                                    and (allowed_hosts is None or meta.get('imghost') in allowed_hosts)
+                                ):
+                                    upload_stream = ScreenshotUploadStream(config, meta)
+
+                                # Deferred so the cleanup at the end of screenshots() doesn't cancel the streamed uploads
+                                with cleanup_manager.deferred():
+                                    await takescreens_manager.screenshots(
+                                        videopath, filename, meta['uuid'], base_dir, meta,
+                                        manual_frames=manual_frames,  # Pass additional kwargs directly
+                                        upload_stream=upload_stream
+                                    )
+                                    if upload_stream is not None:
+                                        streamed_images = await upload_stream.finish()
+                                        streamed_files = upload_stream.uploaded_files
+                            except asyncio.CancelledError as e:
+                                await cleanup_screenshot_temp_files(meta)
+                                await asyncio.sleep(0.1)
+                                await cleanup_manager.cleanup()
+                                gc.collect()
+                                cleanup_manager.reset_terminal()
+                                raise Exception("Error during screenshot capture") from e
+                            except Exception as e:
+                                console.print(traceback.format_exc())
+                                await cleanup_screenshot_temp_files(meta)
+                                await asyncio.sleep(0.1)
+                                await cleanup_manager.cleanup()
+                                gc.collect()
+                                cleanup_manager.reset_terminal()
+                                if "workers" in str(e):
+                                    console.print("[red]max workers issue, see https://github.com/Audionut/Upload-Assistant/wiki/ffmpeg---max-workers-issues[/red]")
+                                raise Exception(f"Error during screenshot capture: {e}") from e
+
+                    except asyncio.CancelledError as e:
+                        await cleanup_screenshot_temp_files(meta)
+                        await asyncio.sleep(0.1)
+                        await cleanup_manager.cleanup()
+                        gc.collect()
+                        cleanup_manager.reset_terminal()
+                        raise Exception("Error during screenshot capture") from e
+                    except Exception as e:
+                        await cleanup_screenshot_temp_files(meta)
+                        await asyncio.sleep(0.1)
+                        await cleanup_manager.cleanup()
+                        gc.collect()
+                        cleanup_manager.reset_terminal()
+                        raise Exception("Error during screenshot capture") from e
+                    finally:
+                        await asyncio.sleep(0.1)
+                        await cleanup_manager.cleanup()
+                        gc.collect()
+                        cleanup_manager.reset_terminal()
 
                 if 'image_list' not in meta:
                     meta['image_list'] = []
@@ -894,197 +928,110 @@ async def process_meta(meta: Meta, base_dir: str, bot: Any = None) -> None:
                     manual_frames_count = 0
                 if manual_frames_count > 0:
                     meta['screens'] = manual_frames_count
-                cutoff = int(meta.get('cutoff') or 1)
-                if len(meta.get('image_list', [])) < cutoff and meta.get('skip_imghost_upload', False) is False:
-                    # Validate and (if needed) rehost images to tracker-approved hosts before uploading any new screenshots.
-                    trackers_with_image_host_requirements = {'A4K', 'BHD', 'DC', 'GPW', 'HUNO', 'MTV', 'OE', 'PTP', 'STC', 'TVC'}
-
-                    relevant_trackers = [
-                        t for t in cast(list[Any], meta.get('trackers', []))
-                        if isinstance(t, str) and t in trackers_with_image_host_requirements and t in tracker_class_map
-                    ]
+                if upload_images:
+                    if meta.get('debug'):
+                        image_list_for_debug = cast(list[Any], meta.get('image_list') or [])
+                        console.print(
+                            f"[cyan]Image host debug: pre-upload_screens meta['imghost']={meta.get('imghost')} image_list={len(image_list_for_debug)} cutoff={meta.get('cutoff')} screens={meta.get('screens')}[/cyan]"  # noqa: E501
+                        )
 
-                    # If all relevant trackers share exactly one common approved host that the user has configured,
-                    # and it's not the initially selected host, switch meta['imghost'] to that common host.
-                    # If multiple common hosts exist, pick the first by config priority (img_host_1..img_host_9).
-                    allowed_hosts: Optional[list[str]] = None
-                    if relevant_trackers:
+                    async with pipeline_stage('image_upload'):
+                        return_dict: dict[str, Any] = {}
                         try:
-                            tracker_instances = {
-                                tracker_name: tracker_class_map[tracker_name](config=config)
-                                for tracker_name in relevant_trackers
-                            }
-
-                            if meta.get('debug'):
-                                console.print(f"[cyan]Image host debug: meta['imghost']={meta.get('imghost')} img_host_1={config['DEFAULT'].get('img_host_1')}[/cyan]")
-                                console.print(f"[cyan]Image host debug: relevant_trackers={relevant_trackers}[/cyan]")
-
                             default_cfg_obj = config.get('DEFAULT', {})
-                            default_cfg: dict[str, Any] = cast(dict[str, Any], default_cfg_obj) if isinstance(default_cfg_obj, dict) else {}
-                            configured_hosts: list[str] = []
+                            default_cfg = cast(dict[str, Any], default_cfg_obj) if isinstance(default_cfg_obj, dict) else {}
+                            min_successful_uploads = int(default_cfg.get('min_successful_image_uploads', 3))
+                            host_order: list[str] = []
                             for host_index in range(1, 10):
                                 host_key = f'img_host_{host_index}'
-                                if host_key in default_cfg:
-                                    host = default_cfg.get(host_key)
-                                    if host and host not in configured_hosts:
-                                        configured_hosts.append(str(host))
-
-                            if meta.get('debug'):
-                                console.print(f"[cyan]Image host debug: configured_hosts={configured_hosts}[/cyan]")
-
-                            approved_sets: list[set[str]] = []
-                            all_known = True
-                            for tracker_name in relevant_trackers:
-                                tracker_instance = tracker_instances[tracker_name]
-                                approved_hosts = getattr(tracker_instance, 'approved_image_hosts', None)
-                                if not approved_hosts:
-                                    all_known = False
-                                    break
-                                if isinstance(approved_hosts, (list, set, tuple)):
-                                    approved_hosts_list = [
-                                        str(host)
-                                        for host in cast(Iterable[Any], approved_hosts)
-                                    ]
-                                    approved_sets.append(set(approved_hosts_list))
-                                else:
-                                    all_known = False
-                                    break
+                                host = default_cfg.get(host_key)
+                                if host and host not in host_order:
+                                    host_str = str(host)
+                                    if allowed_hosts is None or host_str in allowed_hosts:
+                                        host_order.append(host_str)
+
+                            current_img_host = str(meta.get('imghost') or default_cfg.get('img_host_1') or '')
+                            if (
+                                current_img_host
+                                and current_img_host not in host_order
+                                and (allowed_hosts is None or current_img_host in allowed_hosts)
+                            ):
+                                host_order.insert(0, current_img_host)
+
+                            if not host_order and allowed_hosts:
+                                host_order = list(allowed_hosts)
+
+                            start_index = host_order.index(current_img_host) if current_img_host in host_order else 0
+                            image_list_count = 0
+
+                            image_list = cast(list[dict[str, Any]], meta.get('image_list') or [])
+                            existing_count = len([img for img in image_list if img.get('img_url') and img.get('web_url')])
+                            if streamed_images:
+                                known_urls = {img.get('raw_url') for img in image_list}
+                                image_list.extend(img for img in streamed_images if img['raw_url'] not in known_urls)
+                                meta['image_list'] = image_list
+                            if streamed_images and existing_count + len(streamed_images) >= int(meta['screens']):
+                                # Every screenshot was uploaded while capturing, nothing left for upload_screens
+                                console.print(f"[green]Successfully obtained and uploaded {len(streamed_images)} images.")
+                                start_index = len(host_order)
+                                image_list_count = len(image_list)
+                            elif streamed_images:
+                                console.print(
+                                    f"[yellow]Only {len(streamed_images)} screenshots were uploaded while capturing; "
+                                    "uploading the rest.[/yellow]"
+                                )
 
+                            for idx in range(start_index, len(host_order)):
+                                meta['imghost'] = host_order[idx]
+                                await uploadscreens_manager.upload_screens(
+                                    meta, meta['screens'], 1, 0, meta['screens'], [], return_dict=return_dict, allowed_hosts=allowed_hosts,
+                                    skip_files=streamed_files
+                                )
+                                image_list_count = len(meta.get('image_list', []) or [])
                                 if meta.get('debug'):
                                     console.print(
-                                        f"[cyan]Image host debug: {tracker_name}.approved_image_hosts={approved_hosts_list}[/cyan]"
+                                        f"[cyan]Image host debug: post-upload_screens image_list={image_list_count}[/cyan]"
                                     )
 
-                            if all_known and approved_sets and configured_hosts:
-                                common_hosts: set[str] = set()
-                                for host_set in approved_sets:
-                                    if not common_hosts:
-                                        common_hosts = set(host_set)
-                                    else:
-                                        common_hosts &= host_set
-                                common_configured_hosts = [h for h in configured_hosts if h in common_hosts]
+                                if image_list_count >= min_successful_uploads:
+                                    break
 
-                                if meta.get('debug'):
-                                    console.print(f"[cyan]Image host debug: common_hosts={sorted(common_hosts)}[/cyan]")
-                                    console.print(f"[cyan]Image host debug: common_configured_hosts={common_configured_hosts}[/cyan]")
-
-                                # If we have any common hosts, use them as allowed_hosts for upload_screens
-                                if common_configured_hosts:
-                                    allowed_hosts = common_configured_hosts
-                                elif common_hosts:
-                                    allowed_hosts = sorted(common_hosts)
-
-                                # Prefer the user-selected host if it's valid for all relevant trackers; otherwise
-                                # fall back to the first common configured host by config priority (img_host_1..img_host_9).
-                                current_img_host = str(meta.get('imghost') or config['DEFAULT'].get('img_host_1') or "")
-                                preferred_host: Optional[str] = None
-
-                                if common_configured_hosts and current_img_host not in common_configured_hosts:
-                                    preferred_host = common_configured_hosts[0]
-                                elif common_hosts and current_img_host not in common_hosts:
-                                    preferred_host = sorted(common_hosts)[0]
-
-                                if preferred_host and preferred_host != meta.get('imghost'):
-                                    if meta.get('debug'):
-                                        console.print(
-                                            f"[cyan]Image host debug: current host '{current_img_host}' is not common to all trackers; "
-                                            f"switching meta['imghost'] from '{meta.get('imghost')}' to '{preferred_host}'.[/cyan]"
-                                        )
-                                    meta['imghost'] = preferred_host
+                                if idx + 1 < len(host_order):
+                                    console.print(
+                                        f"[yellow]Only {image_list_count} images uploaded; minimum is {min_successful_uploads}. "
+                                        f"Switching to next host: {host_order[idx + 1]}[/yellow]"
+                                    )
 
-                            elif meta.get('debug'):
-                                console.print(
-                                    f"[cyan]Image host debug: cannot compute common host (all_known={all_known}, approved_sets={len(approved_sets)}, configured_hosts={len(configured_hosts)}).[/cyan]"
+                            if image_list_count < min_successful_uploads:
+                                raise Exception(
+                                    f"Minimum of {min_successful_uploads} successful image uploads required, but only "
+                                    f"{image_list_count} were uploaded."
                                 )
 
+                            # Now that image_list exists, populate tracker-specific keys (and only reupload if required)
+                            for tracker_name in relevant_trackers:
+                                tracker_instance = tracker_class_map[tracker_name](config=config)
+                                if meta.get('debug'):
+                                    key = f"{tracker_name}_images_key"
+                                    console.print(
+                                        f"[cyan]Image host debug: post-upload before {tracker_name}.check_image_hosts() image_list={len(meta.get('image_list', []) or [])} {key}={len(meta.get(key, []) or [])}[/cyan]"  # noqa: E501
+                                    )
+                                await tracker_instance.check_image_hosts(meta)
+                                if meta.get('debug'):
+                                    key = f"{tracker_name}_images_key"
+                                    console.print(
+                                        f"[cyan]Image host debug: post-upload after  {tracker_name}.check_image_hosts() image_list={len(meta.get('image_list', []) or [])} {key}={len(meta.get(key, []) or [])}[/cyan]"  # noqa: E501
+                                    )
+                        except asyncio.CancelledError:
+                            console.print("\n[red]Upload process interrupted! Cancelling tasks...[/red]")
+                            return
                         except Exception as e:
-                            if meta.get('debug'):
-                                console.print(f"[yellow]Could not determine a common approved image host: {e}[/yellow]")
-
-                    if meta.get('debug'):
-                        image_list_for_debug = cast(list[Any], meta.get('image_list') or [])
-                        console.print(
-                            f"[cyan]Image host debug: pre-upload_screens meta['imghost']={meta.get('imghost')} image_list={len(image_list_for_debug)} cutoff={meta.get('cutoff')} screens={meta.get('screens')}[/cyan]"  # noqa: E501
-                        )
-
-                    return_dict: dict[str, Any] = {}
-                    try:
-                        default_cfg_obj = config.get('DEFAULT', {})
-                        default_cfg = cast(dict[str, Any], default_cfg_obj) if isinstance(default_cfg_obj, dict) else {}
-                        min_successful_uploads = int(default_cfg.get('min_successful_image_uploads', 3))
-                        host_order: list[str] = []
-                        for host_index in range(1, 10):
-                            host_key = f'img_host_{host_index}'
-                            host = default_cfg.get(host_key)
-                            if host and host not in host_order:
-                                host_str = str(host)
-                                if allowed_hosts is None or host_str in allowed_hosts:
-                                    host_order.append(host_str)
-
-                        current_img_host = str(meta.get('imghost') or default_cfg.get('img_host_1') or '')
-                        if (
-                            current_img_host
-                            and current_img_host not in host_order
-                            and (allowed_hosts is None or current_img_host in allowed_hosts)
-                        ):
-                            host_order.insert(0, current_img_host)
-
-                        if not host_order and allowed_hosts:
-                            host_order = list(allowed_hosts)
-
-                        start_index = host_order.index(current_img_host) if current_img_host in host_order else 0
-                        image_list_count = 0
-
-                        for idx in range(start_index, len(host_order)):
-                            meta['imghost'] = host_order[idx]
-                            await uploadscreens_manager.upload_screens(
-                                meta, meta['screens'], 1, 0, meta['screens'], [], return_dict=return_dict, allowed_hosts=allowed_hosts
-                            )
-                            image_list_count = len(meta.get('image_list', []) or [])
-                            if meta.get('debug'):
-                                console.print(
-                                    f"[cyan]Image host debug: post-upload_screens image_list={image_list_count}[/cyan]"
-                                )
-
-                            if image_list_count >= min_successful_uploads:
-                                break
-
-                            if idx + 1 < len(host_order):
-                                console.print(
-                                    f"[yellow]Only {image_list_count} images uploaded; minimum is {min_successful_uploads}. "
-                                    f"Switching to next host: {host_order[idx + 1]}[/yellow]"
-                                )
-
-                        if image_list_count < min_successful_uploads:
-                            raise Exception(
-                                f"Minimum of {min_successful_uploads} successful image uploads required, but only "
-                                f"{image_list_count} were uploaded."
-                            )
-
-                        # Now that image_list exists, populate tracker-specific keys (and only reupload if required)
-                        for tracker_name in relevant_trackers:
-                            tracker_instance = tracker_class_map[tracker_name](config=config)
-                            if meta.get('debug'):
-                                key = f"{tracker_name}_images_key"
-                                console.print(
-                                    f"[cyan]Image host debug: post-upload before {tracker_name}.check_image_hosts() image_list={len(meta.get('image_list', []) or [])} {key}={len(meta.get(key, []) or [])}[/cyan]"  # noqa: E501
-                                )
-                            await tracker_instance.check_image_hosts(meta)
-                            if meta.get('debug'):
-                                key = f"{tracker_name}_images_key"
-                                console.print(
-                                    f"[cyan]Image host debug: post-upload after  {tracker_name}.check_image_hosts() image_list={len(meta.get('image_list', []) or [])} {key}={len(meta.get(key, []) or [])}[/cyan]"  # noqa: E501
-                                )
-                    except asyncio.CancelledError:
-                        console.print("\n[red]Upload process interrupted! Cancelling tasks...[/red]")
-                        return
-                    except Exception as e:
-                        raise e
-                    finally:
-                        cleanup_manager.reset_terminal()
-                        if meta['debug']:
-                            console.print("[yellow]Cleaning up resources...[/yellow]")
-                        gc.collect()
+                            raise e
+                        finally:
+                            cleanup_manager.reset_terminal()
+                            if meta['debug']:
+                                console.print("[yellow]Cleaning up resources...[/yellow]")
+                            gc.collect()
 
                 elif meta.get('skip_imghost_upload', False) is True and meta.get('image_list', False) is False:
                     meta['image_list'] = []
@@ -1117,20 +1064,21 @@ async def process_meta(meta: Meta, base_dir: str, bot: Any = None) -> None:
         if meta.get('force_recheck', False):
             waiter = Wait(config)
             await waiter.select_and_recheck_best_torrent(meta, meta['path'], check_interval=5)
-        if not os.path.exists(torrent_path):
-            reuse_torrent = None
-            if meta.get('rehash', False) is False and not meta['base_torrent_created'] and not meta['we_checked_them_all']:
-                reuse_torrent = await client.find_existing_torrent(meta)
-                if reuse_torrent is not None:
-                    await TorrentCreator.create_base_from_existing_torrent(reuse_torrent, meta['base_dir'], meta['uuid'])
-
-            if meta['nohash'] is False and reuse_torrent is None:
-                await TorrentCreator.create_torrent(meta, Path(meta['path']), "BASE")
-            if meta['nohash']:
-                meta['client'] = "none"
-
-        elif os.path.exists(torrent_path) and meta.get('rehash', False) is True and meta['nohash'] is False:
-            await TorrentCreator.create_torrent(meta, Path(meta['path']), "BASE")
+        async with pipeline_stage('hashing'):
+            if not os.path.exists(torrent_path):
+                reuse_torrent = None
+                if meta.get('rehash', False) is False and not meta['base_torrent_created'] and not meta['we_checked_them_all']:
+                    reuse_torrent = await client.find_existing_torrent(meta)
+                    if reuse_torrent is not None:
+                        await TorrentCreator.create_base_from_existing_torrent(reuse_torrent, meta['base_dir'], meta['uuid'])
+
+                if meta['nohash'] is False and reuse_torrent is None:
+                    await TorrentCreator.create_torrent(meta, Path(meta['path']), "BASE", variant_piece_sizes=TorrentCreator.piece_size_variant_caps(meta, config))
+                if meta['nohash']:
+                    meta['client'] = "none"
+
+            elif os.path.exists(torrent_path) and meta.get('rehash', False) is True and meta['nohash'] is False:
+                await TorrentCreator.create_torrent(meta, Path(meta['path']), "BASE", variant_piece_sizes=TorrentCreator.piece_size_variant_caps(meta, config))
 
         if os.path.exists(torrent_path):
             raw_trackers = meta.get('trackers')
@@ -1175,6 +1123,116 @@ async def process_meta(meta: Meta, base_dir: str, bot: Any = None) -> None:
             await f.write(json.dumps(meta, indent=4))
 
 
+def select_image_host(meta: Meta) -> tuple[list[str], Optional[list[str]]]:
+    """Pick an image host every tracker with image host requirements accepts, returning those trackers and the allowed hosts."""
+    # Validate and (if needed) rehost images to tracker-approved hosts before uploading any new screenshots.
+    trackers_with_image_host_requirements = {'A4K', 'BHD', 'DC', 'GPW', 'HUNO', 'MTV', 'OE', 'PTP', 'STC', 'TVC'}
+
+    relevant_trackers = [
+        t for t in cast(list[Any], meta.get('trackers', []))
+        if isinstance(t, str) and t in trackers_with_image_host_requirements and t in tracker_class_map
+    ]
+
+    # If all relevant trackers share exactly one common approved host that the user has configured,
+    # and it's not the initially selected host, switch meta['imghost'] to that common host.
+    # If multiple common hosts exist, pick the first by config priority (img_host_1..img_host_9).
+    allowed_hosts: Optional[list[str]] = None
+    if relevant_trackers:
+        try:
+            tracker_instances = {
+                tracker_name: tracker_class_map[tracker_name](config=config)
+                for tracker_name in relevant_trackers
+            }
+
+            if meta.get('debug'):
+                console.print(f"[cyan]Image host debug: meta['imghost']={meta.get('imghost')} img_host_1={config['DEFAULT'].get('img_host_1')}[/cyan]")
+                console.print(f"[cyan]Image host debug: relevant_trackers={relevant_trackers}[/cyan]")
+
+            default_cfg_obj = config.get('DEFAULT', {})
+            default_cfg: dict[str, Any] = cast(dict[str, Any], default_cfg_obj) if isinstance(default_cfg_obj, dict) else {}
+            configured_hosts: list[str] = []
+            for host_index in range(1, 10):
+                host_key = f'img_host_{host_index}'
+                if host_key in default_cfg:
+                    host = default_cfg.get(host_key)
+                    if host and host not in configured_hosts:
+                        configured_hosts.append(str(host))
+
+            if meta.get('debug'):
+                console.print(f"[cyan]Image host debug: configured_hosts={configured_hosts}[/cyan]")
+
+            approved_sets: list[set[str]] = []
+            all_known = True
+            for tracker_name in relevant_trackers:
+                tracker_instance = tracker_instances[tracker_name]
+                approved_hosts = getattr(tracker_instance, 'approved_image_hosts', None)
+                if not approved_hosts:
+                    all_known = False
+                    break
+                if isinstance(approved_hosts, (list, set, tuple)):
+                    approved_hosts_list = [
+                        str(host)
+                        for host in cast(Iterable[Any], approved_hosts)
+                    ]
+                    approved_sets.append(set(approved_hosts_list))
+                else:
+                    all_known = False
+                    break
+
+                if meta.get('debug'):
+                    console.print(
+                        f"[cyan]Image host debug: {tracker_name}.approved_image_hosts={approved_hosts_list}[/cyan]"
+                    )
+
+            if all_known and approved_sets and configured_hosts:
+                common_hosts: set[str] = set()
+                for host_set in approved_sets:
+                    if not common_hosts:
+                        common_hosts = set(host_set)
+                    else:
+                        common_hosts &= host_set
+                common_configured_hosts = [h for h in configured_hosts if h in common_hosts]
+
+                if meta.get('debug'):
+                    console.print(f"[cyan]Image host debug: common_hosts={sorted(common_hosts)}[/cyan]")
+                    console.print(f"[cyan]Image host debug: common_configured_hosts={common_configured_hosts}[/cyan]")
+
+                # If we have any common hosts, use them as allowed_hosts for upload_screens
+                if common_configured_hosts:
+                    allowed_hosts = common_configured_hosts
+                elif common_hosts:
+                    allowed_hosts = sorted(common_hosts)
+
+                # Prefer the user-selected host if it's valid for all relevant trackers; otherwise
+                # fall back to the first common configured host by config priority (img_host_1..img_host_9).
+                current_img_host = str(meta.get('imghost') or config['DEFAULT'].get('img_host_1') or "")
+                preferred_host: Optional[str] = None
+
+                if common_configured_hosts and current_img_host not in common_configured_hosts:
+                    preferred_host = common_configured_hosts[0]
+                elif common_hosts and current_img_host not in common_hosts:
+                    preferred_host = sorted(common_hosts)[0]
+
+                if preferred_host and preferred_host != meta.get('imghost'):
+                    if meta.get('debug'):
+                        console.print(
+                            f"[cyan]Image host debug: current host '{current_img_host}' is not common to all trackers; "
+                            f"switching meta['imghost'] from '{meta.get('imghost')}' to '{preferred_host}'.[/cyan]"
+                        )
+                    meta['imghost'] = preferred_host
+
+            elif meta.get('debug'):
+                console.print(
+                    f"[cyan]Image host debug: cannot compute common host (all_known={all_known}, approved_sets={len(approved_sets)}, configured_hosts={len(configured_hosts)}).[/cyan]"
+                )
+
+        except Exception as e:
+            if meta.get('debug'):
+                console.print(f"[yellow]Could not determine a common approved image host: {e}[/yellow]")
+
+    return relevant_trackers, allowed_hosts
+
+
 async def cleanup_screenshot_temp_files(meta: Meta) -> None:
     """Cleanup temporary screenshot files to prevent orphaned files in case of failures."""
     tmp_dir = f"{meta['base_dir']}/tmp/{meta['uuid']}"
@@ -1228,48 +1286,8 @@ def get_local_version(version_file: str) -> Optional[str]:
         return None
 
 
-def get_remote_version(url: str) -> tuple[Optional[str], Optional[str]]:
-    """Fetches the latest version information from the remote repository."""
-    try:
-        response = requests.get(url, timeout=30)
-        if response.status_code == 200:
-            content = response.text
-            match = re.search(r'__version__\s*=\s*"([^"]+)"', content)
-            if match:
-                return match.group(1), content
-            else:
-                console.print("[red]Version not found in remote file.")
-                return None, None
-        else:
-            console.print(f"[red]Failed to fetch remote version file. Status code: {response.status_code}")
-            return None, None
-    except requests.RequestException as e:
-        console.print(f"[red]An error occurred while fetching the remote version file: {e}")
-        return None, None
-
-
-def extract_changelog(content: str, to_version: str) -> Optional[str]:
-    """Extracts the changelog entries between the specified versions."""
-    # Try to find the to_version with 'v' prefix first (current format)
-    patterns_to_try = [
-        rf'__version__\s*=\s*"{re.escape(to_version)}"\s*\n\s*"""\s*(.*?)\s*"""',  # Try with 'v' prefix
-        rf'__version__\s*=\s*"{re.escape(to_version.lstrip("v"))}"\s*\n\s*"""\s*(.*?)\s*"""'  # Try without 'v' prefix
-    ]
-
-    for pattern in patterns_to_try:
-        match = re.search(pattern, content, re.DOTALL)
-        if match:
-            changelog = match.group(1).strip()
-            # Remove the comment markers (# ) that were added by the GitHub Action
-            changelog = re.sub(r'^# ', '', changelog, flags=re.MULTILINE)
-            return changelog
-
-    return None
-
-
 async def update_notification(base_dir: str) -> Optional[str]:
     version_file = os.path.join(base_dir, 'data', 'version.py')
-    remote_version_url = 'https://raw.githubusercontent.com/Audionut/Upload-Assistant/master/data/version.py'
 
     notice = config['DEFAULT'].get('update_notification', True)
     verbose = config['DEFAULT'].get('verbose_notification', False)
@@ -1281,18 +1299,24 @@ async def update_notification(base_dir: str) -> Optional[str]:
     if not notice:
         return local_version
 
-    remote_version, remote_content = get_remote_version(remote_version_url)
-    if not remote_version:
+    # Announce from the last stored check and refresh it in the background, startup never waits on the network
+    update_check = load_update_check(base_dir)
+    schedule_update_check(base_dir, update_check)
+    remote_version = update_check.get('remote_version')
+    if not isinstance(remote_version, str):
+        return local_version
+
+    try:
+        newer = version.parse(remote_version) > version.parse(local_version)
+    except version.InvalidVersion:
         return local_version
 
-    if version.parse(remote_version) > version.parse(local_version):
+    if newer:
         console.print(f"[red][NOTICE] [green]Update available: v[/green][yellow]{remote_version}")
         console.print(f"[red][NOTICE] [green]Current version: v[/green][yellow]{local_version}")
-        asyncio.create_task(asyncio.sleep(1))
-        if verbose and remote_content:
-            changelog = extract_changelog(remote_content, remote_version)
+        if verbose:
+            changelog = update_check.get('changelog')
             if changelog:
-                asyncio.create_task(asyncio.sleep(1))
                 console.print(f"{changelog}")
             else:
                 console.print("[yellow]Changelog not found between versions.[/yellow]")
@@ -1300,13 +1324,399 @@ async def update_notification(base_dir: str) -> Optional[str]:
     return local_version
 
 
+def ensure_secure_tmp_subdir(subdir_path: str) -> None:
+    """Ensure tmp subdirectories are created with secure permissions (0o700)"""
+    if not os.path.exists(subdir_path):
+        if os.name != 'nt':
+            os.makedirs(subdir_path, mode=0o700, exist_ok=True)
+        else:
+            os.makedirs(subdir_path, exist_ok=True)
+    else:
+        if os.name != 'nt':
+            os.chmod(subdir_path, 0o700)
+
+
+async def prepare_queue_item(queue_item: Any, base_meta: Meta, base_dir: str, path: str) -> tuple[Meta, str, str, str]:
+    """Build a fresh meta for one queue entry, resetting its tmp directory and cached meta as configured."""
+    current_item_path = ""
+    tmp_path = ""
+    # Deep copy: pipelined items run at once and must not share the base meta's nested lists and dicts
+    meta: Meta = copy.deepcopy(base_meta)
+    try:
+        if meta.get('site_upload_queue'):
+            # Extract path and metadata from site upload queue item
+            queue_item_mapping = cast(Mapping[str, Any], queue_item)
+            path = await QueueManager.process_site_upload_item(queue_item_mapping, meta)
+            current_item_path = path  # Store for logging
+        else:
+            # Regular queue processing
+            path = queue_item if isinstance(queue_item, str) else str(queue_item)
+            current_item_path = path
+
+        meta['path'] = path
+        meta['uuid'] = None
+
+        if not path:
+            raise ValueError("The 'path' variable is not defined or is empty.")
+
+        tmp_path = os.path.join(base_dir, "tmp", os.path.basename(path))
+
+        # Ensure tmp subdirectory exists with secure permissions
+        ensure_secure_tmp_subdir(tmp_path)
+
+        if meta.get('delete_tmp', False) and os.path.exists(tmp_path):
+            try:
+                shutil.rmtree(tmp_path)
+                if os.name != 'nt':
+                    os.makedirs(tmp_path, mode=0o700, exist_ok=True)
+                else:
+                    os.makedirs(tmp_path, exist_ok=True)
+                if meta['debug']:
+                    console.print(f"[yellow]Successfully cleaned temp directory for {os.path.basename(path)}[/yellow]")
+                    console.print()
+            except Exception as e:
+                console.print(f"[bold red]Failed to delete temp directory: {str(e)}")
+
+        meta_file = os.path.join(base_dir, "tmp", os.path.basename(path), "meta.json")
+
+        keep_meta = config['DEFAULT'].get('keep_meta', False)
+
+        if not keep_meta or meta.get('delete_meta', False):
+            if os.path.exists(meta_file):
+                try:
+                    os.remove(meta_file)
+                    if meta['debug']:
+                        console.print(f"[bold yellow]Found and deleted existing metadata file: {meta_file}")
+                except Exception as e:
+                    console.print(f"[bold red]Failed to delete metadata file {meta_file}: {str(e)}")
+            else:
+                if meta['debug']:
+                    console.print(f"[yellow]No metadata file found at {meta_file}")
+
+        if keep_meta and os.path.exists(meta_file):
+            async with aiofiles.open(meta_file, encoding='utf-8') as f:
+                content = await f.read()
+                saved_meta = cast(dict[str, Any], json.loads(content)) if content.strip() else {}
+                console.print("[yellow]Existing metadata file found, it holds cached values")
+                await merge_meta(meta, saved_meta)
+
+    except Exception as e:
+        console.print(f"[red]Exception: '{path}': {e}")
+        cleanup_manager.reset_terminal()
+
+    return meta, path, current_item_path, tmp_path
+
+
+async def record_processed_item(meta: Meta, log_file: Optional[str], path: str, current_item_path: str) -> None:
+    """Add a finished queue item to the processed-files log."""
+    if log_file and (not meta['debug'] or "debug" in os.path.basename(log_file)):
+        if meta.get('site_upload_queue'):
+            await QueueManager.save_processed_path(log_file, current_item_path)
+        else:
+            await save_processed_file(log_file, path)
+
+
+async def start_discord_bot(meta: Meta) -> tuple[Any, Optional[asyncio.Task[None]]]:
+    """Log in the Discord bot when Discord notifications are enabled for this run."""
+    bot: Any = None
+    connect_task: Optional[asyncio.Task[None]] = None
+    discord_bot_token = discord_config.get('discord_bot_token') if discord_config is not None else None
+    only_unattended = bool(discord_config.get('only_unattended', False)) if discord_config is not None else False
+
+    if (
+        use_discord
+        and discord_config is not None
+        and isinstance(discord_bot_token, str)
+        and discord_bot_token
+        and not meta['debug']
+        and ((only_unattended and meta.get('unattended', False)) or not only_unattended)
+    ):
+        try:
+            console.print("[cyan]Starting Discord bot initialization...")
+            intents = discord.Intents.default()
+            intents.message_content = True
+            bot = discord.Client(intents=intents)
+            token = discord_bot_token
+            await asyncio.wait_for(bot.login(token), timeout=10)
+            connect_task = asyncio.create_task(bot.connect())
+
+            try:
+                await asyncio.wait_for(bot.wait_until_ready(), timeout=20)
+                console.print("[green]Discord Bot is ready!")
+            except asyncio.TimeoutError:
+                console.print("[bold red]Bot failed to connect within timeout period.")
+                console.print("[yellow]Continuing without Discord integration...")
+                if connect_task is not None:
+                    connect_task.cancel()
+        except discord.LoginFailure:
+            console.print("[bold red]Discord bot token is invalid. Please check your configuration.")
+        except discord.ClientException as e:
+            console.print(f"[bold red]Discord client exception: {e}")
+        except Exception as e:
+            console.print(f"[bold red]Unexpected error during Discord bot initialization: {e}")
+
+    return bot, connect_task
+
+
+async def upload_to_trackers(meta: Meta, tracker_setup: TRACKER_SETUP, bot: Any) -> bool:
+    """
+    Run trump checks, the optional double dupe check and the tracker uploads for a prepared item.
+    Returns False when not enough trackers passed the checks and nothing was uploaded.
+    """
+    console.print()
+    console.print("[yellow]Processing uploads to trackers.....")
+    if meta.get('were_trumping', False):
+        trump_trackers = [t for t in cast(list[Any], meta.get('trackers', [])) if isinstance(t, str)]
+        console.print("[yellow]Checking for existing trump reports.....")
+        tracker_status = cast(dict[str, dict[str, Any]], meta.get('tracker_status') or {})
+        trumping_trackers: list[str] = []
+        for tracker in trump_trackers:
+            is_trumping = await tracker_setup.process_trumpables(meta, tracker=tracker)
+            skip_upload_trackers = set(meta.get('skip_upload_trackers', []) or [])
+
+            # Apply any per-tracker skip decisions made during trumpable processing
+
+            if skip_upload_trackers:
+                for t in skip_upload_trackers:
+                    per_tracker = tracker_status.setdefault(t, {})
+                    per_tracker['upload'] = False
+                    per_tracker['skipped'] = True
+
+                meta['trackers'] = [t for t in meta.get('trackers', []) if t not in skip_upload_trackers]
+                if meta.get('debug', False):
+                    console.print(f"[yellow]Skipping trackers due to trump report selection: {', '.join(sorted(skip_upload_trackers))}[/yellow]")
+                if not meta['trackers']:
+                    console.print("[bold red]No trackers left to upload after trump checking.[/bold red]")
+            if is_trumping and not skip_upload_trackers.__contains__(tracker):
+                trumping_trackers.append(tracker)
+
+        meta['trumping_trackers'] = trumping_trackers
+
+    # allowing the skip uploading feature to only apply when double dupe checking is enabled
+    successful_trackers = 10
+    if meta.get('dupe_again', False):
+        console.print("[yellow]Performing double dupe check on trackers that passed initial upload checks.....[/yellow]")
+        raw_trackers_list = meta.get('trackers', [])
+        trackers_list: list[str]
+        if isinstance(raw_trackers_list, list):
+            trackers_list = [t for t in cast(list[Any], raw_trackers_list) if isinstance(t, str)]
+        else:
+            trackers_list = []
+            meta['trackers'] = trackers_list
+
+        for tracker in list(trackers_list):
+            tracker_status = cast(dict[str, Any], meta.get('tracker_status', {})).get(tracker, {})
+            if tracker_status.get('upload') is not True:
+                if meta.get('debug'):
+                    console.print(f"[yellow]{tracker} was previously marked to skip upload. Skipping double dupe check.[/yellow]")
+                trackers_list.remove(tracker)
+                tracker_status_map = cast(dict[str, Any], meta.get('tracker_status', {}))
+                tracker_status_map.pop(tracker, None)
+                meta['tracker_status'] = tracker_status_map
+                continue
+
+        if trackers_list:
+            successful_trackers = await TrackerStatusManager(config=config).process_all_trackers(meta)
+        else:
+            successful_trackers = 0
+
+    skip_uploading = meta.get('skip_uploading')
+    skip_uploading_int = int(skip_uploading) if isinstance(skip_uploading, (int, str)) else 0
+
+    if successful_trackers < skip_uploading_int and not meta['debug']:
+        console.print(f"[red]Not enough successful trackers ({successful_trackers}/{skip_uploading_int}). No uploads being processed.[/red]")
+        return False
+
+    await process_trackers(
+        meta,
+        config,
+        client,
+        console,
+        list(api_trackers),
+        tracker_class_map,
+        list(http_trackers),
+        list(other_api_trackers),
+    )
+    if use_discord and bot:
+        await DiscordNotifier.send_upload_status_notification(config, bot, meta)
+
+    if config['DEFAULT'].get('cross_seeding', True):
+        await process_cross_seeds(meta)
+
+    return True
+
+
+async def finish_queue_item(meta: Meta, tracker_setup: TRACKER_SETUP, bot: Any, tmp_path: str, path: str) -> None:
+    """Post-upload notifications, trump reports, request searching and emby tmp cleanup."""
+    def build_tracker_status_line(tracker: str, status: Any) -> str:
+        try:
+            if not isinstance(status, dict):
+                return f"Error printing {tracker} data: invalid status type\n"
+
+            status_dict = cast(dict[str, Any], status)
+            status_message = status_dict.get('status_message')
+
+            if tracker == "MTV" and status_message is not None and "data error" not in str(status_message):
+                return f"{str(status_message)}\n"
+
+            if 'torrent_id' in status_dict:
+                tracker_class = tracker_class_map[tracker](config=config)
+                torrent_url = tracker_class.torrent_url
+                return f"{tracker}: {torrent_url}{status_dict['torrent_id']}\n"
+
+            if status_message is not None and "data error" not in str(status_message) and tracker != "MTV":
+                return f"{tracker}: {Redaction.redact_private_info(status_message)}\n"
+
+            if status_message is not None and "data error" in str(status_message):
+                return f"{tracker}: {str(status_message)}\n"
+
+            if status_dict.get('skipping') is False:
+                return f"{tracker} gave no useful message.\n"
+
+            return ""
+        except Exception as exc:
+            return f"Error printing {tracker} data: {exc}\n"
+
+    if use_discord and bot:
+        send_upload_links = bool(discord_config.get('send_upload_links', False)) if discord_config is not None else False
+        if send_upload_links:
+            try:
+                discord_message = ""
+                for tracker, status in cast(dict[str, Any], meta.get('tracker_status', {})).items():
+                    discord_message += build_tracker_status_line(tracker, status)
+                discord_message += "All tracker uploads processed.\n"
+                await DiscordNotifier.send_discord_notification(
+                    config, bot, discord_message, debug=meta.get('debug', False), meta=meta
+                )
+            except Exception as e:
+                console.print(f"[red]Error in tracker print loop: {e}[/red]")
+        else:
+            await DiscordNotifier.send_discord_notification(
+                config, bot, f"Finished uploading: {meta['path']}\n", debug=meta.get('debug', False), meta=meta
+            )
+
+    for tracker in meta.get('trumping_trackers', []):
+        console.print(f"[yellow]Submitting trumpable report to {tracker}.....")
+        await tracker_setup.make_trumpable_report(meta, tracker)
+
+    find_requests = config['DEFAULT'].get('search_requests', False) if meta.get('search_requests') is None else meta.get('search_requests')
+    if find_requests and meta['trackers'] not in ([], None, "") and not (meta.get('site_check', False) and not meta['is_disc']):
+        console.print("[green]Searching for requests on supported trackers.....")
+        if meta.get('site_check', False):
+            trackers = meta['requested_trackers']
+            if meta['debug']:
+                console.print(f"[cyan]Using requested trackers for site check: {trackers}[/cyan]")
+        else:
+            trackers = [t for t in cast(list[Any], meta.get('trackers', [])) if isinstance(t, str)]
+            if meta['debug']:
+                console.print(f"[cyan]Using trackers for request search: {trackers}[/cyan]")
+        await tracker_setup.tracker_request(meta, trackers)
+
+    if meta.get('delete_tmp', False) and tmp_path and os.path.exists(tmp_path) and meta.get('emby', False):
+        try:
+            shutil.rmtree(tmp_path)
+            console.print(f"[yellow]Successfully deleted temp directory for {os.path.basename(path)}[/yellow]")
+            console.print()
+        except Exception as e:
+            console.print(f"[bold red]Failed to delete temp directory: {str(e)}")
+
+
+async def process_queue_pipelined(queue_list: list[Any], base_meta: Meta, base_dir: str, path: str, log_file: Optional[str]) -> None:
+    """
+    Process queue items concurrently through the per-stage worker pools of QueuePipeline.
+    Requires unattended mode, since prompts from several items would interleave.
+    """
+    total_files = len(queue_list)
+    sanitize_meta = config['DEFAULT'].get('sanitize_meta', True)
+    pipeline = QueuePipeline(config, limit=int(base_meta.get('limit_queue') or 0), debug=bool(base_meta.get('debug')))
+    processed_files_count = 0
+    skipped_files_count = 0
+
+    bot, connect_task = await start_discord_bot(base_meta)
+
+    async def process_item(_index: int, queue_item: Any) -> LogWriter:
+        nonlocal processed_files_count, skipped_files_count
+        meta, item_path, current_item_path, tmp_path = await prepare_queue_item(queue_item, base_meta, base_dir, path)
+        console.print(f"[green]Gathering info for {os.path.basename(item_path)}")
+
+        uploaded = False
+        try:
+            await process_meta(meta, base_dir, bot=bot)
+            if meta.get('queue_limit_reached'):
+                console.print(f"[yellow]Queue limit reached, leaving {os.path.basename(item_path)} for a later run.[/yellow]")
+                return None
+            tracker_setup = TRACKER_SETUP(config=config)
+            record = False
+            if 'we_are_uploading' not in meta or not meta.get('we_are_uploading', False):
+                if config['DEFAULT'].get('cross_seeding', True):
+                    await process_cross_seeds(meta)
+                if not meta.get('site_check', False):
+                    if not meta.get('emby', False):
+                        console.print(f"we are not uploading....... ({os.path.basename(item_path)})")
+                    if 'queue' in meta and meta.get('queue') is not None:
+                        processed_files_count += 1
+                        if not meta.get('emby', False):
+                            skipped_files_count += 1
+                        console.print(f"[cyan]Processed {processed_files_count}/{total_files} files with {skipped_files_count} skipped uploading.")
+                        record = True
+            else:
+                async with pipeline_stage('tracker_upload'):
+                    if not reserve_queue_upload(meta):
+                        console.print(f"[yellow]Queue limit reached, leaving {os.path.basename(item_path)} for a later run.[/yellow]")
+                        return None
+                    uploaded = await upload_to_trackers(meta, tracker_setup, bot)
+                if uploaded and 'queue' in meta and meta.get('queue') is not None:
+                    processed_files_count += 1
+                    console.print(f"[cyan]Successfully uploaded {processed_files_count - skipped_files_count}/{total_files} files.")
+                    record = True
+        finally:
+            # process_meta claims the limit_queue slot before screenshots; give it back unless the item uploaded
+            if meta.get('queue_upload_reserved'):
+                meta['queue_upload_reserved'] = False
+                pipeline.finish_upload(uploaded)
+
+        await finish_queue_item(meta, tracker_setup, bot, tmp_path, item_path)
+
+        if meta.get('site_check', False) and 'queue' in meta and meta.get('queue') is not None:
+            processed_files_count += 1
+            skipped_files_count += 1
+            console.print(f"[cyan]Processed {processed_files_count}/{total_files} files.")
+            record = True
+
+        if sanitize_meta and not meta.get('emby', False):
+            try:
+                meta = await Redaction.clean_meta_for_export(meta)
+            except Exception as e:
+                console.print(f"[red]Error cleaning meta for export: {e}")
+
+        if not record:
+            return None
+        return lambda: record_processed_item(meta, log_file, item_path, current_item_path)
+
+    try:
+        with cleanup_manager.deferred():
+            await pipeline.run(queue_list, process_item)
+    finally:
+        if bot is not None:
+            await bot.close()
+        if connect_task is not None:
+            connect_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await connect_task
+        await cleanup_manager.cleanup()
+        gc.collect()
+        cleanup_manager.reset_terminal()
+
+
 async def do_the_thing(base_dir: str) -> None:
     # Reload config from disk so that changes made via the WebUI config
     # editor (or manual file edits between runs) are picked up.  The
     # module-level ``config`` dict is imported once at startup and would
     # otherwise remain stale for the lifetime of the process.  Updating
-    # in-place (clear + update) keeps all existing references (Args,
-    # Clients, managers, etc.) pointing at the same dict object.
+    # in-place keeps all existing references (Args, Clients, managers,
+    # etc.) pointing at the same dict object; stale sections are dropped
+    # before the update rather than clearing first, so a concurrent
+    # in-process run never sees an empty config.
     try:
         import importlib
 
@@ -1316,7 +1726,8 @@ async def do_the_thing(base_dir: str) -> None:
         _reloaded = _cfg_mod.config  # may raise AttributeError
         if not isinstance(_reloaded, dict):
             raise TypeError(f"Expected dict, got {type(_reloaded).__name__}")
-        config.clear()
+        for _stale_key in [key for key in config if key not in _reloaded]:
+            config.pop(_stale_key, None)
         config.update(_reloaded)
     except Exception as exc:
         console.print(f"[yellow]Warning: could not reload config from disk: {exc}[/yellow]")
@@ -1334,22 +1745,12 @@ async def do_the_thing(base_dir: str) -> None:
         if os.name != 'nt':
             os.chmod(tmp_dir, 0o700)
 
-    def ensure_secure_tmp_subdir(subdir_path: str) -> None:
-        """Ensure tmp subdirectories are created with secure permissions (0o700)"""
-        if not os.path.exists(subdir_path):
-            if os.name != 'nt':
-                os.makedirs(subdir_path, mode=0o700, exist_ok=True)
-            else:
-                os.makedirs(subdir_path, exist_ok=True)
-        else:
-            if os.name != 'nt':
-                os.chmod(subdir_path, 0o700)
-
     bot: Any = None
     connect_task: Optional[asyncio.Task[None]] = None
     meta: Meta = {}
+    argv = run_argv()
     paths: list[str] = []
-    for each in sys.argv[1:]:
+    for each in argv[1:]:
         if os.path.exists(each):
             paths.append(os.path.abspath(each))
         else:
@@ -1364,17 +1765,17 @@ async def do_the_thing(base_dir: str) -> None:
     meta['ua_signature'] = signature
     meta['base_dir'] = base_dir
 
-    cleanup_only = any(arg in ('--cleanup', '-cleanup') for arg in sys.argv) and len(sys.argv) <= 2
+    cleanup_only = any(arg in ('--cleanup', '-cleanup') for arg in argv) and len(argv) <= 2
     sanitize_meta = config['DEFAULT'].get('sanitize_meta', True)
 
     try:
         # If cleanup is the only operation, use a dummy path to satisfy the parser
         if cleanup_only:
-            args_list = sys.argv[1:] + ['dummy_path']
+            args_list = argv[1:] + ['dummy_path']
             meta, _help, _before_args = cast(tuple[Meta, Any, Any], parser.parse(list(' '.join(args_list).split(' ')), meta))
             meta['path'] = None  # Clear the dummy path after parsing
         else:
-            meta, _help, _before_args = cast(tuple[Meta, Any, Any], parser.parse(list(' '.join(sys.argv[1:]).split(' ')), meta))
+            meta, _help, _before_args = cast(tuple[Meta, Any, Any], parser.parse(list(' '.join(argv[1:]).split(' ')), meta))
 
         # Start web UI if requested (exclusive mode - doesn't continue with uploads)
         if meta.get('webui'):
@@ -1522,109 +1923,20 @@ async def do_the_thing(base_dir: str) -> None:
         skipped_files_count = 0
         base_meta = dict(meta.items())
 
+        if meta.get('pipeline') and len(queue_list) > 1:
+            auto_mode = str(config['DEFAULT'].get('auto_mode', False)).lower() == "true"
+            if meta.get('unattended') or auto_mode:
+                await process_queue_pipelined(queue_list, base_meta, base_dir, path, log_file)
+                return
+            console.print("[yellow]--pipeline requires unattended mode, processing the queue sequentially.[/yellow]")
+
         for queue_item in queue_list:
             total_files = len(queue_list)
-            bot = None
-            current_item_path = ""
-            tmp_path = ""
-            try:
-                meta = base_meta.copy()
+            meta, path, current_item_path, tmp_path = await prepare_queue_item(queue_item, base_meta, base_dir, path)
 
-                if meta.get('site_upload_queue'):
-                    # Extract path and metadata from site upload queue item
-                    queue_item_mapping = cast(Mapping[str, Any], queue_item)
-                    path = await QueueManager.process_site_upload_item(queue_item_mapping, meta)
-                    current_item_path = path  # Store for logging
-                else:
-                    # Regular queue processing
-                    path = queue_item if isinstance(queue_item, str) else str(queue_item)
-                    current_item_path = path
-
-                meta['path'] = path
-                meta['uuid'] = None
-
-                if not path:
-                    raise ValueError("The 'path' variable is not defined or is empty.")
-
-                tmp_path = os.path.join(base_dir, "tmp", os.path.basename(path))
-
-                # Ensure tmp subdirectory exists with secure permissions
-                ensure_secure_tmp_subdir(tmp_path)
-
-                if meta.get('delete_tmp', False) and os.path.exists(tmp_path):
-                    try:
-                        shutil.rmtree(tmp_path)
-                        if os.name != 'nt':
-                            os.makedirs(tmp_path, mode=0o700, exist_ok=True)
-                        else:
-                            os.makedirs(tmp_path, exist_ok=True)
-                        if meta['debug']:
-                            console.print(f"[yellow]Successfully cleaned temp directory for {os.path.basename(path)}[/yellow]")
-                            console.print()
-                    except Exception as e:
-                        console.print(f"[bold red]Failed to delete temp directory: {str(e)}")
-
-                meta_file = os.path.join(base_dir, "tmp", os.path.basename(path), "meta.json")
-
-                keep_meta = config['DEFAULT'].get('keep_meta', False)
-
-                if not keep_meta or meta.get('delete_meta', False):
-                    if os.path.exists(meta_file):
-                        try:
-                            os.remove(meta_file)
-                            if meta['debug']:
-                                console.print(f"[bold yellow]Found and deleted existing metadata file: {meta_file}")
-                        except Exception as e:
-                            console.print(f"[bold red]Failed to delete metadata file {meta_file}: {str(e)}")
-                    else:
-                        if meta['debug']:
-                            console.print(f"[yellow]No metadata file found at {meta_file}")
-
-                if keep_meta and os.path.exists(meta_file):
-                    async with aiofiles.open(meta_file, encoding='utf-8') as f:
-                        content = await f.read()
-                        saved_meta = cast(dict[str, Any], json.loads(content)) if content.strip() else {}
-                        console.print("[yellow]Existing metadata file found, it holds cached values")
-                        await merge_meta(meta, saved_meta)
-
-            except Exception as e:
-                console.print(f"[red]Exception: '{path}': {e}")
-                cleanup_manager.reset_terminal()
-
-            discord_bot_token = discord_config.get('discord_bot_token') if discord_config is not None else None
-            only_unattended = bool(discord_config.get('only_unattended', False)) if discord_config is not None else False
-
-            if (
-                use_discord
-                and discord_config is not None
-                and isinstance(discord_bot_token, str)
-                and discord_bot_token
-                and not meta['debug']
-                and ((only_unattended and meta.get('unattended', False)) or not only_unattended)
-            ):
-                try:
-                    console.print("[cyan]Starting Discord bot initialization...")
-                    intents = discord.Intents.default()
-                    intents.message_content = True
-                    bot = discord.Client(intents=intents)
-                    token = discord_bot_token
-                    await asyncio.wait_for(bot.login(token), timeout=10)
-                    connect_task = asyncio.create_task(bot.connect())
-
-                    try:
-                        await asyncio.wait_for(bot.wait_until_ready(), timeout=20)
-                        console.print("[green]Discord Bot is ready!")
-                    except asyncio.TimeoutError:
-                        console.print("[bold red]Bot failed to connect within timeout period.")
-                        console.print("[yellow]Continuing without Discord integration...")
-                        if 'connect_task' in locals():
-                            connect_task.cancel()
-                except discord.LoginFailure:
-                    console.print("[bold red]Discord bot token is invalid. Please check your configuration.")
-                except discord.ClientException as e:
-                    console.print(f"[bold red]Discord client exception: {e}")
-                except Exception as e:
-                    console.print(f"[bold red]Unexpected error during Discord bot initialization: {e}")
+            bot, started_task = await start_discord_bot(meta)
+            if started_task is not None:
+                connect_task = started_task
 
             start_time = 0.0
             if meta['debug']:
@@ -1647,190 +1959,27 @@ async def do_the_thing(base_dir: str) -> None:
                             console.print(f"[cyan]Processed {processed_files_count}/{total_files} files with {skipped_files_count} skipped uploading.")
                         else:
                             console.print(f"[cyan]Processed {processed_files_count}/{total_files}.")
-                        if log_file and (not meta['debug'] or "debug" in os.path.basename(log_file)):
-                            if meta.get('site_upload_queue'):
-                                await QueueManager.save_processed_path(log_file, current_item_path)
-                            else:
-                                await save_processed_file(log_file, path)
+                        await record_processed_item(meta, log_file, path, current_item_path)
 
-            else:
-                meta = cast(Meta, meta)
-                console.print()
-                console.print("[yellow]Processing uploads to trackers.....")
-                if meta.get('were_trumping', False):
-                    trump_trackers = [t for t in cast(list[Any], meta.get('trackers', [])) if isinstance(t, str)]
-                    console.print("[yellow]Checking for existing trump reports.....")
-                    tracker_status = cast(dict[str, dict[str, Any]], meta.get('tracker_status') or {})
-                    trumping_trackers: list[str] = []
-                    for tracker in trump_trackers:
-                        is_trumping = await tracker_setup.process_trumpables(meta, tracker=tracker)
-                        skip_upload_trackers = set(meta.get('skip_upload_trackers', []) or [])
-
-                        # Apply any per-tracker skip decisions made during trumpable processing
-
-                        if skip_upload_trackers:
-                            for t in skip_upload_trackers:
-                                per_tracker = tracker_status.setdefault(t, {})
-                                per_tracker['upload'] = False
-                                per_tracker['skipped'] = True
-
-                            meta['trackers'] = [t for t in meta.get('trackers', []) if t not in skip_upload_trackers]
-                            if meta.get('debug', False):
-                                console.print(f"[yellow]Skipping trackers due to trump report selection: {', '.join(sorted(skip_upload_trackers))}[/yellow]")
-                            if not meta['trackers']:
-                                console.print("[bold red]No trackers left to upload after trump checking.[/bold red]")
-                        if is_trumping and not skip_upload_trackers.__contains__(tracker):
-                            trumping_trackers.append(tracker)
-
-                    meta['trumping_trackers'] = trumping_trackers
-
-                # allowing the skip uploading feature to only apply when double dupe checking is enabled
-                successful_trackers = 10
-                if meta.get('dupe_again', False):
-                    console.print("[yellow]Performing double dupe check on trackers that passed initial upload checks.....[/yellow]")
-                    raw_trackers_list = meta.get('trackers', [])
-                    trackers_list: list[str]
-                    if isinstance(raw_trackers_list, list):
-                        trackers_list = [t for t in cast(list[Any], raw_trackers_list) if isinstance(t, str)]
-                    else:
-                        trackers_list = []
-                        meta['trackers'] = trackers_list
-
-                    for tracker in list(trackers_list):
-                        tracker_status = cast(dict[str, Any], meta.get('tracker_status', {})).get(tracker, {})
-                        if tracker_status.get('upload') is not True:
-                            if meta.get('debug'):
-                                console.print(f"[yellow]{tracker} was previously marked to skip upload. Skipping double dupe check.[/yellow]")
-                            trackers_list.remove(tracker)
-                            tracker_status_map = cast(dict[str, Any], meta.get('tracker_status', {}))
-                            tracker_status_map.pop(tracker, None)
-                            meta['tracker_status'] = tracker_status_map
-                            continue
-
-                    if trackers_list:
-                        successful_trackers = await TrackerStatusManager(config=config).process_all_trackers(meta)
-                    else:
-                        successful_trackers = 0
-
-                skip_uploading = meta.get('skip_uploading')
-                skip_uploading_int = int(skip_uploading) if isinstance(skip_uploading, (int, str)) else 0
-
-                if successful_trackers < skip_uploading_int and not meta['debug']:
-                    console.print(f"[red]Not enough successful trackers ({successful_trackers}/{skip_uploading_int}). No uploads being processed.[/red]")
+            elif await upload_to_trackers(meta, tracker_setup, bot) and 'queue' in meta and meta.get('queue') is not None:
+                processed_files_count += 1
+                if 'limit_queue' in meta and int(meta['limit_queue']) > 0:
+                    console.print(f"[cyan]Successfully uploaded {processed_files_count - skipped_files_count} of {meta['limit_queue']} in limit with {total_files} files.")
                 else:
-                    await process_trackers(
-                        meta,
-                        config,
-                        client,
-                        console,
-                        list(api_trackers),
-                        tracker_class_map,
-                        list(http_trackers),
-                        list(other_api_trackers),
-                    )
-                    if use_discord and bot:
-                        await DiscordNotifier.send_upload_status_notification(config, bot, meta)
-
-                    if config['DEFAULT'].get('cross_seeding', True):
-                        await process_cross_seeds(meta)
-
-                    if 'queue' in meta and meta.get('queue') is not None:
-                        processed_files_count += 1
-                        if 'limit_queue' in meta and int(meta['limit_queue']) > 0:
-                            console.print(f"[cyan]Successfully uploaded {processed_files_count - skipped_files_count} of {meta['limit_queue']} in limit with {total_files} files.")
-                        else:
-                            console.print(f"[cyan]Successfully uploaded {processed_files_count - skipped_files_count}/{total_files} files.")
-                        if log_file and (not meta['debug'] or "debug" in os.path.basename(log_file)):
-                            if meta.get('site_upload_queue'):
-                                await QueueManager.save_processed_path(log_file, current_item_path)
-                            else:
-                                await save_processed_file(log_file, path)
+                    console.print(f"[cyan]Successfully uploaded {processed_files_count - skipped_files_count}/{total_files} files.")
+                await record_processed_item(meta, log_file, path, current_item_path)
 
             if meta['debug']:
                 finish_time = time.time()
                 console.print(f"Uploads processed in {finish_time - start_time:.4f} seconds")
 
-            def build_tracker_status_line(tracker: str, status: Any) -> str:
-                try:
-                    if not isinstance(status, dict):
-                        return f"Error printing {tracker} data: invalid status type\n"
-
-                    status_dict = cast(dict[str, Any], status)
-                    status_message = status_dict.get('status_message')
-
-                    if tracker == "MTV" and status_message is not None and "data error" not in str(status_message):
-                        return f"{str(status_message)}\n"
-
-                    if 'torrent_id' in status_dict:
-                        tracker_class = tracker_class_map[tracker](config=config)
-                        torrent_url = tracker_class.torrent_url
-                        return f"{tracker}: {torrent_url}{status_dict['torrent_id']}\n"
-
-                    if status_message is not None and "data error" not in str(status_message) and tracker != "MTV":
-                        return f"{tracker}: {Redaction.redact_private_info(status_message)}\n"
-
-                    if status_message is not None and "data error" in str(status_message):
-                        return f"{tracker}: {str(status_message)}\n"
-
-                    if status_dict.get('skipping') is False:
-                        return f"{tracker} gave no useful message.\n"
-
-                    return ""
-                except Exception as exc:
-                    return f"Error printing {tracker} data: {exc}\n"
-
-            if use_discord and bot:
-                send_upload_links = bool(discord_config.get('send_upload_links', False)) if discord_config is not None else False
-                if send_upload_links:
-                    try:
-                        discord_message = ""
-                        for tracker, status in cast(dict[str, Any], meta.get('tracker_status', {})).items():
-                            discord_message += build_tracker_status_line(tracker, status)
-                        discord_message += "All tracker uploads processed.\n"
-                        await DiscordNotifier.send_discord_notification(
-                            config, bot, discord_message, debug=meta.get('debug', False), meta=meta
-                        )
-                    except Exception as e:
-                        console.print(f"[red]Error in tracker print loop: {e}[/red]")
-                else:
-                    await DiscordNotifier.send_discord_notification(
-                        config, bot, f"Finished uploading: {meta['path']}\n", debug=meta.get('debug', False), meta=meta
-                    )
-
-            for tracker in meta.get('trumping_trackers', []):
-                console.print(f"[yellow]Submitting trumpable report to {tracker}.....")
-                await tracker_setup.make_trumpable_report(meta, tracker)
-
-            find_requests = config['DEFAULT'].get('search_requests', False) if meta.get('search_requests') is None else meta.get('search_requests')
-            if find_requests and meta['trackers'] not in ([], None, "") and not (meta.get('site_check', False) and not meta['is_disc']):
-                console.print("[green]Searching for requests on supported trackers.....")
-                if meta.get('site_check', False):
-                    trackers = meta['requested_trackers']
-                    if meta['debug']:
-                        console.print(f"[cyan]Using requested trackers for site check: {trackers}[/cyan]")
-                else:
-                    trackers = [t for t in cast(list[Any], meta.get('trackers', [])) if isinstance(t, str)]
-                    if meta['debug']:
-                        console.print(f"[cyan]Using trackers for request search: {trackers}[/cyan]")
-                await tracker_setup.tracker_request(meta, trackers)
+            await finish_queue_item(meta, tracker_setup, bot, tmp_path, path)
 
             if meta.get('site_check', False) and 'queue' in meta and meta.get('queue') is not None:
                 processed_files_count += 1
                 skipped_files_count += 1
                 console.print(f"[cyan]Processed {processed_files_count}/{total_files} files.")
-                if log_file and (not meta['debug'] or "debug" in os.path.basename(log_file)):
-                    if meta.get('site_upload_queue'):
-                        await QueueManager.save_processed_path(log_file, current_item_path)
-                    else:
-                        await save_processed_file(log_file, path)
-
-            if meta.get('delete_tmp', False) and tmp_path and os.path.exists(tmp_path) and meta.get('emby', False):
-                try:
-                    shutil.rmtree(tmp_path)
-                    console.print(f"[yellow]Successfully deleted temp directory for {os.path.basename(path)}[/yellow]")
-                    console.print()
-                except Exception as e:
-                    console.print(f"[bold red]Failed to delete temp directory: {str(e)}")
+                await record_processed_item(meta, log_file, path, current_item_path)
 
             if 'limit_queue' in meta and int(meta['limit_queue']) > 0 and (processed_files_count - skipped_files_count) >= int(meta['limit_queue']):
                 if sanitize_meta and not meta.get('emby', False):
@@ -1949,7 +2098,7 @@ async def process_cross_seeds(meta: Meta) -> None:
                 if tracker != "PTP":
                     dupes = await tracker_class.search_existing(meta, disctype)
                 else:
-                    ptp = PTP(config=config)
+                    ptp = tracker_class_map['PTP'](config=config)
                     group_id = meta.get('ptp_groupID')
                     if not group_id:
                         group_id = await ptp.get_group_by_imdb(meta['imdb'])
@@ -2023,7 +2172,7 @@ async def process_cross_seeds(meta: Meta) -> None:
 
         if tracker == "AR" and download_url:
             try:
-                ar = AR(config=config)
+                ar = tracker_class_map['AR'](config=config)
                 auth_key = await ar.get_auth_key(meta)
 
                 # Extract torrent_pass from announce_url
@@ -2097,6 +2246,12 @@ async def main() -> None:
     except Exception as e:
         if not _shutdown_requested:
             console.print(f"[bold red]Unexpected error: {e}[/bold red]")
+    finally:
+        # Pooled HTTP connections and the background update check live for the whole run, mid-run cleanups leave them alone
+        with contextlib.suppress(Exception):
+            await cancel_update_checks()
+        with contextlib.suppress(Exception):
+            await close_pools()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,337 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+import contextlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+# Regex for splitting filenames on common separators (dots, dashes, underscores, spaces)
+SEARCH_SEP_RE = re.compile(r'[\s.\-_]+')
+# Seconds before a search triggers a background refresh of the index
+BROWSE_INDEX_REFRESH_INTERVAL = 300.0
+# Seconds between the quick checks of the roots and their first-level directories made before a search
+BROWSE_INDEX_REVALIDATE_INTERVAL = 2.0
+# A directory modified this recently may change again within its mtime resolution; list it again next refresh
+MTIME_SETTLE_SECONDS = 2.0
+
+
+def search_tokens(name: str) -> tuple[str, ...]:
+    return tuple(t for t in SEARCH_SEP_RE.split(name.lower()) if t)
+
+
+def tokens_match(query_tokens: Sequence[str], name_tokens: Sequence[str]) -> bool:
+    """Check if query tokens appear as whole-word ordered subsequence in the name."""
+    pos = 0
+    for qt in query_tokens:
+        found = False
+        while pos < len(name_tokens):
+            if name_tokens[pos] == qt:
+                pos += 1
+                found = True
+                break
+            pos += 1
+        if not found:
+            return False
+    return True
+
+
+class DirListing(NamedTuple):
+    mtime: float
+    # Visible subdirectories (symlinked ones included, as os.walk lists them) and the ones walked into
+    subdirs: tuple[str, ...]
+    walk_subdirs: tuple[str, ...]
+    files: tuple[str, ...]
+
+
+class IndexEntry(NamedTuple):
+    name: str
+    is_dir: bool
+    tokens: tuple[str, ...]
+
+
+class SearchHit(NamedTuple):
+    name: str
+    path: str
+    is_dir: bool
+
+
+def _list_dir(path: str, mtime: float) -> DirListing:
+    subdirs: list[str] = []
+    walk_subdirs: list[str] = []
+    files: list[str] = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                subdirs.append(entry.name)
+                with contextlib.suppress(OSError):
+                    if not entry.is_symlink():
+                        walk_subdirs.append(entry.name)
+            else:
+                files.append(entry.name)
+    # An mtime this fresh can't vouch for the listing yet
+    if time.time() - mtime < MTIME_SETTLE_SECONDS:
+        mtime = -1.0
+    return DirListing(mtime, tuple(subdirs), tuple(walk_subdirs), tuple(files))
+
+
+class BrowseIndex:
+    """
+    Inverted index of name tokens -> paths under the web UI browse roots, for browse_search.
+
+    Directory listings are kept, and persisted to SQLite, with the directory mtime they were
+    read at. A refresh stats every directory but only lists the ones whose mtime changed, so
+    keeping a large library (or one on a network share) current costs one stat per directory
+    instead of a full walk per search. Hidden entries are skipped as in the live walk.
+    Between refreshes, searches revalidate the roots and their first-level directories.
+    """
+
+    def __init__(self, roots: Sequence[str], db_path: Optional[Path] = None) -> None:
+        self.roots = tuple(roots)
+        self.db_path = db_path
+        self.ready = False
+        self.refreshed_at = 0.0
+        self.revalidated_at = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._dirs: dict[str, DirListing] = {}
+        self._entries: dict[str, IndexEntry] = {}
+        self._postings: dict[str, set[str]] = {}
+
+    def _add_entry(self, path: str, name: str, is_dir: bool) -> None:
+        entry = IndexEntry(name, is_dir, search_tokens(name))
+        self._entries[path] = entry
+        for token in set(entry.tokens):
+            self._postings.setdefault(token, set()).add(path)
+
+    def _remove_entry(self, path: str) -> None:
+        entry = self._entries.pop(path, None)
+        if entry is None:
+            return
+        for token in set(entry.tokens):
+            paths = self._postings.get(token)
+            if paths is not None:
+                paths.discard(path)
+                if not paths:
+                    del self._postings[token]
+
+    def _apply_listing(self, dirpath: str, old: Optional[DirListing], new: Optional[DirListing]) -> None:
+        old_children = self._children(old)
+        new_children = self._children(new)
+        for name, is_dir in old_children.items():
+            if new_children.get(name) != is_dir:
+                self._remove_entry(os.path.join(dirpath, name))
+        for name, is_dir in new_children.items():
+            if old_children.get(name) != is_dir:
+                self._add_entry(os.path.join(dirpath, name), name, is_dir)
+
+    @staticmethod
+    def _children(listing: Optional[DirListing]) -> dict[str, bool]:
+        if listing is None:
+            return {}
+        children = dict.fromkeys(listing.files, False)
+        children.update(dict.fromkeys(listing.subdirs, True))
+        return children
+
+    def search(self, query_tokens: Sequence[str], allowed_exts: Iterable[str]) -> list[SearchHit]:
+        """Folders and files (with an allowed extension) whose names contain the query tokens in order."""
+        exts = set(allowed_exts)
+        with self._lock:
+            postings = [self._postings.get(token) for token in set(query_tokens)]
+            if not postings or any(paths is None for paths in postings):
+                return []
+            candidate_sets = sorted((paths for paths in postings if paths is not None), key=len)
+            candidates = candidate_sets[0].intersection(*candidate_sets[1:])
+            hits: list[SearchHit] = []
+            for path in candidates:
+                entry = self._entries[path]
+                if not tokens_match(query_tokens, entry.tokens):
+                    continue
+                if not entry.is_dir and os.path.splitext(entry.name.lower())[1] not in exts:
+                    continue
+                hits.append(SearchHit(entry.name, path, entry.is_dir))
+        return hits
+
+    def refresh(self) -> None:
+        """Bring the index up to date with the filesystem; listings of unchanged directories are reused."""
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            if not self._dirs:
+                self._load()
+            self._update(self._scan())
+            self.refreshed_at = time.monotonic()
+            self.ready = True
+        finally:
+            self._refresh_lock.release()
+
+    def revalidate(self) -> None:
+        """
+        Re-list the roots and their first-level directories whose mtime moved since they were read,
+        so a release added to a root (or a category folder in it) is found by the next search rather
+        than after the background refresh. Changes further down wait for that refresh.
+        """
+        if not self.ready or time.monotonic() - self.revalidated_at < BROWSE_INDEX_REVALIDATE_INTERVAL:
+            return
+        # A running refresh picks the change up itself
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            if self._top_changed():
+                self._update(self._scan(stat_depth=1))
+            self.revalidated_at = time.monotonic()
+        finally:
+            self._refresh_lock.release()
+
+    def _top_changed(self) -> bool:
+        for root in self.roots:
+            root = os.path.abspath(root)
+            root_listing = self._dirs.get(root)
+            top = [root]
+            if root_listing is not None:
+                top.extend(os.path.join(root, name) for name in root_listing.walk_subdirs)
+            for dirpath in top:
+                listing = self._dirs.get(dirpath)
+                try:
+                    mtime: Optional[float] = os.stat(dirpath).st_mtime
+                except OSError:
+                    mtime = None
+                if (listing.mtime if listing is not None else None) != mtime:
+                    return True
+        return False
+
+    def _scan(self, stat_depth: Optional[int] = None) -> dict[str, DirListing]:
+        new_dirs: dict[str, DirListing] = {}
+        for root in self.roots:
+            new_dirs.update(self._walk(os.path.abspath(root), stat_depth))
+        return new_dirs
+
+    def _update(self, new_dirs: dict[str, DirListing]) -> None:
+        changed = [(path, listing) for path, listing in new_dirs.items() if self._dirs.get(path) != listing]
+        removed = [path for path in self._dirs if path not in new_dirs]
+        with self._lock:
+            for path, listing in changed:
+                self._apply_listing(path, self._dirs.get(path), listing)
+            for path in removed:
+                self._apply_listing(path, self._dirs.get(path), None)
+            self._dirs = new_dirs
+        self._save(changed, removed)
+
+    def _walk(self, root: str, stat_depth: Optional[int] = None) -> Iterator[tuple[str, DirListing]]:
+        """Listings under `root`; below `stat_depth` known directories are taken as they are and only new ones read."""
+        if not os.path.isdir(root):
+            return
+        stack = [(root, 0)]
+        while stack:
+            dirpath, depth = stack.pop()
+            listing = self._dirs.get(dirpath)
+            if listing is None or stat_depth is None or depth <= stat_depth:
+                try:
+                    mtime = os.stat(dirpath).st_mtime
+                    if listing is None or listing.mtime != mtime:
+                        listing = _list_dir(dirpath, mtime)
+                except OSError:
+                    # Unreadable (permissions) or gone mid-walk, as os.walk skips it
+                    continue
+            yield dirpath, listing
+            stack.extend((os.path.join(dirpath, name), depth + 1) for name in reversed(listing.walk_subdirs))
+
+    def refresh_in_background(self) -> None:
+        """Start a refresh on a daemon thread unless one is running or the index is fresh."""
+        if self._refresh_lock.locked():
+            return
+        if self.ready and time.monotonic() - self.refreshed_at < BROWSE_INDEX_REFRESH_INTERVAL:
+            return
+        threading.Thread(target=self._refresh_logged, name="browse-index", daemon=True).start()
+
+    def _refresh_logged(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            from src.console import console
+
+            console.print(f"Browse index refresh failed: {e}", markup=False)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        assert self.db_path is not None  # nosec B101 - callers check db_path
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS dirs (
+                    path TEXT PRIMARY KEY,
+                    mtime REAL NOT NULL,
+                    listing TEXT NOT NULL
+                )
+            """)
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _load(self) -> None:
+        """Seed the index with the listings stored by a previous process, to be revalidated by mtime."""
+        if self.db_path is None or not self.db_path.exists():
+            return
+        roots = [os.path.abspath(root) for root in self.roots]
+        try:
+            with self._connect() as conn:
+                rows = conn.execute("SELECT path, mtime, listing FROM dirs").fetchall()
+        except sqlite3.Error:
+            return
+        dirs: dict[str, DirListing] = {}
+        for path, mtime, raw in rows:
+            if not any(path == root or path.startswith(root.rstrip(os.sep) + os.sep) for root in roots):
+                continue
+            try:
+                subdirs, walk_subdirs, files = json.loads(raw)
+                dirs[path] = DirListing(mtime, tuple(subdirs), tuple(walk_subdirs), tuple(files))
+            except ValueError:
+                continue
+        with self._lock:
+            for path, listing in dirs.items():
+                self._apply_listing(path, None, listing)
+            self._dirs = dirs
+
+    def _save(self, changed: list[tuple[str, DirListing]], removed: list[str]) -> None:
+        if self.db_path is None or not (changed or removed):
+            return
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO dirs (path, mtime, listing) VALUES (?, ?, ?)",
+                    [(path, listing.mtime, json.dumps([listing.subdirs, listing.walk_subdirs, listing.files])) for path, listing in changed],
+                )
+                conn.executemany("DELETE FROM dirs WHERE path = ?", [(path,) for path in removed])
+        except sqlite3.Error as e:
+            from src.console import console
+
+            console.print(f"Could not store the browse index: {e}", markup=False)
+
+
+_indexes: dict[tuple[str, ...], BrowseIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_browse_index(roots: Sequence[str], db_path: Optional[Path] = None) -> BrowseIndex:
+    """The index for this set of browse roots, revalidated for the search and refreshed in the background when due."""
+    key = tuple(roots)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            # Browse roots changed; an index of the old ones is no use any more
+            _indexes.clear()
+            index = _indexes[key] = BrowseIndex(key, db_path)
+    index.refresh_in_background()
+    index.revalidate()
+    return index
@@ -18,6 +18,8 @@ import traceback
 from contextlib import suppress
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from collections import deque
+from collections.abc import Iterator
 from typing import Any, Literal, Optional, TypedDict, Union, cast
 
 import pyotp
@@ -30,6 +32,7 @@ from werkzeug.middleware.proxy_fix import ProxyFix
 
 
 import web_ui.auth as auth_mod
+from web_ui.browse_index import get_browse_index, search_tokens, tokens_match
 from flask_session import Session
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -41,6 +44,7 @@ except Exception:
     ansi_to_html = None
 
 from src.console import console
+from src.runcontext import RunContext, activate_run, install_run_hooks
 
 cfg_dir = auth_mod.get_config_dir()
 cfg_dir.mkdir(parents=True, exist_ok=True)
@@ -492,11 +496,59 @@ SUPPORTED_VIDEO_EXTS = {'.mkv', '.mp4', '.ts'}
 # Supported description file extensions for WebUI description file browser
 SUPPORTED_DESC_EXTS = {'.txt', '.nfo', '.md'}
 
-# Regex for splitting filenames on common separators (dots, dashes, underscores, spaces)
-_BROWSE_SEARCH_SEP_RE = re.compile(r'[\s.\-_]+')
 
-# Lock to prevent concurrent in-process uploads (avoids cross-session interference)
-inproc_lock = threading.Lock()
+
+class InprocRunQueue:
+    """Admits at most `limit` in-process runs at once; runs over the cap wait their turn in arrival order."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = max(1, limit)
+        self._cond = threading.Condition()
+        self._running: set[str] = set()
+        self._waiting: deque[str] = deque()
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    def acquire(self, session_id: str, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            if session_id in self._running:
+                return True
+            if session_id not in self._waiting:
+                self._waiting.append(session_id)
+            while len(self._running) >= self.limit or self._waiting[0] != session_id:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            self._waiting.popleft()
+            self._running.add(session_id)
+            return True
+
+    def position(self, session_id: str) -> int:
+        """Number of queued runs ahead of `session_id`."""
+        with self._cond:
+            return self._waiting.index(session_id) if session_id in self._waiting else 0
+
+    def release(self, session_id: str) -> None:
+        with self._cond:
+            self._running.discard(session_id)
+            with contextlib.suppress(ValueError):
+                self._waiting.remove(session_id)
+            self._cond.notify_all()
+
+
+def _inproc_run_limit() -> int:
+    try:
+        return int(os.environ.get("UA_WEBUI_MAX_INPROC_RUNS", "").strip() or 2)
+    except ValueError:
+        return 2
+
+
+# Concurrent in-process uploads; each runs with its own RunContext (src/runcontext.py)
+inproc_runs = InprocRunQueue(_inproc_run_limit())
 
 # Runtime browse roots (set by upload.py when starting web UI)
 _runtime_browse_roots: Optional[str] = None
@@ -840,21 +892,50 @@ class ProcessInfo(TypedDict, total=False):
     input_queue: "queue.Queue[str]"
     # Rich Console type is not imported for typing reasons here; use Any
     record_console: Any
+    # Socket of a job running on the upload worker daemon
+    connection: Any
 
 
 # Store active processes
 active_processes: dict[str, ProcessInfo] = {}
 
-# Local store for consoles we've wrapped to avoid assigning attributes on Console
-_ua_console_store: dict[int, dict[str, Any]] = {}
+# Markup of one exported batch of in-process console output, as in Rich's HTML export body
+RECORD_HTML_FORMAT = "<pre style=\"font-family:Menlo,'DejaVu Sans Mono',consolas,'Courier New',monospace\"><code style=\"font-family:inherit\">{code}</code></pre>"
+# Seconds between full resyncs of the in-process console output
+HTML_RESYNC_INTERVAL = 30.0
+
+
+class RecordedHtmlStream:
+    """
+    Turns what a recording Rich console printed since the last call into SSE events.
+
+    Each batch is exported on its own (export_html clears the record buffer) and sent as an
+    `html_append` event numbered by `seq`. Every HTML_RESYNC_INTERVAL seconds an `html_full`
+    event carries all batches so far, which lets the client repair any batch it missed.
+    """
+
+    def __init__(self, record_console: Any) -> None:
+        self.record_console = record_console
+        self.fragments: list[str] = []
+        self.last_resync = time.monotonic()
+        self._empty = RECORD_HTML_FORMAT.format(code="")
+
+    def events(self) -> Iterator[str]:
+        fragment = self.record_console.export_html(inline_styles=True, clear=True, code_format=RECORD_HTML_FORMAT)
+        if fragment and fragment != self._empty:
+            self.fragments.append(fragment)
+            yield f"data: {json.dumps({'type': 'html_append', 'data': fragment, 'seq': len(self.fragments)})}\n\n"
+        if self.fragments and time.monotonic() - self.last_resync >= HTML_RESYNC_INTERVAL:
+            self.last_resync = time.monotonic()
+            yield f"data: {json.dumps({'type': 'html_full', 'data': ''.join(self.fragments), 'seq': len(self.fragments)})}\n\n"
 
 
 def _debug_process_snapshot(session_id: Optional[str] = None) -> dict[str, Any]:
     try:
         snapshot: dict[str, Any] = {
             "active_sessions": list(active_processes.keys()),
-            "console_store_keys": list(_ua_console_store.keys()),
-            "inproc_lock_locked": inproc_lock.locked(),
+            "inproc_runs": inproc_runs.running,
+            "inproc_limit": inproc_runs.limit,
         }
         if session_id and session_id in active_processes:
             info = active_processes.get(session_id, {})
@@ -2860,29 +2941,42 @@ def browse_search():
         return jsonify({"success": False, "error": "Browsing is not configured"}), 400
 
     # Split on common separators
-    query_tokens = [t for t in _BROWSE_SEARCH_SEP_RE.split(query.lower()) if t]
+    query_tokens = search_tokens(query)
     if not query_tokens:
         return jsonify({"success": True, "items": [], "query": query})
 
     def name_matches(name: str) -> bool:
-        """Check if query tokens appear as whole-word ordered subsequence in the name."""
-        name_tokens = [t for t in _BROWSE_SEARCH_SEP_RE.split(name.lower()) if t]
-        pos = 0
-        for qt in query_tokens:
-            found = False
-            while pos < len(name_tokens):
-                if name_tokens[pos] == qt:
-                    pos += 1
-                    found = True
-                    break
-                pos += 1
-            if not found:
-                return False
-        return True
+        return tokens_match(query_tokens, search_tokens(name))
 
     allowed_exts = SUPPORTED_DESC_EXTS if file_filter == "desc" else SUPPORTED_VIDEO_EXTS
     items: list[BrowseItem] = []
 
+    # Answer from the token index once it has been built; until then walk the roots
+    index = get_browse_index(roots, cfg_dir / "browse_index.sqlite3")
+    if index.ready:
+        try:
+            hits = index.search(query_tokens, allowed_exts)
+            # Folders first and then alphabetically, before truncating, so the cut is stable
+            hits.sort(key=lambda hit: (0 if hit.is_dir else 1, hit.name.lower(), hit.path))
+            for hit in hits:
+                try:
+                    _assert_safe_resolved_path(hit.path)
+                except ValueError:
+                    continue
+                if hit.is_dir:
+                    items.append({"name": hit.name, "path": hit.path, "type": "folder", "children": []})
+                else:
+                    items.append({"name": hit.name, "path": hit.path, "type": "file", "children": None})
+                if len(items) >= max_results:
+                    break
+
+            return jsonify({"success": True, "items": items, "query": query, "count": len(items), "truncated": len(items) >= max_results})
+
+        except Exception as e:
+            console.print(f"Error in browse_search: {e}", markup=False)
+            console.print(traceback.format_exc(), markup=False)
+            return jsonify({"error": "Error searching files", "success": False}), 500
+
     try:
         for root in roots:
             root_abs = os.path.abspath(root)
@@ -2948,6 +3042,86 @@ def browse_search():
         return jsonify({"error": "Error searching files", "success": False}), 500
 
 
+def _worker_output_event(chunk: str) -> str:
+    try:
+        if ansi_to_html:
+            html_fragment = ansi_to_html(chunk)
+        else:
+            import html as _html
+
+            html_fragment = f"<pre>{_html.escape(chunk)}</pre>"
+    except Exception as e:
+        console.print(f"HTML conversion error: {e}", markup=False)
+        import html as _html
+
+        html_fragment = f"<pre>{_html.escape(chunk)}</pre>"
+    return f"data: {json.dumps({'type': 'html', 'data': html_fragment, 'origin': 'stdout'})}\n\n"
+
+
+def _stream_worker_job(socket_path: str, session_id: str, argv: list[str]) -> Iterator[str]:
+    """Run one upload on the worker daemon (src/workerdaemon.py), streaming it like a subprocess run."""
+    from src.workerdaemon import connect_worker, read_messages, send_message
+
+    try:
+        sock = connect_worker(socket_path)
+    except OSError as e:
+        console.print(f"Upload worker unavailable at {socket_path}: {e}", markup=False)
+        yield f"data: {json.dumps({'type': 'error', 'data': 'Upload worker unavailable'})}\n\n"
+        return
+
+    output_queue: queue.Queue[Optional[dict[str, Any]]] = queue.Queue()
+
+    def read_worker() -> None:
+        try:
+            with sock.makefile("rb") as lines:
+                for message in read_messages(lines):
+                    output_queue.put(message)
+        except OSError:
+            pass
+        finally:
+            output_queue.put(None)
+
+    active_processes[session_id] = {"mode": "worker", "connection": sock}
+    try:
+        send_message(sock, {"type": "run", "argv": argv})
+        threading.Thread(target=read_worker, daemon=True).start()
+
+        buffer = ""
+        exit_code = 1
+        while True:
+            try:
+                message = output_queue.get(timeout=0.5)
+            except queue.Empty:
+                # Quiet for a moment: flush a partial line such as a prompt
+                if buffer:
+                    yield _worker_output_event(buffer)
+                    buffer = ""
+                yield f"data: {json.dumps({'type': 'keepalive'})}\n\n"
+                continue
+            if message is None:
+                break
+
+            message_type = message.get("type")
+            if message_type == "output":
+                buffer += str(message.get("data", ""))
+                lines, newline, buffer = buffer.rpartition("\n")
+                if newline:
+                    yield _worker_output_event(lines + newline)
+            elif message_type == "system":
+                yield f"data: {json.dumps({'type': 'system', 'data': str(message.get('data', ''))})}\n\n"
+            elif message_type == "exit":
+                code = message.get("code")
+                exit_code = code if isinstance(code, int) else 1
+
+        if buffer:
+            yield _worker_output_event(buffer)
+        yield f"data: {json.dumps({'type': 'exit', 'code': exit_code})}\n\n"
+    finally:
+        with contextlib.suppress(OSError):
+            sock.close()
+        active_processes.pop(session_id, None)
+
+
 @app.route("/api/execute", methods=["POST", "OPTIONS"])
 @limiter.limit("100 per hour", key_func=_rate_limit_key_func)
 def execute_command():
@@ -3083,21 +3257,23 @@ def execute_command():
 
                 yield f"data: {json.dumps({'type': 'system', 'data': f'Executing: {command_str}'})}\n\n"
 
+                # A running upload worker (python -m src.workerdaemon serve) takes the job
+                # without starting a new interpreter or re-importing the application.
+                worker_socket = os.environ.get("UA_WEBUI_WORKER_SOCKET", "").strip()
+                if worker_socket:
+                    yield from _stream_worker_job(worker_socket, session_id, command[3:])
+                    return
+
                 # Decide whether to run as a subprocess or in-process. In-process
                 # preserves Rich output and allows capturing console.input / cli_ui prompts.
                 use_subprocess = bool(os.environ.get("UA_WEBUI_USE_SUBPROCESS", "").strip())
 
                 if not use_subprocess:
-                    # In-process execution path
-                    import cli_ui as _cli_ui
-
-                    from src import console as src_console
-
+                    # In-process execution path. Each run gets its own RunContext (argv, output
+                    # sink, input channel, cancel token) and its own thread and event loop, so
+                    # several runs can share the process up to the UA_WEBUI_MAX_INPROC_RUNS cap.
                     console.print("Running in-process (rich-captured) mode", markup=False)
 
-                    # Prepare input queue for prompts
-                    input_queue: queue.Queue[str] = queue.Queue()
-
                     # Import upload.main on the main thread to avoid thread-unsafe imports
                     # inside the worker thread. Importing here ensures any module-level
                     # side-effects run on the request/main thread rather than inside
@@ -3121,235 +3297,88 @@ def execute_command():
                     # Queue to serialize print actions from the worker thread
                     render_queue: queue.Queue[tuple[Any, dict[str, Any]]] = queue.Queue()
 
-                    # Cancellation event for cooperative shutdown
-                    cancel_event = threading.Event()
-
-                    # Monkeypatch the existing shared console to record prints and intercept input
-                    orig_console = src_console.console
-
-                    # Avoid double-wrapping the console if already patched by a previous run
-                    console_key = id(orig_console)
-                    if console_key not in _ua_console_store:
-                        # Store originals so we can restore later
-                        _ua_console_store[console_key] = {
-                            "orig_print": orig_console.print,
-                            "orig_input": getattr(orig_console, "input", None),
-                            "orig_ask_yes_no": None,
-                            "orig_ask_string": None,
-                        }
-
-                        # Wrap print to duplicate into the recorder
-                        orig_print = orig_console.print
+                    import shlex
 
-                        def wrapped_print(*p_args: Any, **p_kwargs: Any) -> Any:
-                            # Enqueue print calls to be applied from the SSE thread
-                            with contextlib.suppress(Exception):
-                                render_queue.put((p_args, p_kwargs))
-                            return orig_print(*p_args, **p_kwargs)
+                    parsed_args: list[str] = []
+                    if args:
+                        parsed_args = _validate_upload_assistant_args(shlex.split(args))
 
-                        orig_console.print = cast(Any, wrapped_print)
+                    def queue_output(p_args: tuple[Any, ...], p_kwargs: dict[str, Any]) -> None:
+                        # Applied to the recorder from the SSE thread
+                        render_queue.put((p_args, p_kwargs))
 
-                        # Intercept console.input to send prompt to client and wait for queue
-                        orig_input = getattr(orig_console, "input", None)
+                    run = RunContext(session_id, [str(upload_script), validated_path, *parsed_args], queue_output)
+                    install_run_hooks()
 
-                        def wrapped_input(prompt: str = "") -> str:
-                            # Print the prompt so it appears in the recorded output
-                            with contextlib.suppress(Exception):
-                                wrapped_print(prompt)
-                            # Wait for input while respecting cancellation
-                            while True:
-                                if cancel_event.is_set():
-                                    raise EOFError()
-                                try:
-                                    return input_queue.get(timeout=0.5)
-                                except queue.Empty:
-                                    continue
-                                except Exception:
-                                    raise
+                    # Store in active_processes so /api/input and /api/kill can reach the run,
+                    # including while it waits for a free slot
+                    cast(Any, active_processes)[session_id] = {
+                        "mode": "inproc",
+                        "input_queue": run.input_queue,
+                        "record_console": record_console,
+                        "cancel_event": run.cancel_event,
+                    }
 
-                        orig_console.input = cast(Any, wrapped_input)
-                    else:
-                        # Already wrapped; retrieve stored originals so restoration works
-                        stored = _ua_console_store.get(console_key, {})
-                        orig_print = stored.get("orig_print", orig_console.print)
-                        orig_input = stored.get("orig_input", getattr(orig_console, "input", None))
-
-                    # Monkeypatch cli_ui.ask_yes_no and ask_string similarly
-                    orig_ask_yes_no = None
-                    orig_ask_string = None
                     try:
-                        orig_ask_yes_no = _cli_ui.ask_yes_no
-
-                        def wrapped_ask_yes_no(*args, default: bool = False, **kwargs) -> bool:
-                                # Support both signatures used across the codebase:
-                                #   ask_yes_no(question, default=...)
-                                #   ask_yes_no(color, question, default=...)
-                                # Extract the question and default value from args/kwargs.
-                                if len(args) >= 2:
-                                    question = args[1]
-                                elif len(args) == 1:
-                                    question = args[0]
-                                else:
-                                    question = kwargs.get('question', '')
-
-                                # If default was passed positionally (third arg), use it.
-                                default_val = args[2] if len(args) >= 3 else kwargs.get('default', default)
-
-                                with contextlib.suppress(Exception):
-                                    wrapped_print(str(question))
-                                # Wait for a response or cancellation
-                                while True:
-                                    if cancel_event.is_set():
-                                        raise EOFError()
-                                    try:
-                                        resp = input_queue.get(timeout=0.5)
-                                    except queue.Empty:
-                                        continue
-                                    except Exception:
-                                        raise
-                                    resp = (resp or "").strip().lower()
-                                    if resp in ("y", "yes"):
-                                        return True
-                                    if resp in ("n", "no"):
-                                        return False
-                                    return default_val
-
-                        _cli_ui.ask_yes_no = wrapped_ask_yes_no
-                        # Save original ask_yes_no so external cleaners (eg. /api/kill)
-                        # can restore it if the inproc run is terminated early.
-                        try:
-                            if console_key in _ua_console_store:
-                                _ua_console_store[console_key]["orig_ask_yes_no"] = orig_ask_yes_no
-                        except Exception:
-                            pass
-
-                        # ask_string: prompt user for an arbitrary string
+                        if not inproc_runs.acquire(session_id, timeout=0):
+                            position = inproc_runs.position(session_id)
+                            yield f"data: {json.dumps({'type': 'system', 'data': f'Queued behind {position} other run(s); {inproc_runs.limit} in-process run(s) execute at a time'})}\n\n"
+                            while not inproc_runs.acquire(session_id, timeout=0.5):
+                                if run.cancelled:
+                                    yield f"data: {json.dumps({'type': 'system', 'data': 'Queued run cancelled'})}\n\n"
+                                    return
+                                yield f"data: {json.dumps({'type': 'keepalive'})}\n\n"
+                    except BaseException:
+                        # Client went away while queued: give up the place in line
+                        inproc_runs.release(session_id)
+                        active_processes.pop(session_id, None)
+                        raise
+
+                    # Run the upload main loop in a separate thread to avoid blocking SSE generator
+                    def run_upload():
                         try:
-                            orig_ask_string = _cli_ui.ask_string
-
-                            def wrapped_ask_string(prompt: str, _default: Optional[str] = None) -> str:
-                                with contextlib.suppress(Exception):
-                                    wrapped_print(prompt)
-                                # Wait for input or cancellation
-                                while True:
-                                    if cancel_event.is_set():
-                                        raise EOFError()
-                                    try:
-                                        resp = input_queue.get(timeout=0.5)
-                                        return resp
-                                    except queue.Empty:
-                                        continue
-                                    except Exception:
-                                        raise
-
-                            _cli_ui.ask_string = wrapped_ask_string
-                            # Save original ask_string for external cleanup
-                            try:
-                                if console_key in _ua_console_store:
-                                    _ua_console_store[console_key]["orig_ask_string"] = orig_ask_string
-                            except Exception:
-                                pass
-                        except Exception:
-                            orig_ask_string = None
-                    except Exception:
-                        orig_ask_yes_no = None
-
-                    # Prepare sys.argv for upload.py to parse
-                    old_argv = list(sys.argv)
-                    try:
-                        import shlex
-
-                        parsed_args = []
-                        if args:
-                            parsed_args = shlex.split(args)
-                            parsed_args = _validate_upload_assistant_args(parsed_args)
-
-                        sys.argv = [str(upload_script), validated_path] + parsed_args
-
-                        # Store in active_processes so /api/input can post into the queue
-                        cast(Any, active_processes)[session_id] = {
-                            "mode": "inproc",
-                            "input_queue": input_queue,
-                            "record_console": record_console,
-                            "cancel_event": cancel_event,
-                        }
-
-                        # Run the upload main loop in a separate thread to avoid blocking SSE generator
-                        def run_upload():
-                            try:
-                                # Run the async main() entry point of upload.py
-                                import asyncio
+                            with activate_run(run):
+                                try:
+                                    # Run the async main() entry point of upload.py
+                                    import asyncio
 
-                                # Use the pre-imported upload_main from the outer scope.
-                                # If it wasn't available, attempt a safe import here as fallback.
-                                nonlocal_upload = upload_main
-                                if nonlocal_upload is None:
-                                    try:
-                                        import upload as _upload_fallback
+                                    # Use the pre-imported upload_main from the outer scope.
+                                    # If it wasn't available, attempt a safe import here as fallback.
+                                    nonlocal_upload = upload_main
+                                    if nonlocal_upload is None:
+                                        try:
+                                            import upload as _upload_fallback
 
-                                        nonlocal_upload = _upload_fallback.main
-                                    except Exception:
-                                        nonlocal_upload = None
+                                            nonlocal_upload = _upload_fallback.main
+                                        except Exception:
+                                            nonlocal_upload = None
 
-                                # Ensure Windows event loop policy when needed
-                                if sys.platform == "win32":
-                                    with contextlib.suppress(Exception):
-                                        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
-                                if nonlocal_upload is None:
-                                    raise RuntimeError("upload.main not available for in-process execution")
-                                asyncio.run(nonlocal_upload())
-                            except Exception as e:
-                                # If the exception is the cooperative cancellation marker,
-                                # print a short, non-alarming message and avoid printing
-                                # the full traceback which can confuse the operator.
-                                try:
-                                    if isinstance(e, EOFError):
-                                        console.print("In-process run cancelled (Ctrl+C)", markup=False)
-                                    else:
-                                        console.print(f"In-process execution error: {e}", markup=False)
-                                        console.print(traceback.format_exc(), markup=False)
-                                except Exception:
-                                    with contextlib.suppress(Exception):
-                                        console.print("In-process run ended", markup=False)
-                            finally:
-                                # Restore sys.argv in finally block
-                                # Restore patched console
-                                console_key = id(src_console.console)
-                                if console_key in _ua_console_store:
-                                    origs = _ua_console_store[console_key]
-                                    src_console.console.print = origs["orig_print"]
-                                    if "orig_input" in origs and origs["orig_input"] is not None:
-                                        src_console.console.input = origs["orig_input"]
-                                    # Restore cli_ui patched functions if present
-                                    try:
-                                        if "orig_ask_yes_no" in origs and origs["orig_ask_yes_no"] is not None:
-                                            _cli_ui.ask_yes_no = origs["orig_ask_yes_no"]
-                                    except Exception:
-                                        pass
+                                    # Ensure Windows event loop policy when needed
+                                    if sys.platform == "win32":
+                                        with contextlib.suppress(Exception):
+                                            asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+                                    if nonlocal_upload is None:
+                                        raise RuntimeError("upload.main not available for in-process execution")
+                                    asyncio.run(nonlocal_upload())
+                                except Exception as e:
+                                    # If the exception is the cooperative cancellation marker,
+                                    # print a short, non-alarming message and avoid printing
+                                    # the full traceback which can confuse the operator.
                                     try:
-                                        if "orig_ask_string" in origs and origs["orig_ask_string"] is not None:
-                                            _cli_ui.ask_string = origs["orig_ask_string"]
+                                        if isinstance(e, EOFError):
+                                            console.print("In-process run cancelled (Ctrl+C)", markup=False)
+                                        else:
+                                            console.print(f"In-process execution error: {e}", markup=False)
+                                            console.print(traceback.format_exc(), markup=False)
                                     except Exception:
-                                        pass
-                                    del _ua_console_store[console_key]
-                                # Release lock to allow next inproc run
-                                inproc_lock.release()
-
-                        worker = threading.Thread(target=run_upload, daemon=True)
-                        # Acquire lock to prevent concurrent inproc runs (avoids cross-session interference)
-                        # Use a timed acquire so we don't block indefinitely; if we fail
-                        # to acquire the lock, return an error to the client.
-                        try:
-                            acquired = inproc_lock.acquire(timeout=2)
-                        except TypeError:
-                            # Some older Python runtimes may not support timeout parameter
-                            acquired = inproc_lock.acquire(blocking=False)
-
-                        if not acquired:
-                            console.print(f"Failed to acquire inproc lock for session {session_id}; another inproc run may be active", markup=False)
-                            yield f"data: {json.dumps({'type': 'error', 'data': 'Another in-process run is active'})}\n\n"
-                            return
+                                        with contextlib.suppress(Exception):
+                                            console.print("In-process run ended", markup=False)
+                        finally:
+                            # Free the slot so the next queued run can start
+                            inproc_runs.release(session_id)
 
+                    worker = threading.Thread(target=run_upload, name=f"inproc-{session_id}", daemon=True)
+                    try:
                         worker.start()
 
                         # Record worker thread for debugging/cleanup
@@ -3361,12 +3390,12 @@ def execute_command():
 
                         console.print(f"Started inproc worker for session {session_id}: {worker.name}", markup=False)
 
-                        # Stream full HTML snapshots from the recorder while the worker runs.
+                        # Stream the recorder's new output as HTML deltas while the worker runs.
                         # To avoid spinning the SSE thread and growing the server task queue
                         # when the uploader prints heavily, block waiting for print events
                         # with a short timeout and coalesce multiple prints into a
-                        # single exported snapshot.
-                        last_body = ""
+                        # single exported batch.
+                        html_stream = RecordedHtmlStream(record_console)
                         try:
                             while worker.is_alive():
                                 try:
@@ -3378,7 +3407,7 @@ def execute_command():
                                         record_console.print(*r_args, **r_kwargs)
 
                                     # Drain any additional queued prints so we can coalesce
-                                    # them into a single exported snapshot.
+                                    # them into a single exported batch.
                                     while not render_queue.empty():
                                         try:
                                             r_args, r_kwargs = render_queue.get_nowait()
@@ -3387,14 +3416,8 @@ def execute_command():
                                         with contextlib.suppress(Exception):
                                             record_console.print(*r_args, **r_kwargs)
 
-                                    # Export and yield a full HTML snapshot only when the
-                                    # rendered body has changed.
-                                    html_doc = record_console.export_html(inline_styles=True)
-                                    m = re.search(r"<body[^>]*>(.*?)</body>", html_doc, re.S | re.I)
-                                    body = m.group(1).strip() if m else html_doc
-                                    if body != last_body:
-                                        last_body = body
-                                        yield f"data: {json.dumps({'type': 'html_full', 'data': body})}\n\n"
+                                    # Export only what was printed since the last batch
+                                    yield from html_stream.events()
                                 except queue.Empty:
                                     # No print activity within the timeout — send a keepalive
                                     # to keep the SSE connection alive without busy-waiting.
@@ -3403,7 +3426,7 @@ def execute_command():
                                     # Swallow per-iteration errors to keep the stream alive.
                                     yield f"data: {json.dumps({'type': 'keepalive'})}\n\n"
 
-                            # Worker finished; drain any remaining prints and send final snapshot
+                            # Worker finished; drain any remaining prints and send the last batch
                             while not render_queue.empty():
                                 try:
                                     r_args, r_kwargs = render_queue.get_nowait()
@@ -3412,47 +3435,16 @@ def execute_command():
                                 with contextlib.suppress(Exception):
                                     record_console.print(*r_args, **r_kwargs)
 
-                            try:
-                                html_doc = record_console.export_html(inline_styles=True)
-                                m = re.search(r"<body[^>]*>(.*?)</body>", html_doc, re.S | re.I)
-                                body = m.group(1).strip() if m else html_doc
-                                if body != last_body:
-                                    yield f"data: {json.dumps({'type': 'html_full', 'data': body})}\n\n"
-                            except Exception:
-                                pass
+                            with contextlib.suppress(Exception):
+                                yield from html_stream.events()
                         except Exception:
                             # Ensure generator continues and yields a final keepalive on error
                             yield f"data: {json.dumps({'type': 'keepalive'})}\n\n"
 
                     finally:
-                        # restore patched functions and argv
-                        try:
-                            # Prefer restoring originals from the module-level store
-                            console_key = id(orig_console)
-                            if console_key in _ua_console_store:
-                                stored = _ua_console_store.pop(console_key, {})
-                                with contextlib.suppress(Exception):
-                                    orig_console.print = stored.get("orig_print", orig_console.print)
-                                with contextlib.suppress(Exception):
-                                    orig_in = stored.get("orig_input", None)
-                                    if orig_in is not None:
-                                        orig_console.input = orig_in
-                        except Exception:
-                            # best-effort restore using locals
-                            with contextlib.suppress(Exception):
-                                orig_console.print = orig_print
-                            with contextlib.suppress(Exception):
-                                if orig_input is not None:
-                                    orig_console.input = orig_input
-
-                        with contextlib.suppress(Exception):
-                            if orig_ask_yes_no is not None:
-                                _cli_ui.ask_yes_no = orig_ask_yes_no
-                        with contextlib.suppress(Exception):
-                            if orig_ask_string is not None:
-                                _cli_ui.ask_string = orig_ask_string
-
-                        sys.argv = old_argv
+                        # Nobody can answer this run's prompts once its stream is gone
+                        if worker.is_alive():
+                            run.cancel()
 
                         # Remove process tracking for this session
                         with contextlib.suppress(Exception):
@@ -3711,6 +3703,15 @@ def send_input():
         # If this session is an in-process run, push to its input queue
         try:
             process_info = active_processes[session_id]
+            if process_info.get("mode") == "worker":
+                from src.workerdaemon import send_message
+
+                connection = process_info.get("connection")
+                if connection is None:
+                    return jsonify({"success": False, "error": "Worker connection not available"}), 400
+                send_message(connection, {"type": "input", "data": user_input})
+                return jsonify({"success": True})
+
             if process_info.get("mode") == "inproc":
                 raw_q = process_info.get("input_queue")
                 if raw_q is None:
@@ -3774,10 +3775,24 @@ def kill_process():
         process_info = active_processes[session_id]
         mode = process_info.get('mode')
 
-        # If this is an in-process run, perform best-effort cleanup of patched
-        # console state and release the inproc lock so future inproc runs can start.
+        # A worker job can't be killed from here without taking the worker down; closing its
+        # input ends it at its next prompt, the same way an in-process run is cancelled.
+        if mode == 'worker':
+            from src.workerdaemon import send_message
+
+            connection = process_info.get("connection")
+            if connection is not None:
+                with contextlib.suppress(Exception):
+                    send_message(connection, {"type": "eof"})
+            with contextlib.suppress(Exception):
+                if session_id in active_processes:
+                    del active_processes[session_id]
+            console.print(f"Worker job cancelled for session {session_id}", markup=False)
+            return jsonify({"success": True, "message": "Worker job input closed; it stops at its next prompt"})
+
+        # An in-process run is cancelled through its RunContext token: it stops at its next
+        # prompt, or gives up its place if it is still queued.
         if mode == 'inproc':
-            # Signal cancellation to the inproc worker and attempt to join it
             try:
                 cancel_event = process_info.get("cancel_event")
                 if isinstance(cancel_event, threading.Event):
@@ -3788,68 +3803,13 @@ def kill_process():
             except Exception:
                 pass
 
-            # Attempt to restore any patched console/cli state from the
-            # module-level store so future runs have working print/input.
-            try:
-                with contextlib.suppress(Exception):
-                    # Prefer restoring originals tied to the current src.console
-                    try:
-                        from src import console as _src_console
-                        ck = id(_src_console.console)
-                        if ck in _ua_console_store:
-                            origs = _ua_console_store.pop(ck)
-                            with contextlib.suppress(Exception):
-                                _src_console.console.print = origs.get("orig_print", _src_console.console.print)
-                            with contextlib.suppress(Exception):
-                                orig_in = origs.get("orig_input", None)
-                                if orig_in is not None:
-                                    _src_console.console.input = orig_in
-                            # Restore any cli_ui wrappers if we have originals
-                            try:
-                                import cli_ui as _cli_ui
-                                with contextlib.suppress(Exception):
-                                    if "orig_ask_yes_no" in origs and origs["orig_ask_yes_no"] is not None:
-                                        _cli_ui.ask_yes_no = origs["orig_ask_yes_no"]
-                                with contextlib.suppress(Exception):
-                                    if "orig_ask_string" in origs and origs["orig_ask_string"] is not None:
-                                        _cli_ui.ask_string = origs["orig_ask_string"]
-                            except Exception:
-                                pass
-                    except Exception:
-                        # Best-effort: if we can't import src.console, fall back to
-                        # restoring any stored callables into the module-level
-                        # `console` we imported at module import time.
-                        try:
-                            ck = id(console)
-                            if ck in _ua_console_store:
-                                origs = _ua_console_store.pop(ck)
-                                with contextlib.suppress(Exception):
-                                    console.print = origs.get("orig_print", console.print)
-                                with contextlib.suppress(Exception):
-                                    orig_in = origs.get("orig_input", None)
-                                    if orig_in is not None:
-                                        console.input = orig_in
-                        except Exception:
-                            pass
-
-                    # If any other entries remain in the store, drop them to avoid
-                    # leaking references — they are unlikely to be useful now.
-                    _ua_console_store.clear()
-            except Exception:
-                pass
-
-            # Release inproc lock if held; best-effort only.
-            with contextlib.suppress(Exception):
-                if inproc_lock.locked():
-                    inproc_lock.release()
-
             # Remove tracking entry
             with contextlib.suppress(Exception):
                 if session_id in active_processes:
                     del active_processes[session_id]
 
             console.print(f"In-process run terminated for session {session_id}", markup=False)
-            return jsonify({"success": True, "message": "In-process run terminated and console state wiped"})
+            return jsonify({"success": True, "message": "In-process run terminated"})
 
         # Otherwise assume subprocess.Popen case
         # Retrieve subprocess handle
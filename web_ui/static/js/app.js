@@ -52,6 +52,7 @@ const argumentCategories = [
     args: [
       { label: "--queue", placeholder: "QUEUE_NAME", description: "Process a named queue from a folder path" },
       { label: "--limit-queue", placeholder: "N", description: "Limit queue successful uploads" },
+      { label: "--pipeline", description: "Overlap queue items across stages (unattended)" },
       { label: "--site-check", description: "Site check (can it be uploaded)" },
       { label: "--site-upload", placeholder: "TRACKER", description: "Site upload (process site check content)" },
       { label: "--search_requests", description: "Search supported site for matching requests (config)" },
@@ -132,6 +133,7 @@ const argumentCategories = [
       { label: "--extras", description: "Extras included" },
       { label: "--distributor", placeholder: "NAME", description: "Disc distributor" },
       { label: "--sorted-filelist", description: "Sorted filelist (handles typical anime nonsense)" },
+      { label: "--no-meta-cache", description: "Bypass the cached TMDB/IMDb/TVMaze responses" },
       { label: "--keep-folder", description: "Keep top folder with single file uploads" },
       { label: "--keep-nfo", description: "Keep nfo (extremely site specific)" },
     ]
@@ -359,7 +361,6 @@ function AudionutsUAGUI() {
   const [descLinkFocused, setDescLinkFocused] = useState(false);
   
   const richOutputRef = useRef(null);
-  const lastFullHashRef = useRef('');
   const inputRef = useRef(null);
   const sseAbortControllerRef = useRef(null);
   
@@ -527,12 +528,14 @@ function AudionutsUAGUI() {
     setCustomArgs(prev => updateArgValue(prev, '--desclink', url));
   };
 
-  const appendHtmlFragment = (rawHtml) => {
+  const appendHtmlFragment = (rawHtml, seq) => {
     const container = richOutputRef.current;
     if (container) {
       const clean = sanitizeHtml((rawHtml || '').trim());
       const wrapper = document.createElement('div');
       wrapper.innerHTML = clean;
+      // Numbered in-process output batches can be replaced by a later resync
+      if (seq !== undefined) wrapper.dataset.uaSeq = String(seq);
       container.appendChild(wrapper);
       // Use scrollIntoView to avoid clipping of the last line
       setTimeout(() => {
@@ -1012,8 +1015,6 @@ function AudionutsUAGUI() {
     if (rootContainer) {
       rootContainer.innerHTML = '';
     }
-    // Reset last-full snapshot key to allow appending fresh full snapshots
-    if (lastFullHashRef) lastFullHashRef.current = '';
 
     appendSystemMessage('');
     appendSystemMessage(`$ python upload.py "${selectedPath}" ${customArgs}`);
@@ -1055,33 +1056,37 @@ function AudionutsUAGUI() {
       const decoder = new TextDecoder();
       let buffer = '';
 
+      // In-process output arrives as numbered html_append batches; html_full resyncs them all
+      let lastSeq = 0;
+      let outOfSync = false;
+
       const processSSELine = (line) => {
         if (localController && localController.signal.aborted) return;
         if (!line.trim() || !line.startsWith('data: ')) return;
         try {
           const data = JSON.parse(line.substring(6));
-          if (data.type === 'html' || data.type === 'html_full') {
+          if (data.type === 'html' || data.type === 'html_append' || data.type === 'html_full') {
             try {
               const rawHtml = data.data || '';
-              const clean = sanitizeHtml(rawHtml);
               if (data.type === 'html_full') {
-                const shortSample = clean.slice(0, 200);
-                const key = `${clean.length}:${shortSample}`;
-                if (lastFullHashRef.current !== key) {
-                  lastFullHashRef.current = key;
-                  const wrapper = document.createElement('div');
-                  wrapper.innerHTML = clean;
-                  if (rootContainer) rootContainer.appendChild(wrapper);
-                  setTimeout(() => {
-                    const last = rootContainer && rootContainer.lastElementChild;
-                    if (last && last.scrollIntoView) last.scrollIntoView({ block: 'end' });
-                    else if (rootContainer) rootContainer.scrollTop = rootContainer.scrollHeight;
-                  }, 0);
+                // Nothing to repair when every batch up to this one arrived
+                if (!outOfSync && data.seq === lastSeq) return;
+                if (rootContainer) {
+                  rootContainer.querySelectorAll('[data-ua-seq]').forEach((el) => el.remove());
                 }
+                appendHtmlFragment(rawHtml, data.seq);
+                lastSeq = data.seq;
+                outOfSync = false;
+                return;
+              }
+              if (data.type === 'html_append') {
+                if (data.seq !== lastSeq + 1) outOfSync = true;
+                lastSeq = data.seq;
+                appendHtmlFragment(rawHtml, data.seq);
                 return;
               }
               // delegate to shared helper for fragments
-              appendHtmlFragment(clean);
+              appendHtmlFragment(rawHtml);
             } catch (e) {
               console.error('Failed to render HTML fragment:', e);
             }
@@ -1146,7 +1146,7 @@ function ItemList({
 
   // Define known subgroupings for better visual breakdown (screenshots-related)
   const subgroupDefinitions = {
-    'General ffmpeg': ['ffmpeg_compression', 'process_limit', 'ffmpeg_limit'],
+    'General ffmpeg': ['ffmpeg_compression', 'process_limit', 'ffmpeg_limit', 'ffmpeg_batch_screens'],
     'Overlay': ['frame_overlay', 'overlay_text_size'],
     'HDR Tonemapping': ['tone_map', 'algorithm', 'desat', 'use_libplacebo', 'ffmpeg_is_good', 'ffmpeg_warmup'],
     'Bluray & DVD': ['use_largest_playlist', 'get_bluray_info', 'bluray_score', 'bluray_single_score', 'ping_unit3d'],